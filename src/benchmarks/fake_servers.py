@@ -0,0 +1,321 @@
+# src/benchmarks/fake_servers.py
+"""
+Servidores HTTP locais que imitam a Bot API do Telegram, o PostgREST do Supabase e
+o endpoint do Gemini, com latência e erros injetáveis. Usados pelo teste de carga.
+"""
+
+import datetime
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, ClassVar, Dict, List, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from src.benchmarks.fake_supabase import FakeSupabaseClient
+from src.core.backends import Query
+
+# Parâmetros da URL do PostgREST que não são filtros
+_POSTGREST_RESERVED = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+_GEMINI_MESSAGE_RE = re.compile(r"Mensagem do Usuário:\s*(.+)")
+
+
+class FaultInjector:
+    """Latência (média ± jitter, em ms) e taxa de erro aplicadas a cada requisição."""
+
+    def __init__(
+        self,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: Union[int, None] = None,
+    ):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def apply(self) -> bool:
+        """Dorme a latência sorteada e retorna True se a requisição deve falhar."""
+        with self._lock:
+            delay = self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)
+            fail = self._rng.random() < self.error_rate
+        if delay > 0:
+            time.sleep(delay / 1000)
+        return fail
+
+
+class _FakeRequestHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 mantém as conexões vivas entre requisições, como as APIs reais
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self) -> None:
+        fake = self.server.fake
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        fake.requests += 1
+        if fake.fault.apply():
+            fake.errors += 1
+            status, payload = fake.error_response()
+        else:
+            try:
+                status, payload = fake.handle(
+                    self.command, self.path, self.headers, body
+                )
+            except Exception as e:
+                # Requisição que o fake não entende: devolve 400 em vez de derrubar
+                status, payload = 400, {"message": f"{type(e).__name__}: {e}"}
+        data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PATCH = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        # Milhares de requisições por execução: o log por requisição só atrapalha
+        pass
+
+
+class FakeServer:
+    """Base: sobe um ThreadingHTTPServer numa thread daemon em uma porta livre."""
+
+    def __init__(self, fault: Union[FaultInjector, None] = None):
+        self.fault = fault or FaultInjector()
+        self.requests = 0
+        self.errors = 0
+        self._server: Union[ThreadingHTTPServer, None] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self, host: str = "127.0.0.1", port: int = 0) -> "FakeServer":
+        self._server = ThreadingHTTPServer((host, port), _FakeRequestHandler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        threading.Thread(
+            target=self._server.serve_forever,
+            name=type(self).__name__,
+            daemon=True,
+        ).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+
+    def handle(self, method: str, path: str, headers, body: bytes) -> Tuple[int, Any]:
+        raise NotImplementedError
+
+    def error_response(self) -> Tuple[int, Any]:
+        return 500, {"message": "erro injetado"}
+
+
+class FakeTelegramServer(FakeServer):
+    """
+    Bot API em /bot<token>/<método>. Cada sendMessage é repassado a `on_message`
+    (chat_id, texto), que o teste de carga usa para medir o tempo de resposta.
+    """
+
+    BOT_USER: ClassVar[Dict[str, Any]] = {
+        "id": 1,
+        "is_bot": True,
+        "first_name": "Bot de Carga",
+        "username": "carga_bot",
+    }
+
+    def __init__(
+        self,
+        fault: Union[FaultInjector, None] = None,
+        on_message: Union[Callable[[int, str], None], None] = None,
+    ):
+        super().__init__(fault)
+        self.on_message = on_message
+        self._message_id = 0
+        self._lock = threading.Lock()
+
+    def handle(self, method, path, headers, body):
+        bot_method = path.rstrip("/").rsplit("/", 1)[-1]
+        if "json" in (headers.get("Content-Type") or ""):
+            params = json.loads(body or b"{}")
+        else:
+            params = {
+                key: values[0] for key, values in parse_qs(body.decode("utf-8")).items()
+            }
+
+        if bot_method == "getMe":
+            return 200, {"ok": True, "result": self.BOT_USER}
+        if bot_method == "sendMessage":
+            chat_id = int(params["chat_id"])
+            with self._lock:
+                self._message_id += 1
+                message_id = self._message_id
+            if self.on_message:
+                self.on_message(chat_id, params.get("text", ""))
+            return 200, {
+                "ok": True,
+                "result": {
+                    "message_id": message_id,
+                    "date": int(time.time()),
+                    "chat": {"id": chat_id, "type": "private"},
+                    "from": self.BOT_USER,
+                    "text": params.get("text", ""),
+                },
+            }
+        # Demais métodos (sendChatAction, deleteWebhook...) só precisam de sucesso
+        return 200, {"ok": True, "result": True}
+
+    def error_response(self):
+        return 500, {
+            "ok": False,
+            "error_code": 500,
+            "description": "Internal Server Error: erro injetado",
+        }
+
+
+class FakePostgrestServer(FakeServer):
+    """
+    Traduz as requisições REST do postgrest-py (/rest/v1/<tabela>) para o
+    FakeSupabaseClient em memória. Uma trava serializa as escritas, como as
+    transações do Postgres fariam para este volume.
+    """
+
+    def __init__(
+        self, client: FakeSupabaseClient, fault: Union[FaultInjector, None] = None
+    ):
+        super().__init__(fault)
+        self.client = client
+        self._lock = threading.Lock()
+
+    def handle(self, method, path, headers, body):
+        parts = urlsplit(path)
+        table = parts.path.rstrip("/").rsplit("/", 1)[-1]
+        params = parse_qs(parts.query, keep_blank_values=True)
+        query = self._build_query(table, method, params, headers, body)
+        with self._lock:
+            rows = query.execute().data
+        return (201 if method == "POST" else 200), rows
+
+    def _build_query(
+        self, table: str, method: str, params: Dict[str, List[str]], headers, body
+    ) -> Query:
+        query = self.client.table(table)
+        payload = json.loads(body) if body else None
+        if method == "POST":
+            prefer = headers.get("Prefer") or ""
+            if "on_conflict" in params or "resolution=" in prefer:
+                query.upsert(
+                    payload,
+                    on_conflict=params.get("on_conflict", ["id"])[0],
+                    ignore_duplicates="ignore-duplicates" in prefer,
+                )
+            else:
+                query.insert(payload)
+        elif method == "PATCH":
+            query.update(payload)
+        elif method == "DELETE":
+            query.delete()
+        else:
+            query.select(params.get("select", ["*"])[0])
+
+        for column, values in params.items():
+            if column in _POSTGREST_RESERVED:
+                continue
+            for value in values:
+                if column in ("or", "and"):
+                    query.or_(value)
+                else:
+                    op, _, operand = value.partition(".")
+                    query.filter(column, op, operand)
+
+        for order in params.get("order", [""])[0].split(","):
+            if order:
+                column, _, direction = order.partition(".")
+                query.order(column, desc=direction.startswith("desc"))
+        if "limit" in params:
+            query.limit(int(params["limit"][0]))
+        if "offset" in params:
+            query.offset(int(params["offset"][0]))
+        return query
+
+    def error_response(self):
+        return 503, {
+            "code": "PGRST000",
+            "message": "erro injetado",
+            "details": None,
+            "hint": None,
+        }
+
+
+class FakeGeminiServer(FakeServer):
+    """
+    Endpoint generateContent do Gemini. Prompts de extração viram um gasto cuja
+    categoria ainda não existe (forçando a clarificação); os demais, "Lazer".
+    """
+
+    def __init__(
+        self,
+        fault: Union[FaultInjector, None] = None,
+        responder: Union[Callable[[str], str], None] = None,
+    ):
+        super().__init__(fault)
+        self.responder = responder or default_gemini_responder
+
+    def handle(self, method, path, headers, body):
+        request = json.loads(body or b"{}")
+        prompt = "".join(
+            part.get("text", "")
+            for content in request.get("contents", [])
+            for part in content.get("parts", [])
+        )
+        return 200, {
+            "candidates": [
+                {
+                    "content": {
+                        "parts": [{"text": self.responder(prompt)}],
+                        "role": "model",
+                    },
+                    "finishReason": "STOP",
+                    "index": 0,
+                }
+            ]
+        }
+
+    def error_response(self):
+        return 503, {
+            "error": {
+                "code": 503,
+                "message": "erro injetado",
+                "status": "UNAVAILABLE",
+            }
+        }
+
+
+def default_gemini_responder(prompt: str) -> str:
+    """
+    Responde como o Gemini ao fluxo de gasto do teste de carga. A categoria leva a
+    última palavra da mensagem (única por usuário e iteração), para que os aliases
+    aprendidos numa iteração não pulem a clarificação na seguinte.
+    """
+    match = _GEMINI_MESSAGE_RE.search(prompt)
+    if not match:
+        return "Lazer"
+    tag = match.group(1).strip().split()[-1]
+    return json.dumps(
+        {
+            "intencao": "gasto",
+            "valor": 50.0,
+            "categoria": f"Academia {tag}",
+            "data": datetime.date.today().isoformat(),
+            "forma_pagamento": None,
+            "descricao_gasto": "academia",
+        }
+    )
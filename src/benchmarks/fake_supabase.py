@@ -0,0 +1,20 @@
+# src/benchmarks/fake_supabase.py
+from typing import Any, Dict, List
+
+from src.core.backends.memory import MemoryBackend
+from src.core.backends.query import Query
+
+
+class FakeSupabaseClient(MemoryBackend):
+    """
+    Backend em memória que também conta as consultas executadas (`calls`), para os
+    benchmarks compararem quantas idas ao banco cada caminho faz.
+    """
+
+    def __init__(self, tables: Dict[str, List[Dict[str, Any]]]):
+        super().__init__(tables)
+        self.calls = 0
+
+    def execute(self, query: Query) -> List[Dict[str, Any]]:
+        self.calls += 1
+        return super().execute(query)
@@ -0,0 +1,112 @@
+# src/benchmarks/ledger.py
+import datetime
+import random
+from typing import Any, Dict, List, Union
+
+# Nomes realistas; os pesos decrescentes (Zipf) fazem poucas categorias e formas de
+# pagamento concentrarem a maior parte dos lançamentos, como num extrato real
+CATEGORY_NAMES = [
+    "Alimentacao",
+    "Mercado",
+    "Transporte",
+    "Moradia",
+    "Lazer",
+    "Saude",
+    "Assinaturas",
+    "Educacao",
+    "Vestuario",
+    "Viagem",
+    "Presentes",
+    "Pets",
+    "Outros",
+]
+PAYMENT_METHOD_NAMES = ["Pix", "Credito", "Debito", "Dinheiro", "Boleto", "Vale"]
+DESCRIPTIONS = {
+    "Alimentacao": ["almoço", "ifood", "padaria", "lanche", "restaurante"],
+    "Mercado": ["supermercado", "feira", "atacadão"],
+    "Transporte": ["uber", "gasolina", "ônibus", "estacionamento"],
+    "Moradia": ["aluguel", "condomínio", "luz", "internet"],
+    "Lazer": ["cinema", "bar", "show"],
+}
+
+
+def _zipf_weights(n: int, s: float = 1.1) -> List[float]:
+    return [1 / (rank**s) for rank in range(1, n + 1)]
+
+
+def generate_ledger(
+    n_expenses: int,
+    n_incomes: Union[int, None] = None,
+    months: int = 24,
+    end_date: datetime.date = datetime.date(2025, 6, 30),
+    seed: int = 42,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Gera um livro-caixa sintético com as tabelas do Supabase (categories,
+    payment_methods, expenses, ganhos). É determinístico para uma mesma seed.
+    """
+    rng = random.Random(seed)
+    categories = [
+        {
+            "id": f"cat-{i}",
+            "name": name,
+            # Só parte das categorias tem limite, como na base real
+            "monthly_limit": float(rng.choice([300, 500, 800, 1200]))
+            if i % 3 == 0
+            else None,
+            "aliases": [name.lower()],
+        }
+        for i, name in enumerate(CATEGORY_NAMES)
+    ]
+    payment_methods = [
+        {"id": f"fp-{i}", "name": name} for i, name in enumerate(PAYMENT_METHOD_NAMES)
+    ]
+
+    days = months * 30
+    start = end_date - datetime.timedelta(days=days - 1)
+    category_idx = rng.choices(
+        range(len(categories)), weights=_zipf_weights(len(categories)), k=n_expenses
+    )
+    payment_idx = rng.choices(
+        range(len(payment_methods)),
+        weights=_zipf_weights(len(payment_methods), s=1.5),
+        k=n_expenses,
+    )
+
+    expenses = []
+    for i in range(n_expenses):
+        categoria = categories[category_idx[i]]
+        descricoes = DESCRIPTIONS.get(categoria["name"], ["compra"])
+        expenses.append(
+            {
+                "id": f"exp-{i}",
+                "value": round(rng.lognormvariate(3.5, 0.9), 2),
+                "date": (
+                    start + datetime.timedelta(days=rng.randrange(days))
+                ).isoformat(),
+                "description": rng.choice(descricoes),
+                "category_id": categoria["id"],
+                # ~5% dos gastos ficam sem forma de pagamento
+                "payment_method_id": payment_methods[payment_idx[i]]["id"]
+                if rng.random() > 0.05
+                else None,
+            }
+        )
+
+    n_incomes = n_incomes if n_incomes is not None else max(months, n_expenses // 50)
+    ganhos = [
+        {
+            "id": f"gan-{i}",
+            "value": round(rng.uniform(500, 6000), 2),
+            "date": (start + datetime.timedelta(days=rng.randrange(days))).isoformat(),
+            "description": rng.choice(["salário", "freelance", "reembolso"]),
+        }
+        for i in range(n_incomes)
+    ]
+
+    return {
+        "categories": categories,
+        "payment_methods": payment_methods,
+        "expenses": expenses,
+        "ganhos": ganhos,
+    }
@@ -0,0 +1,307 @@
+# src/benchmarks/loadtest.py
+"""
+Teste de carga ponta a ponta do fluxo de gasto com Telegram, Supabase e Gemini falsos.
+
+    python -m src.benchmarks.loadtest --users 20 --iterations 5
+    python -m src.benchmarks.loadtest --gemini-latency 800 --supabase-error-rate 0.02
+
+Cada usuário simulado percorre o ConversationHandler completo (mensagem ->
+clarificação da categoria -> forma de pagamento -> confirmação). O relatório traz
+p50/p95/p99 de cada etapa e do fluxo inteiro, vazão e erros.
+"""
+
+import argparse
+import asyncio
+import datetime
+import itertools
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List, Union
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+from telegram import Update
+
+from src.benchmarks.fake_servers import (
+    FakeGeminiServer,
+    FakePostgrestServer,
+    FakeTelegramServer,
+    FaultInjector,
+)
+from src.benchmarks.fake_supabase import FakeSupabaseClient
+from src.benchmarks.ledger import generate_ledger
+
+# (etapa, mensagem do usuário, trecho esperado na resposta do bot). A mensagem
+# inicial leva uma marca única por usuário/iteração (ver default_gemini_responder)
+FLOW_STEPS = [
+    ("mensagem", "gastei 50 na academia {tag}", "Não encontrei uma categoria exata"),
+    ("clarificacao", "Lazer", "forma de pagamento"),
+    ("pagamento", "Pix", "Confirma o *gasto*"),
+    ("confirmacao", "Sim", "registrado com sucesso"),
+]
+SERVICES = ("telegram", "supabase", "gemini")
+FIRST_CHAT_ID = 10_000
+
+
+def latency_summary(samples: List[float]) -> Dict[str, Any]:
+    """Percentis (nearest-rank) em milissegundos de uma lista de durações em segundos."""
+    if not samples:
+        return {"count": 0, "p50_ms": None, "p95_ms": None, "p99_ms": None}
+    ordered = sorted(samples)
+
+    def percentile(p: float) -> float:
+        index = max(0, -(-len(ordered) * p // 100) - 1)
+        return round(ordered[int(index)] * 1000, 2)
+
+    return {
+        "count": len(ordered),
+        "p50_ms": percentile(50),
+        "p95_ms": percentile(95),
+        "p99_ms": percentile(99),
+        "max_ms": round(ordered[-1] * 1000, 2),
+    }
+
+
+class _Mailbox:
+    """Entrega as mensagens enviadas pelo bot (thread do servidor) a cada usuário."""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self._loop = loop
+        self._queues: Dict[int, asyncio.Queue] = {}
+
+    def queue(self, chat_id: int) -> asyncio.Queue:
+        if chat_id not in self._queues:
+            self._queues[chat_id] = asyncio.Queue()
+        return self._queues[chat_id]
+
+    def deliver(self, chat_id: int, text: str) -> None:
+        self._loop.call_soon_threadsafe(self.queue(chat_id).put_nowait, text)
+
+    def clear(self, chat_id: int) -> None:
+        queue = self.queue(chat_id)
+        while not queue.empty():
+            queue.get_nowait()
+
+    async def wait_for(self, chat_id: int, marker: str, timeout: float) -> bool:
+        """Espera uma resposta que contenha `marker`; False se estourar o prazo."""
+        deadline = time.perf_counter() + timeout
+        queue = self.queue(chat_id)
+        while True:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                return False
+            try:
+                text = await asyncio.wait_for(queue.get(), remaining)
+            except asyncio.TimeoutError:
+                return False
+            if marker in text:
+                return True
+
+
+def _make_update(bot, update_id: int, chat_id: int, text: str) -> Update:
+    message = {
+        "message_id": update_id,
+        "date": int(time.time()),
+        "chat": {"id": chat_id, "type": "private"},
+        "from": {"id": chat_id, "is_bot": False, "first_name": f"Usuario {chat_id}"},
+        "text": text,
+    }
+    if text.startswith("/"):
+        message["entities"] = [
+            {"type": "bot_command", "offset": 0, "length": len(text.split()[0])}
+        ]
+    return Update.de_json({"update_id": update_id, "message": message}, bot)
+
+
+async def _simulate_user(
+    application,
+    mailbox: _Mailbox,
+    update_ids,
+    user: int,
+    iterations: int,
+    timeout: float,
+    results: Dict[str, Any],
+) -> None:
+    chat_id = FIRST_CHAT_ID + user
+    for iteration in range(iterations):
+        tag = f"u{user}i{iteration}"
+        flow_start = time.perf_counter()
+        for step, text, marker in FLOW_STEPS:
+            mailbox.clear(chat_id)
+            start = time.perf_counter()
+            await application.update_queue.put(
+                _make_update(
+                    application.bot, next(update_ids), chat_id, text.format(tag=tag)
+                )
+            )
+            if await mailbox.wait_for(chat_id, marker, timeout):
+                results["steps"][step].append(time.perf_counter() - start)
+                continue
+            results["errors"][step] += 1
+            # Encerra a conversa presa para a próxima iteração começar do zero
+            await application.update_queue.put(
+                _make_update(application.bot, next(update_ids), chat_id, "/cancel")
+            )
+            break
+        else:
+            results["flows"].append(time.perf_counter() - flow_start)
+
+
+async def run_load_test(
+    users: int = 10,
+    iterations: int = 5,
+    ledger_size: int = 1_000,
+    faults: Union[Dict[str, FaultInjector], None] = None,
+    timeout: float = 10.0,
+) -> Dict[str, Any]:
+    """
+    Sobe os servidores falsos e o bot real apontado para eles, simula os usuários
+    em paralelo e retorna o relatório de latência, vazão e erros.
+    """
+    import google.generativeai as genai
+    from supabase import create_client
+
+    from src.bot.bot_setup import build_application
+
+    faults = faults or {}
+    loop = asyncio.get_running_loop()
+    mailbox = _Mailbox(loop)
+    servers = {
+        "telegram": FakeTelegramServer(
+            faults.get("telegram"), on_message=mailbox.deliver
+        ),
+        "supabase": FakePostgrestServer(
+            FakeSupabaseClient(generate_ledger(ledger_size)), faults.get("supabase")
+        ),
+        "gemini": FakeGeminiServer(faults.get("gemini")),
+    }
+    for server in servers.values():
+        server.start()
+
+    genai.configure(
+        api_key="carga",
+        transport="rest",
+        client_options={"api_endpoint": servers["gemini"].url},
+    )
+    application = build_application(
+        {
+            "TELEGRAM_BOT_TOKEN": "123456:carga",
+            "TELEGRAM_BASE_URL": f"{servers['telegram'].url}/bot",
+            "SUPABASE_CLIENT": create_client(
+                servers["supabase"].url, "carga.carga.carga"
+            ),
+        }
+    )
+
+    results = {
+        "steps": {step: [] for step, _, _ in FLOW_STEPS},
+        "errors": {step: 0 for step, _, _ in FLOW_STEPS},
+        "flows": [],
+    }
+    try:
+        await application.initialize()
+        await application.start()
+        update_ids = itertools.count(1)
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _simulate_user(
+                    application, mailbox, update_ids, user, iterations, timeout, results
+                )
+                for user in range(users)
+            )
+        )
+        elapsed = time.perf_counter() - started
+    finally:
+        if application.running:
+            await application.stop()
+        await application.shutdown()
+        for server in servers.values():
+            server.stop()
+
+    answered = sum(len(samples) for samples in results["steps"].values())
+    return {
+        "meta": {
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "users": users,
+            "iterations": iterations,
+            "ledger_size": ledger_size,
+            "timeout_s": timeout,
+            "faults": {
+                name: {
+                    "latency_ms": fault.latency_ms,
+                    "jitter_ms": fault.jitter_ms,
+                    "error_rate": fault.error_rate,
+                }
+                for name, fault in faults.items()
+            },
+        },
+        "steps": {
+            step: {**latency_summary(samples), "errors": results["errors"][step]}
+            for step, samples in results["steps"].items()
+        },
+        "flow": latency_summary(results["flows"]),
+        "throughput": {
+            "elapsed_s": round(elapsed, 3),
+            "flows_per_s": round(len(results["flows"]) / elapsed, 3),
+            "updates_per_s": round(answered / elapsed, 3),
+        },
+        "errors": {
+            "failed_flows": users * iterations - len(results["flows"]),
+            "injected": {name: server.errors for name, server in servers.items()},
+        },
+        "requests": {name: server.requests for name, server in servers.items()},
+    }
+
+
+def main(argv: Union[List[str], None] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--ledger-size", type=int, default=1_000)
+    parser.add_argument(
+        "--timeout", type=float, default=10.0, help="prazo de cada etapa, em segundos"
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default="", help="arquivo JSON de saída")
+    # Latências padrão próximas das observadas em produção
+    default_latency = {"telegram": 50.0, "supabase": 30.0, "gemini": 600.0}
+    for service in SERVICES:
+        parser.add_argument(
+            f"--{service}-latency", type=float, default=default_latency[service]
+        )
+        parser.add_argument(f"--{service}-jitter", type=float, default=0.0)
+        parser.add_argument(f"--{service}-error-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+
+    faults = {
+        service: FaultInjector(
+            latency_ms=getattr(args, f"{service}_latency"),
+            jitter_ms=getattr(args, f"{service}_jitter"),
+            error_rate=getattr(args, f"{service}_error_rate"),
+            seed=args.seed,
+        )
+        for service in SERVICES
+    }
+    report = asyncio.run(
+        run_load_test(
+            users=args.users,
+            iterations=args.iterations,
+            ledger_size=args.ledger_size,
+            faults=faults,
+            timeout=args.timeout,
+        )
+    )
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+# src/benchmarks/run.py
+"""
+Benchmarks offline de gráficos e agregações sobre livros-caixa sintéticos.
+
+    python -m src.benchmarks.run --sizes 1000,100000 --output bench.json
+    python -m src.benchmarks.run --compare base.json bench.json
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+import warnings
+from typing import Any, Callable, Dict, List, Union
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+from src.benchmarks.fake_supabase import FakeSupabaseClient
+from src.benchmarks.ledger import generate_ledger
+from src.bot.handlers.aux.send_expense_list import format_expense_line
+from src.core import ai, charts, db, export, llm_fixtures
+from src.core.backends import SQLiteBackend
+from src.core.ledger import Ledger
+from src.core.models import Gasto
+from src.core.search import SearchIndex
+
+DEFAULT_SIZES = [1_000, 100_000, 1_000_000]
+# Um caso é mais lento que a base se passar deste fator (ex: 1.2 = 20% mais lento)
+DEFAULT_REGRESSION_THRESHOLD = 1.2
+
+
+def _build_cases(
+    client: Any, ledger: Dict[str, List[Dict[str, Any]]]
+) -> Dict[str, Callable[[], Any]]:
+    """Casos medidos; cada um recebe o mesmo cliente fake já populado."""
+    expenses = ledger["expenses"]
+    last_date = max(row["date"] for row in expenses)
+    first_of_month = last_date[:8] + "01"
+    gastos = db.get_gastos(client)
+    page = (
+        client.table("expenses")
+        .select("date,value,description,categories(name),payment_methods(name)")
+        .execute()
+        .data
+    )
+    fk_rows = (
+        client.table("expenses")
+        .select("value,date,description,category_id,payment_method_id")
+        .execute()
+        .data
+    )
+    categories = db.get_categories(client)
+    payment_methods = db.get_payment_methods(client)
+    gastos_ledger = Ledger.from_rows(fk_rows, categories, payment_methods)
+    category_names = {c["id"]: c["name"] for c in categories}
+    payment_names = {p["id"]: p["name"] for p in payment_methods}
+    search_index = SearchIndex()
+    search_term = expenses[0]["description"]
+    search_index.search(client, search_term)
+
+    return {
+        # Custo da própria consulta no cliente fake, para descontar dos demais
+        "fake_select_expenses": lambda: (
+            client.table("expenses").select("value,date,category_id").execute()
+        ),
+        "filter_gastos_data": lambda: charts.filter_gastos_data(
+            expenses, data_inicio=first_of_month, data_fim=last_date
+        ),
+        "generate_balance_chart": lambda: charts.generate_balance_chart(client),
+        "generate_category_spending_chart": lambda: (
+            charts.generate_category_spending_chart(client)
+        ),
+        "generate_payment_method_spending_chart": lambda: (
+            charts.generate_payment_method_spending_chart(client)
+        ),
+        "generate_monthly_category_payment_chart": lambda: (
+            charts.generate_monthly_category_payment_chart(client)
+        ),
+        "db_get_gastos_normalize": lambda: db.get_gastos(client),
+        # Mesma normalização com nomes embutidos e com ids + dados de referência
+        "normalize_gastos_embedded": lambda: Gasto.from_rows(page),
+        "normalize_gastos_reference": lambda: Gasto.from_rows(
+            fk_rows, category_names, payment_names
+        ),
+        "ledger_from_rows": lambda: Ledger.from_rows(
+            fk_rows, categories, payment_methods
+        ),
+        "ledger_sum_by_month_category_payment": lambda: (
+            gastos_ledger.sum_by_month_category_payment()
+        ),
+        # Busca por descrição no índice já carregado (prefixo, com totais)
+        "search_description": lambda: search_index.search(client, search_term[:4]),
+        "export_flatten_page": lambda: export.flatten_page(page),
+        "format_expense_lines": lambda: [format_expense_line(g) for g in gastos],
+    }
+
+
+def _time_case(func: Callable[[], Any], repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def _peak_memory_mb(func: Callable[[], Any]) -> float:
+    """Pico de memória alocada (tracemalloc) durante uma execução do caso."""
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return round(peak / (1024 * 1024), 3)
+
+
+def _git_commit() -> Union[str, None]:
+    try:
+        return (
+            subprocess.check_output(
+                ["git", "rev-parse", "HEAD"], stderr=subprocess.DEVNULL
+            )
+            .decode()
+            .strip()
+        )
+    except Exception:
+        return None
+
+
+def _measure(
+    name: str, size: int, func: Callable[[], Any], runs: int, measure_memory: bool
+) -> Dict[str, Any]:
+    timings = _time_case(func, runs)
+    result = {
+        "case": name,
+        "size": size,
+        "runs": runs,
+        "seconds_min": round(min(timings), 6),
+        "seconds_median": round(statistics.median(timings), 6),
+    }
+    if measure_memory:
+        result["peak_mb"] = _peak_memory_mb(func)
+    print(
+        f"{name:<42} {size:>9} linhas  {result['seconds_min']:.4f}s"
+        + (f"  {result['peak_mb']:.1f} MB" if measure_memory else ""),
+        file=sys.stderr,
+    )
+    return result
+
+
+def run_benchmarks(
+    sizes: List[int],
+    repeat: int = 3,
+    cases: Union[List[str], None] = None,
+    measure_memory: bool = True,
+    llm_fixtures_path: Union[str, None] = None,
+    backend: str = "memory",
+) -> Dict[str, Any]:
+    """
+    Roda os casos para cada tamanho de livro-caixa e retorna o relatório. O
+    backend é "memory" ou "sqlite" (em memória). Com `llm_fixtures_path`, mede
+    também o parse das respostas gravadas do Gemini.
+    """
+    results = []
+    for size in sizes:
+        ledger = generate_ledger(size)
+        client = (
+            SQLiteBackend(":memory:", ledger)
+            if backend == "sqlite"
+            else FakeSupabaseClient(ledger)
+        )
+        all_cases = _build_cases(client, ledger)
+        for name, func in all_cases.items():
+            if cases and name not in cases:
+                continue
+            # Execuções grandes são lentas demais para repetir
+            runs = repeat if size < 1_000_000 else 1
+            results.append(_measure(name, size, func, runs, measure_memory))
+
+    if llm_fixtures_path:
+        responses = [
+            entry["response"]
+            for entry in llm_fixtures.load_entries(llm_fixtures_path)
+            if entry.get("prompt_type") == "transacao"
+        ]
+        if responses:
+            results.append(
+                _measure(
+                    "parse_recorded_transacoes",
+                    len(responses),
+                    lambda: [ai.parse_transaction_response(r) for r in responses],
+                    repeat,
+                    measure_memory,
+                )
+            )
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "sizes": sizes,
+            "repeat": repeat,
+            "backend": backend,
+        },
+        "results": results,
+    }
+
+
+def compare_reports(
+    base: Dict[str, Any],
+    new: Dict[str, Any],
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+) -> List[Dict[str, Any]]:
+    """Compara dois relatórios caso a caso (tempo mínimo) e marca as regressões."""
+    base_index = {(r["case"], r["size"]): r for r in base["results"]}
+    rows = []
+    for result in new["results"]:
+        previous = base_index.get((result["case"], result["size"]))
+        if not previous or not previous["seconds_min"]:
+            continue
+        ratio = result["seconds_min"] / previous["seconds_min"]
+        rows.append(
+            {
+                "case": result["case"],
+                "size": result["size"],
+                "base": previous["seconds_min"],
+                "new": result["seconds_min"],
+                "ratio": round(ratio, 3),
+                "regression": ratio > threshold,
+            }
+        )
+    return rows
+
+
+def main(argv: Union[List[str], None] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="tamanhos dos livros-caixa, separados por vírgula",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--cases", default="", help="casos a rodar (padrão: todos)")
+    parser.add_argument("--no-memory", action="store_true")
+    parser.add_argument("--backend", choices=("memory", "sqlite"), default="memory")
+    parser.add_argument("--output", default="", help="arquivo JSON de saída")
+    parser.add_argument(
+        "--llm-fixtures",
+        default="",
+        help="gravações do Gemini (LLM_FIXTURE_MODE=record) para medir o parse",
+    )
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("BASE", "NOVO"),
+        help="compara dois relatórios JSON em vez de rodar",
+    )
+    parser.add_argument("--threshold", type=float, default=DEFAULT_REGRESSION_THRESHOLD)
+    args = parser.parse_args(argv)
+    # Avisos de layout do matplotlib se repetem a cada gráfico e poluem a saída
+    warnings.simplefilter("ignore", UserWarning)
+
+    if args.compare:
+        with open(args.compare[0], encoding="utf-8") as f:
+            base = json.load(f)
+        with open(args.compare[1], encoding="utf-8") as f:
+            new = json.load(f)
+        rows = compare_reports(base, new, args.threshold)
+        for row in rows:
+            flag = "  <-- REGRESSÃO" if row["regression"] else ""
+            print(
+                f"{row['case']:<42} {row['size']:>9} {row['base']:.4f}s -> "
+                f"{row['new']:.4f}s ({row['ratio']:.2f}x){flag}"
+            )
+        return 1 if any(row["regression"] for row in rows) else 0
+
+    report = run_benchmarks(
+        [int(size) for size in args.sizes.split(",") if size.strip()],
+        repeat=args.repeat,
+        cases=[case for case in args.cases.split(",") if case.strip()] or None,
+        measure_memory=not args.no_memory,
+        llm_fixtures_path=args.llm_fixtures or None,
+        backend=args.backend,
+    )
+    output = json.dumps(report, indent=2, ensure_ascii=False)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,11 +1,15 @@
 # src/bot/bot_setup.py
+import asyncio
 from telegram.ext import (
     Application,
     MessageHandler,
     filters,
     CommandHandler,
+    CallbackQueryHandler,
     ConversationHandler,
+    TypeHandler,
 )
+from telegram import Update
 from src.bot.commands import (
     start_command,
     help_command,
@@ -19,6 +23,9 @@ from src.bot.commands import (
     payment_method_spending_command,
     monthly_category_payment_command,
     list_expenses_command,
+    export_command,
+    digest_subscription_command,
+    search_command,
 )
 from src.bot.handlers import (
     handle_initial_message,
@@ -27,19 +34,141 @@ from src.bot.handlers import (
     handle_payment_method,
     handle_confirmation,
     handle_correction,
+    handle_expense_list_page,
+    handle_statement_document,
+    handle_import_confirmation,
+    handle_expense_edit,
+    handle_expense_edit_value,
+)
+from src.bot.handlers.states import (
     ASKING_CATEGORY_CLARIFICATION,
     ASKING_NEW_CATEGORY_NAME,
     ASKING_PAYMENT_METHOD,
     ASKING_CONFIRMATION,
     ASKING_CORRECTION,
+    ASKING_IMPORT_CONFIRMATION,
+    ASKING_EXPENSE_EDIT,
+)
+from src.bot.handlers.aux import discard_pending_import
+from src.bot.jobs import (
+    drain_write_queue,
+    schedule_replica_sync,
+    schedule_report_jobs,
+    schedule_write_queue_flush,
+)
+from src.config import (
+    CONVERSATION_TIMEOUT,
+    DIGEST_CHAT_IDS,
+    DIGEST_SUBSCRIPTIONS_PATH,
+    METRICS_HOST,
+    METRICS_PORT,
+    WRITE_QUEUE_PATH,
 )
+from src.core import metrics, profiling
+from src.core.backends import ReplicaClient
+from src.core.log import bind_update, get_logger
+from src.core.budget import BudgetTracker
+from src.core.reports import ChartCache, DigestSubscriptions
+from src.core.resilience import DependencyUnavailableError
+from src.core.search import SearchIndex
+from src.core.write_queue import WriteQueue
 
 
-def setup_and_run_bot(config: dict):
-    """Configura e inicia a aplicação do bot do Telegram."""
-    application = Application.builder().token(config["TELEGRAM_BOT_TOKEN"]).build()
+logger = get_logger(__name__)
+
+
+class ProfilingApplication(Application):
+    """Application que perfila updates de chats selecionados ou sorteados."""
+
+    async def process_update(self, update: object) -> None:
+        chat = update.effective_chat if isinstance(update, Update) else None
+        if not profiling.should_profile(chat.id if chat else None):
+            await super().process_update(update)
+            return
+
+        with profiling.profile_update(f"update-{update.update_id}") as profile:
+            await super().process_update(update)
+        path = await asyncio.to_thread(profile.dump)
+        logger.info(
+            "Profile do update gravado em %s (%.0f ms)", path, profile.total() * 1000
+        )
+
+
+async def bind_log_context(update: Update, context) -> None:
+    """Associa os logs do processamento deste update ao seu id e ao chat."""
+    chat = update.effective_chat
+    bind_update(update.update_id, chat.id if chat else None)
+
+
+async def cancel_conversation(update, context) -> int:
+    """Encerra a conversa atual (/cancel)."""
+    discard_pending_import(context)
+    return ConversationHandler.END
+
+
+async def expire_conversation(update, context) -> int:
+    """Conversa abandonada (CONVERSATION_TIMEOUT): descarta o que ficou pendente."""
+    discard_pending_import(context)
+    return ConversationHandler.END
+
+
+async def handle_error(update: object, context) -> None:
+    """
+    Erros que escaparam dos handlers. Dependência fora do ar vira uma mensagem
+    clara para o usuário; o resto é registrado no log e o usuário recebe um aviso
+    genérico, em vez de ficar sem resposta.
+    """
+    error = context.error
+    if isinstance(error, DependencyUnavailableError):
+        logger.warning("Update não processado: %s", error)
+        if isinstance(update, Update) and update.effective_message:
+            await update.effective_message.reply_text(error.user_message)
+        return
+    logger.error("Erro não tratado ao processar update", exc_info=error)
+    if isinstance(update, Update) and update.effective_message:
+        await update.effective_message.reply_text(
+            "❌ Desculpe, não consegui processar sua requisição agora. "
+            "Tente de novo mais tarde. 😔"
+        )
+
+
+def build_application(config: dict) -> Application:
+    """
+    Monta a aplicação com todos os handlers e jobs, sem iniciá-la. Com
+    `TELEGRAM_BASE_URL` no config o bot fala com outro servidor da Bot API (ex: o
+    servidor fake do teste de carga); `WRITE_QUEUE_PATH` no config sobrepõe o
+    do .env.
+    """
+    builder = (
+        Application.builder()
+        .application_class(ProfilingApplication)
+        .token(config["TELEGRAM_BOT_TOKEN"])
+    )
+    if config.get("TELEGRAM_BASE_URL"):
+        builder = builder.base_url(config["TELEGRAM_BASE_URL"])
+    write_queue_path = config.get("WRITE_QUEUE_PATH", WRITE_QUEUE_PATH)
+    if write_queue_path:
+        builder = builder.post_shutdown(drain_write_queue)
+    application = builder.build()
 
     application.bot_data["supabase_client"] = config["SUPABASE_CLIENT"]
+    write_queue = WriteQueue(write_queue_path) if write_queue_path else None
+    application.bot_data["budget_tracker"] = BudgetTracker(write_queue=write_queue)
+    application.bot_data["chart_cache"] = ChartCache()
+    application.bot_data["search_index"] = SearchIndex()
+    if not DIGEST_SUBSCRIPTIONS_PATH:
+        logger.warning(
+            "DIGEST_SUBSCRIPTIONS_PATH não definido: inscrições do /resumo_mensal "
+            "ficam só em memória e se perdem ao reiniciar"
+        )
+    application.bot_data["digest_subscriptions"] = DigestSubscriptions(
+        DIGEST_SUBSCRIPTIONS_PATH or None, DIGEST_CHAT_IDS
+    )
+    if write_queue is not None:
+        application.bot_data["write_queue"] = write_queue
+
+    # Roda antes de todos os handlers (grupo -1) para correlacionar os logs
+    application.add_handler(TypeHandler(Update, bind_log_context), group=-1)
 
     # Adiciona os handlers para comandos
     application.add_handler(CommandHandler("start", start_command))
@@ -62,46 +191,121 @@ def setup_and_run_bot(config: dict):
     application.add_handler(
         CommandHandler("listar_gastos", list_expenses_command)
     )  # NOVO COMANDO REGISTRADO
+    application.add_handler(CommandHandler("exportar", export_command))
+    application.add_handler(CommandHandler("buscar", search_command))
+    application.add_handler(
+        CommandHandler("resumo_mensal", digest_subscription_command)
+    )
+    application.add_handler(
+        CallbackQueryHandler(handle_expense_list_page, pattern=r"^lista_gastos:")
+    )
 
     # Configura o ConversationHandler
     conv_handler = ConversationHandler(
         entry_points=[
-            MessageHandler(filters.TEXT & ~filters.COMMAND, handle_initial_message)
+            MessageHandler(
+                filters.TEXT & ~filters.COMMAND,
+                metrics.track_conversation(handle_initial_message),
+            ),
+            MessageHandler(
+                filters.Document.ALL,
+                metrics.track_conversation(handle_statement_document),
+            ),
         ],
         states={
             ASKING_CATEGORY_CLARIFICATION: [
                 MessageHandler(
-                    filters.TEXT & ~filters.COMMAND, handle_category_clarification
+                    filters.TEXT & ~filters.COMMAND,
+                    metrics.track_conversation(handle_category_clarification),
                 )
             ],
             ASKING_NEW_CATEGORY_NAME: [
                 MessageHandler(
-                    filters.TEXT & ~filters.COMMAND, handle_new_category_name
+                    filters.TEXT & ~filters.COMMAND,
+                    metrics.track_conversation(handle_new_category_name),
                 )
             ],
             ASKING_PAYMENT_METHOD: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, handle_payment_method)
+                MessageHandler(
+                    filters.TEXT & ~filters.COMMAND,
+                    metrics.track_conversation(handle_payment_method),
+                )
             ],
             ASKING_CONFIRMATION: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, handle_confirmation)
+                MessageHandler(
+                    filters.TEXT & ~filters.COMMAND,
+                    metrics.track_conversation(handle_confirmation),
+                )
             ],
             ASKING_CORRECTION: [
-                MessageHandler(filters.TEXT & ~filters.COMMAND, handle_correction)
+                MessageHandler(
+                    filters.TEXT & ~filters.COMMAND,
+                    metrics.track_conversation(handle_correction),
+                )
+            ],
+            ASKING_IMPORT_CONFIRMATION: [
+                MessageHandler(
+                    filters.TEXT & ~filters.COMMAND,
+                    metrics.track_conversation(handle_import_confirmation),
+                )
+            ],
+            ASKING_EXPENSE_EDIT: [
+                CallbackQueryHandler(
+                    metrics.track_conversation(handle_expense_edit),
+                    pattern=r"^editar_gasto:",
+                ),
+                MessageHandler(
+                    filters.TEXT & ~filters.COMMAND,
+                    metrics.track_conversation(handle_expense_edit_value),
+                ),
+            ],
+            ConversationHandler.TIMEOUT: [
+                TypeHandler(Update, metrics.track_conversation(expire_conversation))
             ],
         },
         fallbacks=[
-            CommandHandler("cancel", lambda update, context: ConversationHandler.END)
+            CommandHandler("cancel", metrics.track_conversation(cancel_conversation))
         ],
+        conversation_timeout=CONVERSATION_TIMEOUT or None,
     )
     application.add_handler(conv_handler)
 
-    print(
+    metrics.CONVERSATIONS.state_names = {
+        ASKING_CATEGORY_CLARIFICATION: "ASKING_CATEGORY_CLARIFICATION",
+        ASKING_NEW_CATEGORY_NAME: "ASKING_NEW_CATEGORY_NAME",
+        ASKING_PAYMENT_METHOD: "ASKING_PAYMENT_METHOD",
+        ASKING_CONFIRMATION: "ASKING_CONFIRMATION",
+        ASKING_CORRECTION: "ASKING_CORRECTION",
+        ASKING_IMPORT_CONFIRMATION: "ASKING_IMPORT_CONFIRMATION",
+        ASKING_EXPENSE_EDIT: "ASKING_EXPENSE_EDIT",
+    }
+
+    # Falhas do Supabase/Gemini que persistiram após os retries
+    application.add_error_handler(handle_error)
+
+    # Pré-cálculo de relatórios fora do pico e resumo mensal
+    schedule_report_jobs(application)
+    if isinstance(config["SUPABASE_CLIENT"], ReplicaClient):
+        schedule_replica_sync(application)
+    if write_queue_path:
+        schedule_write_queue_flush(application)
+    return application
+
+
+def setup_and_run_bot(config: dict):
+    """Configura e inicia a aplicação do bot do Telegram."""
+    application = build_application(config)
+
+    if METRICS_PORT:
+        metrics.start_metrics_server(METRICS_HOST, METRICS_PORT)
+        logger.info(
+            "Métricas disponíveis em http://%s:%s/metrics", METRICS_HOST, METRICS_PORT
+        )
+
+    logger.info(
         "Bot Telegram iniciado! Procure por @<nome_do_seu_bot> no Telegram e comece a conversar."
     )
-    print(
-        "Certifique-se de que o Ollama está rodando e o modelo 'llama3' (ou o que você configurou) está baixado."
-    )
-    print(
+    logger.info(
         "Verifique também se suas credenciais do Supabase estão corretas e as tabelas 'expenses', 'ganhos', 'categories' e 'payment_methods' foram criadas."
     )
 
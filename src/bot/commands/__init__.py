@@ -1,5 +1,5 @@
 from .utils import start_command, help_command
-from .balanco import balanco_command
+from .balance import balanco_command
 from .category import (
     add_alias_command,
     add_category_command,
@@ -7,6 +7,9 @@ from .category import (
     set_limit_command,
     total_category_command,
 )
+from .digest import digest_subscription_command
+from .export import export_command
+from .search import search_command
 from .gasto import (
     category_spending_command,
     list_expenses_command,
@@ -27,4 +30,7 @@ ALL_COMMANDS = [
     add_alias_command,
     total_category_command,
     list_expenses_command,
+    export_command,
+    digest_subscription_command,
+    search_command,
 ]
@@ -1,13 +1,24 @@
+import asyncio
 from telegram import Update
 from telegram.ext import ContextTypes
 from src.core import charts
+from src.core.metrics import timed
 
 
+@timed("handler")
 async def balanco_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Gera e envia o gráfico de balanço."""
     supabase_client = context.bot_data["supabase_client"]
     await update.message.reply_text("Gerando seu balanço mensal, por favor aguarde...")
-    chart_buffer = charts.generate_balance_chart(supabase_client)
+    chart_cache = context.bot_data.get("chart_cache")
+    if chart_cache is not None:
+        chart_buffer = await asyncio.to_thread(
+            chart_cache.render, supabase_client, "balanco"
+        )
+    else:
+        chart_buffer = await asyncio.to_thread(
+            charts.generate_balance_chart, supabase_client
+        )
     if chart_buffer:
         chart_buffer.name = "balanco_chart.png"
         await update.message.reply_photo(
@@ -1,19 +1,26 @@
+import asyncio
 from typing import Union
 from telegram import Update
 from telegram.ext import ContextTypes
 from src.core import db
+from src.utils.money import format_money, from_cents, parse_money, sum_money, to_cents
 from src.utils.text_utils import to_camel_case
+from src.core.log import get_logger, trace
+from src.core.metrics import timed
 
+logger = get_logger(__name__)
 
+
+@timed("handler")
 async def category_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Lista todas as categorias existentes."""
     supabase_client = context.bot_data["supabase_client"]
-    categorias = db.get_categories(supabase_client)
+    categorias = await asyncio.to_thread(db.get_categories, supabase_client)
     if categorias:
         message = "**Categorias de Gastos:**\n\n"
         for cat in categorias:
             limite = (
-                f" (Limite: R${cat['monthly_limit']:.2f})"
+                f" (Limite: {format_money(to_cents(cat['monthly_limit']))})"
                 if cat["monthly_limit"] is not None and cat["monthly_limit"] > 0
                 else ""
             )
@@ -32,29 +39,32 @@ async def category_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         )
 
 
+@timed("handler")
 async def total_category_command(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> None:
     """Mostra o total de gastos para uma categoria específica."""
     supabase_client = context.bot_data["supabase_client"]
-    print(f"DEBUG: Comando /total_categoria recebido com args: {context.args}")
+    logger.debug("Comando /total_categoria recebido com args: %s", context.args)
 
     if not context.args:
         await update.message.reply_text(
             "Uso: `/total_categoria [nome_da_categoria]`\nEx: `/total_categoria Alimentacao`"
         )
-        print("DEBUG: Sem argumentos fornecidos.")
+        logger.debug("Sem argumentos fornecidos.")
         return
 
     categoria_nome_input = " ".join(context.args).strip()
     categoria_nome_normalizada = to_camel_case(categoria_nome_input)
-    print(f"DEBUG: Categoria normalizada para busca: {categoria_nome_normalizada}")
+    logger.debug("Categoria normalizada para busca: %s", categoria_nome_normalizada)
 
-    categorias_existentes = db.get_categories(supabase_client)
+    categorias_existentes = await asyncio.to_thread(db.get_categories, supabase_client)
     category_id = None
     for cat in categorias_existentes:
-        print(
-            f"DEBUG: Comparando '{categoria_nome_normalizada.lower()}' com '{cat['name'].lower()}'"
+        logger.debug(
+            "Comparando '%s' com '%s'",
+            categoria_nome_normalizada.lower(),
+            cat["name"].lower(),
         )
         if cat["name"].lower() == categoria_nome_normalizada.lower():
             category_id = cat["id"]
@@ -65,31 +75,34 @@ async def total_category_command(
             f"Categoria '{categoria_nome_input}' não encontrada. "
             "Use `/categorias` para ver as existentes ou `/adicionar_categoria` para criá-la."
         )
-        print(f"DEBUG: Categoria '{categoria_nome_input}' não encontrada no DB.")
+        logger.debug("Categoria '%s' não encontrada no DB.", categoria_nome_input)
         return
 
-    print(
-        f"DEBUG: Categoria '{categoria_nome_normalizada}' encontrada com ID: {category_id}"
+    logger.debug(
+        "Categoria '%s' encontrada com ID: %s", categoria_nome_normalizada, category_id
     )
 
-    gastos_da_categoria = db.get_expense_by_category(supabase_client, category_id)
-    print(f"DEBUG: Gastos obtidos da categoria: {gastos_da_categoria}")
+    gastos_da_categoria = await asyncio.to_thread(
+        db.get_expense_by_category, supabase_client, category_id
+    )
+    trace(logger, "Gastos obtidos da categoria", gastos=gastos_da_categoria)
 
-    total_gasto = sum(gasto["value"] for gasto in gastos_da_categoria)
-    print(f"DEBUG: Total gasto calculado: {total_gasto}")
+    total_gasto = from_cents(sum_money(gasto["value"] for gasto in gastos_da_categoria))
+    logger.debug("Total gasto calculado: %s", total_gasto)
 
     if gastos_da_categoria:
         await update.message.reply_text(
-            f"O total gasto na categoria **'{categoria_nome_normalizada}'** é de **R${total_gasto:.2f}**."
+            f"O total gasto na categoria **'{categoria_nome_normalizada}'** é de **{format_money(to_cents(total_gasto))}**."
         )
-        print("DEBUG: Mensagem de total enviada.")
+        logger.debug("Mensagem de total enviada.")
     else:
         await update.message.reply_text(
             f"Você ainda não tem gastos registrados na categoria **'{categoria_nome_normalizada}'**."
         )
-        print("DEBUG: Mensagem de sem gastos enviada.")
+        logger.debug("Mensagem de sem gastos enviada.")
 
 
+@timed("handler")
 async def add_category_command(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> None:
@@ -106,24 +119,21 @@ async def add_category_command(
 
     limite: Union[float, None] = None
     if len(context.args) > 1:
-        try:
-            potential_limit = float(context.args[-1].replace(",", "."))
-            if len(context.args) > 1 and potential_limit == float(
-                context.args[-1].replace(",", ".")
-            ):
-                limite = potential_limit
-                categoria_nome_input = " ".join(context.args[:-1]).strip()
-        except ValueError:
-            pass
+        potential_limit = parse_money(context.args[-1])
+        if potential_limit is not None:
+            limite = from_cents(potential_limit)
+            categoria_nome_input = " ".join(context.args[:-1]).strip()
 
     if not categoria_nome_input:
         await update.message.reply_text("Por favor, forneça o nome da categoria.")
         return
 
-    if db.add_category(supabase_client, categoria_nome_input, monthly_limit=limite):
+    if await asyncio.to_thread(
+        db.add_category, supabase_client, categoria_nome_input, monthly_limit=limite
+    ):
         nome_exibicao = to_camel_case(categoria_nome_input)
         limite_msg = (
-            f" com limite de R${limite:.2f}"
+            f" com limite de {format_money(to_cents(limite))}"
             if limite is not None and limite > 0
             else ""
         )
@@ -137,6 +147,7 @@ async def add_category_command(
         )
 
 
+@timed("handler")
 async def set_limit_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Define ou altera o limite mensal para uma categoria."""
     supabase_client = context.bot_data["supabase_client"]
@@ -150,15 +161,15 @@ async def set_limit_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
     categoria_nome_input = context.args[0]
     categoria_nome_normalizada = to_camel_case(categoria_nome_input)
 
-    try:
-        novo_limite = float(context.args[1].replace(",", "."))
-    except ValueError:
+    novo_limite_centavos = parse_money(context.args[1])
+    if novo_limite_centavos is None:
         await update.message.reply_text(
             "Valor do limite inválido. Use um número (ex: 800 ou 800.50). Use 0 para remover o limite."
         )
         return
+    novo_limite = from_cents(novo_limite_centavos)
 
-    categorias = db.get_categories(supabase_client)
+    categorias = await asyncio.to_thread(db.get_categories, supabase_client)
     category_id = None
     for cat in categorias:
         if cat["name"].lower() == categoria_nome_normalizada.lower():
@@ -174,9 +185,11 @@ async def set_limit_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
     limite_para_db: Union[float, None] = novo_limite if novo_limite > 0 else None
 
-    if db.update_categoria_limite(supabase_client, category_id, limite_para_db):
+    if await asyncio.to_thread(
+        db.update_categoria_limite, supabase_client, category_id, limite_para_db
+    ):
         limite_msg = (
-            f" com limite de R${novo_limite:.2f}"
+            f" com limite de {format_money(to_cents(novo_limite))}"
             if novo_limite > 0
             else " (limite removido)"
         )
@@ -189,6 +202,7 @@ async def set_limit_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
 
 
+@timed("handler")
 async def add_alias_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """Adiciona aliases (palavras-chave) para uma categoria existente."""
     supabase_client = context.bot_data["supabase_client"]
@@ -211,7 +225,7 @@ async def add_alias_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
         )
         return
 
-    categorias = db.get_categories(supabase_client)
+    categorias = await asyncio.to_thread(db.get_categories, supabase_client)
     categoria_encontrada = None
     for cat in categorias:
         if cat["name"].lower() == categoria_nome_normalizada.lower():
@@ -233,8 +247,11 @@ async def add_alias_command(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
     updated_aliases = list(current_aliases)
 
-    if db.update_category_aliases(
-        supabase_client, categoria_encontrada["id"], updated_aliases
+    if await asyncio.to_thread(
+        db.update_category_aliases,
+        supabase_client,
+        categoria_encontrada["id"],
+        updated_aliases,
     ):
         await update.message.reply_text(
             f"Aliases adicionados para '{categoria_encontrada['name']}'.\nNovos aliases: {', '.join(updated_aliases)}"
@@ -0,0 +1,31 @@
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from src.core.log import get_logger
+from src.core.metrics import timed
+
+logger = get_logger(__name__)
+
+
+@timed("handler")
+async def digest_subscription_command(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    """Liga/desliga o envio do resumo mensal para o chat atual."""
+    subscriptions = context.bot_data["digest_subscriptions"]
+    try:
+        subscribed = subscriptions.toggle(update.effective_chat.id)
+    except OSError as e:
+        logger.error("Erro ao gravar as inscrições do resumo mensal: %s", e)
+        await update.message.reply_text(
+            "❌ Não consegui alterar sua inscrição no resumo mensal. Tente novamente mais tarde."
+        )
+        return
+    if subscribed:
+        await update.message.reply_text(
+            "🔔 Pronto! Todo dia 1º vou te enviar o resumo do mês anterior."
+        )
+    else:
+        await update.message.reply_text(
+            "🔕 Você não vai mais receber o resumo mensal. Envie /resumo_mensal para voltar a receber."
+        )
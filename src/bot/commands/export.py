@@ -0,0 +1,150 @@
+import asyncio
+import datetime
+import os
+from typing import Any, BinaryIO, Tuple, Union
+from telegram import Update
+from telegram.ext import ContextTypes
+from src.core import db
+from src.core import export
+from src.utils.text_utils import to_camel_case
+from src.core.log import get_logger
+from src.core.metrics import timed
+
+logger = get_logger(__name__)
+
+
+@timed("handler")
+async def export_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Exporta os gastos como documento CSV (gzip) ou Parquet.
+    Uso: /exportar [csv|parquet] [AAAA-MM | AAAA-MM-DD [AAAA-MM-DD]] [categoria]
+    """
+    supabase_client = context.bot_data["supabase_client"]
+
+    fmt = "csv"
+    data_inicio: Union[str, None] = None
+    data_fim: Union[str, None] = None
+    categoria_partes = []
+
+    for arg in context.args or []:
+        arg_lower = arg.lower()
+        if arg_lower in ("csv", "parquet"):
+            fmt = arg_lower
+            continue
+        try:
+            day = datetime.datetime.strptime(arg, "%Y-%m-%d").date()
+            if data_inicio is None:
+                data_inicio = day.isoformat()
+            else:
+                data_fim = day.isoformat()
+            continue
+        except ValueError:
+            pass
+        try:
+            month = datetime.datetime.strptime(arg, "%Y-%m").date()
+            next_month = (month + datetime.timedelta(days=32)).replace(day=1)
+            data_inicio = month.isoformat()
+            data_fim = (next_month - datetime.timedelta(days=1)).isoformat()
+            continue
+        except ValueError:
+            pass
+        categoria_partes.append(arg)
+
+    category_id = None
+    if categoria_partes:
+        categoria_nome = to_camel_case(" ".join(categoria_partes))
+        category_id = await asyncio.to_thread(
+            db.get_category_id_by_text, supabase_client, categoria_nome
+        )
+        if not category_id:
+            await update.message.reply_text(
+                f"Categoria '{categoria_nome}' não encontrada. Use `/categorias` para ver as existentes."
+            )
+            return
+
+    if fmt == "parquet" and not export.parquet_available():
+        await update.message.reply_text(
+            "⚠️ Exportação em Parquet indisponível neste servidor (pyarrow não instalado). Gerando CSV."
+        )
+        fmt = "csv"
+
+    await update.message.reply_text(
+        "📦 Gerando sua exportação em segundo plano. Envio o arquivo assim que ficar pronto!"
+    )
+
+    # A exportação roda fora do event loop para não travar as outras conversas
+    context.application.create_task(
+        _run_export(
+            context,
+            update.effective_chat.id,
+            fmt,
+            data_inicio,
+            data_fim,
+            category_id,
+        ),
+        update=update,
+    )
+
+
+def _export_to_file(
+    supabase_client: Any,
+    fmt: str,
+    data_inicio: Union[str, None],
+    data_fim: Union[str, None],
+    category_id: Union[str, None],
+) -> Tuple[Union[BinaryIO, None], int]:
+    """Gera o arquivo e o abre para envio (tudo fora do event loop)."""
+    path, total = export.export_ledger(
+        supabase_client, fmt, data_inicio, data_fim, category_id
+    )
+    if not path:
+        return None, 0
+    return open(path, "rb"), total
+
+
+async def _run_export(
+    context: ContextTypes.DEFAULT_TYPE,
+    chat_id: int,
+    fmt: str,
+    data_inicio: Union[str, None],
+    data_fim: Union[str, None],
+    category_id: Union[str, None],
+) -> None:
+    """Gera o arquivo em uma thread e o envia como documento."""
+    supabase_client = context.bot_data["supabase_client"]
+    try:
+        f, total = await asyncio.to_thread(
+            _export_to_file,
+            supabase_client,
+            fmt,
+            data_inicio,
+            data_fim,
+            category_id,
+        )
+    except Exception:
+        # Inclui falhas no meio da paginação: um arquivo parcial não é enviado
+        logger.exception("Erro ao exportar gastos do chat %s", chat_id)
+        await context.bot.send_message(
+            chat_id,
+            "❌ Ocorreu um erro ao gerar a exportação. Nenhum arquivo foi enviado; "
+            "tente novamente mais tarde. 😟",
+        )
+        return
+
+    if f is None:
+        await context.bot.send_message(
+            chat_id, "Nenhum gasto encontrado com os filtros informados. 🤷‍♀️"
+        )
+        return
+
+    try:
+        extension = ".parquet" if fmt == "parquet" else ".csv.gz"
+        await context.bot.send_document(
+            chat_id,
+            document=f,
+            filename=f"gastos_{datetime.date.today().isoformat()}{extension}",
+            caption=f"📊 {total} gastos exportados.",
+        )
+    finally:
+        f.close()
+        os.remove(f.name)
@@ -0,0 +1,43 @@
+import datetime
+from typing import Union
+from telegram import Update
+from telegram.ext import ContextTypes
+from src.bot.handlers.aux import send_search_results
+from src.core.metrics import timed
+
+
+@timed("handler")
+async def search_command(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Busca gastos pela descrição (sem diferenciar acentos, por prefixo) e mostra o total.
+    Uso: /buscar [termo] [AAAA-MM]
+    """
+    data_inicio: Union[str, None] = None
+    data_fim: Union[str, None] = None
+    termo_partes = []
+
+    for arg in context.args or []:
+        try:
+            month = datetime.datetime.strptime(arg, "%Y-%m").date()
+            next_month = (month + datetime.timedelta(days=32)).replace(day=1)
+            data_inicio = month.isoformat()
+            data_fim = (next_month - datetime.timedelta(days=1)).isoformat()
+            continue
+        except ValueError:
+            pass
+        termo_partes.append(arg)
+
+    if not termo_partes:
+        await update.message.reply_text(
+            "Uso: `/buscar [termo] [AAAA-MM]`\n"
+            "Exemplos: `/buscar uber` ou `/buscar cafe 2025-07`"
+        )
+        return
+
+    await send_search_results(
+        update,
+        context,
+        " ".join(termo_partes),
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+    )
@@ -1,6 +1,8 @@
 from telegram import Update
+from src.core.metrics import timed
 
 
+@timed("handler")
 async def start_command(update: Update) -> None:
     """Envia uma mensagem quando o comando /start é emitido."""
     await update.message.reply_text(
@@ -13,6 +15,9 @@ async def start_command(update: Update) -> None:
         "- `/total_por_pagamento` para ver o total gasto por forma de pagamento.\n"
         "- `/gastos_mensal_combinado` para ver gastos por mês, categoria e forma de pagamento.\n"
         "- `/listar_gastos [mes-MM ou nome_categoria]` para listar gastos detalhados.\n"
+        "- `/exportar [csv|parquet] [AAAA-MM] [categoria]` para baixar seus gastos em arquivo.\n"
+        "- `/buscar [termo] [AAAA-MM]` para achar gastos pela descrição e ver o total.\n"
+        "- `/resumo_mensal` para receber (ou parar de receber) o resumo do mês todo dia 1º.\n"
         "- `/categorias` para listar as categorias existentes.\n"
         "- `/adicionar_categoria [nome] [limite]` para criar uma nova categoria.\n"
         "- `/definir_limite [nome_da_categoria] [valor]` para definir/alterar um limite.\n"
@@ -21,6 +26,7 @@ async def start_command(update: Update) -> None:
     )
 
 
+@timed("handler")
 async def help_command(update: Update) -> None:
     """Envia uma mensagem quando o comando /help é emitido."""
     await update.message.reply_text(
@@ -36,6 +42,9 @@ async def help_command(update: Update) -> None:
         "**Para adicionar uma categoria, basta dizer:**\n"
         "- `adicione a categoria Lazer`\n"
         "- `quero adicionar uma categoria de Estudos com limite de 300`\n\n"
+        "**Para editar ou excluir um gasto, descreva-o:**\n"
+        "- `edite o gasto de 15 reais no Uber de ontem`\n"
+        "- `corrigir o gasto de 10/07 na Avatim`\n\n"
         "**Comandos de Gráfico e Relatório:**\n"
         "- `/start`: Mensagem de boas-vindas.\n"
         "- `/help`: Mostra esta mensagem.\n"
@@ -45,6 +54,9 @@ async def help_command(update: Update) -> None:
         "- `/total_por_pagamento`: Gera um gráfico do total de gastos por forma de pagamento.\n"
         "- `/gastos_mensal_combinado`: Gera um gráfico de gastos mensais por categoria e forma de pagamento.\n"
         "- `/listar_gastos [mês-MM ou nome_categoria]`: Lista todos os gastos de um mês específico (ex: `2025-07`) ou de uma categoria (ex: `Transporte`).\n"
+        "- `/exportar [csv|parquet] [AAAA-MM ou AAAA-MM-DD AAAA-MM-DD] [categoria]`: Envia seus gastos como arquivo CSV compactado (ou Parquet).\n"
+        "- `/buscar [termo] [AAAA-MM]`: Busca gastos pela descrição (ex: `/buscar uber`), sem diferenciar acentos, e mostra o total e os mais recentes.\n"
+        "- `/resumo_mensal`: Liga/desliga o envio automático do resumo do mês anterior (ganhos, gastos e limites) todo dia 1º.\n"
         "**Comandos de Gerenciamento:**\n"
         "- `/categorias`: Lista todas as categorias de gastos que você definiu.\n"
         "- `/adicionar_categoria [nome] [limite_opcional]`: Adiciona uma nova categoria (ex: `/adicionar_categoria Lazer 500`). Se o limite for omitido, será `NULL`.\n"
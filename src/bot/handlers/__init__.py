@@ -1,17 +1,14 @@
 from .handle_category_clarification import handle_category_clarification
 from .handle_confirmation import handle_confirmation
 from .handle_correction import handle_correction
+from .handle_expense_edit import handle_expense_edit
+from .handle_expense_edit_value import handle_expense_edit_value
+from .handle_expense_list_page import handle_expense_list_page
+from .handle_import_confirmation import handle_import_confirmation
 from .handle_initial_message import handle_initial_message
 from .handle_new_category_name import handle_new_category_name
 from .handle_payment_method import handle_payment_method
-
-# --- Estados da Conversa ---
-HANDLE_INITIAL_MESSAGE = 0
-ASKING_CATEGORY_CLARIFICATION = 1
-ASKING_NEW_CATEGORY_NAME = 2
-ASKING_PAYMENT_METHOD = 3
-ASKING_CONFIRMATION = 4
-ASKING_CORRECTION = 5
+from .handle_statement_document import handle_statement_document
 
 
 ALL_HANDLERS = {
@@ -19,6 +16,11 @@ ALL_HANDLERS = {
     handle_confirmation,
     handle_category_clarification,
     handle_correction,
+    handle_expense_edit,
+    handle_expense_edit_value,
+    handle_expense_list_page,
+    handle_import_confirmation,
     handle_initial_message,
     handle_payment_method,
+    handle_statement_document,
 }
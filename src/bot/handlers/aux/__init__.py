@@ -1,5 +1,27 @@
 from .send_confirmation_message import send_confirmation_message
+from .send_batch_confirmation_message import send_batch_confirmation_message
+from .send_budget_alerts import send_budget_alerts
+from .save_expenses import save_expenses
 from .register_expense import register_expense
+from .register_expense_batch import register_expense_batch
 from .register_income import register_income
+from .send_expense_list import send_expense_list
+from .send_search_results import send_search_results
+from .send_edit_candidates import send_edit_candidates
+from .apply_expense_edit import apply_expense_edit
+from .discard_pending_import import discard_pending_import
 
-ALL_COMANDS = {send_confirmation_message, register_income, register_expense}
+ALL_COMANDS = {
+    send_confirmation_message,
+    send_batch_confirmation_message,
+    register_income,
+    register_expense,
+    register_expense_batch,
+    send_expense_list,
+    send_search_results,
+    send_edit_candidates,
+    apply_expense_edit,
+    discard_pending_import,
+    send_budget_alerts,
+    save_expenses,
+}
@@ -0,0 +1,85 @@
+import asyncio
+from typing import Any, Dict, List, Union
+from telegram import Update
+from telegram.ext import ContextTypes
+from src.bot.handlers.aux.send_budget_alerts import send_budget_alerts
+from src.core import db
+from src.core.budget import month_bounds
+from src.core.log import get_logger
+from src.utils.money import from_cents, to_cents
+
+logger = get_logger(__name__)
+
+
+def _rollup_deltas(
+    gasto: Dict[str, Any], changes: Union[Dict[str, Any], None]
+) -> List[Dict[str, Any]]:
+    """
+    Lançamentos que levam os totais mensais do estado antigo ao novo: só a
+    diferença se categoria e mês não mudaram; senão, estorno do antigo e o novo.
+    """
+    old = {
+        "category_id": gasto["category_id"],
+        "date": gasto["date"],
+        "value": -gasto["value"],
+    }
+    if changes is None:
+        return [old]
+    new = {
+        "category_id": changes.get("category_id", gasto["category_id"]),
+        "date": changes.get("date", gasto["date"]),
+        "value": changes.get("value", gasto["value"]),
+    }
+    if new["category_id"] != old["category_id"] or (
+        month_bounds(new["date"])[0] != month_bounds(old["date"])[0]
+    ):
+        return [old, new]
+    delta = to_cents(new["value"]) - to_cents(gasto["value"])
+    return [{**new, "value": from_cents(delta)}] if delta else []
+
+
+async def apply_expense_edit(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    gasto: Dict[str, Any],
+    changes: Union[Dict[str, Any], None],
+) -> bool:
+    """
+    Atualiza (changes com as colunas novas) ou exclui (changes=None) o gasto no
+    banco e ajusta o que depende dele sem recarregar o histórico: totais mensais
+    dos alertas, cache de gráficos e índice de busca.
+    """
+    supabase_client = context.bot_data["supabase_client"]
+    if changes is None:
+        saved = await asyncio.to_thread(db.delete_expense, supabase_client, gasto["id"])
+    else:
+        saved = await asyncio.to_thread(
+            db.update_expense, supabase_client, gasto["id"], changes
+        )
+    if not saved:
+        await update.effective_message.reply_text(
+            "❌ Ops! Não consegui alterar o gasto. Tente novamente mais tarde. 😔"
+        )
+        return False
+
+    chart_cache = context.bot_data.get("chart_cache")
+    if chart_cache is not None:
+        chart_cache.invalidate()
+    search_index = context.bot_data.get("search_index")
+    if search_index is not None:
+        search_index.update(gasto["id"], changes)
+
+    await update.effective_message.reply_text(
+        "🗑️ Gasto excluído com sucesso!"
+        if changes is None
+        else "✅ Gasto atualizado com sucesso! 🎉"
+    )
+    # A alteração já está no banco: os alertas vêm depois da confirmação e uma
+    # falha neles só vai para o log
+    try:
+        await send_budget_alerts(update, context, _rollup_deltas(gasto, changes))
+    except Exception as e:
+        logger.error(
+            "Erro ao enviar alertas após alterar o gasto %s: %s", gasto["id"], e
+        )
+    return True
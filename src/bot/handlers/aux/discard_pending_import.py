@@ -0,0 +1,16 @@
+import os
+from telegram.ext import ContextTypes
+
+
+def discard_pending_import(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Descarta a importação pendente do usuário (confirmada, cancelada ou
+    abandonada) e apaga o arquivo temporário do extrato.
+    """
+    pending_import = context.user_data.pop("pending_import", None)
+    if not pending_import:
+        return
+    try:
+        os.remove(pending_import["path"])
+    except OSError:
+        pass
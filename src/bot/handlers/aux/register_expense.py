@@ -1,7 +1,14 @@
+import asyncio
 from typing import Any, Dict
 from telegram import Update, ReplyKeyboardRemove
 from telegram.ext import ContextTypes
 from src.core import db
+from src.core.log import get_logger
+from src.utils.money import format_money, to_cents
+from src.bot.handlers.aux.save_expenses import save_expenses
+from src.bot.handlers.aux.send_budget_alerts import send_budget_alerts
+
+logger = get_logger(__name__)
 
 
 async def register_expense(
@@ -19,37 +26,73 @@ async def register_expense(
         "forma_pagamento_nome_real"
     ) or transaction_info.get("forma_pagamento_text")
 
-    if db.add_expense(
-        supabase_client, valor, category_id, data, forma_pagamento_id, descricao_gasto
+    if await asyncio.to_thread(
+        save_expenses,
+        context,
+        [
+            {
+                "value": valor,
+                "category_id": category_id,
+                "date": data,
+                "payment_method_id": forma_pagamento_id,
+                "description": descricao_gasto,
+            }
+        ],
     ):
         await update.message.reply_text(
-            f"✅ Gasto de R${valor:.2f} ({descricao_gasto}) em '{categoria_nome_db}' via '{final_payment_method_name}' registrado com sucesso! 🎉",
+            f"✅ Gasto de {format_money(to_cents(valor))} ({descricao_gasto}) em '{categoria_nome_db}' via '{final_payment_method_name}' registrado com sucesso! 🎉",
             reply_markup=ReplyKeyboardRemove(),
         )
-        original_category_text = transaction_info.get("original_category_text")
-        if (
-            original_category_text
-            and original_category_text.lower() != categoria_nome_db.lower()
-        ):
-            current_aliases = set()
-            for cat in db.get_categories(supabase_client):
-                if cat["id"] == category_id:
-                    if cat["aliases"] and isinstance(cat["aliases"], list):
-                        current_aliases.update(cat["aliases"])
-                    break
-            if original_category_text.lower() not in [
-                a.lower() for a in current_aliases
-            ]:
-                current_aliases.add(original_category_text)
-                db.update_category_aliases(
-                    supabase_client, category_id, list(current_aliases)
-                )
-                await update.message.reply_text(
-                    f"✨ '{original_category_text}' foi adicionado como um atalho para '{categoria_nome_db}'. O bot aprenderá com isso! 🧠",
-                    reply_markup=ReplyKeyboardRemove(),
-                )
+        chart_cache = context.bot_data.get("chart_cache")
+        if chart_cache is not None:
+            chart_cache.invalidate()
+        await send_budget_alerts(
+            update,
+            context,
+            [{"category_id": category_id, "date": data, "value": valor}],
+            queued="write_queue" in context.bot_data,
+        )
+        # O gasto já foi gravado: uma falha ao aprender o atalho não pode virar
+        # a mensagem de "nada foi alterado" do handle_error
+        try:
+            await _learn_category_alias(update, supabase_client, transaction_info)
+        except Exception as e:
+            logger.error("Erro ao aprender atalho de categoria: %s", e)
     else:
         await update.message.reply_text(
             "❌ Ocorreu um erro ao registrar seu gasto. Tente novamente mais tarde. 😟",
             reply_markup=ReplyKeyboardRemove(),
         )
+
+
+async def _learn_category_alias(
+    update: Update, supabase_client: Any, transaction_info: Dict[str, Any]
+) -> None:
+    """Guarda o texto original da categoria como atalho, se ainda não for um."""
+    category_id = transaction_info["category_id"]
+    categoria_nome_db = transaction_info.get("categoria_nome_db")
+    original_category_text = transaction_info.get("original_category_text")
+    if (
+        not original_category_text
+        or original_category_text.lower() == categoria_nome_db.lower()
+    ):
+        return
+    current_aliases = set()
+    for cat in await asyncio.to_thread(db.get_categories, supabase_client):
+        if cat["id"] == category_id:
+            if cat["aliases"] and isinstance(cat["aliases"], list):
+                current_aliases.update(cat["aliases"])
+            break
+    if original_category_text.lower() in [a.lower() for a in current_aliases]:
+        return
+    current_aliases.add(original_category_text)
+    if await asyncio.to_thread(
+        db.update_category_aliases,
+        supabase_client,
+        category_id,
+        list(current_aliases),
+    ):
+        await update.message.reply_text(
+            f"✨ '{original_category_text}' foi adicionado como um atalho para '{categoria_nome_db}'. O bot aprenderá com isso! 🧠",
+            reply_markup=ReplyKeyboardRemove(),
+        )
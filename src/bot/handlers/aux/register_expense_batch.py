@@ -0,0 +1,41 @@
+import asyncio
+from typing import Any, Dict, List
+from telegram import Update, ReplyKeyboardRemove
+from telegram.ext import ContextTypes
+from src.bot.handlers.aux.save_expenses import save_expenses
+from src.bot.handlers.aux.send_budget_alerts import send_budget_alerts
+from src.utils.money import format_money, sum_money
+
+
+async def register_expense_batch(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, batch: List[Dict[str, Any]]
+) -> None:
+    """Registra um lote de gastos com uma única escrita no banco e envia a confirmação."""
+    expenses = [
+        {
+            "value": item["value"],
+            "category_id": item["category_id"],
+            "date": item["date"],
+            "payment_method_id": item.get("forma_pagamento_id"),
+            "description": item.get("descricao_gasto"),
+        }
+        for item in batch
+    ]
+
+    if await asyncio.to_thread(save_expenses, context, expenses):
+        total = sum_money(item["value"] for item in batch)
+        await update.message.reply_text(
+            f"✅ {len(batch)} gastos registrados com sucesso (total {format_money(total)})! 🎉",
+            reply_markup=ReplyKeyboardRemove(),
+        )
+        chart_cache = context.bot_data.get("chart_cache")
+        if chart_cache is not None:
+            chart_cache.invalidate()
+        await send_budget_alerts(
+            update, context, expenses, queued="write_queue" in context.bot_data
+        )
+    else:
+        await update.message.reply_text(
+            "❌ Ocorreu um erro ao registrar seus gastos. Alguns podem ter sido salvos; confira com /listar_gastos antes de tentar de novo. 😟",
+            reply_markup=ReplyKeyboardRemove(),
+        )
@@ -1,7 +1,9 @@
+import asyncio
 from typing import Any, Dict
 from telegram.ext import ContextTypes
 from telegram import Update, ReplyKeyboardRemove
 from src.core import db
+from src.utils.money import format_money, to_cents
 
 
 async def register_income(
@@ -13,11 +15,14 @@ async def register_income(
     data = transaction_info["date"]
     descricao = transaction_info["description"]
 
-    if db.add_ganho(supabase_client, valor, descricao, data):
+    if await asyncio.to_thread(db.add_ganho, supabase_client, valor, descricao, data):
         await update.message.reply_text(
-            f"✅ Ganho de R${valor:.2f} de '{descricao}' registrado com sucesso! 🥳",
+            f"✅ Ganho de {format_money(to_cents(valor))} de '{descricao}' registrado com sucesso! 🥳",
             reply_markup=ReplyKeyboardRemove(),
         )
+        chart_cache = context.bot_data.get("chart_cache")
+        if chart_cache is not None:
+            chart_cache.invalidate()
     else:
         await update.message.reply_text(
             "❌ Ocorreu um erro ao registrar seu ganho. Tente novamente mais tarde. 😟",
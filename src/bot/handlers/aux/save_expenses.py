@@ -0,0 +1,40 @@
+from typing import Any, Dict, List, Union
+from telegram.ext import ContextTypes
+from src.core import db
+
+
+def save_expenses(
+    context: ContextTypes.DEFAULT_TYPE, expenses: List[Dict[str, Any]]
+) -> Union[List[Dict[str, Any]], None]:
+    """
+    Grava gastos confirmados (itens no formato de db.add_expenses) e retorna as
+    linhas salvas, ou None se a gravação falhar. Com a fila de escrita ativa
+    (WRITE_QUEUE_PATH), só enfileira localmente e retorna na hora; o job de
+    flush envia ao Supabase. Sem a fila, grava direto no banco.
+    Gastos gravados entram na hora no índice de busca, com o id devolvido pelo
+    banco; os enfileirados entram quando o flush os grava.
+    Bloqueia durante os retries: chame fora do event loop (asyncio.to_thread).
+    """
+    write_queue = context.bot_data.get("write_queue")
+    if write_queue is not None:
+        return expenses if write_queue.enqueue(expenses) is not None else None
+
+    supabase_client = context.bot_data["supabase_client"]
+    if len(expenses) == 1:
+        expense = expenses[0]
+        row = db.add_expense(
+            supabase_client,
+            expense["value"],
+            expense["category_id"],
+            expense["date"],
+            expense.get("payment_method_id"),
+            expense.get("description"),
+        )
+        saved = [row] if row else None
+    else:
+        saved = db.add_expenses(supabase_client, expenses)
+
+    search_index = context.bot_data.get("search_index")
+    if saved and search_index is not None:
+        search_index.add(saved)
+    return saved
@@ -0,0 +1,35 @@
+from typing import Any, Dict, List
+from telegram import Update, ReplyKeyboardMarkup
+from telegram.ext import ContextTypes
+from src.utils.money import format_money, to_cents
+
+
+async def send_batch_confirmation_message(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, batch: List[Dict[str, Any]]
+) -> None:
+    """Envia uma única tela de confirmação para um lote de gastos."""
+    linhas = []
+    total = 0
+    for i, item in enumerate(batch, start=1):
+        forma_pagamento = item.get("forma_pagamento_nome_real") or "Não Informado"
+        linhas.append(
+            f"{i}. *{format_money(to_cents(item['value']))}* {item.get('descricao_gasto') or ''} "
+            f"({item['categoria_nome_db']} - {forma_pagamento}) em {item['date']}"
+        )
+        total += to_cents(item["value"])
+
+    message_text = (
+        f"Confirma os *{len(batch)} gastos* abaixo? 🧾\n\n"
+        + "\n".join(linhas)
+        + f"\n\n💰 Total: *{format_money(total)}*"
+    )
+
+    keyboard = [["Sim ✅", "Não ❌"]]
+    reply_markup = ReplyKeyboardMarkup(
+        keyboard, one_time_keyboard=True, resize_keyboard=True
+    )
+    await update.message.reply_text(
+        f"{message_text}\n\n*Tudo certo?* 🤔",
+        reply_markup=reply_markup,
+        parse_mode="Markdown",
+    )
@@ -0,0 +1,66 @@
+import asyncio
+from typing import Any, Dict, List
+from telegram import Update
+from telegram.ext import ContextTypes
+from src.core import db
+from src.core.budget import month_bounds
+from src.core.log import get_logger
+from src.utils.money import format_money, to_cents
+
+logger = get_logger(__name__)
+
+
+async def send_budget_alerts(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    expenses: List[Dict[str, Any]],
+    queued: bool = False,
+) -> None:
+    """
+    Atualiza os totais mensais em memória com os gastos recém-gravados
+    (itens com 'category_id', 'date' e 'value') e avisa quando algum limite
+    de categoria cruza um dos percentuais configurados. queued=True indica
+    gastos que ainda estão na fila de escrita, fora do banco.
+    Roda depois da gravação: uma falha aqui só é registrada no log, nunca chega
+    ao usuário como se o gasto não tivesse sido salvo.
+    """
+    tracker = context.bot_data.get("budget_tracker")
+    if tracker is None:
+        return
+
+    supabase_client = context.bot_data["supabase_client"]
+    try:
+        categorias = {
+            cat["id"]: cat
+            for cat in await asyncio.to_thread(
+                db.reference_data.categories, supabase_client
+            )
+        }
+        transitions = await asyncio.to_thread(
+            tracker.record_expenses, supabase_client, expenses, saved=not queued
+        )
+    except Exception as e:
+        logger.error("Erro ao atualizar os totais dos alertas de orçamento: %s", e)
+        return
+
+    for expense, (previous, new) in zip(expenses, transitions):
+        categoria = categorias.get(expense["category_id"])
+        if not categoria:
+            continue
+        limite = categoria.get("monthly_limit")
+        crossed = tracker.crossed_thresholds(previous, new, limite)
+        if not crossed:
+            continue
+
+        month = month_bounds(expense["date"])[0]
+        threshold = crossed[-1]
+        if threshold >= 1:
+            await update.effective_message.reply_text(
+                f"🚨 Limite estourado! Você já gastou {format_money(to_cents(new))} em "
+                f"'{categoria['name']}' em {month}, acima do limite de {format_money(to_cents(limite))}."
+            )
+        else:
+            await update.effective_message.reply_text(
+                f"⚠️ Atenção: você já usou {threshold:.0%} do limite de "
+                f"'{categoria['name']}' em {month} ({format_money(to_cents(new))} de {format_money(to_cents(limite))})."
+            )
@@ -1,7 +1,9 @@
+import asyncio
 from typing import Any, Dict
 from telegram import Update, ReplyKeyboardMarkup
 from telegram.ext import ContextTypes
 from src.core import db
+from src.utils.money import format_money, to_cents
 
 
 async def send_confirmation_message(
@@ -9,7 +11,7 @@ async def send_confirmation_message(
 ) -> None:
     """Envia a mensagem de confirmação da transação ao usuário com emojis e formatação."""
     supabase_client = context.bot_data["supabase_client"]
-    valor_fmt = f"R${transaction_info['value']:.2f}"
+    valor_fmt = format_money(to_cents(transaction_info["value"]))
     data_fmt = transaction_info["date"]
 
     categoria_nome_real = transaction_info.get(
@@ -21,7 +23,7 @@ async def send_confirmation_message(
         cat_info = next(
             (
                 c
-                for c in db.get_categories(supabase_client)
+                for c in await asyncio.to_thread(db.get_categories, supabase_client)
                 if c["id"] == transaction_info["category_id"]
             ),
             None,
@@ -38,7 +40,9 @@ async def send_confirmation_message(
         fp_info = next(
             (
                 f
-                for f in db.get_payment_methods(supabase_client)
+                for f in await asyncio.to_thread(
+                    db.get_payment_methods, supabase_client
+                )
                 if f["id"] == transaction_info["forma_pagamento_id"]
             ),
             None,
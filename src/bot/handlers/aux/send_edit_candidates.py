@@ -0,0 +1,123 @@
+import asyncio
+import uuid
+from typing import Any, Dict, List
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram.ext import ContextTypes
+from src.core import db
+from src.core.editing import find_edit_candidates
+from src.core.search import SearchIndex
+from src.utils.money import format_money, from_cents, parse_money, to_cents
+
+EDIT_CALLBACK_PREFIX = "editar_gasto"
+# Quantos gastos aparecem como opção para edição
+EDIT_CANDIDATES_LIMIT = 5
+MAX_BUTTON_LABEL_LENGTH = 60
+EDIT_FIELDS = {
+    "valor": "💰 Valor",
+    "data": "📅 Data",
+    "descricao": "📝 Descrição",
+    "categoria": "🏷️ Categoria",
+    "pagamento": "💳 Forma de pagamento",
+}
+
+
+def format_candidate_label(gasto: Dict[str, Any]) -> str:
+    """Texto curto de um gasto para caber num botão."""
+    descricao = gasto.get("description") or gasto.get("categoria_nome", "")
+    label = f"{gasto['date']} · {format_money(to_cents(gasto['value']))} · {descricao}"
+    if len(label) > MAX_BUTTON_LABEL_LENGTH:
+        label = label[: MAX_BUTTON_LABEL_LENGTH - 1] + "…"
+    return label
+
+
+def build_field_keyboard(session_id: str) -> InlineKeyboardMarkup:
+    """Botões com os campos editáveis do gasto escolhido, excluir e cancelar."""
+    prefix = f"{EDIT_CALLBACK_PREFIX}:{session_id}"
+    buttons: List[List[InlineKeyboardButton]] = [
+        [InlineKeyboardButton(label, callback_data=f"{prefix}:campo:{field}")]
+        for field, label in EDIT_FIELDS.items()
+    ]
+    buttons.append(
+        [
+            InlineKeyboardButton("🗑️ Excluir", callback_data=f"{prefix}:excluir"),
+            InlineKeyboardButton("❌ Cancelar", callback_data=f"{prefix}:cancelar"),
+        ]
+    )
+    return InlineKeyboardMarkup(buttons)
+
+
+def build_delete_confirmation_keyboard(session_id: str) -> InlineKeyboardMarkup:
+    """Botões para confirmar ou cancelar a exclusão do gasto escolhido."""
+    prefix = f"{EDIT_CALLBACK_PREFIX}:{session_id}"
+    return InlineKeyboardMarkup(
+        [
+            [
+                InlineKeyboardButton(
+                    "✅ Sim, excluir", callback_data=f"{prefix}:confirmar_exclusao"
+                ),
+                InlineKeyboardButton("❌ Cancelar", callback_data=f"{prefix}:cancelar"),
+            ]
+        ]
+    )
+
+
+async def send_edit_candidates(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, parsed_info: Dict[str, Any]
+) -> bool:
+    """
+    Procura os gastos que combinam com o pedido de edição (valor, data, descrição
+    e categoria extraídos pela IA) e os envia como botões. A sessão fica em
+    user_data["expense_edit"]; retorna False se nenhum gasto foi encontrado.
+    """
+    supabase_client = context.bot_data["supabase_client"]
+    categoria_texto = parsed_info.get("categoria")
+    category_id = (
+        await asyncio.to_thread(
+            db.get_category_id_by_text, supabase_client, categoria_texto
+        )
+        if categoria_texto
+        else None
+    )
+    valor_centavos = parse_money(parsed_info.get("valor"))
+    candidates = await asyncio.to_thread(
+        find_edit_candidates,
+        supabase_client,
+        context.bot_data.setdefault("search_index", SearchIndex()),
+        value=None if valor_centavos is None else from_cents(valor_centavos),
+        date=parsed_info.get("data"),
+        description=parsed_info.get("descricao_gasto"),
+        category_id=category_id,
+        limit=EDIT_CANDIDATES_LIMIT,
+    )
+    if not candidates:
+        await update.message.reply_text(
+            "🤷‍♀️ Não encontrei nenhum gasto com essas informações. "
+            "Tente informar o valor, a data ou a descrição do gasto. 💡"
+        )
+        return False
+
+    session_id = uuid.uuid4().hex[:8]
+    context.user_data["expense_edit"] = {
+        "id": session_id,
+        "candidates": [dict(gasto) for gasto in candidates],
+        "selected": None,
+        "field": None,
+        "confirm_delete": False,
+    }
+    prefix = f"{EDIT_CALLBACK_PREFIX}:{session_id}"
+    buttons = [
+        [
+            InlineKeyboardButton(
+                format_candidate_label(gasto), callback_data=f"{prefix}:sel:{index}"
+            )
+        ]
+        for index, gasto in enumerate(candidates)
+    ]
+    buttons.append(
+        [InlineKeyboardButton("❌ Cancelar", callback_data=f"{prefix}:cancelar")]
+    )
+    await update.message.reply_text(
+        "✏️ Qual destes gastos você quer editar?",
+        reply_markup=InlineKeyboardMarkup(buttons),
+    )
+    return True
@@ -0,0 +1,135 @@
+import asyncio
+import math
+import uuid
+from typing import Any, Dict, List, Tuple, Union
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram.ext import ContextTypes
+from telegram.helpers import escape_markdown
+from src.core import db
+from src.utils.money import format_money, from_cents, sum_money, to_cents
+
+# 20 linhas de no máximo ~150 caracteres cabem com folga no limite de 4096
+# caracteres por mensagem do Telegram
+EXPENSE_PAGE_SIZE = 20
+MAX_DESCRIPTION_LENGTH = 60
+LIST_CALLBACK_PREFIX = "lista_gastos"
+
+
+def format_expense_line(gasto: Dict[str, Any]) -> str:
+    """Formata um gasto como uma linha da listagem."""
+    descricao = gasto.get("description") or "Sem descrição"
+    if len(descricao) > MAX_DESCRIPTION_LENGTH:
+        descricao = descricao[: MAX_DESCRIPTION_LENGTH - 1] + "…"
+    categoria_nome = gasto.get("categoria_nome", "Desconhecida")
+    forma_pagamento_nome = gasto.get("forma_pagamento_nome", "Não Informado")
+    return escape_markdown(
+        f"• {format_money(to_cents(gasto['value']))} {descricao} ({categoria_nome} - {forma_pagamento_nome}) em {gasto['date']}"
+    )
+
+
+def fetch_expense_page(
+    supabase_client: Any, listing: Dict[str, Any]
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Busca somente a página atual da listagem (uma linha a mais indica se há
+    próxima página) e guarda o cursor da página seguinte. Consulta o banco de
+    forma síncrona: chame fora do event loop (asyncio.to_thread).
+    """
+    page = listing["page"]
+    gastos = db.get_gastos_page(
+        supabase_client,
+        EXPENSE_PAGE_SIZE + 1,
+        cursor=listing["cursors"][page],
+        **listing["filters"],
+    )
+    has_next = len(gastos) > EXPENSE_PAGE_SIZE
+    gastos = gastos[:EXPENSE_PAGE_SIZE]
+    if has_next and len(listing["cursors"]) == page + 1:
+        listing["cursors"].append({"date": gastos[-1]["date"], "id": gastos[-1]["id"]})
+    return gastos, has_next
+
+
+def render_expense_page(
+    listing: Dict[str, Any], gastos: List[Dict[str, Any]], has_next: bool
+) -> Tuple[str, Union[InlineKeyboardMarkup, None]]:
+    """Monta o texto e os botões de navegação de uma página da listagem."""
+    page = listing["page"]
+    total_pages = max(1, math.ceil(listing["count"] / EXPENSE_PAGE_SIZE))
+    parts = [
+        f"*Detalhes dos Gastos{escape_markdown(listing['title'])}* "
+        f"(página {page + 1}/{total_pages}):\n",
+        *(format_expense_line(gasto) for gasto in gastos),
+        f"\n*Total: {format_money(to_cents(listing['total']))}* ({listing['count']} gastos)",
+    ]
+
+    buttons = []
+    if page > 0:
+        buttons.append(
+            InlineKeyboardButton(
+                "⬅️ Anterior",
+                callback_data=f"{LIST_CALLBACK_PREFIX}:{listing['id']}:ant",
+            )
+        )
+    if has_next:
+        buttons.append(
+            InlineKeyboardButton(
+                "Próxima ➡️",
+                callback_data=f"{LIST_CALLBACK_PREFIX}:{listing['id']}:prox",
+            )
+        )
+    reply_markup = InlineKeyboardMarkup([buttons]) if buttons else None
+    return "\n".join(parts), reply_markup
+
+
+async def send_expense_list(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    title: str,
+    data_inicio: Union[str, None] = None,
+    data_fim: Union[str, None] = None,
+    category_id: Union[str, None] = None,
+) -> None:
+    """
+    Envia a primeira página da listagem de gastos e guarda o estado da navegação
+    em user_data; as próximas páginas são buscadas sob demanda pelos botões.
+    """
+    supabase_client = context.bot_data["supabase_client"]
+    filters = {
+        "data_inicio": data_inicio,
+        "data_fim": data_fim,
+        "category_id": category_id,
+    }
+    listing = {
+        "id": uuid.uuid4().hex[:8],
+        "title": title,
+        "filters": filters,
+        "cursors": [None],
+        "page": 0,
+    }
+
+    gastos, has_next = await asyncio.to_thread(
+        fetch_expense_page, supabase_client, listing
+    )
+    if not gastos:
+        await update.message.reply_text(
+            f"Nenhum gasto encontrado{title} com os critérios fornecidos. 🤷‍♀️"
+        )
+        return
+
+    if has_next:
+        listing.update(
+            await asyncio.to_thread(db.get_gastos_summary, supabase_client, **filters)
+        )
+    else:
+        listing.update(
+            {
+                "count": len(gastos),
+                "total": from_cents(sum_money(gasto["value"] for gasto in gastos)),
+            }
+        )
+
+    context.user_data["expense_listing"] = listing
+    text, reply_markup = render_expense_page(listing, gastos, has_next)
+    await update.message.reply_text(
+        text, reply_markup=reply_markup, parse_mode="Markdown"
+    )
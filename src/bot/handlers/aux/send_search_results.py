@@ -0,0 +1,52 @@
+import asyncio
+from typing import Union
+from telegram import Update
+from telegram.ext import ContextTypes
+from telegram.helpers import escape_markdown
+from src.bot.handlers.aux.send_expense_list import format_expense_line
+from src.core.search import SearchIndex
+from src.utils.money import format_money, to_cents
+
+# Quantos gastos (os mais recentes) aparecem na resposta de uma busca
+SEARCH_RESULTS_LIMIT = 10
+
+
+async def send_search_results(
+    update: Update,
+    context: ContextTypes.DEFAULT_TYPE,
+    termo: str,
+    data_inicio: Union[str, None] = None,
+    data_fim: Union[str, None] = None,
+) -> None:
+    """
+    Busca gastos pela descrição no índice local (bot_data["search_index"]) e envia
+    o total, a quantidade e os gastos mais recentes encontrados.
+    """
+    supabase_client = context.bot_data["supabase_client"]
+    search_index = context.bot_data.setdefault("search_index", SearchIndex())
+    result = await asyncio.to_thread(
+        search_index.search,
+        supabase_client,
+        termo,
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        limit=SEARCH_RESULTS_LIMIT,
+    )
+
+    if not result["count"]:
+        await update.message.reply_text(
+            f"Nenhum gasto encontrado com '{termo}' na descrição. 🤷‍♀️"
+        )
+        return
+
+    periodo = ""
+    if data_inicio or data_fim:
+        periodo = f" de {data_inicio or 'início'} a {data_fim or 'hoje'}"
+    parts = [
+        f"*🔎 Gastos com '{escape_markdown(termo)}'{escape_markdown(periodo)}:*",
+        f"*Total: {format_money(to_cents(result['total']))}* ({result['count']} gastos)\n",
+        *(format_expense_line(gasto) for gasto in result["gastos"]),
+    ]
+    if result["count"] > len(result["gastos"]):
+        parts.append(f"\n_Mostrando os {len(result['gastos'])} mais recentes._")
+    await update.message.reply_text("\n".join(parts), parse_mode="Markdown")
@@ -1,7 +1,9 @@
+import asyncio
+
 from telegram import ReplyKeyboardRemove, Update, ReplyKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler
 
-from src.bot.handlers import (
+from src.bot.handlers.states import (
     ASKING_CATEGORY_CLARIFICATION,
     ASKING_CONFIRMATION,
     ASKING_NEW_CATEGORY_NAME,
@@ -10,8 +12,10 @@ from src.bot.handlers import (
 from src.bot.handlers.aux import send_confirmation_message
 from src.core import db
 from src.utils.text_utils import to_camel_case
+from src.core.metrics import timed
 
 
+@timed("handler")
 async def handle_category_clarification(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> int:
@@ -46,7 +50,7 @@ async def handle_category_clarification(
             break
 
     if not chosen_category_id:
-        all_categorias = db.get_categories(supabase_client)
+        all_categorias = await asyncio.to_thread(db.get_categories, supabase_client)
         for cat in all_categorias:
             if user_response_camel_case == cat["name"]:
                 chosen_category_id = cat["id"]
@@ -64,7 +68,9 @@ async def handle_category_clarification(
         forma_pagamento_nome_real = None
         if forma_pagamento_text:
             forma_pagamento_normalizada = to_camel_case(forma_pagamento_text)
-            formas_pagamento_db_info = db.get_payment_methods(supabase_client)
+            formas_pagamento_db_info = await asyncio.to_thread(
+                db.get_payment_methods, supabase_client
+            )
             for fp in formas_pagamento_db_info:
                 if fp["name"] == forma_pagamento_normalizada:
                     forma_pagamento_id = fp["id"]
@@ -72,7 +78,9 @@ async def handle_category_clarification(
                     break
 
         if not forma_pagamento_id:
-            formas_pagamento_disponiveis = db.get_payment_methods(supabase_client)
+            formas_pagamento_disponiveis = await asyncio.to_thread(
+                db.get_payment_methods, supabase_client
+            )
             keyboard_options = [[fp["name"]] for fp in formas_pagamento_disponiveis]
             keyboard_options.append(["Outro / Não sei ❓"])
             reply_markup = ReplyKeyboardMarkup(
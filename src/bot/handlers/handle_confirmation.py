@@ -1,20 +1,27 @@
 from telegram import ReplyKeyboardRemove, Update, ReplyKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler
-from src.bot.handlers import (
+from src.bot.handlers.states import (
     ASKING_CONFIRMATION,
     ASKING_CORRECTION,
 )
 from src.bot.handlers.aux import (
     register_expense,
+    register_expense_batch,
     register_income,
 )
+from src.core.metrics import timed
 
 
+@timed("handler")
 async def handle_confirmation(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> int:
     """Lida com a confirmação (Sim/Não) da transação."""
     user_response = update.message.text.lower()
+    pending_batch = context.user_data.get("pending_batch")
+    if pending_batch:
+        return await _handle_batch_confirmation(update, context, pending_batch)
+
     pending_transaction = context.user_data.get("pending_transaction")
 
     if not pending_transaction:
@@ -25,12 +32,13 @@ async def handle_confirmation(
         return ConversationHandler.END
 
     if user_response == "sim ✅" or user_response == "sim":
+        # Limpa a transação pendente antes de gravar: se algo falhar depois da
+        # gravação, um novo "sim" não pode gravar a mesma transação de novo
+        context.user_data.pop("pending_transaction", None)
         if pending_transaction["transaction_type"] == "gasto":
             await register_expense(update, context, pending_transaction)
         elif pending_transaction["transaction_type"] == "ganho":
             await register_income(update, context, pending_transaction)
-
-        context.user_data.pop("pending_transaction", None)  # Limpa a transação pendente
         return ConversationHandler.END  # Fim da conversa
 
     elif user_response == "não ❌" or user_response == "não" or user_response == "nao":
@@ -52,3 +60,35 @@ async def handle_confirmation(
             reply_markup=reply_markup,
         )
         return ASKING_CONFIRMATION  # Permanece no estado de confirmação
+
+
+async def _handle_batch_confirmation(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, pending_batch: list
+) -> int:
+    """Lida com a confirmação (Sim/Não) de um lote de gastos."""
+    user_response = update.message.text.lower()
+
+    if user_response == "sim ✅" or user_response == "sim":
+        context.user_data.pop("pending_batch", None)
+        await register_expense_batch(update, context, pending_batch)
+        return ConversationHandler.END
+
+    elif user_response == "não ❌" or user_response == "não" or user_response == "nao":
+        context.user_data.pop("pending_batch", None)
+        await update.message.reply_text(
+            "Ok, descartei a lista. 🗑️ Envie novamente os gastos corrigidos "
+            "ou registre-os um a um para ajustar os detalhes.",
+            reply_markup=ReplyKeyboardRemove(),
+        )
+        return ConversationHandler.END
+
+    else:
+        keyboard = [["Sim ✅", "Não ❌"]]
+        reply_markup = ReplyKeyboardMarkup(
+            keyboard, one_time_keyboard=True, resize_keyboard=True
+        )
+        await update.message.reply_text(
+            "Por favor, responda apenas 'Sim ✅' ou 'Não ❌'.",
+            reply_markup=reply_markup,
+        )
+        return ASKING_CONFIRMATION
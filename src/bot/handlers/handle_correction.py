@@ -1,14 +1,18 @@
+import asyncio
 import datetime
 from telegram import ReplyKeyboardRemove, Update, ReplyKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler
 
-from src.bot.handlers import ASKING_CONFIRMATION, ASKING_CORRECTION
+from src.bot.handlers.states import ASKING_CONFIRMATION, ASKING_CORRECTION
 from src.bot.handlers.aux import send_confirmation_message
 from src.core.ai import extract_correction_from_llama
 from src.core import db
+from src.utils.money import from_cents, parse_money
 from src.utils.text_utils import to_camel_case
+from src.core.metrics import timed
 
 
+@timed("handler")
 async def handle_correction(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """Lida com a correção de um campo da transação."""
     supabase_client = context.bot_data["supabase_client"]
@@ -23,9 +27,9 @@ async def handle_correction(update: Update, context: ContextTypes.DEFAULT_TYPE)
         return ConversationHandler.END
 
     # Extrai o campo e o novo valor da correção usando o Llama
-    correction_parsed = extract_correction_from_llama(
-        correction_text
-    )  # <-- CORREÇÃO AQUI
+    correction_parsed = await asyncio.to_thread(
+        extract_correction_from_llama, correction_text
+    )
 
     if not correction_parsed:
         await update.message.reply_text(
@@ -48,14 +52,14 @@ async def handle_correction(update: Update, context: ContextTypes.DEFAULT_TYPE)
 
     # Aplica a correção na transação pendente
     if campo.lower() == "value":
-        try:
-            pending_transaction["value"] = float(str(novo_valor).replace(",", "."))
-            await update.message.reply_text("Valor atualizado! 💰")
-        except ValueError:
+        cents = parse_money(novo_valor)
+        if cents is None:
             await update.message.reply_text(
                 "Valor inválido para o campo 'Valor'. Tente novamente. 🔢"
             )
             return ASKING_CORRECTION
+        pending_transaction["value"] = from_cents(cents)
+        await update.message.reply_text("Valor atualizado! 💰")
     elif campo.lower() == "date":
         try:
             # Valida o formato e atualiza o pending_transaction
@@ -68,7 +72,9 @@ async def handle_correction(update: Update, context: ContextTypes.DEFAULT_TYPE)
             )
             return ASKING_CORRECTION
     elif campo.lower() == "categoria":
-        nova_category_id = db.get_category_id_by_text(supabase_client, str(novo_valor))
+        nova_category_id = await asyncio.to_thread(
+            db.get_category_id_by_text, supabase_client, str(novo_valor)
+        )
         if nova_category_id:
             pending_transaction["category_id"] = nova_category_id
             pending_transaction["categoria_nome_db"] = to_camel_case(str(novo_valor))
@@ -90,8 +96,8 @@ async def handle_correction(update: Update, context: ContextTypes.DEFAULT_TYPE)
             )
             return ASKING_CORRECTION
     elif campo.lower() == "forma" or campo.lower() == "forma_pagamento":
-        nova_forma_id = db.get_payment_method_id_by_name(
-            supabase_client, str(novo_valor)
+        nova_forma_id = await asyncio.to_thread(
+            db.get_payment_method_id_by_name, supabase_client, str(novo_valor)
         )
         if nova_forma_id:
             pending_transaction["forma_pagamento_id"] = nova_forma_id
@@ -152,7 +158,8 @@ async def handle_correction(update: Update, context: ContextTypes.DEFAULT_TYPE)
                 "pending_transaction_temp_category_name"
             )
             if new_category_name_from_correction:
-                if db.add_category(
+                if await asyncio.to_thread(
+                    db.add_category,
                     supabase_client,
                     new_category_name_from_correction,
                     monthly_limit=None,
@@ -160,8 +167,10 @@ async def handle_correction(update: Update, context: ContextTypes.DEFAULT_TYPE)
                     new_category_camel_case = to_camel_case(
                         new_category_name_from_correction
                     )
-                    new_cat_id = db.get_category_id_by_text(
-                        supabase_client, new_category_camel_case
+                    new_cat_id = await asyncio.to_thread(
+                        db.get_category_id_by_text,
+                        supabase_client,
+                        new_category_camel_case,
                     )
                     if new_cat_id:
                         pending_transaction["category_id"] = new_cat_id
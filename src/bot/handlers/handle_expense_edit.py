@@ -0,0 +1,92 @@
+from telegram import Update
+from telegram.ext import ContextTypes, ConversationHandler
+from telegram.helpers import escape_markdown
+
+from src.bot.handlers.states import ASKING_EXPENSE_EDIT
+from src.bot.handlers.aux import apply_expense_edit
+from src.bot.handlers.aux.send_edit_candidates import (
+    EDIT_FIELDS,
+    build_delete_confirmation_keyboard,
+    build_field_keyboard,
+)
+from src.bot.handlers.aux.send_expense_list import format_expense_line
+from src.core.metrics import timed
+
+
+@timed("handler")
+async def handle_expense_edit(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> int:
+    """
+    Lida com os botões da edição de gasto: escolher o gasto, escolher o campo a
+    alterar, excluir (com confirmação) ou cancelar.
+    """
+    query = update.callback_query
+    await query.answer()
+
+    _, session_id, action, *args = query.data.split(":")
+    session = context.user_data.get("expense_edit")
+    if not session or session["id"] != session_id:
+        await query.edit_message_text(
+            "⌛ Essa edição expirou. Peça para editar o gasto novamente."
+        )
+        return ConversationHandler.END
+
+    if action == "cancelar":
+        context.user_data.pop("expense_edit", None)
+        await query.edit_message_text("🚫 Edição cancelada. Nada foi alterado.")
+        return ConversationHandler.END
+
+    if action == "sel":
+        session["selected"] = int(args[0])
+        session["field"] = None
+        session["confirm_delete"] = False
+        gasto = session["candidates"][session["selected"]]
+        await query.edit_message_text(
+            f"*✏️ O que você quer alterar neste gasto?*\n{format_expense_line(gasto)}",
+            reply_markup=build_field_keyboard(session_id),
+            parse_mode="Markdown",
+        )
+        return ASKING_EXPENSE_EDIT
+
+    if session["selected"] is None:
+        return ASKING_EXPENSE_EDIT
+    gasto = session["candidates"][session["selected"]]
+
+    if action == "campo":
+        session["field"] = args[0]
+        session["confirm_delete"] = False
+        instrucoes = {
+            "valor": "Envie o novo valor (ex: 25,90).",
+            "data": "Envie a nova data (AAAA-MM-DD ou DD/MM/AAAA).",
+            "descricao": "Envie a nova descrição.",
+            "categoria": "Envie o nome da nova categoria.",
+            "pagamento": "Envie a nova forma de pagamento (ex: Pix, Crédito).",
+        }
+        await query.edit_message_text(
+            f"*{escape_markdown(EDIT_FIELDS[args[0]])}*\n{format_expense_line(gasto)}\n\n"
+            f"{escape_markdown(instrucoes[args[0]])} Use /cancel para desistir.",
+            parse_mode="Markdown",
+        )
+        return ASKING_EXPENSE_EDIT
+
+    if action == "excluir":
+        # Como no registro, nada é apagado sem confirmação explícita
+        session["confirm_delete"] = True
+        await query.edit_message_text(
+            f"*🗑️ Excluir este gasto?*\n{format_expense_line(gasto)}\n\n"
+            "Essa ação não pode ser desfeita.",
+            reply_markup=build_delete_confirmation_keyboard(session_id),
+            parse_mode="Markdown",
+        )
+        return ASKING_EXPENSE_EDIT
+
+    if action == "confirmar_exclusao":
+        if not session.get("confirm_delete"):
+            return ASKING_EXPENSE_EDIT
+        context.user_data.pop("expense_edit", None)
+        await query.edit_message_reply_markup(reply_markup=None)
+        await apply_expense_edit(update, context, gasto, None)
+        return ConversationHandler.END
+
+    return ASKING_EXPENSE_EDIT
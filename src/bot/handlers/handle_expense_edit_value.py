@@ -0,0 +1,78 @@
+import asyncio
+from typing import Any, Dict, Union
+from telegram import Update
+from telegram.ext import ContextTypes, ConversationHandler
+
+from src.bot.handlers.states import ASKING_EXPENSE_EDIT
+from src.bot.handlers.aux import apply_expense_edit
+from src.bot.handlers.handle_initial_message import handle_initial_message
+from src.core import db
+from src.core.editing import parse_date
+from src.core.metrics import timed
+from src.utils.money import from_cents, parse_money
+
+
+@timed("handler")
+async def handle_expense_edit_value(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> Union[int, None]:
+    """
+    Recebe o novo conteúdo do campo escolhido na edição de gasto e grava a
+    alteração. Sem campo pendente, a mensagem é tratada como uma nova conversa.
+    """
+    supabase_client = context.bot_data["supabase_client"]
+    session = context.user_data.get("expense_edit")
+    if not session or session.get("field") is None:
+        context.user_data.pop("expense_edit", None)
+        return await handle_initial_message(update, context)
+
+    field = session["field"]
+    text = update.message.text.strip()
+    changes: Union[Dict[str, Any], None] = None
+
+    if field == "valor":
+        cents = parse_money(text)
+        if cents is not None and cents > 0:
+            changes = {"value": from_cents(cents)}
+        else:
+            erro = "⚠️ Valor inválido. Envie apenas o número, ex: 25,90."
+    elif field == "data":
+        data = parse_date(text)
+        if data:
+            changes = {"date": data}
+        else:
+            erro = "⚠️ Data inválida. Use o formato AAAA-MM-DD ou DD/MM/AAAA."
+    elif field == "descricao":
+        changes = {"description": text}
+    elif field == "categoria":
+        category_id = await asyncio.to_thread(
+            db.get_category_id_by_text, supabase_client, text
+        )
+        if category_id:
+            changes = {"category_id": category_id}
+        else:
+            erro = f"⚠️ Categoria '{text}' não reconhecida. Use /categorias para ver as opções."
+    elif field == "pagamento":
+        forma_pagamento_id = await asyncio.to_thread(
+            db.get_payment_method_id_by_name, supabase_client, text
+        )
+        if forma_pagamento_id:
+            changes = {"payment_method_id": forma_pagamento_id}
+        else:
+            erro = f"⚠️ Forma de pagamento '{text}' não reconhecida. Tente novamente."
+    else:
+        # Campo desconhecido: não há o que perguntar de novo
+        context.user_data.pop("expense_edit", None)
+        await update.message.reply_text(
+            "⚠️ Não entendi qual campo alterar. Peça a edição de novo, por favor."
+        )
+        return ConversationHandler.END
+
+    if changes is None:
+        await update.message.reply_text(f"{erro} Ou use /cancel para desistir.")
+        return ASKING_EXPENSE_EDIT
+
+    gasto = session["candidates"][session["selected"]]
+    context.user_data.pop("expense_edit", None)
+    await apply_expense_edit(update, context, gasto, changes)
+    return ConversationHandler.END
@@ -0,0 +1,41 @@
+import asyncio
+
+from telegram import Update
+from telegram.ext import ContextTypes
+
+from src.bot.handlers.aux.send_expense_list import (
+    fetch_expense_page,
+    render_expense_page,
+)
+from src.core.metrics import timed
+
+
+@timed("handler")
+async def handle_expense_list_page(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> None:
+    """Lida com os botões 'Anterior'/'Próxima' da listagem de gastos."""
+    supabase_client = context.bot_data["supabase_client"]
+    query = update.callback_query
+    await query.answer()
+
+    _, listing_id, direction = query.data.split(":")
+    listing = context.user_data.get("expense_listing")
+    if not listing or listing["id"] != listing_id:
+        await query.edit_message_text(
+            "⌛ Essa listagem expirou. Use /listar_gastos para gerar uma nova."
+        )
+        return
+
+    if direction == "prox" and listing["page"] + 1 < len(listing["cursors"]):
+        listing["page"] += 1
+    elif direction == "ant" and listing["page"] > 0:
+        listing["page"] -= 1
+
+    gastos, has_next = await asyncio.to_thread(
+        fetch_expense_page, supabase_client, listing
+    )
+    text, reply_markup = render_expense_page(listing, gastos, has_next)
+    await query.edit_message_text(
+        text, reply_markup=reply_markup, parse_mode="Markdown"
+    )
@@ -0,0 +1,144 @@
+import asyncio
+from typing import Any, Dict, Tuple
+from telegram import ReplyKeyboardRemove, Update, ReplyKeyboardMarkup
+from telegram.ext import ContextTypes, ConversationHandler
+
+from src.bot.handlers.states import ASKING_IMPORT_CONFIRMATION
+from src.bot.handlers.aux import discard_pending_import
+from src.core import db
+from src.core.importer import (
+    LocalCategorizer,
+    iter_expense_rows,
+    iter_income_rows,
+    iter_statement_transactions,
+    open_statement,
+)
+from src.core.log import get_logger
+from src.core.metrics import timed
+
+logger = get_logger(__name__)
+
+
+def _import_statement(
+    supabase_client: Any,
+    path: str,
+    file_name: str,
+    categorizer: LocalCategorizer,
+    key_prefix: str,
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Grava os gastos e os ganhos do extrato; retorna os resultados dos dois lotes."""
+    with open_statement(path) as stream:
+        gastos_result = db.add_expenses_bulk(
+            supabase_client,
+            iter_expense_rows(
+                iter_statement_transactions(stream, file_name),
+                categorizer,
+                key_prefix=f"{key_prefix}:gastos",
+            ),
+        )
+    with open_statement(path) as stream:
+        ganhos_result = db.add_ganhos_bulk(
+            supabase_client,
+            iter_income_rows(
+                iter_statement_transactions(stream, file_name),
+                key_prefix=f"{key_prefix}:ganhos",
+            ),
+        )
+    return gastos_result, ganhos_result
+
+
+def _invalidate_derived_data(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Lançamentos importados podem cair em meses já carregados pelos alertas."""
+    for name in ("budget_tracker", "search_index", "chart_cache"):
+        cache = context.bot_data.get(name)
+        if cache is not None:
+            cache.invalidate()
+
+
+async def _confirm_import(
+    update: Update, context: ContextTypes.DEFAULT_TYPE, pending_import: Dict[str, Any]
+) -> None:
+    """Grava o extrato pendente e responde com o resultado."""
+    # O file_unique_id do Telegram identifica o arquivo e a referência de cada
+    # lançamento (FITID ou linha) o identifica no extrato: reenviar o mesmo
+    # extrato não duplica lançamentos já importados.
+    key_prefix = f"import:{pending_import['file_unique_id']}"
+
+    # Fora do event loop: as gravações em lote podem levar vários segundos e,
+    # numa thread, voltam a ter retry (as chaves de idempotência o tornam seguro)
+    try:
+        gastos_result, ganhos_result = await asyncio.to_thread(
+            _import_statement,
+            context.bot_data["supabase_client"],
+            pending_import["path"],
+            pending_import["file_name"],
+            pending_import["categorizer"],
+            key_prefix,
+        )
+    except Exception:
+        logger.exception("Erro ao importar o extrato '%s'", pending_import["file_name"])
+        # Parte dos lotes pode ter sido gravada antes da falha
+        _invalidate_derived_data(context)
+        await update.message.reply_text(
+            "⚠️ A importação foi interrompida e pode ter gravado só parte do extrato. "
+            "Envie o mesmo arquivo de novo para importar o que faltou, sem duplicar "
+            "o que já entrou. 🔄",
+            reply_markup=ReplyKeyboardRemove(),
+        )
+        return
+
+    _invalidate_derived_data(context)
+    falhas = len(gastos_result["failed"]) + len(ganhos_result["failed"])
+    falhas_msg = (
+        f"\n⚠️ {falhas} lançamento(s) falharam. Envie o mesmo arquivo de novo para "
+        "tentar apenas o que faltou."
+        if falhas
+        else ""
+    )
+    await update.message.reply_text(
+        f"✅ Importação concluída: {gastos_result['inserted']} gastos e "
+        f"{ganhos_result['inserted']} ganhos gravados. 🎉{falhas_msg}",
+        reply_markup=ReplyKeyboardRemove(),
+    )
+
+
+@timed("handler")
+async def handle_import_confirmation(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> int:
+    """Lida com a confirmação (Sim/Não) da importação de um extrato."""
+    user_response = update.message.text.lower()
+    pending_import = context.user_data.get("pending_import")
+
+    if not pending_import:
+        await update.message.reply_text(
+            "Ops! 😬 Não encontrei uma importação pendente. Envie o extrato novamente. 🔄",
+            reply_markup=ReplyKeyboardRemove(),
+        )
+        return ConversationHandler.END
+
+    if user_response in ["sim ✅", "sim"]:
+        try:
+            await _confirm_import(update, context, pending_import)
+        finally:
+            # Concluída ou interrompida, o arquivo temporário não serve mais
+            discard_pending_import(context)
+        return ConversationHandler.END
+
+    if user_response in ["não ❌", "não", "nao"]:
+        await update.message.reply_text(
+            "🚫 Importação cancelada. Nada foi gravado.",
+            reply_markup=ReplyKeyboardRemove(),
+        )
+        discard_pending_import(context)
+        return ConversationHandler.END
+
+    keyboard = [["Sim ✅", "Não ❌"]]
+    reply_markup = ReplyKeyboardMarkup(
+        keyboard, one_time_keyboard=True, resize_keyboard=True
+    )
+    await update.message.reply_text(
+        "Por favor, responda apenas 'Sim ✅' ou 'Não ❌'.",
+        reply_markup=reply_markup,
+    )
+    return ASKING_IMPORT_CONFIRMATION
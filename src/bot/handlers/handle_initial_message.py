@@ -1,34 +1,97 @@
+import asyncio
 import datetime
-from typing import Union, Dict, Any
+from typing import Union, Dict, Any, List
 from telegram import Update, ReplyKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler
 
-from src.bot.handlers import (
+from src.bot.handlers.states import (
     ASKING_CATEGORY_CLARIFICATION,
     ASKING_CONFIRMATION,
+    ASKING_EXPENSE_EDIT,
     ASKING_PAYMENT_METHOD,
 )
-from src.bot.handlers.aux import send_confirmation_message
+from src.bot.handlers.aux import (
+    send_batch_confirmation_message,
+    send_confirmation_message,
+    send_edit_candidates,
+    send_expense_list,
+    send_search_results,
+)
 from src.core.ai import extract_transaction_info
 from src.core import db
 from src.utils.text_utils import to_camel_case
 from src.core import charts
+from src.core.metrics import timed
+from src.core.log import get_logger, trace
+from src.utils.money import format_money, from_cents, parse_money, to_cents
+
+logger = get_logger(__name__)
+
+
+def _build_expense_batch(
+    transacoes: List[Dict[str, Any]],
+    categorias: List[Dict[str, Any]],
+    formas_pagamento: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """
+    Resolve categoria e forma de pagamento de cada item de uma mensagem com vários
+    gastos usando as listas já carregadas (sem consultas ao banco por item).
+    Itens sem categoria reconhecida vão para 'Outros', se essa categoria existir.
+    """
+    outros_id = db.find_category_id_in_list(categorias, "Outros")
+    nomes_categorias = {cat["id"]: cat["name"] for cat in categorias}
+    formas_por_nome = {fp["name"]: fp for fp in formas_pagamento}
+
+    batch = []
+    for transacao in transacoes:
+        valor_centavos = parse_money(transacao.get("valor"))
+        if valor_centavos is None:
+            continue
+
+        categoria_texto_llama = transacao.get("categoria") or "Outros"
+        category_id = (
+            db.find_category_id_in_list(categorias, categoria_texto_llama) or outros_id
+        )
+        if not category_id:
+            continue
+
+        forma_pagamento_text = transacao.get("forma_pagamento")
+        fp = (
+            formas_por_nome.get(to_camel_case(forma_pagamento_text))
+            if forma_pagamento_text
+            else None
+        )
 
+        batch.append(
+            {
+                "value": from_cents(valor_centavos),
+                "date": transacao.get("data") or str(datetime.date.today()),
+                "category_id": category_id,
+                "categoria_nome_db": nomes_categorias[category_id],
+                "forma_pagamento_id": fp["id"] if fp else None,
+                "forma_pagamento_nome_real": fp["name"] if fp else None,
+                "descricao_gasto": transacao.get("descricao_gasto"),
+                "transaction_type": "gasto",
+            }
+        )
+    return batch
 
+
+@timed("handler")
 async def handle_initial_message(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> Union[int, None]:
     supabase_client = context.bot_data["supabase_client"]
     user_message = update.message.text
-    chat_id = update.message.chat_id
 
-    print(f"Mensagem recebida de {chat_id}: {user_message}")
+    trace(logger, "Mensagem recebida", text=user_message)
 
     if not user_message:
         return ConversationHandler.END  # Não faz nada se a mensagem for vazia
 
-    parsed_info: Union[Dict[str, Any], None] = extract_transaction_info(
-        user_message, supabase_client
+    # Fora do event loop: os retries do Gemini não congelam os outros chats
+    parsed_info: Union[Dict[str, Any], None] = await asyncio.to_thread(
+        extract_transaction_info, user_message, supabase_client
     )
 
     if not parsed_info:
@@ -52,12 +115,15 @@ async def handle_initial_message(
             )
             return ConversationHandler.END
 
-        if db.add_category(
-            supabase_client, categoria_nome_input, monthly_limit=monthly_limit
+        if await asyncio.to_thread(
+            db.add_category,
+            supabase_client,
+            categoria_nome_input,
+            monthly_limit=monthly_limit,
         ):
             nome_exibicao = to_camel_case(categoria_nome_input)
             limite_msg = (
-                f" com limite de R${monthly_limit:.2f}"
+                f" com limite de {format_money(to_cents(monthly_limit))}"
                 if monthly_limit is not None and monthly_limit > 0
                 else ""
             )
@@ -73,12 +139,22 @@ async def handle_initial_message(
 
     # --- Lógica para Registrar Gasto ou Ganho (iniciar fluxo de confirmação) ---
     elif intencao == "gasto" or intencao == "ganho":
+        context.user_data.pop("pending_batch", None)
         context.user_data["pending_transaction"] = parsed_info
 
+        valor_centavos = parse_money(parsed_info.get("valor"))
+        if valor_centavos is None:
+            context.user_data.pop("pending_transaction", None)
+            await update.message.reply_text(
+                "🤔 Não consegui identificar o valor. Tente de novo informando "
+                "quanto foi (ex: 'gastei 25,90 no almoço'). 💡"
+            )
+            return ConversationHandler.END
+        valor = from_cents(valor_centavos)
+
         # Para gastos, prepare mais dados para o user_data
         if intencao == "gasto":
-            valor = float(parsed_info["valor"])
-            data = parsed_info.get("date", str(datetime.date.today()))
+            data = parsed_info.get("data") or str(datetime.date.today())
             categoria_texto_llama = parsed_info.get("categoria", "Outros") or "Outros"
             forma_pagamento_text = parsed_info.get("forma_pagamento")
             descricao_gasto = parsed_info.get("descricao_gasto", user_message)
@@ -94,22 +170,24 @@ async def handle_initial_message(
                 }
             )
 
-            category_id = db.get_category_id_by_text(
-                supabase_client, categoria_texto_llama
+            category_id = await asyncio.to_thread(
+                db.get_category_id_by_text, supabase_client, categoria_texto_llama
             )
             if category_id:
                 context.user_data["pending_transaction"]["category_id"] = category_id
                 context.user_data["pending_transaction"]["categoria_nome_db"] = next(
                     (
                         cat["name"]
-                        for cat in db.get_categories(supabase_client)
+                        for cat in await asyncio.to_thread(
+                            db.get_categories, supabase_client
+                        )
                         if cat["id"] == category_id
                     ),
                     categoria_texto_llama,
                 )
             else:
-                similar_categories = db.find_similar_categories(
-                    supabase_client, categoria_texto_llama
+                similar_categories = await asyncio.to_thread(
+                    db.find_similar_categories, supabase_client, categoria_texto_llama
                 )
                 context.user_data["pending_transaction"]["suggestions"] = (
                     similar_categories
@@ -134,7 +212,9 @@ async def handle_initial_message(
             forma_pagamento_nome_real = None
             if forma_pagamento_text:
                 forma_pagamento_normalizada = to_camel_case(forma_pagamento_text)
-                formas_pagamento_db_info = db.get_payment_methods(supabase_client)
+                formas_pagamento_db_info = await asyncio.to_thread(
+                    db.get_payment_methods, supabase_client
+                )
                 for fp in formas_pagamento_db_info:
                     if fp["name"] == forma_pagamento_normalizada:
                         forma_pagamento_id = fp["id"]
@@ -142,7 +222,9 @@ async def handle_initial_message(
                         break
 
             if not forma_pagamento_id:
-                formas_pagamento_disponiveis = db.get_payment_methods(supabase_client)
+                formas_pagamento_disponiveis = await asyncio.to_thread(
+                    db.get_payment_methods, supabase_client
+                )
                 keyboard_options = [[fp["name"]] for fp in formas_pagamento_disponiveis]
                 keyboard_options.append(["Outro / Não sei ❓"])
                 reply_markup = ReplyKeyboardMarkup(
@@ -161,9 +243,8 @@ async def handle_initial_message(
             )
 
         elif intencao == "ganho":
-            valor = float(parsed_info["value"])
-            data = parsed_info.get("date", str(datetime.date.today()))
-            descricao = parsed_info.get("description", "Diversos")
+            data = parsed_info.get("data") or str(datetime.date.today())
+            descricao = parsed_info.get("descricao") or "Diversos"
             context.user_data["pending_transaction"].update(
                 {
                     "value": valor,
@@ -178,6 +259,32 @@ async def handle_initial_message(
         )
         return ASKING_CONFIRMATION
 
+    # --- Lógica para Registrar Vários Gastos de uma vez ---
+    elif intencao == "gastos_multiplos":
+        transacoes = parsed_info.get("transacoes") or []
+        batch = _build_expense_batch(
+            transacoes,
+            await asyncio.to_thread(db.get_categories, supabase_client),
+            await asyncio.to_thread(db.get_payment_methods, supabase_client),
+        )
+
+        if not batch:
+            await update.message.reply_text(
+                "😕 Não consegui identificar os gastos da sua lista. "
+                "Tente enviar um gasto por linha, com valor e descrição. 💡"
+            )
+            return ConversationHandler.END
+
+        if len(batch) < len(transacoes):
+            await update.message.reply_text(
+                f"⚠️ {len(transacoes) - len(batch)} item(ns) da lista ficaram de fora "
+                "por falta de valor ou de uma categoria correspondente."
+            )
+
+        context.user_data["pending_batch"] = batch
+        await send_batch_confirmation_message(update, context, batch)
+        return ASKING_CONFIRMATION
+
     elif intencao in [
         "mostrar_balanco",
         "mostrar_grafico_gastos_categoria",
@@ -194,14 +301,17 @@ async def handle_initial_message(
             forma_pagamento_text = parsed_info.get("forma_pagamento")
             if forma_pagamento_text:
                 forma_pagamento_normalizada = to_camel_case(forma_pagamento_text)
-                forma_pagamento_id = db.get_payment_method_id_by_name(
-                    supabase_client, forma_pagamento_normalizada
+                forma_pagamento_id = await asyncio.to_thread(
+                    db.get_payment_method_id_by_name,
+                    supabase_client,
+                    forma_pagamento_normalizada,
                 )
                 if not forma_pagamento_id:
                     await update.message.reply_text(
                         f"⚠️ Forma de pagamento '{forma_pagamento_text}' não reconhecida. Gerando gráfico sem este filtro. 📊"
                     )
-            chart_buffer = charts.generate_category_spending_chart(
+            chart_buffer = await asyncio.to_thread(
+                charts.generate_category_spending_chart,
                 supabase_client,
                 forma_pagamento_id=forma_pagamento_id,
                 data_inicio=data_inicio,
@@ -212,14 +322,15 @@ async def handle_initial_message(
         elif intencao == "mostrar_grafico_gastos_por_pagamento":
             categoria_texto_llama = parsed_info.get("categoria")
             if categoria_texto_llama:
-                category_id = db.get_category_id_by_text(
-                    supabase_client, categoria_texto_llama
+                category_id = await asyncio.to_thread(
+                    db.get_category_id_by_text, supabase_client, categoria_texto_llama
                 )
                 if not category_id:
                     await update.message.reply_text(
                         f"⚠️ Categoria '{categoria_texto_llama}' não reconhecida. Gerando gráfico sem este filtro. 📊"
                     )
-            chart_buffer = charts.generate_payment_method_spending_chart(
+            chart_buffer = await asyncio.to_thread(
+                charts.generate_payment_method_spending_chart,
                 supabase_client,
                 category_id=category_id,
                 data_inicio=data_inicio,
@@ -228,14 +339,20 @@ async def handle_initial_message(
             title = "Gastos por Forma de Pagamento"
 
         elif intencao == "mostrar_balanco":
-            chart_buffer = charts.generate_balance_chart(
-                supabase_client, data_inicio=data_inicio, data_fim=data_fim
+            chart_buffer = await asyncio.to_thread(
+                charts.generate_balance_chart,
+                supabase_client,
+                data_inicio=data_inicio,
+                data_fim=data_fim,
             )
             title = "Balanço Mensal"
 
         elif intencao == "mostrar_grafico_mensal_combinado":
-            chart_buffer = charts.generate_monthly_category_payment_chart(
-                supabase_client, data_inicio=data_inicio, data_fim=data_fim
+            chart_buffer = await asyncio.to_thread(
+                charts.generate_monthly_category_payment_chart,
+                supabase_client,
+                data_inicio=data_inicio,
+                data_fim=data_fim,
             )
             title = "Gastos Mensais Combinados"
 
@@ -260,29 +377,19 @@ async def handle_initial_message(
         data_inicio = parsed_info.get("data_inicio")
         data_fim = parsed_info.get("data_fim")
 
-        gastos_filtrados = []
         period_title = ""
 
         # Lógica para filtrar por categoria, se fornecida
         category_id = None
         if categoria_texto_llama:
-            category_id = db.get_category_id_by_text(
-                supabase_client, categoria_texto_llama
+            category_id = await asyncio.to_thread(
+                db.get_category_id_by_text, supabase_client, categoria_texto_llama
             )
             if not category_id:
                 await update.message.reply_text(
                     f"⚠️ Categoria '{categoria_texto_llama}' não reconhecida. Listando todos os gastos no período."
                 )
 
-        # Lógica para filtrar por data, se fornecida
-        gastos_data_raw = db.get_gastos(supabase_client)  # Pega todos os gastos
-        gastos_filtrados = charts.filter_gastos_data(
-            gastos_data_raw,
-            category_id=category_id,
-            data_inicio=data_inicio,
-            data_fim=data_fim,
-        )
-
         # Constrói o título do período/categoria para a mensagem
         if data_inicio and data_fim:
             start_date_obj = datetime.datetime.strptime(data_inicio, "%Y-%m-%d")
@@ -304,7 +411,9 @@ async def handle_initial_message(
             categoria_nome_real = next(
                 (
                     cat["name"]
-                    for cat in db.get_categories(supabase_client)
+                    for cat in await asyncio.to_thread(
+                        db.get_categories, supabase_client
+                    )
                     if cat["id"] == category_id
                 ),
                 categoria_texto_llama,
@@ -313,31 +422,34 @@ async def handle_initial_message(
         elif not category_id and not period_title:  # Se não teve filtro
             period_title = " (Todos os Gastos)"
 
-        if gastos_filtrados:
-            message = f"**Detalhes dos Gastos{period_title}:**\n\n"
-            total_sum = 0.0
-            gastos_filtrados_sorted = sorted(
-                gastos_filtrados, key=lambda x: x["date"], reverse=True
-            )
-
-            for gasto in gastos_filtrados_sorted:
-                valor_fmt = f"R${gasto['value']:.2f}"
-                data_fmt = gasto["date"].strftime("%Y-%m-%d")  # Formata para string
-                categoria_nome = gasto.get("categoria_nome", "Desconhecida")
-                forma_pagamento_nome = gasto.get(
-                    "forma_pagamento_nome", "Não Informado"
-                )
-                descricao = gasto.get("description", "Sem descrição")
-
-                message += f"• {valor_fmt} {descricao} ({categoria_nome} - {forma_pagamento_nome}) em {data_fmt}\n"
-                total_sum += gasto["value"]
-
-            message += f"\n**Total: R${total_sum:.2f}**"
-            await update.message.reply_text(message, parse_mode="Markdown")
-        else:
+        await send_expense_list(
+            update,
+            context,
+            period_title,
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            category_id=category_id,
+        )
+        return ConversationHandler.END
+    elif intencao == "buscar_gastos":
+        termo = parsed_info.get("termo")
+        if not termo:
             await update.message.reply_text(
-                f"Nenhum gasto encontrado{period_title} com os critérios fornecidos. 🤷‍♀️"
+                "🤔 Não consegui identificar o que buscar. Tente `/buscar [termo]`. 💡"
             )
+            return ConversationHandler.END
+
+        await send_search_results(
+            update,
+            context,
+            termo,
+            data_inicio=parsed_info.get("data_inicio"),
+            data_fim=parsed_info.get("data_fim"),
+        )
+        return ConversationHandler.END
+    elif intencao == "edicao_gasto":
+        if await send_edit_candidates(update, context, parsed_info):
+            return ASKING_EXPENSE_EDIT
         return ConversationHandler.END
     else:
         await update.message.reply_text(
@@ -1,12 +1,16 @@
+import asyncio
+
 from telegram import ReplyKeyboardRemove, Update, ReplyKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler
 
-from src.bot.handlers import ASKING_CONFIRMATION, ASKING_PAYMENT_METHOD
+from src.bot.handlers.states import ASKING_CONFIRMATION, ASKING_PAYMENT_METHOD
 from src.bot.handlers.aux import send_confirmation_message
 from src.core import db
 from src.utils.text_utils import to_camel_case
+from src.core.metrics import timed
 
 
+@timed("handler")
 async def handle_new_category_name(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> int:
@@ -28,10 +32,12 @@ async def handle_new_category_name(
     forma_pagamento_text = pending_transaction["forma_pagamento_text"]
     # descricao_gasto = pending_transaction["descricao_gasto"]
 
-    if db.add_category(supabase_client, new_category_name_input, monthly_limit=None):
+    if await asyncio.to_thread(
+        db.add_category, supabase_client, new_category_name_input, monthly_limit=None
+    ):
         new_category_name_camel_case = to_camel_case(new_category_name_input)
-        category_id = db.get_category_id_by_text(
-            supabase_client, new_category_name_camel_case
+        category_id = await asyncio.to_thread(
+            db.get_category_id_by_text, supabase_client, new_category_name_camel_case
         )
 
         if category_id:
@@ -44,7 +50,9 @@ async def handle_new_category_name(
             forma_pagamento_nome_real = None
             if forma_pagamento_text:
                 forma_pagamento_normalizada = to_camel_case(forma_pagamento_text)
-                formas_pagamento_db_info = db.get_payment_methods(supabase_client)
+                formas_pagamento_db_info = await asyncio.to_thread(
+                    db.get_payment_methods, supabase_client
+                )
                 for fp in formas_pagamento_db_info:
                     if fp["name"] == forma_pagamento_normalizada:
                         forma_pagamento_id = fp["id"]
@@ -52,7 +60,9 @@ async def handle_new_category_name(
                         break
 
             if not forma_pagamento_id:
-                formas_pagamento_disponiveis = db.get_payment_methods(supabase_client)
+                formas_pagamento_disponiveis = await asyncio.to_thread(
+                    db.get_payment_methods, supabase_client
+                )
                 keyboard_options = [[fp["name"]] for fp in formas_pagamento_disponiveis]
                 keyboard_options.append(["Outro / Não sei ❓"])
                 reply_markup = ReplyKeyboardMarkup(
@@ -1,12 +1,19 @@
+import asyncio
+
 from telegram import ReplyKeyboardRemove, Update
 from telegram.ext import ContextTypes, ConversationHandler
 
-from src.bot.handlers import ASKING_CONFIRMATION
+from src.bot.handlers.states import ASKING_CONFIRMATION
 from src.bot.handlers.aux import send_confirmation_message
 from src.core import db
 from src.utils.text_utils import to_camel_case
+from src.core.metrics import timed
+from src.core.log import get_logger
+
+logger = get_logger(__name__)
 
 
+@timed("handler")
 async def handle_payment_method(
     update: Update, context: ContextTypes.DEFAULT_TYPE
 ) -> int:
@@ -30,8 +37,8 @@ async def handle_payment_method(
     # descricao_gasto = pending_transaction["descricao_gasto"]
 
     final_payment_method_name = to_camel_case(user_response_payment)
-    forma_pagamento_id = db.get_payment_method_id_by_name(
-        supabase_client, final_payment_method_name
+    forma_pagamento_id = await asyncio.to_thread(
+        db.get_payment_method_id_by_name, supabase_client, final_payment_method_name
     )
 
     if not forma_pagamento_id:
@@ -42,14 +49,15 @@ async def handle_payment_method(
             "nao sei",
         ]:
             try:
-                response_add_fp = (
+                response_add_fp = await asyncio.to_thread(
                     supabase_client.table("payment_methods")
                     .insert({"name": final_payment_method_name})
-                    .execute()
+                    .execute
                 )
                 if response_add_fp.data:
                     # Supabase `insert` retorna uma lista de dicionários, pegue o ID do primeiro elemento
                     forma_pagamento_id = response_add_fp.data[0]["id"]
+                    db.reference_data.invalidate(supabase_client)
                     await update.message.reply_text(
                         f"✨ Forma de pagamento '{final_payment_method_name}' adicionada para uso futuro! 💳",
                         reply_markup=ReplyKeyboardRemove(),
@@ -60,15 +68,15 @@ async def handle_payment_method(
                         reply_markup=ReplyKeyboardRemove(),
                     )
             except Exception as e:
-                print(f"Erro ao adicionar nova forma de pagamento: {e}")
+                logger.error("Erro ao adicionar nova forma de pagamento: %s", e)
                 await update.message.reply_text(
                     "⚠️ Erro ao adicionar nova forma de pagamento. Usando 'Não Informado'. 😕",
                     reply_markup=ReplyKeyboardRemove(),
                 )
 
         if not forma_pagamento_id:
-            forma_pagamento_id = db.get_payment_method_id_by_name(
-                supabase_client, "NaoInformado"
+            forma_pagamento_id = await asyncio.to_thread(
+                db.get_payment_method_id_by_name, supabase_client, "NaoInformado"
             )
             final_payment_method_name = (
                 "Não Informado" if forma_pagamento_id else "Desconhecido"
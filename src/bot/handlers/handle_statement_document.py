@@ -0,0 +1,127 @@
+import asyncio
+import os
+import tempfile
+from typing import Any, Dict, Tuple
+from telegram import Update, ReplyKeyboardMarkup
+from telegram.ext import ContextTypes, ConversationHandler
+
+from src.bot.handlers.states import ASKING_IMPORT_CONFIRMATION
+from src.bot.handlers.aux import discard_pending_import
+from src.core import db
+from src.core.importer import (
+    LocalCategorizer,
+    iter_statement_transactions,
+    open_statement,
+    summarize_statement,
+)
+from src.core.metrics import timed
+from src.utils.money import format_money, to_cents
+
+# Limite de download de arquivos da Bot API do Telegram
+MAX_STATEMENT_SIZE = 20 * 1024 * 1024
+
+
+def _summarize_statement(
+    supabase_client: Any, path: str, file_name: str
+) -> Tuple[LocalCategorizer, Dict[str, Any]]:
+    """
+    Carrega o histórico do categorizador e resume o extrato salvo em `path`. Lê o
+    banco e o arquivo inteiro: roda fora do event loop (asyncio.to_thread).
+    """
+    categorizer = LocalCategorizer(
+        db.get_categories(supabase_client),
+        db.get_expense_descriptions(supabase_client),
+    )
+    with open_statement(path) as stream:
+        summary = summarize_statement(
+            iter_statement_transactions(stream, file_name), categorizer
+        )
+    return categorizer, summary
+
+
+@timed("handler")
+async def handle_statement_document(
+    update: Update, context: ContextTypes.DEFAULT_TYPE
+) -> int:
+    """Recebe um extrato CSV/OFX, categoriza localmente e pede confirmação da importação."""
+    supabase_client = context.bot_data["supabase_client"]
+    document = update.message.document
+    file_name = document.file_name or ""
+
+    if not file_name.lower().endswith((".csv", ".ofx")):
+        await update.message.reply_text(
+            "📄 Envie o extrato em formato .csv ou .ofx para importar seus lançamentos."
+        )
+        return ConversationHandler.END
+
+    if document.file_size and document.file_size > MAX_STATEMENT_SIZE:
+        await update.message.reply_text(
+            "⚠️ O arquivo é grande demais (máximo 20 MB). Divida o extrato em períodos menores."
+        )
+        return ConversationHandler.END
+
+    await update.message.reply_text("⏳ Lendo seu extrato, um momento...")
+
+    # O extrato vai para disco e é lido em streaming duas vezes (resumo e gravação),
+    # então nunca fica inteiro em memória.
+    fd, path = tempfile.mkstemp(suffix=os.path.splitext(file_name)[1])
+    os.close(fd)
+    # Até o pending_import guardar o caminho, o arquivo temporário é nosso: uma
+    # falha no download ou nas consultas não pode deixá-lo para trás
+    stored = False
+    try:
+        telegram_file = await document.get_file()
+        await telegram_file.download_to_drive(path)
+
+        categorizer, summary = await asyncio.to_thread(
+            _summarize_statement, supabase_client, path, file_name
+        )
+
+        if not summary["gastos"] and not summary["ganhos"]:
+            await update.message.reply_text(
+                "😕 Não encontrei lançamentos nesse arquivo. Verifique se o CSV tem colunas "
+                "de data, descrição e valor, ou se o OFX está completo."
+            )
+            return ConversationHandler.END
+
+        # Um extrato anterior ainda não confirmado é substituído por este
+        discard_pending_import(context)
+        context.user_data["pending_import"] = {
+            "path": path,
+            "file_name": file_name,
+            "file_unique_id": document.file_unique_id,
+            "categorizer": categorizer,
+        }
+        stored = True
+    finally:
+        if not stored:
+            os.remove(path)
+
+    top_categorias = summary["por_categoria"].most_common(8)
+    linhas_categorias = "\n".join(
+        f"• {nome}: {format_money(to_cents(total))}" for nome, total in top_categorias
+    )
+    outras = len(summary["por_categoria"]) - len(top_categorias)
+    if outras > 0:
+        linhas_categorias += f"\n• ... e mais {outras} categoria(s)"
+    sem_categoria_msg = (
+        f"\n⚠️ {summary['sem_categoria']} gasto(s) sem categoria serão ignorados "
+        "(crie a categoria 'Outros' para importá-los)."
+        if summary["sem_categoria"]
+        else ""
+    )
+
+    keyboard = [["Sim ✅", "Não ❌"]]
+    reply_markup = ReplyKeyboardMarkup(
+        keyboard, one_time_keyboard=True, resize_keyboard=True
+    )
+    await update.message.reply_text(
+        f"📄 *Extrato {file_name}* ({summary['data_inicio']} a {summary['data_fim']})\n\n"
+        f"💸 {summary['gastos']} gastos: *{format_money(to_cents(summary['total_gastos']))}*\n"
+        f"💰 {summary['ganhos']} ganhos: *{format_money(to_cents(summary['total_ganhos']))}*\n\n"
+        f"*Gastos por categoria:*\n{linhas_categorias or '—'}"
+        f"{sem_categoria_msg}\n\n*Importar tudo?* 🤔",
+        reply_markup=reply_markup,
+        parse_mode="Markdown",
+    )
+    return ASKING_IMPORT_CONFIRMATION
@@ -0,0 +1,9 @@
+# --- Estados da Conversa ---
+HANDLE_INITIAL_MESSAGE = 0
+ASKING_CATEGORY_CLARIFICATION = 1
+ASKING_NEW_CATEGORY_NAME = 2
+ASKING_PAYMENT_METHOD = 3
+ASKING_CONFIRMATION = 4
+ASKING_CORRECTION = 5
+ASKING_IMPORT_CONFIRMATION = 6
+ASKING_EXPENSE_EDIT = 7
@@ -0,0 +1,180 @@
+# src/bot/jobs.py
+import asyncio
+import datetime
+from telegram.error import RetryAfter, TelegramError
+from telegram.ext import Application, ContextTypes
+
+from src.config import (
+    DIGEST_SEND_INTERVAL,
+    REPLICA_RECONCILE_INTERVAL,
+    REPLICA_SYNC_INTERVAL,
+    WRITE_QUEUE_DRAIN_TIMEOUT,
+    WRITE_QUEUE_FLUSH_INTERVAL,
+    REPORT_JOB_HOUR,
+    REPORT_JOB_JITTER,
+)
+from src.core import reports
+from src.core.log import get_logger
+
+logger = get_logger(__name__)
+
+
+async def warm_reports_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Pré-renderiza os gráficos pesados fora do horário de pico."""
+    supabase_client = context.bot_data["supabase_client"]
+    cache = context.bot_data["chart_cache"]
+    ready = await asyncio.to_thread(reports.warm_chart_cache, supabase_client, cache)
+    logger.info("Cache de gráficos aquecido: %s gráfico(s) prontos.", ready)
+
+
+async def monthly_digest_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Envia o resumo do mês anterior aos chats inscritos, um de cada vez."""
+    subscriptions = context.bot_data.get("digest_subscriptions")
+    if not subscriptions:
+        return
+
+    supabase_client = context.bot_data["supabase_client"]
+    # O resumo é o mesmo para todos os chats: é calculado uma única vez
+    digest = await asyncio.to_thread(
+        reports.build_monthly_digest, supabase_client, reports.previous_month()
+    )
+    if not digest:
+        return
+
+    for chat_id in list(subscriptions):
+        try:
+            try:
+                await context.bot.send_message(chat_id=chat_id, text=digest)
+            except RetryAfter as e:
+                # Uma única nova tentativa após a espera pedida pelo Telegram; se
+                # também falhar, o chat é pulado e os demais continuam recebendo
+                await asyncio.sleep(e.retry_after)
+                await context.bot.send_message(chat_id=chat_id, text=digest)
+        except TelegramError as e:
+            logger.error("Erro ao enviar resumo mensal para o chat %s: %s", chat_id, e)
+        await asyncio.sleep(DIGEST_SEND_INTERVAL)
+
+
+def schedule_report_jobs(application: Application) -> None:
+    """
+    Agenda o aquecimento diário do cache de gráficos e o resumo mensal.
+    O jitter espalha o horário de execução para não concentrar chamadas ao Supabase.
+    """
+    job_queue = application.job_queue
+    if job_queue is None:
+        logger.warning(
+            "JobQueue indisponível (instale python-telegram-bot[job-queue]); relatórios agendados desativados."
+        )
+        return
+
+    job_queue.run_daily(
+        warm_reports_job,
+        time=datetime.time(hour=REPORT_JOB_HOUR),
+        name="warm_reports",
+        job_kwargs={"jitter": REPORT_JOB_JITTER},
+    )
+    job_queue.run_monthly(
+        monthly_digest_job,
+        when=datetime.time(hour=(REPORT_JOB_HOUR + 1) % 24),
+        day=1,
+        name="monthly_digest",
+        job_kwargs={"jitter": REPORT_JOB_JITTER},
+    )
+
+
+def _invalidate_derived_data(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Lançamentos de fora do bot: gráficos, totais e busca em cache ficaram velhos."""
+    context.bot_data["chart_cache"].invalidate()
+    context.bot_data["budget_tracker"].invalidate()
+    context.bot_data["search_index"].invalidate()
+
+
+async def replica_sync_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Traz para a réplica local as linhas gravadas no Supabase por outros clientes."""
+    supabase_client = context.bot_data["supabase_client"]
+    synced = await asyncio.to_thread(supabase_client.sync_all)
+    if synced:
+        _invalidate_derived_data(context)
+        logger.info("Réplica local: %s linha(s) nova(s) do Supabase.", synced)
+
+
+async def replica_reconcile_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Relê as tabelas para trazer edições e exclusões feitas fora do bot."""
+    supabase_client = context.bot_data["supabase_client"]
+    try:
+        changed = await asyncio.to_thread(supabase_client.reconcile_all)
+    except Exception as e:
+        logger.error("Erro ao reconciliar a réplica local: %s", e)
+        return
+    if changed:
+        _invalidate_derived_data(context)
+        logger.info(
+            "Réplica local: %s linha(s) editada(s) ou excluída(s) fora do bot.", changed
+        )
+
+
+def schedule_replica_sync(application: Application) -> None:
+    """Agenda a sincronização periódica da réplica local (DB_REPLICA_PATH)."""
+    job_queue = application.job_queue
+    if job_queue is None:
+        logger.warning(
+            "JobQueue indisponível; a réplica local só é sincronizada na inicialização."
+        )
+        return
+
+    job_queue.run_repeating(
+        replica_sync_job,
+        interval=REPLICA_SYNC_INTERVAL,
+        first=REPLICA_SYNC_INTERVAL,
+        name="replica_sync",
+    )
+    if REPLICA_RECONCILE_INTERVAL:
+        job_queue.run_repeating(
+            replica_reconcile_job,
+            interval=REPLICA_RECONCILE_INTERVAL,
+            first=REPLICA_RECONCILE_INTERVAL,
+            name="replica_reconcile",
+        )
+
+
+async def write_queue_flush_job(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Envia ao Supabase o próximo lote da fila local de gastos."""
+    write_queue = context.bot_data["write_queue"]
+    result = await asyncio.to_thread(
+        write_queue.flush, context.bot_data["supabase_client"]
+    )
+    if result["flushed"]:
+        # Gráficos renderizados antes do flush não incluem esses gastos
+        context.bot_data["chart_cache"].invalidate()
+        # Só agora os gastos têm id no banco e podem ser editados pela busca
+        context.bot_data["search_index"].add(result["rows"])
+
+
+async def drain_write_queue(application: Application) -> None:
+    """post_shutdown: tenta esvaziar a fila antes de o processo terminar."""
+    write_queue = application.bot_data.get("write_queue")
+    if write_queue is None:
+        return
+    await asyncio.to_thread(
+        write_queue.drain,
+        application.bot_data["supabase_client"],
+        WRITE_QUEUE_DRAIN_TIMEOUT,
+    )
+    write_queue.close()
+
+
+def schedule_write_queue_flush(application: Application) -> None:
+    """Agenda o envio periódico da fila local de gastos (WRITE_QUEUE_PATH)."""
+    job_queue = application.job_queue
+    if job_queue is None:
+        logger.warning(
+            "JobQueue indisponível; a fila de gastos só é enviada ao desligar o bot."
+        )
+        return
+
+    job_queue.run_repeating(
+        write_queue_flush_job,
+        interval=WRITE_QUEUE_FLUSH_INTERVAL,
+        first=0,
+        name="write_queue_flush",
+    )
@@ -6,13 +6,125 @@ load_dotenv()
 
 # Configurações do Telegram
 TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
+# Conversas sem resposta por CONVERSATION_TIMEOUT segundos são encerradas e o que
+# ficou pendente (ex: extrato aguardando confirmação) é descartado. 0 desativa
+CONVERSATION_TIMEOUT = int(os.getenv("CONVERSATION_TIMEOUT", "900"))
 
 # Configurações do Supabase
 SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_KEY = os.getenv("SUPABASE_KEY")
+# Máximo de linhas que o PostgREST devolve por requisição (max-rows; 1000 no
+# Supabase). Páginas maiores seriam cortadas em silêncio pelo servidor
+SUPABASE_MAX_ROWS = int(os.getenv("SUPABASE_MAX_ROWS", "1000"))
 
 # Configurações do Ollama (Llama local) - REVERTIDAS
 
 # Configurações do Gemini API
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")  # <-- Carrega a chave Gemini
 GEMINI_MODEL = "gemini-1.5-flash"  # <-- Define o modelo Gemini a ser usado
+
+# Alertas de orçamento: frações do limite mensal da categoria que disparam aviso
+BUDGET_ALERT_THRESHOLDS = [
+    float(t)
+    for t in os.getenv("BUDGET_ALERT_THRESHOLDS", "0.8,1.0").split(",")
+    if t.strip()
+]
+
+# Relatórios agendados: hora (0-23) de pré-cálculo fora do pico, jitter em segundos
+# e chats que recebem o resumo mensal (IDs separados por vírgula)
+REPORT_JOB_HOUR = int(os.getenv("REPORT_JOB_HOUR", "4"))
+REPORT_JOB_JITTER = int(os.getenv("REPORT_JOB_JITTER", "900"))
+REPORT_CACHE_TTL = int(os.getenv("REPORT_CACHE_TTL", "86400"))
+DIGEST_CHAT_IDS = [
+    int(chat_id)
+    for chat_id in os.getenv("DIGEST_CHAT_IDS", "").split(",")
+    if chat_id.strip()
+]
+# Arquivo JSON onde ficam os chats inscritos pelo /resumo_mensal, para que as
+# inscrições sobrevivam a reinícios (use o mesmo diretório da réplica e da fila).
+# Se o arquivo ainda não existe, começa com DIGEST_CHAT_IDS; sem ele definido as
+# inscrições ficam só em memória
+DIGEST_SUBSCRIPTIONS_PATH = os.getenv("DIGEST_SUBSCRIPTIONS_PATH", "")
+# Intervalo mínimo (segundos) entre mensagens do resumo, para respeitar a cota do Telegram
+DIGEST_SEND_INTERVAL = float(os.getenv("DIGEST_SEND_INTERVAL", "0.5"))
+
+# Endpoint /metrics (formato Prometheus). Desativado se METRICS_PORT não for definido.
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT")) if os.getenv("METRICS_PORT") else None
+
+# Logging: nível, formato ("json" ou "text"), fração de requisições com payloads de
+# depuração (respostas brutas do Gemini, mensagens) e chats sempre depurados
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_DEBUG_SAMPLE_RATE = float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "0"))
+LOG_DEBUG_CHAT_IDS = [
+    int(chat_id)
+    for chat_id in os.getenv("LOG_DEBUG_CHAT_IDS", "").split(",")
+    if chat_id.strip()
+]
+
+# Profiling por update: fração de updates perfilados, chats sempre perfilados e
+# diretório onde os stacks (formato "collapsed", para flame graphs) são gravados
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_CHAT_IDS = [
+    int(chat_id)
+    for chat_id in os.getenv("PROFILE_CHAT_IDS", "").split(",")
+    if chat_id.strip()
+]
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+
+# Gravação/replay das chamadas ao Gemini: "off", "record" (grava prompt -> resposta)
+# ou "replay" (responde com as gravações, sem rede). A escala multiplica a latência
+# gravada no replay (0 responde na hora)
+LLM_FIXTURE_MODE = os.getenv("LLM_FIXTURE_MODE", "off").lower()
+LLM_FIXTURE_PATH = os.getenv("LLM_FIXTURE_PATH", "fixtures/llm_prompts.jsonl")
+LLM_REPLAY_LATENCY_SCALE = float(os.getenv("LLM_REPLAY_LATENCY_SCALE", "1.0"))
+
+# Banco: "supabase" (padrão), "sqlite" (arquivo em DB_SQLITE_PATH) ou "memory"
+# (não persiste; para desenvolvimento local)
+DB_BACKEND = os.getenv("DB_BACKEND", "supabase").lower()
+DB_SQLITE_PATH = os.getenv("DB_SQLITE_PATH", "bot_gastos.db")
+
+# Réplica local (SQLite) do Supabase para leituras: ativada quando DB_REPLICA_PATH é
+# definido. Sincroniza a cada REPLICA_SYNC_INTERVAL segundos pela coluna de marca
+# d'água (use "updated_at" se as tabelas tiverem essa coluna, para trazer edições)
+DB_REPLICA_PATH = os.getenv("DB_REPLICA_PATH", "")
+REPLICA_SYNC_INTERVAL = int(os.getenv("REPLICA_SYNC_INTERVAL", "60"))
+REPLICA_WATERMARK_COLUMN = os.getenv("REPLICA_WATERMARK_COLUMN", "created_at")
+REPLICA_SYNC_OVERLAP = int(os.getenv("REPLICA_SYNC_OVERLAP", "300"))
+# A cada REPLICA_RECONCILE_INTERVAL segundos a réplica relê as tabelas inteiras,
+# trazendo edições e exclusões feitas fora do bot mesmo sem "updated_at". 0 desativa
+REPLICA_RECONCILE_INTERVAL = int(os.getenv("REPLICA_RECONCILE_INTERVAL", "3600"))
+
+# Categorias e formas de pagamento em cache (segundos): os gastos são lidos só com as
+# chaves estrangeiras e os nomes resolvidos localmente. Gravações feitas pelo bot
+# invalidam o cache na hora; o TTL cobre edições feitas fora dele
+REFERENCE_CACHE_TTL = int(os.getenv("REFERENCE_CACHE_TTL", "300"))
+
+# Busca por descrição (/buscar): índice invertido local, montado na primeira busca e
+# atualizado a cada gasto gravado pelo bot. É remontado após SEARCH_INDEX_TTL
+# segundos para incluir gastos gravados fora do bot
+SEARCH_INDEX_TTL = int(os.getenv("SEARCH_INDEX_TTL", "3600"))
+
+# Fila local de gastos (write-behind): com WRITE_QUEUE_PATH definido, gastos
+# confirmados são gravados num SQLite local e enviados ao Supabase em lotes a cada
+# WRITE_QUEUE_FLUSH_INTERVAL segundos, com backoff exponencial entre
+# WRITE_QUEUE_RETRY_BASE e WRITE_QUEUE_RETRY_MAX segundos quando falham
+WRITE_QUEUE_PATH = os.getenv("WRITE_QUEUE_PATH", "")
+WRITE_QUEUE_FLUSH_INTERVAL = float(os.getenv("WRITE_QUEUE_FLUSH_INTERVAL", "2"))
+WRITE_QUEUE_BATCH_SIZE = int(os.getenv("WRITE_QUEUE_BATCH_SIZE", "100"))
+WRITE_QUEUE_RETRY_BASE = float(os.getenv("WRITE_QUEUE_RETRY_BASE", "1"))
+WRITE_QUEUE_RETRY_MAX = float(os.getenv("WRITE_QUEUE_RETRY_MAX", "300"))
+# Tempo máximo para esvaziar a fila ao desligar o bot
+WRITE_QUEUE_DRAIN_TIMEOUT = float(os.getenv("WRITE_QUEUE_DRAIN_TIMEOUT", "30"))
+
+# Resiliência das chamadas ao Supabase e ao Gemini: timeout (orçamento de latência,
+# em segundos, incluindo os retries), tentativas com espera exponencial e disjuntor
+# que abre após BREAKER_FAILURE_THRESHOLD falhas seguidas por BREAKER_RESET_TIMEOUT s
+SUPABASE_TIMEOUT = float(os.getenv("SUPABASE_TIMEOUT", "10"))
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "30"))
+RETRY_ATTEMPTS = int(os.getenv("RETRY_ATTEMPTS", "3"))
+RETRY_BASE_DELAY = float(os.getenv("RETRY_BASE_DELAY", "0.2"))
+RETRY_MAX_DELAY = float(os.getenv("RETRY_MAX_DELAY", "2"))
+BREAKER_FAILURE_THRESHOLD = int(os.getenv("BREAKER_FAILURE_THRESHOLD", "5"))
+BREAKER_RESET_TIMEOUT = float(os.getenv("BREAKER_RESET_TIMEOUT", "30"))
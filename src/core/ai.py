@@ -1,6 +1,7 @@
 # src/core/ai.py
 import json
 import datetime
+import time
 from typing import Dict, Any, Union, List
 from supabase import Client  # Para tipagem
 
@@ -10,6 +11,11 @@ from google.generativeai.types import HarmCategory, HarmBlockThreshold
 
 # Importa as configurações do Gemini do seu config.py
 from src.config import GOOGLE_API_KEY, GEMINI_MODEL
+from src.core import llm_fixtures, metrics, profiling, resilience
+from src.core.log import get_logger, trace
+from src.utils.money import from_cents, parse_money
+
+logger = get_logger(__name__)
 
 # Configura a API do Gemini com sua chave
 genai.configure(api_key=GOOGLE_API_KEY)
@@ -24,28 +30,73 @@ safety_settings = {
 
 
 # Função que agora se comunica com o Gemini
-def ask_llama(prompt: str, model: str = GEMINI_MODEL) -> str:
-    """Envia um prompt para o modelo Gemini."""
+def ask_llama(
+    prompt: str, model: str = GEMINI_MODEL, prompt_type: str = "geral"
+) -> str:
+    """
+    Envia um prompt para o modelo Gemini. O prompt_type rotula a latência e os
+    erros nas métricas (ex: 'transacao', 'sugestao_categoria', 'correcao').
+    Com LLM_FIXTURE_MODE=record as respostas são gravadas; com replay, servidas
+    das gravações sem chamar o Gemini. Falhas passageiras são repetidas com backoff
+    e, se persistirem, sobem como DependencyUnavailableError; erros permanentes e
+    gravações ausentes (MissingFixtureError) também sobem. Nenhuma falha vira
+    texto, que quem chama leria como resposta do modelo. Uma resposta vazia ou
+    bloqueada retorna "".
+    """
+    fixtures = llm_fixtures.get_fixtures()
+    start = time.perf_counter()
+    error = False
     try:
+        if fixtures.replaying:
+            return fixtures.replay(prompt, model)
+
         model_instance = genai.GenerativeModel(
             model_name=model, safety_settings=safety_settings
         )
-        response = model_instance.generate_content(prompt)
+        response = resilience.call(
+            "gemini",
+            model_instance.generate_content,
+            prompt,
+            request_options={"timeout": resilience.POLICIES["gemini"].attempt_timeout},
+        )
 
         # O Gemini pode retornar um erro se a resposta for bloqueada ou vazia
         if not response.parts:  # Verifica se há partes na resposta
-            print(f"DEBUG Gemini: Resposta vazia ou bloqueada. Raw: {response}")
-            return "Modelo de IA retornou uma resposta vazia ou bloqueada."
+            error = True
+            logger.warning(
+                "Gemini retornou resposta vazia ou bloqueada",
+                extra={"prompt_type": prompt_type},
+            )
+            trace(logger, "Resposta bloqueada do Gemini", response=str(response))
+            return ""
 
-        return response.text.strip()
+        text = response.text.strip()
+        if fixtures.recording:
+            fixtures.record(
+                prompt, model, prompt_type, text, time.perf_counter() - start
+            )
+        return text
+    except resilience.DependencyUnavailableError as e:
+        error = True
+        logger.error("Gemini indisponível: %s", e, extra={"prompt_type": prompt_type})
+        raise
+    except llm_fixtures.MissingFixtureError as e:
+        error = True
+        logger.warning("%s", e, extra={"prompt_type": prompt_type})
+        raise
     except Exception as e:
-        print(f"Erro ao conectar com Gemini: {e}")
-        # Se for um erro 404 de modelo, pode sugerir verificar o nome do modelo
-        if "404" in str(e):
-            return "Desculpe, o modelo de IA especificado não foi encontrado ou está indisponível. Verifique o nome do modelo."
-        return "Desculpe, não consegui processar sua requisição agora. O modelo de IA está offline ou indisponível."
+        error = True
+        logger.error(
+            "Erro ao conectar com Gemini: %s", e, extra={"prompt_type": prompt_type}
+        )
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        metrics.observe("llm", prompt_type, elapsed, error)
+        profiling.record(f"llm:{prompt_type}", elapsed)
 
 
+@metrics.timed("ai")
 def extract_transaction_info(
     text: str, supabase_client: Client
 ) -> Union[Dict[str, Any], None]:
@@ -80,8 +131,11 @@ def extract_transaction_info(
 
         existing_categories_data = get_categories(supabase_client)
         existing_category_names = [cat["name"] for cat in existing_categories_data]
+    except resilience.DependencyUnavailableError:
+        # Supabase fora do ar: não adianta gastar uma chamada ao Gemini
+        raise
     except Exception as e:
-        print(f"Erro ao obter categorias para o prompt do Gemini: {e}")
+        logger.error("Erro ao obter categorias para o prompt do Gemini: %s", e)
         existing_category_names = [
             "Alimentacao",
             "Transporte",
@@ -100,6 +154,7 @@ def extract_transaction_info(
 
     Identifique a intenção:
     - Registrar um gasto
+    - Registrar vários gastos de uma vez (lista de gastos na mesma mensagem)
     - Registrar um ganho
     - Adicionar uma nova categoria de gasto
     - Mostrar o gráfico de balanço (ganhos vs. gastos)
@@ -107,9 +162,12 @@ def extract_transaction_info(
     - Mostrar o gráfico de gastos por forma de pagamento (com ou sem filtros)
     - Mostrar o gráfico de gastos mensais por categoria e forma de pagamento (combinado)
     - Editar um gasto existente
+    - Buscar gastos pela descrição (um estabelecimento, serviço ou item, ex: Uber, Avatim, farmácia)
 
     Formato JSON:
     - Para "gasto": {{"intencao": "gasto", "valor": float, "categoria": "...", "data": "AAAA-MM-DD", "forma_pagamento": "..." (ou null), "descricao_gasto": "..."}}
+    - Para "gastos_multiplos": {{"intencao": "gastos_multiplos", "transacoes": [{{"valor": float, "categoria": "...", "data": "AAAA-MM-DD", "forma_pagamento": "..." (ou null), "descricao_gasto": "..."}}, ...]}}
+        (Use quando a mensagem listar DOIS OU MAIS gastos; cada item segue as mesmas regras de um "gasto")
     - Para "ganho": {{"intencao": "ganho", "valor": float, "descricao": "...", "data": "AAAA-MM-DD"}}
     - Para "adicionar_categoria": {{"intencao": "adicionar_categoria", "categoria_nome": "...", "monthly_limit": float ou null}}
     - Para mostrar gráficos:
@@ -120,6 +178,8 @@ def extract_transaction_info(
     - Para "edicao_gasto": {{"intencao": "edicao_gasto", "valor": float (ou null), "categoria": "..." (ou null), "data": "AAAA-MM-DD" (ou null), "descricao_gasto": "..." (ou null)}}
         (Extraia o máximo de informações para identificar o gasto a ser editado)
     - Para "listar_gastos_detalhados": {{"intencao": "listar_gastos_detalhados", "categoria": "..." (ou null), "data_inicio": "AAAA-MM-DD" (ou null), "data_fim": "AAAA-MM-DD" (ou null)}} 
+    - Para "buscar_gastos": {{"intencao": "buscar_gastos", "termo": "...", "data_inicio": "AAAA-MM-DD" (ou null), "data_fim": "AAAA-MM-DD" (ou null)}}
+        (Use quando o usuário perguntar por um termo que aparece na descrição dos gastos, e não por uma categoria)
 
 
     Detalhes de extração:
@@ -147,6 +207,10 @@ def extract_transaction_info(
     Usuário: gastei 18,10 com 99 no crédito
     Resposta: {{"intencao": "gasto", "valor": 18.10, "categoria": "Transporte", "data": "{today_str}", "forma_pagamento": "crédito", "descricao_gasto": "Corrida 99"}}
 
+    Exemplos de Vários Gastos:
+    Usuário: mercado 120, uber 25 ontem, farmácia 40 pix
+    Resposta: {{"intencao": "gastos_multiplos", "transacoes": [{{"valor": 120.0, "categoria": "Alimentacao", "data": "{today_str}", "forma_pagamento": null, "descricao_gasto": "Mercado"}}, {{"valor": 25.0, "categoria": "Transporte", "data": "{yesterday_str}", "forma_pagamento": null, "descricao_gasto": "Uber"}}, {{"valor": 40.0, "categoria": "Saude", "data": "{today_str}", "forma_pagamento": "pix", "descricao_gasto": "Farmácia"}}]}}
+
    Exemplos de Mostrar Gráficos:
     Usuário: mostre meu balanço
     Resposta: {{"intencao": "mostrar_balanco", "data_inicio": null, "data_fim": null}}
@@ -176,14 +240,37 @@ def extract_transaction_info(
     Usuário: quais foram meus gastos com alimentação
     Resposta: {{"intencao": "listar_gastos_detalhados", "categoria": "Alimentacao", "data_inicio": null, "data_fim": null}}
 
+   Exemplos de Buscar Gastos pela Descrição:
+    Usuário: quanto gastei com Uber?
+    Resposta: {{"intencao": "buscar_gastos", "termo": "Uber", "data_inicio": null, "data_fim": null}}
+
+    Usuário: liste gastos da Avatim
+    Resposta: {{"intencao": "buscar_gastos", "termo": "Avatim", "data_inicio": null, "data_fim": null}}
+
+    Usuário: quanto gastei na farmácia no mês passado
+    Resposta: {{"intencao": "buscar_gastos", "termo": "farmácia", "data_inicio": "{last_month_start_str}", "data_fim": "{last_month_end_str}"}}
+
     ---
     Mensagem do Usuário: {text}
     ---
     JSON de Saída:
     """
-    response_text = ask_llama(prompt)  # ask_llama chama Gemini agora
-    print(f"DEBUG Gemini response raw: {response_text}")
+    response_text = ask_llama(prompt, prompt_type="transacao")
+    trace(
+        logger,
+        "Resposta bruta do Gemini",
+        prompt_type="transacao",
+        response=response_text,
+    )
+
+    return parse_transaction_response(response_text)
 
+
+def parse_transaction_response(response_text: str) -> Union[Dict[str, Any], None]:
+    """
+    Extrai o objeto JSON da resposta do Gemini ao prompt de transação. Separado de
+    extract_transaction_info para poder ser medido e testado com respostas gravadas.
+    """
     try:
         json_start = response_text.find("{")
         json_end = response_text.rfind("}")
@@ -199,20 +286,36 @@ def extract_transaction_info(
             )
 
             data = json.loads(json_str)
-            for key in ["value", "monthly_limit"]:
-                if key in data and isinstance(data[key], str):
-                    try:
-                        data[key] = float(data[key].replace(",", "."))
-                    except ValueError:
-                        data[key] = None
+            if not isinstance(data, dict):
+                raise ValueError(f"resposta não é um objeto JSON: {type(data)!r}")
+            transacoes = data.get("transacoes")
+            if transacoes is not None:
+                if not isinstance(transacoes, list):
+                    raise ValueError(
+                        f"'transacoes' não é uma lista: {type(transacoes)!r}"
+                    )
+                # Itens que não são objetos ("uber 20") não têm valor nem categoria
+                data["transacoes"] = [t for t in transacoes if isinstance(t, dict)]
+                if len(data["transacoes"]) < len(transacoes):
+                    logger.warning(
+                        "Ignorando %s item(ns) de 'transacoes' que não são objetos",
+                        len(transacoes) - len(data["transacoes"]),
+                    )
+            # Valores em texto ("25,90") ou float com ruído (18.099999) viram
+            # reais arredondados no centavo; o que não for valor vira None
+            for item in [data, *(data.get("transacoes") or [])]:
+                for key in ["valor", "value", "monthly_limit"]:
+                    if item.get(key) is not None:
+                        cents = parse_money(item[key])
+                        item[key] = None if cents is None else from_cents(cents)
             return data
     except ValueError as e:
-        print(
-            f"Erro ao decodificar JSON ou converter valor do Gemini: {e}. Resposta bruta: {response_text}"
-        )
+        logger.error("Erro ao decodificar JSON ou converter valor do Gemini: %s", e)
+        trace(logger, "Resposta bruta inválida do Gemini", response=response_text)
     return None
 
 
+@metrics.timed("ai")
 def suggest_category_from_llama(
     text_from_llama: str, existing_categories: List[str]
 ) -> Union[str, None]:
@@ -248,8 +351,13 @@ def suggest_category_from_llama(
     Lista de Categorias: {categories_str}
     Resposta:
     """
-    response = ask_llama(prompt)  # ask_llama chama Gemini
-    print(f"DEBUG Gemini suggestion response raw: {response}")
+    response = ask_llama(prompt, prompt_type="sugestao_categoria")
+    trace(
+        logger,
+        "Resposta bruta do Gemini",
+        prompt_type="sugestao_categoria",
+        response=response,
+    )
     cleaned_response = response.strip()
 
     if cleaned_response != "NENHUMA" and cleaned_response in existing_categories:
@@ -258,6 +366,7 @@ def suggest_category_from_llama(
     return None
 
 
+@metrics.timed("ai")
 def extract_correction_from_llama(text: str) -> Union[Dict[str, Any], None]:
     """
     Pede ao Gemini para extrair o campo e o novo valor de uma mensagem de correção.
@@ -292,8 +401,13 @@ def extract_correction_from_llama(text: str) -> Union[Dict[str, Any], None]:
     ---
     JSON de Saída:
     """
-    response_text = ask_llama(prompt)  # ask_llama chama Gemini
-    print(f"DEBUG Gemini correction raw: {response_text}")
+    response_text = ask_llama(prompt, prompt_type="correcao")
+    trace(
+        logger,
+        "Resposta bruta do Gemini",
+        prompt_type="correcao",
+        response=response_text,
+    )
 
     try:
         json_start = response_text.find("{")
@@ -311,13 +425,11 @@ def extract_correction_from_llama(text: str) -> Union[Dict[str, Any], None]:
             if data.get("campo", "").lower() == "valor" and isinstance(
                 data.get("novo_valor"), str
             ):
-                try:
-                    data["novo_valor"] = float(data["novo_valor"].replace(",", "."))
-                except ValueError:
-                    pass
+                cents = parse_money(data["novo_valor"])
+                if cents is not None:
+                    data["novo_valor"] = from_cents(cents)
             return data
     except ValueError as e:
-        print(
-            f"Erro ao decodificar JSON de correção do Gemini: {e}. Resposta bruta: {response_text}"
-        )
+        logger.error("Erro ao decodificar JSON de correção do Gemini: %s", e)
+        trace(logger, "Resposta bruta inválida do Gemini", response=response_text)
     return None
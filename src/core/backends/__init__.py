@@ -0,0 +1,62 @@
+# src/core/backends/__init__.py
+"""
+Backends de banco intercambiáveis. Todos expõem a mesma interface usada por
+db.py, charts.py e export.py: `client.table(nome)` devolvendo o query builder do
+postgrest (select/filtros/order/limit/insert/upsert/update/delete + execute()).
+
+- "supabase": o cliente oficial (padrão)
+- "sqlite": arquivo local (ou ":memory:"), com índices por data, categoria e forma
+  de pagamento
+- "memory": listas em memória com os mesmos índices; não persiste nada
+
+Com o Supabase, `replica_path` liga a réplica local de leitura (ReplicaClient).
+"""
+
+from typing import Any
+
+from src.core.log import get_logger
+
+from .memory import MemoryBackend
+from .query import Query
+from .replica import ReplicaClient
+from .sqlite import SQLiteBackend
+
+logger = get_logger(__name__)
+
+BACKENDS = ("supabase", "sqlite", "memory")
+
+
+def create_backend(
+    kind: str = "supabase", sqlite_path: str = ":memory:", replica_path: str = ""
+) -> Any:
+    """
+    Cria o cliente de banco do tipo pedido (ver DB_BACKEND em config.py). Com a
+    réplica ligada, faz a sincronização inicial antes de devolver o cliente.
+    """
+    if kind == "supabase":
+        from src.core.db import get_supabase_client
+
+        if not replica_path:
+            return get_supabase_client()
+        replica = ReplicaClient(
+            get_supabase_client(),
+            SQLiteBackend(replica_path, enforce_foreign_keys=False),
+        )
+        logger.info("Sincronizando réplica local em %s...", replica_path)
+        logger.info("Réplica sincronizada: %s linha(s).", replica.sync_all())
+        return replica
+    if kind == "sqlite":
+        return SQLiteBackend(sqlite_path)
+    if kind == "memory":
+        return MemoryBackend()
+    raise ValueError(f"Backend desconhecido: {kind} (use um de {', '.join(BACKENDS)})")
+
+
+__all__ = [
+    "BACKENDS",
+    "MemoryBackend",
+    "Query",
+    "ReplicaClient",
+    "SQLiteBackend",
+    "create_backend",
+]
@@ -0,0 +1,271 @@
+# src/core/backends/memory.py
+import bisect
+import datetime
+import threading
+import uuid
+from typing import Any, Dict, List, Tuple, Union
+
+from src.core.backends.query import (
+    EMBEDDED_RESOURCES,
+    Query,
+    parse_aggregates,
+    parse_columns,
+)
+
+# Colunas com índice hash (igualdade) e coluna com índice ordenado (intervalos)
+HASH_INDEXES = {
+    "expenses": ("category_id", "payment_method_id", "idempotency_key"),
+    "ganhos": ("idempotency_key",),
+    "categories": ("name",),
+    "payment_methods": ("name",),
+}
+SORTED_INDEXES = {"expenses": "date", "ganhos": "date"}
+_RANGE_OPS = ("lt", "lte", "gt", "gte")
+
+
+def _coerce(current: Any, value: Any) -> Any:
+    """Valores de filtro podem chegar como texto (URL); converte para o tipo da coluna."""
+    if value == "null":
+        return None
+    if isinstance(value, str) and isinstance(current, (int, float)):
+        if not isinstance(current, bool):
+            try:
+                return float(value)
+            except ValueError:
+                return value
+    return value
+
+
+def matches(row: Dict[str, Any], condition: Tuple) -> bool:
+    """Avalia uma folha (coluna, operador, valor) ou um nó (modo, [condições])."""
+    if len(condition) == 2:
+        mode, conditions = condition
+        results = (matches(row, cond) for cond in conditions)
+        return any(results) if mode == "or" else all(results)
+    column, op, value = condition
+    current = row.get(column)
+    value = _coerce(current, value)
+    if op == "eq":
+        return current == value
+    if op == "neq":
+        return current != value
+    if op == "is":
+        return current is None if value is None else current == value
+    if current is None or value is None:
+        return False
+    if op == "lt":
+        return current < value
+    if op == "lte":
+        return current <= value
+    if op == "gt":
+        return current > value
+    if op == "gte":
+        return current >= value
+    raise ValueError(f"Operador não suportado: {op}")
+
+
+class _TableIndex:
+    """Índices de uma tabela: id, hash por coluna e lista ordenada por data."""
+
+    def __init__(self, table: str, rows: List[Dict[str, Any]]):
+        self.by_id: Dict[Any, Dict[str, Any]] = {}
+        self.hash_columns = HASH_INDEXES.get(table, ())
+        self.hashes: Dict[str, Dict[Any, List[Dict[str, Any]]]] = {
+            column: {} for column in self.hash_columns
+        }
+        self.sorted_column = SORTED_INDEXES.get(table)
+        self.sorted_keys: List[Any] = []
+        self.sorted_rows: List[Dict[str, Any]] = []
+        if self.sorted_column:
+            ordered = sorted(
+                (row for row in rows if row.get(self.sorted_column) is not None),
+                key=lambda row: row[self.sorted_column],
+            )
+            self.sorted_keys = [row[self.sorted_column] for row in ordered]
+            self.sorted_rows = ordered
+        for row in rows:
+            self._add_hashes(row)
+
+    def _add_hashes(self, row: Dict[str, Any]) -> None:
+        self.by_id[row.get("id")] = row
+        for column in self.hash_columns:
+            self.hashes[column].setdefault(row.get(column), []).append(row)
+
+    def add(self, row: Dict[str, Any]) -> None:
+        self._add_hashes(row)
+        key = row.get(self.sorted_column) if self.sorted_column else None
+        if key is not None:
+            position = bisect.bisect_right(self.sorted_keys, key)
+            self.sorted_keys.insert(position, key)
+            self.sorted_rows.insert(position, row)
+
+    def candidates(
+        self, filters: List[Tuple], rows: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Linhas que podem satisfazer os filtros de nível superior: o menor balde
+        hash de uma igualdade indexada ou a faixa de datas via bisect. Sem filtro
+        indexável, a tabela inteira.
+        """
+        best: Union[List[Dict[str, Any]], None] = None
+        low, high = None, None
+        for condition in filters:
+            if len(condition) != 3:
+                continue
+            column, op, value = condition
+            if value is None or value == "null":
+                continue
+            if op == "eq" and column in self.hashes:
+                bucket = self.hashes[column].get(value, [])
+                if best is None or len(bucket) < len(best):
+                    best = bucket
+            elif op == "eq" and column == "id":
+                row = self.by_id.get(value)
+                best = [row] if row is not None else []
+            elif column == self.sorted_column and op in _RANGE_OPS + ("eq",):
+                if op in ("gt", "gte", "eq"):
+                    position = (
+                        bisect.bisect_right if op == "gt" else bisect.bisect_left
+                    )(self.sorted_keys, value)
+                    low = position if low is None else max(low, position)
+                if op in ("lt", "lte", "eq"):
+                    position = (
+                        bisect.bisect_left if op == "lt" else bisect.bisect_right
+                    )(self.sorted_keys, value)
+                    high = position if high is None else min(high, position)
+
+        if low is not None or high is not None:
+            date_range = self.sorted_rows[low or 0 : high]
+            if best is None or len(date_range) < len(best):
+                best = date_range
+        return rows if best is None else best
+
+
+class MemoryBackend:
+    """
+    Banco em memória com a interface de `supabase.Client.table(...)`, para testes,
+    benchmarks e desenvolvimento local. Cada execute() devolve dicionários novos,
+    como o parse do JSON da API real. Não persiste nada ao encerrar o processo.
+    """
+
+    def __init__(self, tables: Union[Dict[str, List[Dict[str, Any]]], None] = None):
+        self.tables: Dict[str, List[Dict[str, Any]]] = (
+            tables if tables is not None else {}
+        )
+        self._indexes: Dict[str, _TableIndex] = {}
+        self._lock = threading.RLock()
+
+    def table(self, name: str) -> Query:
+        return Query(self, name)
+
+    def index(self, table: str) -> _TableIndex:
+        if table not in self._indexes:
+            self._indexes[table] = _TableIndex(table, self.tables.get(table, []))
+        return self._indexes[table]
+
+    def invalidate_index(self, table: str) -> None:
+        self._indexes.pop(table, None)
+
+    def execute(self, query: Query) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = self.tables.setdefault(query.table, [])
+            if query.action == "select":
+                return self._select(query, rows)
+            return self._write(query, rows)
+
+    def _select(self, query: Query, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        candidates = self.index(query.table).candidates(query.filters, rows)
+        selected = [
+            row
+            for row in candidates
+            if all(matches(row, condition) for condition in query.filters)
+        ]
+        aggregates = parse_aggregates(query.columns)
+        if aggregates is not None:
+            return [
+                {
+                    function: (
+                        len(selected)
+                        if function == "count"
+                        else sum(row.get(column) or 0 for row in selected)
+                    )
+                    for column, function in aggregates
+                }
+            ]
+        # Ordenações estáveis aplicadas da última para a primeira
+        for column, desc in reversed(query.orders):
+            selected.sort(
+                key=lambda row: (row.get(column) is None, row.get(column)),
+                reverse=desc,
+            )
+        end = None if query.row_limit is None else query.row_offset + query.row_limit
+        selected = selected[query.row_offset : end]
+
+        plain, embeds = parse_columns(query.columns)
+        return [self._project(row, plain, embeds) for row in selected]
+
+    def _project(self, row: Dict[str, Any], plain, embeds) -> Dict[str, Any]:
+        if plain == ["*"] and not embeds:
+            return dict(row)
+        result = dict(row) if "*" in plain else {}
+        for column in plain:
+            if column != "*":
+                result[column] = row.get(column)
+        for name, columns in embeds.items():
+            fk, table = EMBEDDED_RESOURCES[name]
+            related = self.index(table).by_id.get(row.get(fk))
+            result[name] = (
+                {column: related.get(column) for column in columns} if related else None
+            )
+        return result
+
+    def _write(self, query: Query, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Aplica insert/upsert/update/delete e devolve as linhas afetadas."""
+
+        def matching(row: Dict[str, Any]) -> bool:
+            return all(matches(row, condition) for condition in query.filters)
+
+        if query.action in ("update", "delete"):
+            affected = [row for row in rows if matching(row)]
+            if query.action == "update":
+                for row in affected:
+                    row.update(query.values)
+            else:
+                rows[:] = [row for row in rows if not matching(row)]
+            self.invalidate_index(query.table)
+            return [dict(row) for row in affected]
+
+        index = self.index(query.table)
+        written = []
+        for payload_row in query.payload:
+            current = None
+            if query.action == "upsert":
+                conflict_value = payload_row.get(query.on_conflict)
+                if conflict_value is not None:
+                    current = next(
+                        (
+                            row
+                            for row in index.candidates(
+                                [(query.on_conflict, "eq", conflict_value)], rows
+                            )
+                            if row.get(query.on_conflict) == conflict_value
+                        ),
+                        None,
+                    )
+            if current is not None:
+                if not query.ignore_duplicates:
+                    current.update(payload_row)
+                    self.invalidate_index(query.table)
+                    index = self.index(query.table)
+                    written.append(dict(current))
+                continue
+            row = dict(payload_row)
+            # O Postgres gera o uuid da chave primária e o created_at
+            row.setdefault("id", str(uuid.uuid4()))
+            row.setdefault(
+                "created_at", datetime.datetime.now(datetime.timezone.utc).isoformat()
+            )
+            rows.append(row)
+            index.add(row)
+            written.append(dict(row))
+        return written
@@ -0,0 +1,181 @@
+# src/core/backends/query.py
+import re
+from types import SimpleNamespace
+from typing import Any, Dict, List, Tuple, Union
+
+# Recursos embutidos no select ("categories(name)") -> (coluna FK, tabela)
+EMBEDDED_RESOURCES = {
+    "categories": ("category_id", "categories"),
+    "payment_methods": ("payment_method_id", "payment_methods"),
+}
+
+_EMBED_RE = re.compile(r"(\w+)\(([^)]*)\)")
+
+
+def parse_columns(columns: str) -> Tuple[List[str], Dict[str, List[str]]]:
+    """Separa "a,b,categories(name)" em colunas simples e recursos embutidos."""
+    embeds = {
+        name: [c.strip() for c in cols.split(",")]
+        for name, cols in _EMBED_RE.findall(columns)
+    }
+    plain = [c.strip() for c in _EMBED_RE.sub("", columns).split(",") if c.strip()]
+    return plain, embeds
+
+
+_AGGREGATE_RE = re.compile(r"^(?:(\w+)\.)?(count|sum)\(\)$")
+
+
+def parse_aggregates(columns: str) -> Union[List[Tuple[Union[str, None], str]], None]:
+    """
+    Agregações do PostgREST ("count(),value.sum()") como [(coluna, função)];
+    None se a seleção não for só de agregações. O resultado é uma única linha
+    com as chaves "count" e "sum".
+    """
+    aggregates = []
+    for item in columns.split(","):
+        match = _AGGREGATE_RE.match(item.strip())
+        if not match:
+            return None
+        aggregates.append((match.group(1), match.group(2)))
+    return aggregates
+
+
+def _split_top_level(text: str) -> List[str]:
+    """Separa por vírgulas fora de parênteses."""
+    parts, depth, current = [], 0, ""
+    for char in text:
+        if char == "," and depth == 0:
+            parts.append(current)
+            current = ""
+            continue
+        depth += {"(": 1, ")": -1}.get(char, 0)
+        current += char
+    if current:
+        parts.append(current)
+    return parts
+
+
+def parse_logic(mode: str, expression: str) -> Tuple[str, List[Any]]:
+    """
+    Converte "a.lt.x,and(b.eq.y,c.lt.z)" na árvore (modo, [condições]);
+    folhas são (coluna, operador, valor).
+    """
+    conditions: List[Any] = []
+    for part in _split_top_level(expression):
+        part = part.strip()
+        name, _, rest = part.partition("(")
+        if name in ("and", "or") and rest.endswith(")"):
+            conditions.append(parse_logic(name, rest[:-1]))
+        else:
+            conditions.append(tuple(part.split(".", 2)))
+    return (mode, conditions)
+
+
+class Query:
+    """
+    Subconjunto do query builder do postgrest-py usado por db.py, charts.py e
+    export.py. Só acumula a consulta; quem executa é o backend (backend.execute).
+    Opções do postgrest-py que os backends locais não implementam (ex: `count`,
+    `returning`, `foreign_table`) não são aceitas, para não serem ignoradas.
+    """
+
+    def __init__(self, backend: Any, table: str):
+        self.backend = backend
+        self.table = table
+        self.columns = "*"
+        # Folhas (coluna, operador, valor) ou nós (modo, [condições]) de or_()
+        self.filters: List[Tuple] = []
+        self.orders: List[Tuple[str, bool]] = []
+        self.row_offset = 0
+        self.row_limit: Union[int, None] = None
+        self.action = "select"
+        self.payload: List[Dict[str, Any]] = []
+        self.values: Dict[str, Any] = {}
+        self.on_conflict = ""
+        self.ignore_duplicates = False
+
+    def select(self, *columns: str) -> "Query":
+        self.columns = ",".join(columns) or "*"
+        return self
+
+    def filter(self, column: str, operator: str, criteria: Any) -> "Query":
+        self.filters.append((column, operator, criteria))
+        return self
+
+    def eq(self, column: str, value: Any) -> "Query":
+        return self.filter(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "Query":
+        return self.filter(column, "neq", value)
+
+    def lt(self, column: str, value: Any) -> "Query":
+        return self.filter(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "Query":
+        return self.filter(column, "lte", value)
+
+    def gt(self, column: str, value: Any) -> "Query":
+        return self.filter(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "Query":
+        return self.filter(column, "gte", value)
+
+    def is_(self, column: str, value: Any) -> "Query":
+        return self.filter(column, "is", value)
+
+    def or_(self, filters: str) -> "Query":
+        """Aceita a sintaxe do PostgREST: "a.lt.x,and(b.eq.y,c.lt.z)"."""
+        filters = filters.strip()
+        if filters.startswith("(") and filters.endswith(")"):
+            filters = filters[1:-1]
+        self.filters.append(parse_logic("or", filters))
+        return self
+
+    def order(self, column: str, desc: bool = False) -> "Query":
+        self.orders.append((column, desc))
+        return self
+
+    def limit(self, size: int) -> "Query":
+        self.row_limit = size
+        return self
+
+    def offset(self, size: int) -> "Query":
+        self.row_offset = size
+        return self
+
+    def range(self, start: int, end: int) -> "Query":
+        self.row_offset = start
+        self.row_limit = end - start + 1
+        return self
+
+    def insert(self, rows: Any) -> "Query":
+        self.action = "insert"
+        self.payload = [
+            dict(row) for row in (rows if isinstance(rows, list) else [rows])
+        ]
+        return self
+
+    def upsert(
+        self,
+        rows: Any,
+        on_conflict: str = "",
+        ignore_duplicates: bool = False,
+    ) -> "Query":
+        self.insert(rows)
+        self.action = "upsert"
+        self.on_conflict = on_conflict or "id"
+        self.ignore_duplicates = ignore_duplicates
+        return self
+
+    def update(self, values: Dict[str, Any]) -> "Query":
+        self.action = "update"
+        self.values = dict(values)
+        return self
+
+    def delete(self) -> "Query":
+        self.action = "delete"
+        return self
+
+    def execute(self) -> SimpleNamespace:
+        """Mesmo formato da resposta do postgrest-py: `.data` com a lista de linhas."""
+        return SimpleNamespace(data=self.backend.execute(self), count=None)
@@ -0,0 +1,346 @@
+# src/core/backends/replica.py
+import datetime
+from typing import Any, Dict, List, Tuple, Union
+
+from src.config import (
+    REPLICA_SYNC_OVERLAP,
+    REPLICA_WATERMARK_COLUMN,
+    SUPABASE_MAX_ROWS,
+)
+from src.core.backends.query import Query
+from src.core.backends.sqlite import SQLiteBackend
+from src.core.log import get_logger
+
+logger = get_logger(__name__)
+
+# Ordem importa: categorias e formas de pagamento antes dos gastos que as referenciam
+REPLICATED_TABLES = ("categories", "payment_methods", "ganhos", "expenses")
+
+_STATE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS _replica_state (
+    table_name TEXT PRIMARY KEY,
+    watermark TEXT,
+    synced_at TEXT
+)
+"""
+
+
+def _render_condition(condition: Tuple) -> str:
+    """Converte uma condição do Query de volta para a sintaxe do PostgREST."""
+    if len(condition) == 2:
+        mode, conditions = condition
+        return f"{mode}({','.join(_render_condition(c) for c in conditions)})"
+    column, op, value = condition
+    if value is None:
+        return f"{column}.is.null"
+    return f"{column}.{op}.{value}"
+
+
+def _parse_moment(value: Any) -> Union[datetime.datetime, None]:
+    """Timestamp ISO do Supabase como datetime com fuso (UTC se não tiver)."""
+    try:
+        moment = datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.timezone.utc)
+    return moment
+
+
+class ReplicaClient:
+    """
+    Réplica local (SQLite) das tabelas do Supabase, com a mesma interface de
+    `supabase.Client.table(...)`. Leituras vão para o SQLite indexado; escritas vão
+    primeiro ao Supabase e as linhas devolvidas são aplicadas localmente
+    (write-through). sync() traz as linhas novas de outros clientes pela marca
+    d'água em `watermark_column`; reconcile_all() relê as tabelas inteiras para
+    trazer as edições e exclusões feitas fora do bot, que a marca d'água não vê.
+    """
+
+    def __init__(
+        self,
+        remote: Any,
+        local: SQLiteBackend,
+        watermark_column: str = REPLICA_WATERMARK_COLUMN,
+        page_size: int = SUPABASE_MAX_ROWS,
+        overlap_seconds: int = REPLICA_SYNC_OVERLAP,
+    ):
+        self.remote = remote
+        self.local = local
+        self.watermark_column = watermark_column
+        self.page_size = page_size
+        self.overlap_seconds = overlap_seconds
+        self.local.execute_sql(_STATE_SCHEMA)
+
+    @property
+    def ready(self) -> bool:
+        """True depois que todas as tabelas foram sincronizadas ao menos uma vez."""
+        rows = self.local.execute_sql(
+            "SELECT COUNT(*) FROM _replica_state WHERE synced_at IS NOT NULL"
+        )
+        return rows[0][0] >= len(REPLICATED_TABLES)
+
+    def table(self, name: str) -> Query:
+        return Query(self, name)
+
+    # --- Execução ---
+    def execute(self, query: Query) -> List[Dict[str, Any]]:
+        if query.table not in REPLICATED_TABLES:
+            return self._execute_remote(query)
+        if query.action == "select":
+            if self.ready:
+                try:
+                    return self.local.execute(query)
+                except ValueError as e:
+                    # Coluna que a réplica não tem: a consulta vai ao Supabase
+                    logger.warning("Consulta fora da réplica local: %s", e)
+            return self._execute_remote(query)
+
+        rows = self._execute_remote(query)
+        try:
+            if query.action == "delete":
+                self.local.execute(query)
+            else:
+                self._apply(query.table, rows)
+        except Exception as e:
+            # O Supabase já gravou; o próximo sync corrige a réplica
+            logger.warning("Erro ao aplicar escrita na réplica local: %s", e)
+        return rows
+
+    def _execute_remote(self, query: Query) -> List[Dict[str, Any]]:
+        builder = self.remote.table(query.table)
+        if query.action == "insert":
+            builder = builder.insert(query.payload)
+        elif query.action == "upsert":
+            builder = builder.upsert(
+                query.payload,
+                on_conflict=query.on_conflict,
+                ignore_duplicates=query.ignore_duplicates,
+            )
+        elif query.action == "update":
+            builder = builder.update(query.values)
+        elif query.action == "delete":
+            builder = builder.delete()
+        else:
+            builder = builder.select(query.columns)
+
+        for condition in query.filters:
+            if len(condition) == 2:
+                builder = builder.or_(
+                    ",".join(_render_condition(c) for c in condition[1])
+                )
+            elif condition[2] is None:
+                builder = builder.is_(condition[0], "null")
+            else:
+                builder = builder.filter(*condition)
+        for column, desc in query.orders:
+            builder = builder.order(column, desc=desc)
+        if query.row_limit is not None:
+            builder = builder.limit(query.row_limit)
+        if query.row_offset:
+            builder = builder.offset(query.row_offset)
+        return builder.execute().data
+
+    def _apply(self, table: str, rows: List[Dict[str, Any]]) -> int:
+        """
+        Grava (upsert por id) linhas vindas do Supabase na réplica. Retorna quantas
+        eram novas ou mudaram a marca d'água (releituras da janela não contam).
+        """
+        columns = set(self.local.columns(table))
+        mark = self.watermark_column if self.watermark_column in columns else "id"
+        changed = 0
+        for start in range(0, len(rows), 500):
+            chunk = [
+                {k: v for k, v in row.items() if k in columns}
+                for row in rows[start : start + 500]
+            ]
+            if not chunk:
+                continue
+            ids = [row["id"] for row in chunk]
+            known = {
+                record[0]: record[1]
+                for record in self.local.execute_sql(
+                    f'SELECT id, "{mark}" FROM {table} '
+                    f"WHERE id IN ({','.join('?' * len(ids))})",
+                    ids,
+                )
+            }
+            changed += sum(
+                1
+                for row in chunk
+                if row["id"] not in known or known[row["id"]] != row.get(mark)
+            )
+            self.local.table(table).upsert(chunk, on_conflict="id").execute()
+        return changed
+
+    # --- Sincronização ---
+    def _state(self, table: str) -> Union[str, None]:
+        rows = self.local.execute_sql(
+            "SELECT watermark FROM _replica_state WHERE table_name = ?", (table,)
+        )
+        return rows[0][0] if rows else None
+
+    def _save_state(self, table: str, watermark: Union[str, None]) -> None:
+        self.local.execute_sql(
+            "INSERT INTO _replica_state (table_name, watermark, synced_at) "
+            "VALUES (?, ?, ?) ON CONFLICT(table_name) DO UPDATE SET "
+            "watermark = excluded.watermark, synced_at = excluded.synced_at",
+            (
+                table,
+                watermark,
+                datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            ),
+        )
+
+    def _sync_start(self, watermark: Union[str, None]) -> Union[str, None]:
+        """
+        Recua a marca d'água em `overlap_seconds`: transações longas podem gravar
+        created_at anterior a linhas já vistas. O upsert por id torna a releitura
+        inofensiva.
+        """
+        if not watermark or not self.overlap_seconds:
+            return watermark
+        moment = _parse_moment(watermark)
+        if moment is None:
+            return watermark
+        return (moment - datetime.timedelta(seconds=self.overlap_seconds)).isoformat()
+
+    def sync(self, table: str) -> int:
+        """
+        Traz do Supabase as linhas com marca d'água >= a última vista, paginando
+        por (marca, id). Retorna quantas linhas novas ou alteradas chegaram.
+        """
+        column = self.watermark_column
+        watermark = self._state(table)
+        start = self._sync_start(watermark)
+        cursor: Union[Tuple[str, str], None] = None
+        applied = 0
+        while True:
+            builder = (
+                self.remote.table(table)
+                .select("*")
+                .order(column)
+                .order("id")
+                .limit(self.page_size)
+            )
+            if cursor:
+                builder = builder.or_(
+                    f"{column}.gt.{cursor[0]},"
+                    f"and({column}.eq.{cursor[0]},id.gt.{cursor[1]})"
+                )
+            elif start:
+                builder = builder.gte(column, start)
+            rows = builder.execute().data
+            if rows:
+                applied += self._apply(table, rows)
+                last = rows[-1]
+                cursor = (last[column], last["id"])
+                if not watermark or last[column] > watermark:
+                    watermark = last[column]
+            if len(rows) < self.page_size:
+                break
+        self._save_state(table, watermark)
+        return applied
+
+    def _reconcile_page(self, table: str, rows: List[Dict[str, Any]]) -> int:
+        """
+        Grava uma página da releitura e retorna quantas linhas eram novas ou
+        diferentes da cópia local em alguma coluna (não só na marca d'água).
+        """
+        columns = set(self.local.columns(table))
+        rows = [{k: v for k, v in row.items() if k in columns} for row in rows]
+        # A página vem ordenada por id: a cópia local do mesmo intervalo basta
+        known = {
+            row["id"]: row
+            for row in self.local.table(table)
+            .select("*")
+            .gte("id", rows[0]["id"])
+            .lte("id", rows[-1]["id"])
+            .execute()
+            .data
+        }
+        changed = sum(
+            1
+            for row in rows
+            if row["id"] not in known
+            or any(known[row["id"]].get(k) != v for k, v in row.items())
+        )
+        for start in range(0, len(rows), 500):
+            self.local.table(table).upsert(
+                rows[start : start + 500], on_conflict="id"
+            ).execute()
+        return changed
+
+    def _reconcile_table(
+        self, table: str, started: datetime.datetime
+    ) -> Tuple[int, List[str]]:
+        """
+        Relê a tabela inteira do Supabase, paginando por id, e grava o que mudou.
+        Retorna (linhas novas ou alteradas, ids locais que não existem mais lá).
+        Linhas criadas perto do início da releitura (dentro da margem) não entram
+        como excluídas: podem ter chegado pelo write-through no meio dela.
+        """
+        seen = set()
+        changed = 0
+        last_id = None
+        while True:
+            builder = (
+                self.remote.table(table).select("*").order("id").limit(self.page_size)
+            )
+            if last_id is not None:
+                builder = builder.gt("id", last_id)
+            rows = builder.execute().data
+            if not rows:
+                break
+            changed += self._reconcile_page(table, rows)
+            seen.update(row["id"] for row in rows)
+            last_id = rows[-1]["id"]
+
+        cutoff = started - datetime.timedelta(seconds=self.overlap_seconds)
+        has_created_at = "created_at" in self.local.columns(table)
+        stale = []
+        for record in self.local.execute_sql(
+            f"SELECT id, {'created_at' if has_created_at else 'NULL'} FROM {table}"
+        ):
+            if record[0] in seen:
+                continue
+            moment = _parse_moment(record[1]) if record[1] else None
+            if moment is not None and moment >= cutoff:
+                continue
+            stale.append(record[0])
+        return changed, stale
+
+    def reconcile_all(self) -> int:
+        """
+        Relê todas as tabelas do Supabase: edições e exclusões feitas fora do bot
+        chegam à réplica mesmo com a marca d'água em created_at. As exclusões só
+        são aplicadas depois de todas as leituras, e na ordem inversa (gastos antes
+        das categorias que eles referenciam); se uma leitura falhar, nada é
+        excluído. Retorna quantas linhas mudaram ou foram excluídas.
+        """
+        started = datetime.datetime.now(datetime.timezone.utc)
+        changed = 0
+        stale: Dict[str, List[str]] = {}
+        for table in REPLICATED_TABLES:
+            table_changed, stale[table] = self._reconcile_table(table, started)
+            changed += table_changed
+        for table in reversed(REPLICATED_TABLES):
+            ids = stale[table]
+            for start in range(0, len(ids), 500):
+                chunk = ids[start : start + 500]
+                self.local.execute_sql(
+                    f"DELETE FROM {table} WHERE id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                )
+            changed += len(ids)
+        return changed
+
+    def sync_all(self) -> int:
+        """Sincroniza todas as tabelas; erros de uma tabela não impedem as demais."""
+        total = 0
+        for table in REPLICATED_TABLES:
+            try:
+                total += self.sync(table)
+            except Exception as e:
+                logger.error("Erro ao sincronizar a réplica de '%s': %s", table, e)
+        return total
@@ -0,0 +1,300 @@
+# src/core/backends/sqlite.py
+import json
+import sqlite3
+import threading
+import uuid
+from typing import Any, Dict, List, Tuple, Union
+
+from src.core.backends.query import (
+    EMBEDDED_RESOURCES,
+    Query,
+    parse_aggregates,
+    parse_columns,
+)
+
+# Mesmo esquema das tabelas do Supabase (ver README), com os índices usados pelas
+# consultas do bot: período, categoria, forma de pagamento e valor (edição)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS categories (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    name TEXT NOT NULL UNIQUE,
+    monthly_limit REAL,
+    aliases TEXT
+);
+CREATE TABLE IF NOT EXISTS payment_methods (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS ganhos (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    value REAL NOT NULL,
+    description TEXT NOT NULL,
+    date TEXT NOT NULL,
+    idempotency_key TEXT UNIQUE
+);
+CREATE TABLE IF NOT EXISTS expenses (
+    id TEXT PRIMARY KEY,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    value REAL NOT NULL,
+    category_id TEXT NOT NULL REFERENCES categories(id),
+    date TEXT NOT NULL,
+    payment_method_id TEXT REFERENCES payment_methods(id),
+    description TEXT,
+    idempotency_key TEXT UNIQUE
+);
+CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses(date, id);
+CREATE INDEX IF NOT EXISTS idx_expenses_category ON expenses(category_id, date);
+CREATE INDEX IF NOT EXISTS idx_expenses_payment ON expenses(payment_method_id, date);
+CREATE INDEX IF NOT EXISTS idx_expenses_value ON expenses(value, date);
+CREATE INDEX IF NOT EXISTS idx_ganhos_date ON ganhos(date);
+"""
+
+# Colunas guardadas como JSON (text[] no Postgres)
+JSON_COLUMNS = {"categories": ("aliases",)}
+_OPERATORS = {"eq": "=", "neq": "!=", "lt": "<", "lte": "<=", "gt": ">", "gte": ">="}
+
+
+class SQLiteBackend:
+    """
+    Banco SQLite (arquivo ou ":memory:") com a interface de
+    `supabase.Client.table(...)`. Traduz cada consulta para SQL parametrizado;
+    os recursos embutidos ("categories(name)") viram LEFT JOIN.
+    """
+
+    def __init__(
+        self,
+        path: str = ":memory:",
+        tables: Union[Dict[str, List[Dict[str, Any]]], None] = None,
+        enforce_foreign_keys: bool = True,
+    ):
+        self.path = path
+        # O bot consulta o banco tanto do event loop quanto de threads
+        # (asyncio.to_thread); a trava serializa o acesso à conexão
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.RLock()
+        with self._lock:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            if enforce_foreign_keys:
+                self._conn.execute("PRAGMA foreign_keys=ON")
+            self._conn.executescript(SCHEMA)
+            self._columns = {
+                table: [
+                    row["name"]
+                    for row in self._conn.execute(f"PRAGMA table_info({table})")
+                ]
+                for table in ("categories", "payment_methods", "ganhos", "expenses")
+            }
+        for table in ("categories", "payment_methods", "ganhos", "expenses"):
+            if tables and tables.get(table):
+                self.table(table).insert(tables[table]).execute()
+
+    def table(self, name: str) -> Query:
+        return Query(self, name)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def columns(self, table: str) -> List[str]:
+        """Colunas da tabela no esquema local."""
+        return list(self._columns.get(table, ()))
+
+    def execute_sql(self, sql: str, params: Any = ()) -> List[sqlite3.Row]:
+        """SQL direto (ex: tabelas auxiliares), na mesma conexão e com a trava."""
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            self._conn.commit()
+            return rows
+
+    def _check_column(self, table: str, column: str) -> str:
+        # Nomes de coluna entram no SQL; só aceita os que existem no esquema
+        if column not in self._columns.get(table, ()):
+            raise ValueError(f"Coluna desconhecida: {table}.{column}")
+        return column
+
+    def _where(self, query: Query) -> Tuple[str, List[Any]]:
+        params: List[Any] = []
+
+        def render(condition: Tuple) -> str:
+            if len(condition) == 2:
+                mode, conditions = condition
+                joiner = " OR " if mode == "or" else " AND "
+                return "(" + joiner.join(render(cond) for cond in conditions) + ")"
+            column, op, value = condition
+            column = f't."{self._check_column(query.table, column)}"'
+            if value is None or value == "null":
+                if op in ("eq", "is"):
+                    return f"{column} IS NULL"
+                if op == "neq":
+                    return f"{column} IS NOT NULL"
+            if op == "is":
+                op = "eq"
+            if op not in _OPERATORS:
+                raise ValueError(f"Operador não suportado: {op}")
+            params.append(value)
+            return f"{column} {_OPERATORS[op]} ?"
+
+        clauses = [render(condition) for condition in query.filters]
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
+    def _decode(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        for column in JSON_COLUMNS.get(table, ()):
+            if isinstance(row.get(column), str):
+                row[column] = json.loads(row[column])
+        return row
+
+    def _encode(self, table: str, row: Dict[str, Any]) -> Dict[str, Any]:
+        row = dict(row)
+        for column in JSON_COLUMNS.get(table, ()):
+            if row.get(column) is not None:
+                row[column] = json.dumps(row[column], ensure_ascii=False)
+        return row
+
+    def execute(self, query: Query) -> List[Dict[str, Any]]:
+        with self._lock:
+            if query.action == "select":
+                return self._select(query)
+            try:
+                rows = self._write(query)
+                self._conn.commit()
+                return rows
+            except Exception:
+                self._conn.rollback()
+                raise
+
+    def _select(self, query: Query) -> List[Dict[str, Any]]:
+        table = query.table
+        aggregates = parse_aggregates(query.columns)
+        if aggregates is not None:
+            selected = [
+                "COUNT(*) AS count"
+                if function == "count"
+                else f'COALESCE(SUM(t."{self._check_column(table, column)}"), 0) AS sum'
+                for column, function in aggregates
+            ]
+            where, params = self._where(query)
+            record = self._conn.execute(
+                f"SELECT {', '.join(selected)} FROM {table} AS t{where}", params
+            ).fetchone()
+            return [dict(record)]
+
+        plain, embeds = parse_columns(query.columns)
+        if plain == ["*"] or "*" in plain:
+            plain = list(self._columns[table])
+        selected = [f't."{self._check_column(table, c)}" AS "{c}"' for c in plain]
+        joins = []
+        for name, columns in embeds.items():
+            fk, related = EMBEDDED_RESOURCES[name]
+            self._check_column(table, fk)
+            joins.append(f'LEFT JOIN {related} AS "{name}" ON "{name}".id = t."{fk}"')
+            selected.append(f'"{name}".id AS "{name}.__id"')
+            selected.extend(
+                f'"{name}"."{self._check_column(related, c)}" AS "{name}.{c}"'
+                for c in columns
+            )
+
+        where, params = self._where(query)
+        sql = f"SELECT {', '.join(selected)} FROM {table} AS t {' '.join(joins)}{where}"
+        if query.orders:
+            sql += " ORDER BY " + ", ".join(
+                f't."{self._check_column(table, column)}" {"DESC" if desc else "ASC"}'
+                for column, desc in query.orders
+            )
+        if query.row_limit is not None or query.row_offset:
+            sql += " LIMIT ? OFFSET ?"
+            params += [
+                query.row_limit if query.row_limit is not None else -1,
+                query.row_offset,
+            ]
+
+        result = []
+        for record in self._conn.execute(sql, params):
+            row = self._decode(table, {c: record[c] for c in plain})
+            for name, columns in embeds.items():
+                related = EMBEDDED_RESOURCES[name][1]
+                row[name] = (
+                    self._decode(related, {c: record[f"{name}.{c}"] for c in columns})
+                    if record[f"{name}.__id"] is not None
+                    else None
+                )
+            result.append(row)
+        return result
+
+    def _fetch_by_ids(self, table: str, ids: List[Any]) -> List[Dict[str, Any]]:
+        if not ids:
+            return []
+        placeholders = ",".join("?" * len(ids))
+        records = self._conn.execute(
+            f"SELECT * FROM {table} WHERE id IN ({placeholders})", ids
+        )
+        by_id = {record["id"]: self._decode(table, dict(record)) for record in records}
+        return [by_id[i] for i in ids if i in by_id]
+
+    def _write(self, query: Query) -> List[Dict[str, Any]]:
+        """Aplica insert/upsert/update/delete e devolve as linhas afetadas."""
+        table = query.table
+        if query.action in ("update", "delete"):
+            where, params = self._where(query)
+            ids = [
+                record["id"]
+                for record in self._conn.execute(
+                    f"SELECT t.id FROM {table} AS t{where}", params
+                )
+            ]
+            if query.action == "delete":
+                affected = self._fetch_by_ids(table, ids)
+                self._conn.executemany(
+                    f"DELETE FROM {table} WHERE id = ?", [(i,) for i in ids]
+                )
+                return affected
+            values = self._encode(table, query.values)
+            assignments = ", ".join(
+                f'"{self._check_column(table, column)}" = ?' for column in values
+            )
+            self._conn.executemany(
+                f"UPDATE {table} SET {assignments} WHERE id = ?",
+                [list(values.values()) + [i] for i in ids],
+            )
+            return self._fetch_by_ids(table, ids)
+
+        written_ids = []
+        for payload_row in query.payload:
+            row = self._encode(table, payload_row)
+            # O Postgres gera o uuid da chave primária
+            row.setdefault("id", str(uuid.uuid4()))
+            columns = [self._check_column(table, column) for column in row]
+            quoted = ", ".join(f'"{c}"' for c in columns)
+            sql = (
+                f"INSERT INTO {table} ({quoted}) "
+                f"VALUES ({', '.join('?' * len(columns))})"
+            )
+            if query.action == "upsert":
+                conflict = self._check_column(table, query.on_conflict)
+                if query.ignore_duplicates:
+                    sql += f' ON CONFLICT("{conflict}") DO NOTHING'
+                else:
+                    updates = ", ".join(
+                        f'"{c}" = excluded."{c}"'
+                        for c in columns
+                        if c not in (conflict, "id")
+                    )
+                    sql += f' ON CONFLICT("{conflict}") DO UPDATE SET {updates}'
+                    self._conn.execute(sql, list(row.values()))
+                    record = self._conn.execute(
+                        f'SELECT id FROM {table} WHERE "{conflict}" = ?',
+                        (row.get(conflict),),
+                    ).fetchone()
+                    written_ids.append(record["id"])
+                    continue
+            if self._conn.execute(sql, list(row.values())).rowcount:
+                written_ids.append(row["id"])
+
+        written = []
+        # Respeita o limite de parâmetros por instrução de versões antigas do SQLite
+        for start in range(0, len(written_ids), 500):
+            written.extend(self._fetch_by_ids(table, written_ids[start : start + 500]))
+        return written
@@ -0,0 +1,189 @@
+# src/core/budget.py
+import contextlib
+import datetime
+import threading
+from decimal import Decimal
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+from supabase import Client
+
+from src.config import BUDGET_ALERT_THRESHOLDS
+from src.core import db
+from src.core.write_queue import WriteQueue
+from src.utils.money import cents_array, from_cents, to_cents
+
+
+def month_bounds(date: str) -> Tuple[str, str, str]:
+    """Retorna (mês 'AAAA-MM', primeiro dia, último dia) do mês de uma data 'AAAA-MM-DD'."""
+    day = datetime.datetime.strptime(str(date)[:10], "%Y-%m-%d").date()
+    first = day.replace(day=1)
+    last = (first + datetime.timedelta(days=32)).replace(day=1) - datetime.timedelta(
+        days=1
+    )
+    return first.strftime("%Y-%m"), first.isoformat(), last.isoformat()
+
+
+class BudgetTracker:
+    """
+    Totais de gastos por (categoria, mês) mantidos em memória, em centavos.
+    Cada mês é carregado do banco uma única vez (só as colunas category_id e value);
+    depois disso cada gasto novo apenas soma no contador, sem refazer a soma.
+    Os métodos recebem e devolvem reais; a soma em centavos não acumula erro.
+    Com `write_queue`, a carga de um mês inclui os gastos ainda na fila de escrita
+    (inclusive os que sobraram de antes de um reinício).
+    """
+
+    def __init__(
+        self,
+        thresholds: Union[List[float], None] = None,
+        write_queue: Union[WriteQueue, None] = None,
+    ):
+        self.thresholds = sorted(
+            thresholds if thresholds is not None else BUDGET_ALERT_THRESHOLDS
+        )
+        self.write_queue = write_queue
+        self._totals: Dict[Tuple[str, str], int] = {}
+        self._seeded_months: set = set()
+        # Muda a cada invalidate(): cargas iniciadas antes dele são descartadas
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _load_month(
+        self, supabase_client: Client, month: str, first: str, last: str
+    ) -> Dict[Tuple[str, str], int]:
+        """
+        Lê do banco os totais por categoria de um mês, sem segurar o lock: uma
+        leitura lenta não atrasa os alertas de meses já carregados. Se alguma
+        página falhar, o erro é propagado e nada é guardado.
+        Os gastos da fila de escrita são lidos com os flushes suspensos, para que um
+        gasto enviado durante a carga não fique de fora nem entre duas vezes.
+        """
+        totals: Dict[Tuple[str, str], int] = {}
+
+        def add(page: List[Dict[str, Any]]) -> None:
+            for row, cents in zip(page, cents_array([row["value"] for row in page])):
+                key = (row["category_id"], month)
+                totals[key] = totals.get(key, 0) + int(cents)
+
+        queue = self.write_queue
+        with queue.paused() if queue is not None else contextlib.nullcontext():
+            for page in db.iter_gastos_pages(
+                supabase_client,
+                data_inicio=first,
+                data_fim=last,
+                columns="category_id,value",
+            ):
+                add(page)
+            if queue is not None:
+                add(queue.pending_expenses(first, last))
+        return totals
+
+    @contextlib.contextmanager
+    def _loaded(
+        self, supabase_client: Client, bounds: Dict[str, Tuple[str, str]]
+    ) -> Iterator[List[str]]:
+        """
+        Garante os meses de `bounds` ({mês: (primeiro dia, último dia)}) em memória
+        e entrega, com o lock seguro, os meses cuja carga esta chamada instalou.
+        As leituras rodam fora do lock; só cargas completas são instaladas, e uma
+        carga que cruzou um invalidate() é refeita, pois pode não ver a mudança.
+        """
+        while True:
+            with self._lock:
+                generation = self._generation
+                missing = [m for m in bounds if m not in self._seeded_months]
+            loads = {
+                month: self._load_month(supabase_client, month, *bounds[month])
+                for month in missing
+            }
+            with self._lock:
+                if generation != self._generation:
+                    continue
+                installed = []
+                for month, totals in loads.items():
+                    # Outra chamada pode ter instalado o mesmo mês enquanto isso
+                    if month not in self._seeded_months:
+                        self._totals.update(totals)
+                        self._seeded_months.add(month)
+                        installed.append(month)
+                yield installed
+                return
+
+    def record_expenses(
+        self,
+        supabase_client: Client,
+        expenses: List[Dict[str, Any]],
+        saved: bool = True,
+    ) -> List[Tuple[float, float]]:
+        """
+        Registra gastos (itens com 'category_id', 'date' e 'value'; valor negativo
+        desconta um gasto removido/alterado) e retorna, na mesma ordem, (total
+        anterior, total novo) da categoria no mês de cada um. Meses ainda não
+        carregados são lidos do banco uma vez. Com saved=True os gastos já estão no
+        banco, e portanto nessa carga: os valores do lote são descontados dela e
+        reaplicados um a um, para que cada transição parta do estado anterior à
+        gravação. Com saved=False (gastos ainda na fila de escrita) a carga só os
+        contém se o tracker lê a fila (write_queue); sem ela, eles são apenas somados.
+        """
+        in_load = saved or self.write_queue is not None
+        bounds = {}
+        deltas = []
+        for expense in expenses:
+            month, first, last = month_bounds(expense["date"])
+            bounds[month] = (first, last)
+            deltas.append(((expense["category_id"], month), to_cents(expense["value"])))
+        with self._loaded(supabase_client, bounds) as loaded:
+            for key, cents in deltas:
+                if in_load and key[1] in loaded:
+                    self._totals[key] = self._totals.get(key, 0) - cents
+            transitions = []
+            for key, cents in deltas:
+                previous = self._totals.get(key, 0)
+                self._totals[key] = previous + cents
+                transitions.append((from_cents(previous), from_cents(previous + cents)))
+            return transitions
+
+    def record_expense(
+        self, supabase_client: Client, category_id: str, date: str, value: float
+    ) -> Tuple[float, float]:
+        """
+        Registra um gasto já gravado no banco e retorna (total anterior, total novo)
+        da categoria no mês. Um valor negativo desconta um gasto removido/alterado.
+        """
+        return self.record_expenses(
+            supabase_client,
+            [{"category_id": category_id, "date": date, "value": value}],
+        )[0]
+
+    def get_total(self, supabase_client: Client, category_id: str, date: str) -> float:
+        """Total gasto na categoria no mês da data informada."""
+        month, first, last = month_bounds(date)
+        with self._loaded(supabase_client, {month: (first, last)}):
+            return from_cents(self._totals.get((category_id, month), 0))
+
+    def invalidate(self, month: Union[str, None] = None) -> None:
+        """Descarta os totais de um mês ('AAAA-MM'), ou de todos, para recarregar do banco."""
+        with self._lock:
+            self._generation += 1
+            if month is None:
+                self._totals.clear()
+                self._seeded_months.clear()
+                return
+            self._seeded_months.discard(month)
+            for key in [k for k in self._totals if k[1] == month]:
+                del self._totals[key]
+
+    def crossed_thresholds(
+        self, previous: float, new: float, monthly_limit: Union[float, None]
+    ) -> List[float]:
+        """Frações do limite ultrapassadas pela transição previous -> new."""
+        if not monthly_limit or monthly_limit <= 0:
+            return []
+        # Comparação exata em centavos: 80% de R$100,00 é exatamente R$80,00
+        previous, new = to_cents(previous), to_cents(new)
+        limit = to_cents(monthly_limit)
+        return [
+            threshold
+            for threshold in self.thresholds
+            if previous < Decimal(str(threshold)) * limit <= new
+        ]
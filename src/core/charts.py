@@ -6,6 +6,12 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mticker
 from supabase import Client
+from src.core import db, metrics
+from src.core.ledger import Ledger
+from src.core.log import get_logger
+from src.utils.money import from_cents
+
+logger = get_logger(__name__)
 
 # Configurações globais para os gráficos (cores, fontes, etc.)
 plt.style.use("seaborn-v0_8-darkgrid")
@@ -95,6 +101,7 @@ def _get_period_title(data_inicio: Union[str, None], data_fim: Union[str, None])
 
 
 # --- ATUALIZADO: generate_balance_chart ---
+@metrics.timed("chart")
 def generate_balance_chart(
     supabase_client: Client,
     data_inicio: Union[str, None] = None,
@@ -102,24 +109,33 @@ def generate_balance_chart(
 ) -> Union[io.BytesIO, None]:
     """Gera um gráfico de balanço mensal de ganhos vs. gastos, com filtros de data."""
     try:
-        gastos_data_raw = (
-            supabase_client.table("expenses").select("value,date").execute().data
-        )
-        ganhos_data_raw = (
-            supabase_client.table("ganhos").select("valor,data").execute().data
-        )
+        # Paginado e filtrado no servidor: uma única consulta pararia no
+        # max-rows do PostgREST e o balanço sairia truncado em silêncio
+        gastos_data = [
+            row
+            for page in db.iter_gastos_pages(
+                supabase_client,
+                data_inicio=data_inicio,
+                data_fim=data_fim,
+                columns="value,date",
+            )
+            for row in page
+        ]
+        ganhos_data = [
+            row
+            for page in db.iter_ganhos_pages(
+                supabase_client,
+                data_inicio=data_inicio,
+                data_fim=data_fim,
+                columns="value,date",
+            )
+            for row in page
+        ]
     except Exception as e:
-        print(f"Erro ao obter dados para gráfico de balanço: {e}")
+        metrics.mark_error()
+        logger.error("Erro ao obter dados para gráfico de balanço: %s", e)
         return None
 
-    # Aplica filtro de data aos gastos e ganhos
-    gastos_data = filter_gastos_data(
-        gastos_data_raw, data_inicio=data_inicio, data_fim=data_fim
-    )
-    ganhos_data = filter_gastos_data(
-        ganhos_data_raw, data_inicio=data_inicio, data_fim=data_fim
-    )
-
     if not gastos_data and not ganhos_data:
         return None
 
@@ -182,6 +198,7 @@ def generate_balance_chart(
 
 
 # --- ATUALIZADO: generate_category_spending_chart ---
+@metrics.timed("chart")
 def generate_category_spending_chart(
     supabase_client: Client,
     forma_pagamento_id: Union[str, None] = None,
@@ -190,81 +207,30 @@ def generate_category_spending_chart(
 ) -> Union[io.BytesIO, None]:
     """Gera um gráfico de gastos por categoria e compara com os limites, com filtros."""
     try:
-        gastos_data_raw = (
-            supabase_client.table("expenses")
-            .select(
-                "value,category_id,date,payment_methods(name),categories(name,monthly_limit),payment_method_id"
-            )
-            .execute()
-            .data
-        )
-        categorias_data_full = (
-            supabase_client.table("categories")
-            .select("id,name,monthly_limit")
-            .execute()
-            .data
+        categorias_data_full = db.reference_data.categories(supabase_client)
+        ledger = Ledger.from_pages(
+            db.iter_gastos_pages(
+                supabase_client,
+                data_inicio=data_inicio,
+                data_fim=data_fim,
+                columns="value,date,category_id,payment_method_id",
+            ),
+            categorias_data_full,
+            db.reference_data.payment_methods(supabase_client),
         )
     except Exception as e:
-        print(f"Erro ao obter gastos para gráfico de categoria: {e}")
+        metrics.mark_error()
+        logger.error("Erro ao obter gastos para gráfico de categoria: %s", e)
         return None
 
-    if not gastos_data_raw:
+    ledger = ledger.filter(payment_method_id=forma_pagamento_id)
+    if not len(ledger):
         return None
 
-    adjusted_gastos_data = []
-    for gasto in gastos_data_raw:
-        gasto_copy = gasto.copy()
-        if (
-            "categories" in gasto_copy
-            and gasto_copy["categories"]
-            and "name" in gasto_copy["categories"]
-        ):
-            gasto_copy["categoria_nome"] = gasto_copy["categories"]["name"]
-            gasto_copy["limite_mensal_categoria"] = gasto_copy["categories"][
-                "monthly_limit"
-            ]
-        else:
-            gasto_copy["categoria_nome"] = "Desconhecida"
-            gasto_copy["limite_mensal_categoria"] = None
-        del gasto_copy["categories"]
-
-        if (
-            "payment_methods" in gasto_copy
-            and gasto_copy["payment_methods"]
-            and "name" in gasto_copy["payment_methods"]
-        ):
-            gasto_copy["forma_pagamento_nome"] = gasto_copy["payment_methods"]["name"]
-        else:
-            gasto_copy["forma_pagamento_nome"] = "Não Informado"
-        del gasto_copy["payment_methods"]
-        adjusted_gastos_data.append(gasto_copy)
-
-    df_gastos = pd.DataFrame(adjusted_gastos_data)
-    if df_gastos.empty:
-        return None
-
-    df_gastos["date"] = pd.to_datetime(df_gastos["date"])
-
-    if forma_pagamento_id:
-        df_gastos = df_gastos[df_gastos["forma_pagamento_id"] == forma_pagamento_id]
-
-    if data_inicio:
-        start_date = pd.to_datetime(data_inicio)
-        df_gastos = df_gastos[df_gastos["date"] >= start_date]
-    if data_fim:
-        end_date = pd.to_datetime(data_fim)
-        df_gastos = df_gastos[df_gastos["date"] <= end_date]
-
-    if df_gastos.empty:
-        return None
-
-    gastos_por_categoria = (
-        df_gastos.groupby("categoria_nome")["value"].sum().sort_values(ascending=False)
+    gastos_por_categoria = from_cents(
+        pd.Series(ledger.sum_by_category()).sort_values(ascending=False)
     )
 
-    if gastos_por_categoria.empty:
-        return None
-
     limites_por_categoria = {
         cat["name"]: cat["monthly_limit"] for cat in categorias_data_full
     }
@@ -352,6 +318,7 @@ def generate_category_spending_chart(
 
 
 # --- ATUALIZADO: generate_payment_method_spending_chart ---
+@metrics.timed("chart")
 def generate_payment_method_spending_chart(
     supabase_client: Client,
     category_id: Union[str, None] = None,
@@ -360,56 +327,22 @@ def generate_payment_method_spending_chart(
 ) -> Union[io.BytesIO, None]:
     """Gera um gráfico do total de gastos por forma de pagamento, com filtros."""
     try:
-        gastos_data_raw = (
-            supabase_client.table("expenses")
-            .select("value,date,payment_methods(name),category_id")
-            .execute()
-            .data
+        ledger = db.get_ledger(
+            supabase_client,
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            category_id=category_id,
         )
     except Exception as e:
-        print(f"Erro ao obter gastos para gráfico de formas de pagamento: {e}")
-        return None
-
-    if not gastos_data_raw:
+        metrics.mark_error()
+        logger.error("Erro ao obter gastos para gráfico de formas de pagamento: %s", e)
         return None
 
-    adjusted_gastos_data = []
-    for gasto in gastos_data_raw:
-        gasto_copy = gasto.copy()
-        if (
-            "payment_methods" in gasto_copy
-            and gasto_copy["payment_methods"]
-            and "name" in gasto_copy["payment_methods"]
-        ):
-            gasto_copy["forma_pagamento_nome"] = gasto_copy["payment_methods"]["name"]
-        else:
-            gasto_copy["forma_pagamento_nome"] = "Não Informado"
-        del gasto_copy["payment_methods"]
-        adjusted_gastos_data.append(gasto_copy)
-
-    df_gastos = pd.DataFrame(adjusted_gastos_data)
-    if df_gastos.empty:
-        return None
-
-    df_gastos["date"] = pd.to_datetime(df_gastos["date"])
-
-    if category_id:
-        df_gastos = df_gastos[df_gastos["category_id"] == category_id]
-
-    if data_inicio:
-        start_date = pd.to_datetime(data_inicio)
-        df_gastos = df_gastos[df_gastos["date"] >= start_date]
-    if data_fim:
-        end_date = pd.to_datetime(data_fim)
-        df_gastos = df_gastos[df_gastos["date"] <= end_date]
-
-    if df_gastos.empty:
+    if not len(ledger):
         return None
 
-    gastos_por_forma = (
-        df_gastos.groupby("forma_pagamento_nome")["value"]
-        .sum()
-        .sort_values(ascending=False)
+    gastos_por_forma = from_cents(
+        pd.Series(ledger.sum_by_payment_method()).sort_values(ascending=False)
     )
 
     if gastos_por_forma.empty:
@@ -472,6 +405,7 @@ def generate_payment_method_spending_chart(
 
 
 # --- Gerar Gráfico de Gastos Mensais por Categoria e Forma de Pagamento ---
+@metrics.timed("chart")
 def generate_monthly_category_payment_chart(
     supabase_client: Client,
     data_inicio: Union[str, None] = None,
@@ -482,68 +416,29 @@ def generate_monthly_category_payment_chart(
     com as formas de pagamento como sub-divisões.
     """
     try:
-        gastos_data_raw = (
-            supabase_client.table("expenses")
-            .select("value,date,payment_methods(name),categories(name)")
-            .execute()
-            .data
+        ledger = db.get_ledger(
+            supabase_client, data_inicio=data_inicio, data_fim=data_fim
         )
     except Exception as e:
-        print(f"Erro ao obter gastos para gráfico mensal combinado: {e}")
+        metrics.mark_error()
+        logger.error("Erro ao obter gastos para gráfico mensal combinado: %s", e)
         return None
 
-    if not gastos_data_raw:
+    if not len(ledger):
         return None
 
-    adjusted_gastos_data = []
-    for gasto in gastos_data_raw:
-        gasto_copy = gasto.copy()
-        if (
-            "categories" in gasto_copy
-            and gasto_copy["categories"]
-            and "name" in gasto_copy["categories"]
-        ):
-            gasto_copy["categoria_nome"] = gasto_copy["categories"]["name"]
-        else:
-            gasto_copy["categoria_nome"] = "Desconhecida"
-        del gasto_copy["categories"]
-
-        if (
-            "payment_methods" in gasto_copy
-            and gasto_copy["payment_methods"]
-            and "name" in gasto_copy["payment_methods"]
-        ):
-            gasto_copy["forma_pagamento_nome"] = gasto_copy["payment_methods"]["name"]
-        else:
-            gasto_copy["forma_pagamento_nome"] = "Não Informado"
-        del gasto_copy["payment_methods"]
-        adjusted_gastos_data.append(gasto_copy)
-
-    df_gastos = pd.DataFrame(adjusted_gastos_data)
-    if df_gastos.empty:
-        return None
-
-    df_gastos["date"] = pd.to_datetime(df_gastos["date"])
-
-    # Aplica filtros de data
-    if data_inicio:
-        start_date = pd.to_datetime(data_inicio)
-        df_gastos = df_gastos[df_gastos["date"] >= start_date]
-    if data_fim:
-        end_date = pd.to_datetime(data_fim)
-        df_gastos = df_gastos[df_gastos["date"] <= end_date]
-
-    if df_gastos.empty:
-        return None
-
-    df_gastos["mes_ano"] = df_gastos["date"].dt.to_period("M").astype(str)
-
-    pivot_table = df_gastos.pivot_table(
-        index=["mes_ano", "categoria_nome"],
-        columns="forma_pagamento_nome",
-        values="value",
-        aggfunc="sum",
-    ).fillna(0)
+    totais = ledger.sum_by_month_category_payment()
+    pivot_table = from_cents(
+        pd.Series(
+            list(totais.values()),
+            index=pd.MultiIndex.from_tuples(
+                list(totais),
+                names=["mes_ano", "categoria_nome", "forma_pagamento_nome"],
+            ),
+        )
+        .unstack("forma_pagamento_nome", fill_value=0)
+        .sort_index()
+    )
 
     if pivot_table.empty:
         return None
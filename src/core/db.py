@@ -1,49 +1,372 @@
 # src/core/db.py
-from supabase import create_client, Client
-from src.config import SUPABASE_URL, SUPABASE_KEY
-from typing import Union, List, Dict, Any
+import copy
+import functools
+import inspect
+import threading
+import time
+import weakref
+from supabase import create_client, Client, ClientOptions
+from src.config import (
+    REFERENCE_CACHE_TTL,
+    SUPABASE_KEY,
+    SUPABASE_MAX_ROWS,
+    SUPABASE_URL,
+)
+from typing import Union, List, Dict, Any, Callable, Iterable, Iterator, Tuple
+from src.utils.money import from_cents, sum_money, to_cents
 from src.utils.text_utils import to_camel_case
+from src.core import metrics, resilience
+from src.core.ledger import Ledger
+from src.core.log import get_logger
+from src.core.models import Categoria, Ganho, Gasto
+from src.core.resilience import DependencyUnavailableError
+
+logger = get_logger(__name__)
+
+
+# Quantidade máxima de linhas por requisição nas inserções em lote
+BULK_CHUNK_SIZE = 500
 
 
 def get_supabase_client() -> Client:
-    """Retorna uma instância do cliente Supabase."""
-    return create_client(SUPABASE_URL, SUPABASE_KEY)
+    """
+    Retorna uma instância do cliente Supabase. O timeout de cada requisição é uma
+    fração do orçamento de latência, para sobrar tempo para os retries.
+    """
+    return create_client(
+        SUPABASE_URL,
+        SUPABASE_KEY,
+        options=ClientOptions(
+            postgrest_client_timeout=resilience.POLICIES["supabase"].attempt_timeout
+        ),
+    )
 
 
-# --- Funções para Formas de Pagamento ---
-def get_payment_methods(supabase_client: Client) -> list:
-    """Obtém todas as formas de pagamento do Supabase."""
+def _execute(query: Any, retry: bool = True, write: bool = False) -> Any:
+    """
+    Executa uma consulta do Supabase com retry, backoff e disjuntor. Falhas
+    passageiras que persistem sobem como DependencyUnavailableError: as funções
+    abaixo não as convertem em []/False/None, que o bot leria como "não existe".
+    Escritas passam write=True, para o erro não afirmar que nada foi gravado.
+    """
+    return resilience.call("supabase", query.execute, retry=retry, write=write)
+
+
+def _db_call(fallback: Any, message: str) -> Callable:
+    """
+    Decorator das funções públicas: DependencyUnavailableError sobe intacta (o
+    metrics.timed de fora conta o erro); qualquer outra falha é registrada com
+    `message` (formatada com os argumentos da chamada) e vira uma cópia de
+    `fallback`, o contrato antigo de []/None/False para "não deu certo".
+    """
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            except DependencyUnavailableError:
+                raise
+            except Exception as e:
+                metrics.mark_error()
+                arguments = signature.bind_partial(*args, **kwargs).arguments
+                logger.error("%s: %s", message.format(**arguments), e)
+                return copy.copy(fallback)
+
+        return wrapper
+
+    return decorator
+
+
+# --- Leituras concorrentes iguais ---
+# Handlers (em asyncio.to_thread), os jobs de relatório e da fila de escrita, a
+# sincronização da réplica e o /exportar rodam ao mesmo tempo e repetem as mesmas
+# consultas: a mesma leitura em andamento é feita uma vez só.
+class _Flight:
+    """Uma leitura em andamento: quem chegar depois espera pelo mesmo resultado."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.waiters = 0
+        self.result: Any = None
+        self.error: Union[BaseException, None] = None
+
+
+_flights: Dict[Tuple[Any, ...], _Flight] = {}
+_flights_lock = threading.Lock()
+
+
+def _clone(result: Any) -> Any:
+    # Cada chamador recebe sua própria lista, como se tivesse feito a consulta
+    if isinstance(result, list):
+        return [dict(row) if isinstance(row, dict) else row for row in result]
+    return result
+
+
+def _single_flight(
+    supabase_client: Client, key: Tuple[Any, ...], read: Callable[[], Any]
+) -> Any:
+    """
+    Executa `read` uma vez por leitura concorrente idêntica (mesmo cliente e mesma
+    `key`, que descreve a consulta), entre threads: quem chega com a leitura em
+    andamento recebe uma cópia do mesmo resultado (ou a mesma exceção). Nada é
+    guardado depois que a consulta termina, então não há perda de frescor.
+    """
+    key = (id(supabase_client), *key)
+    with _flights_lock:
+        flight = _flights.get(key)
+        leader = flight is None
+        if leader:
+            flight = _flights[key] = _Flight()
+        else:
+            flight.waiters += 1
+
+    if not leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return _clone(flight.result)
+
+    result, error = None, None
     try:
-        response = (
-            supabase_client.table("payment_methods")
-            .select("id,name")
-            .order("name")
-            .execute()
+        result = read()
+        return result
+    except BaseException as e:
+        error = e
+        raise
+    finally:
+        with _flights_lock:
+            del _flights[key]
+            waiters = flight.waiters
+        if waiters:
+            # Cópia antes de devolver: o líder pode alterar a própria lista
+            flight.result, flight.error = _clone(result), error
+        flight.done.set()
+
+
+# --- Dados de referência em cache ---
+class _Reference:
+    """Categorias e formas de pagamento carregadas de uma vez, com os {id: nome}."""
+
+    def __init__(
+        self, categories: list, payment_methods: list, after_miss: bool = False
+    ):
+        self.loaded_at = time.monotonic()
+        self.categories = categories
+        self.payment_methods = payment_methods
+        self.category_names = {cat["id"]: cat["name"] for cat in categories}
+        self.payment_names = {fp["id"]: fp["name"] for fp in payment_methods}
+        # Recarregada por causa de um id desconhecido: outro id ausente não recarrega
+        self.after_miss = after_miss
+
+
+class ReferenceData:
+    """
+    Categorias e formas de pagamento em cache por cliente, para resolver os nomes
+    das chaves estrangeiras dos gastos sem embutir `categories(name)` e
+    `payment_methods(name)` em cada linha. As entradas expiram após `ttl` segundos
+    e são descartadas pelas gravações feitas pelo bot (invalidate).
+    """
+
+    def __init__(self, ttl: int = REFERENCE_CACHE_TTL):
+        self.ttl = ttl
+        self._entries: "weakref.WeakKeyDictionary[Any, _Reference]" = (
+            weakref.WeakKeyDictionary()
         )
-        return response.data
-    except Exception as e:
-        print(f"Erro ao obter formas de pagamento do Supabase: {e}")
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def _get(self, supabase_client: Client, after_miss: bool = False) -> _Reference:
+        if not after_miss:
+            with self._lock:
+                entry = self._entries.get(supabase_client)
+            if entry and time.monotonic() - entry.loaded_at <= self.ttl:
+                return entry
+
+        with self._lock:
+            generation = self._generation
+        entry = _Reference(
+            get_categories(supabase_client),
+            get_payment_methods(supabase_client),
+            after_miss,
+        )
+        with self._lock:
+            # Uma gravação feita durante a carga invalida este resultado; listas
+            # vazias (banco novo ou falha já registrada) não ficam em cache
+            if generation == self._generation and (
+                entry.categories or entry.payment_methods
+            ):
+                self._entries[supabase_client] = entry
+        return entry
+
+    def categories(self, supabase_client: Client) -> list:
+        """Lista de categorias (mesmo formato de get_categories), do cache."""
+        return self._get(supabase_client).categories
+
+    def payment_methods(self, supabase_client: Client) -> list:
+        """Lista de formas de pagamento (mesmo formato de get_payment_methods)."""
+        return self._get(supabase_client).payment_methods
+
+    def names(
+        self,
+        supabase_client: Client,
+        category_ids: Iterable[Any] = (),
+        payment_ids: Iterable[Any] = (),
+    ) -> Tuple[Dict[Any, str], Dict[Any, str]]:
+        """
+        Retorna ({id: nome} das categorias, {id: nome} das formas de pagamento).
+        Um id informado que não está no cache (criado fora do bot) força uma
+        recarga, uma única vez por entrada.
+        """
+        entry = self._get(supabase_client)
+        if not entry.after_miss and (
+            not entry.category_names.keys() >= set(category_ids) - {None}
+            or not entry.payment_names.keys() >= set(payment_ids) - {None}
+        ):
+            entry = self._get(supabase_client, after_miss=True)
+        return entry.category_names, entry.payment_names
+
+    def invalidate(self, supabase_client: Union[Client, None] = None) -> None:
+        """Descarta o cache de um cliente (ou de todos)."""
+        with self._lock:
+            self._generation += 1
+            if supabase_client is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(supabase_client, None)
+
+
+reference_data = ReferenceData()
+
+
+def _gastos_from_rows(
+    supabase_client: Client, rows: List[Dict[str, Any]]
+) -> List[Gasto]:
+    """Monta os gastos de linhas só com chaves estrangeiras, com os nomes do cache."""
+    if not rows:
         return []
+    category_names, payment_names = reference_data.names(
+        supabase_client,
+        {row.get("category_id") for row in rows},
+        {row.get("payment_method_id") for row in rows},
+    )
+    return Gasto.from_rows(rows, category_names, payment_names)
 
 
+# --- Inserção em lote ---
+def _insert_chunk(
+    supabase_client: Client,
+    table: str,
+    chunk: List[Dict[str, Any]],
+    use_idempotency_key: bool,
+) -> List[Dict[str, Any]]:
+    """
+    Envia um bloco de linhas em uma única requisição multi-row. Retorna as linhas
+    gravadas, com id (duplicatas ignoradas pela chave de idempotência não voltam).
+    """
+    query = supabase_client.table(table)
+    if use_idempotency_key:
+        # Linhas com idempotency_key já gravado são ignoradas pelo Postgres
+        query = query.upsert(
+            chunk, on_conflict="idempotency_key", ignore_duplicates=True
+        )
+    else:
+        query = query.insert(chunk)
+    # Com chave de idempotência o reenvio é seguro; sem ela, uma tentativa só
+    return _execute(query, retry=use_idempotency_key, write=True).data or []
+
+
+def _insert_bulk(
+    supabase_client: Client,
+    table: str,
+    rows: Iterable[Dict[str, Any]],
+    chunk_size: int,
+    idempotency_key: Union[str, None],
+    return_rows: bool = False,
+) -> Dict[str, Any]:
+    """
+    Insere as linhas em blocos de até chunk_size. Consome o iterável sob demanda,
+    então nunca mantém mais que um bloco em memória (a não ser com return_rows).
+    Retorna {"inserted": int, "failed": [{"index", "row", "error"}]}; com
+    return_rows, também "rows": as linhas gravadas, com id.
+    """
+    result: Dict[str, Any] = {"inserted": 0, "failed": []}
+    if return_rows:
+        result["rows"] = []
+    chunk: List[Dict[str, Any]] = []
+    chunk_start = 0
+
+    def flush() -> None:
+        try:
+            written = _insert_chunk(
+                supabase_client,
+                table,
+                chunk,
+                any(row.get("idempotency_key") for row in chunk),
+            )
+            result["inserted"] += len(chunk)
+            if return_rows:
+                result["rows"].extend(written)
+        except Exception as e:
+            metrics.mark_error()
+            logger.error(
+                "Erro ao inserir bloco de %s linhas em '%s' no Supabase: %s",
+                len(chunk),
+                table,
+                e,
+            )
+            result["failed"].extend(
+                {"index": chunk_start + offset, "row": row, "error": str(e)}
+                for offset, row in enumerate(chunk)
+            )
+
+    for index, row in enumerate(rows):
+        if idempotency_key is not None and not row.get("idempotency_key"):
+            # Chave determinística por linha: reenviar o mesmo lote não duplica nada
+            row = {**row, "idempotency_key": f"{idempotency_key}:{index}"}
+        if not chunk:
+            chunk_start = index
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            flush()
+            chunk = []
+
+    if chunk:
+        flush()
+    return result
+
+
+# --- Funções para Formas de Pagamento ---
+@metrics.timed("db")
+@_db_call([], "Erro ao obter formas de pagamento do Supabase")
+def get_payment_methods(supabase_client: Client) -> list:
+    """Obtém todas as formas de pagamento do Supabase."""
+    query = supabase_client.table("payment_methods").select("id,name").order("name")
+    return _single_flight(
+        supabase_client, ("payment_methods",), lambda: _execute(query).data
+    )
+
+
+@metrics.timed("db")
+@_db_call(None, "Erro ao buscar ID da forma de pagamento '{name}'")
 def get_payment_method_id_by_name(
     supabase_client: Client, name: str
 ) -> Union[str, None]:
     """Obtém o ID de uma forma de pagamento pelo name (case-insensitive)."""
-    try:
-        name_lower = name.lower()
-        response = supabase_client.table("payment_methods").select("id,name").execute()
+    name_lower = name.lower()
+    response = _execute(supabase_client.table("payment_methods").select("id,name"))
 
-        for fp in response.data:
-            if fp["name"].lower() == name_lower:
-                return fp["id"]
-        return None
-    except Exception as e:
-        print(f"Erro ao buscar ID da forma de pagamento '{name}': {e}")
-        return None
+    for fp in response.data:
+        if fp["name"].lower() == name_lower:
+            return fp["id"]
+    return None
 
 
 # --- Funções para Gastos ---
+@metrics.timed("db")
+@_db_call(None, "Erro ao adicionar gasto ao Supabase")
 def add_expense(
     supabase_client: Client,
     value: float,
@@ -51,137 +374,502 @@ def add_expense(
     date: str,
     payment_method_id: Union[str, None] = None,
     description: Union[str, None] = None,
-) -> bool:
-    """Adiciona um novo gasto ao Supabase, incluindo a descrição e forma de pagamento."""
-    try:
-        (
-            supabase_client.table("expenses")
-            .insert(
-                {
-                    "value": value,
-                    "category_id": category_id,
-                    "date": date,
-                    "payment_method_id": payment_method_id,
-                    "description": description,
-                }
-            )
-            .execute()
+) -> Union[Dict[str, Any], None]:
+    """
+    Adiciona um novo gasto ao Supabase, incluindo a descrição e forma de pagamento.
+    Retorna a linha gravada (com id), ou None se a gravação falhar.
+    """
+    row = {
+        "value": value,
+        "category_id": category_id,
+        "date": date,
+        "payment_method_id": payment_method_id,
+        "description": description,
+    }
+    response = _execute(
+        supabase_client.table("expenses").insert(row),
+        retry=False,
+        write=True,
+    )
+    return (response.data or [row])[0]
+
+
+@metrics.timed("db")
+def add_expenses(
+    supabase_client: Client, expenses: List[Dict[str, Any]]
+) -> Union[List[Dict[str, Any]], None]:
+    """
+    Adiciona vários gastos ao Supabase em uma única requisição.
+    Cada item deve ter as chaves 'value', 'category_id', 'date' e, opcionalmente,
+    'payment_method_id' e 'description'. Retorna as linhas gravadas (com id), ou
+    None se algum gasto não foi gravado.
+    """
+    if not expenses:
+        return None
+
+    result = add_expenses_bulk(supabase_client, expenses, return_rows=True)
+    if result["failed"]:
+        return None
+    # Resposta sem as linhas (return=minimal): devolve os próprios itens, sem id
+    return result["rows"] or [dict(expense) for expense in expenses]
+
+
+@metrics.timed("db")
+def add_expenses_bulk(
+    supabase_client: Client,
+    expenses: Iterable[Dict[str, Any]],
+    chunk_size: int = BULK_CHUNK_SIZE,
+    idempotency_key: Union[str, None] = None,
+    return_rows: bool = False,
+) -> Dict[str, Any]:
+    """
+    Insere gastos em blocos multi-row (uma requisição por bloco de chunk_size).
+    Com idempotency_key, cada linha recebe a chave '<idempotency_key>:<índice>' e
+    linhas já gravadas são ignoradas, então um retry do mesmo lote não duplica gastos.
+    Linhas que já trazem 'idempotency_key' próprio (ex: fila de escrita) o mantêm.
+    Retorna {"inserted": int, "failed": [{"index", "row", "error"}]}; com
+    return_rows, também "rows" com as linhas gravadas (com id).
+    """
+    rows = (
+        {
+            "value": expense["value"],
+            "category_id": expense["category_id"],
+            "date": expense["date"],
+            "payment_method_id": expense.get("payment_method_id"),
+            "description": expense.get("description"),
+            **(
+                {"idempotency_key": expense["idempotency_key"]}
+                if expense.get("idempotency_key")
+                else {}
+            ),
+        }
+        for expense in expenses
+    )
+    return _insert_bulk(
+        supabase_client, "expenses", rows, chunk_size, idempotency_key, return_rows
+    )
+
+
+@metrics.timed("db")
+@_db_call([], "Erro ao obter gastos do Supabase")
+def get_gastos(supabase_client: Client) -> List[Gasto]:
+    """Obtém todos os gastos do Supabase, dos mais recentes aos mais antigos."""
+    rows = [
+        row
+        for page in _iter_pages(
+            supabase_client,
+            "expenses",
+            "value,category_id,payment_method_id,date,description",
+            SUPABASE_MAX_ROWS,
+            data_inicio=None,
+            data_fim=None,
+            descending=True,
         )
-        return True
-    except Exception as e:
-        print(f"Erro ao adicionar gasto ao Supabase: {e}")
-        return False
+        for row in page
+    ]
+    return _gastos_from_rows(supabase_client, rows)
 
 
-def get_gastos(supabase_client: Client) -> list:
-    """Obtém todos os gastos do Supabase."""
-    try:
-        response = (
-            supabase_client.table("expenses")
-            .select(
-                "value,category_id,date,description,payment_methods(name),categories(name)"
+def _apply_gastos_filters(
+    query: Any,
+    data_inicio: Union[str, None] = None,
+    data_fim: Union[str, None] = None,
+    category_id: Union[str, None] = None,
+) -> Any:
+    """Aplica os filtros opcionais de período e categoria a uma consulta de gastos."""
+    if data_inicio:
+        query = query.gte("date", data_inicio)
+    if data_fim:
+        query = query.lte("date", data_fim)
+    if category_id:
+        query = query.eq("category_id", category_id)
+    return query
+
+
+def _iter_pages(
+    supabase_client: Client,
+    table: str,
+    columns: str,
+    page_size: int,
+    data_inicio: Union[str, None],
+    data_fim: Union[str, None],
+    category_id: Union[str, None] = None,
+    descending: bool = False,
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Percorre as linhas de `table` página a página, ordenadas por data e id (as
+    mais recentes primeiro com `descending`), com os filtros aplicados no
+    servidor. page_size é limitado a SUPABASE_MAX_ROWS e a iteração só termina
+    numa página vazia: o servidor pode devolver menos linhas que o pedido sem que
+    a tabela tenha acabado. Se uma página falhar, registra o erro e o propaga
+    (uma resposta que não é lista também conta como falha): quem consome não pode
+    tratar um histórico interrompido como completo. Leituras simultâneas da mesma
+    página são feitas uma vez só (_single_flight).
+    """
+    page_size = min(page_size, SUPABASE_MAX_ROWS)
+    filters = (table, columns, data_inicio, data_fim, category_id, descending)
+    start = 0
+    while True:
+        try:
+            query = _apply_gastos_filters(
+                supabase_client.table(table).select(columns),
+                data_inicio,
+                data_fim,
+                category_id,
+            )
+            query = (
+                query.order("date", desc=descending)
+                .order("id", desc=descending)
+                .range(start, start + page_size - 1)
+            )
+            page = _single_flight(
+                supabase_client,
+                ("page", *filters, start, page_size),
+                lambda query=query: _execute(query).data,
             )
-            .order("date", desc=True)
-            .execute()
+        except Exception as e:
+            metrics.mark_error()
+            logger.error(
+                "Erro ao paginar '%s' do Supabase (offset %s): %s", table, start, e
+            )
+            raise
+        # Uma resposta que não é lista não tem como avançar o offset: parar ou
+        # repetir a mesma página para sempre; falha como qualquer outra página ruim
+        if not isinstance(page, list):
+            metrics.mark_error()
+            logger.error(
+                "Página inválida de '%s' do Supabase (offset %s): %r",
+                table,
+                start,
+                type(page),
+            )
+            raise TypeError(f"Página de '{table}' não é uma lista: {type(page)!r}")
+        if len(page) == 0:
+            return
+        yield page
+        start += len(page)
+
+
+def iter_gastos_pages(
+    supabase_client: Client,
+    page_size: int = 1000,
+    data_inicio: Union[str, None] = None,
+    data_fim: Union[str, None] = None,
+    category_id: Union[str, None] = None,
+    columns: str = "id,value,date,description,category_id,payment_method_id",
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Percorre os gastos página a página (filtros aplicados no servidor), para
+    exportações e relatórios que não podem carregar o histórico inteiro em memória.
+    """
+    return _iter_pages(
+        supabase_client,
+        "expenses",
+        columns,
+        page_size,
+        data_inicio,
+        data_fim,
+        category_id,
+    )
+
+
+def iter_ganhos_pages(
+    supabase_client: Client,
+    page_size: int = 1000,
+    data_inicio: Union[str, None] = None,
+    data_fim: Union[str, None] = None,
+    columns: str = "id,value,date,description",
+) -> Iterator[List[Dict[str, Any]]]:
+    """Percorre os ganhos página a página, como iter_gastos_pages."""
+    return _iter_pages(
+        supabase_client, "ganhos", columns, page_size, data_inicio, data_fim
+    )
+
+
+@metrics.timed("db")
+def get_ledger(
+    supabase_client: Client,
+    data_inicio: Union[str, None] = None,
+    data_fim: Union[str, None] = None,
+    category_id: Union[str, None] = None,
+) -> Ledger:
+    """
+    Carrega os gastos (filtrados no servidor) num Ledger colunar. Busca só as
+    chaves estrangeiras, página a página; os nomes vêm das tabelas de categorias
+    e formas de pagamento, sem recursos embutidos em cada linha.
+    """
+    return Ledger.from_pages(
+        iter_gastos_pages(
+            supabase_client,
+            data_inicio=data_inicio,
+            data_fim=data_fim,
+            category_id=category_id,
+            columns="value,date,description,category_id,payment_method_id",
+        ),
+        reference_data.categories(supabase_client),
+        reference_data.payment_methods(supabase_client),
+    )
+
+
+@metrics.timed("db")
+def get_gastos_page(
+    supabase_client: Client,
+    limit: int,
+    cursor: Union[Dict[str, str], None] = None,
+    data_inicio: Union[str, None] = None,
+    data_fim: Union[str, None] = None,
+    category_id: Union[str, None] = None,
+) -> List[Gasto]:
+    """
+    Obtém uma página de gastos, do mais recente para o mais antigo, usando
+    paginação por chave (keyset) em (date, id): cursor é {"date", "id"} do último
+    gasto da página anterior. Cada página custa uma consulta indexada, sem offset.
+    Falhas sobem, como em _iter_pages: uma página vazia significa "nenhum gasto".
+    """
+    query = _apply_gastos_filters(
+        supabase_client.table("expenses").select(
+            "id,value,date,description,category_id,payment_method_id"
+        ),
+        data_inicio,
+        data_fim,
+        category_id,
+    )
+    if cursor:
+        query = query.or_(
+            f"date.lt.{cursor['date']},"
+            f"and(date.eq.{cursor['date']},id.lt.{cursor['id']})"
         )
-        gastos_formatados = []
-        for gasto in response.data:
-            gasto_copy = gasto.copy()
-            if (
-                "categories" in gasto_copy
-                and gasto_copy["categories"]
-                and "name" in gasto_copy["categories"]
-            ):
-                gasto_copy["categoria_nome"] = gasto_copy["categories"]["name"]
-            else:
-                gasto_copy["categoria_nome"] = "Desconhecida"
-            del gasto_copy["categories"]
-
-            # Pega o nome da forma de pagamento
-            if (
-                "payment_methods" in gasto_copy
-                and gasto_copy["payment_methods"]
-                and "name" in gasto_copy["payment_methods"]
-            ):
-                gasto_copy["forma_pagamento_nome"] = gasto_copy["payment_methods"][
-                    "name"
-                ]
-            else:
-                gasto_copy["forma_pagamento_nome"] = "Não Informado"
-            del gasto_copy["payment_methods"]  # Remove o objeto aninhado
+    response = _execute(
+        query.order("date", desc=True).order("id", desc=True).limit(limit)
+    )
+    return _gastos_from_rows(supabase_client, response.data)
 
-            gastos_formatados.append(gasto_copy)
-        return gastos_formatados
-    except Exception as e:
-        print(f"Erro ao obter gastos do Supabase: {e}")
-        return []
+
+# Clientes cujo PostgREST recusou funções de agregação (consultados só uma vez)
+_without_aggregates: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+
+@metrics.timed("db")
+def get_gastos_summary(
+    supabase_client: Client,
+    data_inicio: Union[str, None] = None,
+    data_fim: Union[str, None] = None,
+    category_id: Union[str, None] = None,
+) -> Dict[str, Any]:
+    """
+    Retorna {"count": int, "total": float} dos gastos filtrados (usado no
+    cabeçalho da listagem paginada). Contagem e soma são feitas no servidor, numa
+    consulta só; se o PostgREST não aceitar funções de agregação
+    (db-aggregates-enabled desligado), soma a coluna de valor página a página.
+    """
+    if supabase_client not in _without_aggregates:
+        try:
+            query = _apply_gastos_filters(
+                supabase_client.table("expenses").select("count(),value.sum()"),
+                data_inicio,
+                data_fim,
+                category_id,
+            )
+            row = _execute(query).data[0]
+            return {
+                "count": int(row["count"]),
+                "total": from_cents(to_cents(row["sum"] or 0)),
+            }
+        except DependencyUnavailableError:
+            raise
+        except Exception as e:
+            logger.info("Agregações indisponíveis no PostgREST, somando páginas: %s", e)
+            _without_aggregates.add(supabase_client)
+
+    count, cents = 0, 0
+    for page in iter_gastos_pages(
+        supabase_client,
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        category_id=category_id,
+        columns="value",
+    ):
+        count += len(page)
+        cents += sum_money(row["value"] for row in page)
+    return {"count": count, "total": from_cents(cents)}
 
 
-def get_expense_by_category(supabase_client: Client, category_id: str) -> list:
+@metrics.timed("db")
+@_db_call([], "Erro ao obter histórico de descrições do Supabase")
+def get_expense_descriptions(supabase_client: Client) -> list:
+    """
+    Obtém apenas descrição e categoria de todos os gastos (histórico usado para
+    categorizar lançamentos importados sem chamar o LLM), página a página para não
+    parar no max-rows do PostgREST.
+    """
+    return [
+        row
+        for page in iter_gastos_pages(
+            supabase_client, columns="description,category_id"
+        )
+        for row in page
+    ]
+
+
+@metrics.timed("db")
+@_db_call([], "Erro ao obter gastos da categoria {category_id} do Supabase")
+def get_expense_by_category(supabase_client: Client, category_id: str) -> List[Gasto]:
     """Obtém os gastos de uma categoria específica do Supabase."""
-    try:
-        # ATENÇÃO AQUI: Mudado para 'payment_methods(nome)' (plural)
-        response = (
-            supabase_client.table("expenses")
-            .select("value,date,description,payment_methods(name)")
-            .eq("category_id", category_id)
-            .execute()
+    rows = [
+        row
+        for page in iter_gastos_pages(
+            supabase_client,
+            category_id=category_id,
+            columns="value,date,description,payment_method_id",
         )
-        gastos_formatados = []
-        for gasto in response.data:
-            gasto_copy = gasto.copy()
-            # ATENÇÃO AQUI: Mudado para 'payment_methods' (plural) para extrair o nome
-            if (
-                "payment_methods" in gasto_copy
-                and gasto_copy["payment_methods"]
-                and "name" in gasto_copy["payment_methods"]
-            ):
-                gasto_copy["forma_pagamento_nome"] = gasto_copy["payment_methods"][
-                    "name"
-                ]
-            else:
-                gasto_copy["forma_pagamento_nome"] = "Não Informado"
-            del gasto_copy["payment_methods"]
-            gastos_formatados.append(gasto_copy)
-        return gastos_formatados
-    except Exception as e:
-        print(f"Erro ao obter gastos da categoria {category_id} do Supabase: {e}")
-        return []
+        for row in page
+    ]
+    return _gastos_from_rows(supabase_client, rows)
+
+
+@metrics.timed("db")
+def find_expenses(
+    supabase_client: Client,
+    data_inicio: Union[str, None] = None,
+    data_fim: Union[str, None] = None,
+    value: Union[float, None] = None,
+    category_id: Union[str, None] = None,
+    limit: int = 50,
+) -> List[Gasto]:
+    """
+    Gastos mais recentes que atendem aos filtros, aplicados no servidor: período,
+    valor (o mesmo centavo) e categoria. Usado para achar o gasto que o usuário
+    quer editar sem baixar o histórico. Falhas sobem, em vez de virar "nenhum
+    gasto encontrado".
+    """
+    query = _apply_gastos_filters(
+        supabase_client.table("expenses").select(
+            "id,value,date,description,category_id,payment_method_id"
+        ),
+        data_inicio,
+        data_fim,
+        category_id,
+    )
+    if value is not None:
+        # Faixa de meio centavo: value é float no banco
+        query = query.gte("value", value - 0.005).lte("value", value + 0.005)
+    response = _execute(
+        query.order("date", desc=True).order("id", desc=True).limit(limit)
+    )
+    return _gastos_from_rows(supabase_client, response.data)
+
+
+@metrics.timed("db")
+@_db_call(False, "Erro ao atualizar gasto {expense_id} no Supabase")
+def update_expense(
+    supabase_client: Client, expense_id: str, changes: Dict[str, Any]
+) -> bool:
+    """Atualiza as colunas em `changes` de um gasto (value, date, description...)."""
+    _execute(
+        supabase_client.table("expenses").update(changes).eq("id", expense_id),
+        write=True,
+    )
+    return True
+
+
+@metrics.timed("db")
+@_db_call(False, "Erro ao excluir gasto {expense_id} do Supabase")
+def delete_expense(supabase_client: Client, expense_id: str) -> bool:
+    """Remove um gasto pelo id."""
+    _execute(
+        supabase_client.table("expenses").delete().eq("id", expense_id),
+        write=True,
+    )
+    return True
 
 
 # --- Funções para Ganhos ---
+@metrics.timed("db")
+@_db_call(False, "Erro ao adicionar ganho ao Supabase")
 def add_ganho(
     supabase_client: Client, value: float, description: str, date: str
 ) -> bool:
     """Adiciona um novo ganho ao Supabase."""
-    try:
-        (
-            supabase_client.table("ganhos")
-            .insert({"value": value, "description": description, "date": date})
-            .execute()
+    _execute(
+        supabase_client.table("ganhos").insert(
+            {"value": value, "description": description, "date": date}
+        ),
+        retry=False,
+        write=True,
+    )
+    return True
+
+
+@metrics.timed("db")
+def add_ganhos_bulk(
+    supabase_client: Client,
+    ganhos: Iterable[Dict[str, Any]],
+    chunk_size: int = BULK_CHUNK_SIZE,
+    idempotency_key: Union[str, None] = None,
+) -> Dict[str, Any]:
+    """
+    Insere ganhos em blocos multi-row. Mesmo contrato de add_expenses_bulk;
+    cada item deve ter 'value', 'description' e 'date'.
+    """
+    rows = (
+        {
+            "value": ganho["value"],
+            "description": ganho["description"],
+            "date": ganho["date"],
+            **(
+                {"idempotency_key": ganho["idempotency_key"]}
+                if ganho.get("idempotency_key")
+                else {}
+            ),
+        }
+        for ganho in ganhos
+    )
+    return _insert_bulk(supabase_client, "ganhos", rows, chunk_size, idempotency_key)
+
+
+@metrics.timed("db")
+@_db_call([], "Erro ao obter ganhos do Supabase")
+def get_ganhos(supabase_client: Client) -> List[Ganho]:
+    """Obtém todos os ganhos do Supabase, dos mais recentes aos mais antigos."""
+    return [
+        Ganho.from_row(row)
+        for page in _iter_pages(
+            supabase_client,
+            "ganhos",
+            "value,description,date",
+            SUPABASE_MAX_ROWS,
+            data_inicio=None,
+            data_fim=None,
+            descending=True,
         )
-        return True
-    except Exception as e:
-        print(f"Erro ao adicionar ganho ao Supabase: {e}")
-        return False
+        for row in page
+    ]
 
 
-def get_ganhos(supabase_client: Client) -> list:
-    """Obtém todos os ganhos do Supabase."""
-    try:
-        response = (
-            supabase_client.table("ganhos")
-            .select("value,description,date")
-            .order("date", desc=True)
-            .execute()
+@metrics.timed("db")
+@_db_call(0.0, "Erro ao obter total de ganhos do Supabase")
+def get_ganhos_total(
+    supabase_client: Client,
+    data_inicio: Union[str, None] = None,
+    data_fim: Union[str, None] = None,
+) -> float:
+    """Soma dos ganhos no período, buscando apenas a coluna de valor."""
+    return from_cents(
+        sum(
+            sum_money(row["value"] for row in page)
+            for page in iter_ganhos_pages(
+                supabase_client,
+                data_inicio=data_inicio,
+                data_fim=data_fim,
+                columns="value",
+            )
         )
-        return response.data
-    except Exception as e:
-        print(f"Erro ao obter ganhos do Supabase: {e}")
-        return []
+    )
 
 
 # --- Funções para Categorias ---
+@metrics.timed("db")
+@_db_call(False, "Erro ao adicionar categoria ao Supabase")
 def add_category(
     supabase_client: Client,
     name: str,
@@ -191,50 +879,44 @@ def add_category(
     """Adiciona uma nova categoria ao Supabase."""
     name_camel_case = to_camel_case(name)
 
-    try:
-        existing_category = (
-            supabase_client.table("categories")
-            .select("id")
-            .eq("name", name_camel_case)
-            .execute()
-            .data
-        )
-        if existing_category:
-            print(f"Categoria '{name_camel_case}' já existe.")
-            return False
-
-        (
-            supabase_client.table("categories")
-            .insert(
-                {
-                    "name": name_camel_case,
-                    "monthly_limit": monthly_limit,
-                    "aliases": aliases,
-                }
-            )
-            .execute()
-        )
-        return True
-    except Exception as e:
-        print(f"Erro ao adicionar categoria ao Supabase: {e}")
+    existing_category = _execute(
+        supabase_client.table("categories").select("id").eq("name", name_camel_case)
+    ).data
+    if existing_category:
+        logger.info("Categoria '%s' já existe.", name_camel_case)
         return False
 
+    _execute(
+        supabase_client.table("categories").insert(
+            {
+                "name": name_camel_case,
+                "monthly_limit": monthly_limit,
+                "aliases": aliases,
+            }
+        ),
+        retry=False,
+        write=True,
+    )
+    reference_data.invalidate(supabase_client)
+    return True
 
-def get_categories(supabase_client: Client) -> list:
+
+@metrics.timed("db")
+@_db_call([], "Erro ao obter categorias do Supabase")
+def get_categories(supabase_client: Client) -> List[Categoria]:
     """Obtém todas as categorias do Supabase."""
-    try:
-        response = (
-            supabase_client.table("categories")
-            .select("id,name,monthly_limit,aliases")
-            .order("name")
-            .execute()
-        )
-        return response.data
-    except Exception as e:
-        print(f"Erro ao obter categorias do Supabase: {e}")
-        return []
+    query = (
+        supabase_client.table("categories")
+        .select("id,name,monthly_limit,aliases")
+        .order("name")
+    )
+    rows = _single_flight(
+        supabase_client, ("categories",), lambda: _execute(query).data
+    )
+    return [Categoria.from_row(row) for row in rows]
 
 
+@metrics.timed("db")
 def get_category_id_by_text(
     supabase_client: Client, text_from_llama: str
 ) -> Union[str, None]:
@@ -242,9 +924,18 @@ def get_category_id_by_text(
     Tenta encontrar o ID da categoria com base no texto extraído pelo Llama.
     Prioriza correspondência exata, depois busca em aliases.
     """
-    nome_normalizado_llama = to_camel_case(text_from_llama)
-
     categorias = get_categories(supabase_client)
+    return find_category_id_in_list(categorias, text_from_llama)
+
+
+def find_category_id_in_list(
+    categorias: List[Dict[str, Any]], text_from_llama: str
+) -> Union[str, None]:
+    """
+    Mesma busca de get_category_id_by_text, mas sobre uma lista de categorias já
+    carregada (evita uma consulta ao banco por item ao resolver vários gastos).
+    """
+    nome_normalizado_llama = to_camel_case(text_from_llama)
     text_lower = text_from_llama.lower()
 
     for cat in categorias:
@@ -259,6 +950,7 @@ def get_category_id_by_text(
     return None
 
 
+@metrics.timed("db")
 def find_similar_categories(supabase_client: Client, text: str) -> List[Dict[str, Any]]:
     """
     Busca categorias existentes que são similares ao texto fornecido,
@@ -271,9 +963,7 @@ def find_similar_categories(supabase_client: Client, text: str) -> List[Dict[str
     categorias_do_banco = get_categories(supabase_client)
     existing_category_names = [cat["name"] for cat in categorias_do_banco]
 
-    llama_suggestion_name = suggest_category_from_llama(
-        text, existing_category_names, supabase_client
-    )
+    llama_suggestion_name = suggest_category_from_llama(text, existing_category_names)
 
     if llama_suggestion_name:
         for cat in categorias_do_banco:
@@ -332,35 +1022,33 @@ def find_similar_categories(supabase_client: Client, text: str) -> List[Dict[str
     return unique_similar_cats
 
 
+@metrics.timed("db")
+@_db_call(False, "Erro ao atualizar limite da categoria")
 def update_categoria_limite(
     supabase_client: Client, category_id: str, new_limit: Union[float, None]
 ) -> bool:
     """Atualiza o limite mensal de uma categoria."""
-    try:
-        (
-            supabase_client.table("categories")
-            .update({"monthly_limit": new_limit})
-            .eq("id", category_id)
-            .execute()
-        )
-        return True
-    except Exception as e:
-        print(f"Erro ao atualizar limite da categoria: {e}")
-        return False
+    _execute(
+        supabase_client.table("categories")
+        .update({"monthly_limit": new_limit})
+        .eq("id", category_id),
+        write=True,
+    )
+    reference_data.invalidate(supabase_client)
+    return True
 
 
+@metrics.timed("db")
+@_db_call(False, "Erro ao atualizar aliases da categoria")
 def update_category_aliases(
     supabase_client: Client, category_id: str, new_aliases: List[str]
 ) -> bool:
     """Atualiza os aliases de uma categoria."""
-    try:
-        (
-            supabase_client.table("categories")
-            .update({"aliases": new_aliases})
-            .eq("id", category_id)
-            .execute()
-        )
-        return True
-    except Exception as e:
-        print(f"Erro ao atualizar aliases da categoria: {e}")
-        return False
+    _execute(
+        supabase_client.table("categories")
+        .update({"aliases": new_aliases})
+        .eq("id", category_id),
+        write=True,
+    )
+    reference_data.invalidate(supabase_client)
+    return True
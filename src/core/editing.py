@@ -0,0 +1,127 @@
+# src/core/editing.py
+import datetime
+from typing import Any, Dict, List, Union
+
+from supabase import Client
+
+from src.core import db
+from src.core.models import Gasto
+from src.core.search import SearchIndex, query_terms
+from src.utils.money import to_cents
+from src.utils.text_utils import tokenize
+
+# Dias antes/depois da data informada em que o gasto a editar é procurado
+EDIT_DATE_WINDOW_DAYS = 3
+# Quantos gastos, no máximo, cada filtro traz do banco para a classificação
+EDIT_POOL_SIZE = 50
+
+
+def parse_date(text: Any) -> Union[str, None]:
+    """Data 'AAAA-MM-DD' de um texto 'AAAA-MM-DD' ou 'DD/MM/AAAA', ou None se inválido."""
+    for date_format in ("%Y-%m-%d", "%d/%m/%Y"):
+        try:
+            return str(
+                datetime.datetime.strptime(str(text).strip(), date_format).date()
+            )
+        except ValueError:
+            continue
+    return None
+
+
+def _date_window(date: Union[str, None]) -> Dict[str, Union[str, None]]:
+    date = parse_date(date) if date else None
+    if not date:
+        return {"data_inicio": None, "data_fim": None}
+    day = datetime.date.fromisoformat(date)
+    delta = datetime.timedelta(days=EDIT_DATE_WINDOW_DAYS)
+    return {"data_inicio": str(day - delta), "data_fim": str(day + delta)}
+
+
+def score_candidate(
+    gasto: Gasto,
+    value: Union[float, None] = None,
+    date: Union[str, None] = None,
+    terms: Union[List[str], None] = None,
+    category_id: Union[str, None] = None,
+) -> int:
+    """
+    Pontua o quanto um gasto combina com o que o usuário descreveu: valor exato
+    (3), data exata (2) ou próxima (1), cada termo da descrição encontrado como
+    prefixo de uma palavra (2) e a categoria (1). Zero significa que nada bate.
+    """
+    score = 0
+    if value is not None and gasto.cents == to_cents(value):
+        score += 3
+    date = parse_date(date) if date else None
+    if date:
+        distance = abs(
+            (
+                datetime.date.fromisoformat(str(gasto["date"])[:10])
+                - datetime.date.fromisoformat(date)
+            ).days
+        )
+        if distance == 0:
+            score += 2
+        elif distance <= EDIT_DATE_WINDOW_DAYS:
+            score += 1
+    if terms:
+        words = tokenize(gasto.get("description"))
+        score += 2 * sum(
+            1 for term in terms if any(word.startswith(term) for word in words)
+        )
+    if category_id and gasto.get("category_id") == category_id:
+        score += 1
+    return score
+
+
+def find_edit_candidates(
+    supabase_client: Client,
+    search_index: Union[SearchIndex, None],
+    value: Union[float, None] = None,
+    date: Union[str, None] = None,
+    description: Union[str, None] = None,
+    category_id: Union[str, None] = None,
+    limit: int = 5,
+) -> List[Gasto]:
+    """
+    Gastos que o usuário provavelmente quer editar, do mais provável para o menos.
+    Os candidatos vêm de consultas filtradas no servidor (valor e/ou janela de
+    datas; se nada aparecer, só o valor) e do índice de descrições, nunca do
+    histórico inteiro; depois são classificados por score_candidate.
+    """
+    terms = query_terms(description) if description else []
+    # Data vinda do LLM: se não for uma data válida, a busca segue sem ela
+    date = parse_date(date) if date else None
+    window = _date_window(date)
+    pool: Dict[Any, Gasto] = {}
+
+    if value is not None or date:
+        found = db.find_expenses(
+            supabase_client, value=value, limit=EDIT_POOL_SIZE, **window
+        )
+        if not found and value is not None and date:
+            found = db.find_expenses(supabase_client, value=value, limit=EDIT_POOL_SIZE)
+        pool.update((gasto["id"], gasto) for gasto in found)
+    elif category_id and not terms:
+        found = db.find_expenses(
+            supabase_client, category_id=category_id, limit=EDIT_POOL_SIZE
+        )
+        pool.update((gasto["id"], gasto) for gasto in found)
+
+    if terms and search_index is not None:
+        result = search_index.search(
+            supabase_client, description, limit=EDIT_POOL_SIZE, **window
+        )
+        pool.update(
+            (gasto["id"], gasto)
+            for gasto in result["gastos"]
+            if gasto["id"] is not None
+        )
+
+    scored = [
+        (score_candidate(gasto, value, date, terms, category_id), gasto)
+        for gasto in pool.values()
+    ]
+    scored = [item for item in scored if item[0] > 0]
+    scored.sort(key=lambda item: (item[0], str(item[1]["date"])), reverse=True)
+    return [gasto for _, gasto in scored[:limit]]
@@ -0,0 +1,147 @@
+# src/core/export.py
+import csv
+import gzip
+import os
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Union
+
+from supabase import Client
+
+from src.core import db
+from src.core.log import get_logger
+
+logger = get_logger(__name__)
+
+# pyarrow é opcional: sem ele, a exportação fica disponível apenas em CSV
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+EXPORT_COLUMNS = ["date", "value", "description", "categoria", "forma_pagamento"]
+EXPORT_PAGE_SIZE = 1000
+
+
+def parquet_available() -> bool:
+    """Indica se a exportação em Parquet está disponível (pyarrow instalado)."""
+    return pq is not None
+
+
+def flatten_page(
+    page: List[Dict[str, Any]],
+    category_names: Union[Dict[Any, str], None] = None,
+    payment_names: Union[Dict[Any, str], None] = None,
+) -> List[Tuple[Any, ...]]:
+    """
+    Converte uma página de gastos do Supabase em tuplas na ordem de EXPORT_COLUMNS.
+    Os nomes vêm de {id: nome} pelas chaves estrangeiras ou dos recursos embutidos.
+    """
+    category_names = category_names or {}
+    payment_names = payment_names or {}
+    return [
+        (
+            gasto["date"],
+            gasto["value"],
+            gasto.get("description") or "",
+            category_names.get(gasto.get("category_id"))
+            or (gasto.get("categories") or {}).get("name")
+            or "Desconhecida",
+            payment_names.get(gasto.get("payment_method_id"))
+            or (gasto.get("payment_methods") or {}).get("name")
+            or "Não Informado",
+        )
+        for gasto in page
+    ]
+
+
+def write_csv_gz(
+    pages: Iterable[List[Dict[str, Any]]],
+    path: str,
+    category_names: Union[Dict[Any, str], None] = None,
+    payment_names: Union[Dict[Any, str], None] = None,
+) -> int:
+    """
+    Grava as páginas em um CSV compactado com gzip, uma página por vez.
+    Retorna a quantidade de linhas gravadas.
+    """
+    total = 0
+    with gzip.open(path, "wt", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(EXPORT_COLUMNS)
+        for page in pages:
+            rows = flatten_page(page, category_names, payment_names)
+            writer.writerows(rows)
+            total += len(rows)
+    return total
+
+
+def write_parquet(
+    pages: Iterable[List[Dict[str, Any]]],
+    path: str,
+    category_names: Union[Dict[Any, str], None] = None,
+    payment_names: Union[Dict[Any, str], None] = None,
+) -> int:
+    """
+    Grava as páginas em Parquet (compressão zstd), um row group por página.
+    Retorna a quantidade de linhas gravadas.
+    """
+    schema = pa.schema(
+        [
+            ("date", pa.string()),
+            ("value", pa.float64()),
+            ("description", pa.string()),
+            ("categoria", pa.string()),
+            ("forma_pagamento", pa.string()),
+        ]
+    )
+    total = 0
+    with pq.ParquetWriter(path, schema, compression="zstd") as writer:
+        for page in pages:
+            columns = list(zip(*flatten_page(page, category_names, payment_names)))
+            writer.write_table(pa.Table.from_arrays(list(columns), schema=schema))
+            total += len(page)
+    return total
+
+
+def export_ledger(
+    supabase_client: Client,
+    fmt: str = "csv",
+    data_inicio: Union[str, None] = None,
+    data_fim: Union[str, None] = None,
+    category_id: Union[str, None] = None,
+) -> Tuple[Union[str, None], int]:
+    """
+    Exporta os gastos filtrados para um arquivo temporário, paginando a consulta
+    para manter o uso de memória limitado a uma página.
+    Retorna (caminho do arquivo, quantidade de linhas); o caminho é None se não
+    houver gastos. Quem chama é responsável por apagar o arquivo.
+    """
+    pages: Iterator[List[Dict[str, Any]]] = db.iter_gastos_pages(
+        supabase_client,
+        page_size=EXPORT_PAGE_SIZE,
+        data_inicio=data_inicio,
+        data_fim=data_fim,
+        category_id=category_id,
+    )
+    # Páginas só com as chaves estrangeiras; os nomes vêm do cache de referência
+    names = db.reference_data.names(supabase_client)
+    suffix = ".parquet" if fmt == "parquet" else ".csv.gz"
+    fd, path = tempfile.mkstemp(prefix="gastos_", suffix=suffix)
+    os.close(fd)
+
+    try:
+        if fmt == "parquet":
+            total = write_parquet(pages, path, *names)
+        else:
+            total = write_csv_gz(pages, path, *names)
+    except Exception as e:
+        logger.error("Erro ao exportar gastos: %s", e)
+        os.remove(path)
+        raise
+
+    if total == 0:
+        os.remove(path)
+        return None, 0
+    return path, total
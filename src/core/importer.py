@@ -0,0 +1,410 @@
+# src/core/importer.py
+import csv
+import datetime
+import re
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, Iterator, List, TextIO, Union
+
+import numpy as np
+import pandas as pd
+
+from src.core.db import find_category_id_in_list
+from src.core.log import get_logger
+from src.utils.money import from_cents, parse_money, parse_money_array, to_cents
+from src.utils.text_utils import fold_text, tokenize
+
+logger = get_logger(__name__)
+
+# Nomes de colunas aceitos nos CSVs dos bancos (já sem acento e em minúsculas)
+CSV_DATE_COLUMNS = {"data", "date", "data lancamento", "data da transacao"}
+CSV_DESCRIPTION_COLUMNS = {
+    "descricao",
+    "description",
+    "historico",
+    "lancamento",
+    "memo",
+    "title",
+    "estabelecimento",
+}
+CSV_VALUE_COLUMNS = {"valor", "value", "amount", "valor (r$)"}
+
+# Linhas de CSV lidas por vez: a coluna de valor de cada página é convertida de
+# uma vez (parse_amounts), sem carregar o extrato inteiro
+CSV_PAGE_SIZE = 1000
+
+# Palavras que não ajudam a identificar a categoria de um lançamento
+STOPWORDS = {
+    "de",
+    "da",
+    "do",
+    "das",
+    "dos",
+    "em",
+    "no",
+    "na",
+    "com",
+    "compra",
+    "pagamento",
+    "pag",
+    "transferencia",
+    "enviada",
+    "recebida",
+    "pix",
+    "debito",
+    "credito",
+    "cartao",
+}
+
+
+def category_tokens(text: str) -> List[str]:
+    """Palavras de uma descrição úteis para categorização (sem números e stopwords)."""
+    return [
+        token
+        for token in tokenize(text)
+        if len(token) > 2 and not token.isdigit() and token not in STOPWORDS
+    ]
+
+
+# Marcador de débito/crédito no início ou no fim do valor: "D 45,90", "45,90C",
+# "45,90 (D)"
+_DC_MARKER = re.compile(
+    r"(?i)^\(?(?P<start>[DC])\)?(?=[\s\d(R$-])|(?<![A-Za-z])\(?(?P<end>[DC])\)?$"
+)
+
+
+def parse_amount(raw: str) -> Union[float, None]:
+    """
+    Converte valores como '1.234,56', '-45.90', 'R$ 10,98' ou '45,90 D' para
+    float. O marcador "D" (débito) deixa o valor negativo; "C" (crédito) mantém
+    o sinal do número.
+    """
+    text = (raw or "").strip()
+    marker = _DC_MARKER.search(text)
+    if marker:
+        text = text[: marker.start()] + text[marker.end() :]
+    cents = parse_money(re.sub(r"[^0-9,.\-]", "", text))
+    if cents is None:
+        return None
+    if marker and (marker["start"] or marker["end"]).upper() == "D":
+        return from_cents(-abs(cents))
+    return from_cents(cents)
+
+
+def parse_amounts(raws: Iterable[str]) -> List[Union[float, None]]:
+    """
+    Versão vetorizada de parse_amount para a coluna de valor de uma página do
+    extrato: mesmos formatos e marcadores D/C, com None nos valores inválidos.
+    """
+    text = pd.Series(list(raws), dtype=object).fillna("").astype(str).str.strip()
+    if text.empty:
+        return []
+    markers = text.str.extract(_DC_MARKER.pattern)
+    debit = (markers["start"].fillna(markers["end"]).str.upper() == "D").to_numpy()
+    numbers = text.str.replace(_DC_MARKER.pattern, "", n=1, regex=True).str.replace(
+        r"[^0-9,.\-]", "", regex=True
+    )
+    cents, valid = parse_money_array(numbers)
+    cents = np.where(debit, -np.abs(cents), cents)
+    return [
+        from_cents(value) if ok else None
+        for value, ok in zip(cents.tolist(), valid.tolist())
+    ]
+
+
+def parse_date(raw: str) -> Union[str, None]:
+    """Converte datas 'DD/MM/AAAA', 'AAAA-MM-DD' ou 'AAAAMMDD' para 'AAAA-MM-DD'."""
+    raw = (raw or "").strip()
+    for fmt, size in (
+        ("%d/%m/%Y", 10),
+        ("%Y-%m-%d", 10),
+        ("%Y%m%d", 8),
+        ("%d/%m/%y", 8),
+    ):
+        try:
+            return datetime.datetime.strptime(raw[:size], fmt).strftime("%Y-%m-%d")
+        except ValueError:
+            continue
+    return None
+
+
+def _make_transaction(
+    date: Union[str, None],
+    description: str,
+    value: Union[float, None],
+    ref: Union[str, None] = None,
+) -> Union[Dict[str, Any], None]:
+    """
+    Monta o lançamento normalizado; valores negativos são gastos, positivos ganhos.
+    `ref` identifica o lançamento dentro do extrato (FITID do OFX ou posição da
+    linha no arquivo) e não muda quando o mesmo arquivo é reenviado.
+    """
+    if not date or value is None or value == 0:
+        return None
+    return {
+        "date": date,
+        "description": description.strip() or "Sem descrição",
+        "value": round(abs(value), 2),
+        "tipo": "gasto" if value < 0 else "ganho",
+        "ref": ref,
+    }
+
+
+def iter_csv_transactions(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """
+    Lê um extrato CSV linha a linha (sem carregar o arquivo inteiro).
+    O separador (',' ou ';') é detectado pelo cabeçalho.
+    """
+    header_line = stream.readline()
+    if not header_line:
+        return
+    delimiter = ";" if header_line.count(";") > header_line.count(",") else ","
+    header = [
+        fold_text(col).strip()
+        for col in next(csv.reader([header_line], delimiter=delimiter))
+    ]
+
+    def column(names: set) -> Union[int, None]:
+        return next((i for i, col in enumerate(header) if col in names), None)
+
+    date_idx = column(CSV_DATE_COLUMNS)
+    description_idx = column(CSV_DESCRIPTION_COLUMNS)
+    value_idx = column(CSV_VALUE_COLUMNS)
+    if date_idx is None or value_idx is None:
+        logger.warning("Cabeçalho de CSV não reconhecido: %s", header)
+        return
+
+    def parse_page(page: List[tuple]) -> Iterator[Dict[str, Any]]:
+        values = parse_amounts(row[value_idx] for _, row in page)
+        for (line_number, row), value in zip(page, values):
+            description = (
+                row[description_idx]
+                if description_idx is not None and description_idx < len(row)
+                else ""
+            )
+            transaction = _make_transaction(
+                parse_date(row[date_idx]),
+                description,
+                value,
+                ref=f"linha{line_number}",
+            )
+            if transaction:
+                yield transaction
+
+    page: List[tuple] = []
+    for line_number, row in enumerate(csv.reader(stream, delimiter=delimiter), 1):
+        if len(row) <= max(date_idx, value_idx):
+            continue
+        page.append((line_number, row))
+        if len(page) >= CSV_PAGE_SIZE:
+            yield from parse_page(page)
+            page = []
+    yield from parse_page(page)
+
+
+OFX_TAG_RE = re.compile(r"<(/?)([A-Z.]+)>([^<\r\n]*)")
+
+
+def iter_ofx_transactions(stream: TextIO) -> Iterator[Dict[str, Any]]:
+    """
+    Lê um extrato OFX (SGML ou XML) linha a linha, emitindo um lançamento por
+    bloco <STMTTRN>. Funciona com tags sem fechamento, como no OFX 1.x.
+    """
+    current: Union[Dict[str, str], None] = None
+    block_number = 0
+    for line in stream:
+        for closing, tag, value in OFX_TAG_RE.findall(line):
+            if tag == "STMTTRN":
+                if closing and current is not None:
+                    block_number += 1
+                    transaction = _make_transaction(
+                        parse_date(current.get("DTPOSTED", "")),
+                        current.get("MEMO") or current.get("NAME", ""),
+                        parse_amount(current.get("TRNAMT", "")),
+                        ref=(
+                            f"fitid{current['FITID']}"
+                            if current.get("FITID")
+                            else f"bloco{block_number}"
+                        ),
+                    )
+                    if transaction:
+                        yield transaction
+                    current = None
+                elif not closing:
+                    current = {}
+            elif current is not None and not closing and value.strip():
+                current[tag] = value.strip()
+
+
+def iter_statement_transactions(
+    stream: TextIO, file_name: str
+) -> Iterator[Dict[str, Any]]:
+    """Escolhe o parser pelo nome do arquivo (.ofx ou .csv)."""
+    if file_name.lower().endswith(".ofx"):
+        return iter_ofx_transactions(stream)
+    return iter_csv_transactions(stream)
+
+
+def open_statement(path: str) -> TextIO:
+    """Abre o extrato em UTF-8 ou, se não for válido, em Latin-1 (comum em bancos)."""
+    with open(path, "rb") as f:
+        sample = f.read(64 * 1024)
+    try:
+        sample.decode("utf-8-sig")
+        encoding = "utf-8-sig"
+    except UnicodeDecodeError:
+        encoding = "latin-1"
+    return open(path, "r", encoding=encoding, errors="replace", newline="")
+
+
+class LocalCategorizer:
+    """
+    Categoriza lançamentos sem chamar o LLM, usando:
+    1. descrições idênticas já registradas no histórico;
+    2. nomes e aliases das categorias presentes na descrição;
+    3. votação dos tokens da descrição no histórico de gastos.
+    """
+
+    def __init__(
+        self,
+        categorias: List[Dict[str, Any]],
+        history: Iterable[Dict[str, Any]] = (),
+    ):
+        self.categorias = categorias
+        self.names = {cat["id"]: cat["name"] for cat in categorias}
+        self.fallback_id = find_category_id_in_list(categorias, "Outros")
+
+        self.keyword_to_category: Dict[str, str] = {}
+        for cat in categorias:
+            for keyword in [cat["name"]] + list(cat.get("aliases") or []):
+                for token in category_tokens(keyword):
+                    self.keyword_to_category.setdefault(token, cat["id"])
+
+        description_votes: Dict[str, Counter] = defaultdict(Counter)
+        self.token_votes: Dict[str, Counter] = defaultdict(Counter)
+        for gasto in history:
+            description = gasto.get("description")
+            category_id = gasto.get("category_id")
+            if not description or category_id not in self.names:
+                continue
+            description_votes[fold_text(description).strip()][category_id] += 1
+            for token in set(category_tokens(description)):
+                self.token_votes[token][category_id] += 1
+        self.exact_descriptions = {
+            description: votes.most_common(1)[0][0]
+            for description, votes in description_votes.items()
+        }
+
+    def categorize(self, description: str) -> Union[str, None]:
+        """Retorna o ID da categoria mais provável, ou a categoria 'Outros'."""
+        exact = self.exact_descriptions.get(fold_text(description).strip())
+        if exact:
+            return exact
+
+        tokens = category_tokens(description)
+        for token in tokens:
+            if token in self.keyword_to_category:
+                return self.keyword_to_category[token]
+
+        votes: Counter = Counter()
+        for token in tokens:
+            votes.update(self.token_votes.get(token, {}))
+        if votes:
+            return votes.most_common(1)[0][0]
+        return self.fallback_id
+
+
+def summarize_statement(
+    transactions: Iterable[Dict[str, Any]], categorizer: LocalCategorizer
+) -> Dict[str, Any]:
+    """
+    Percorre os lançamentos uma vez e acumula apenas os totais necessários para
+    o resumo de confirmação (memória constante, independente do tamanho do extrato).
+    """
+    summary: Dict[str, Any] = {
+        "gastos": 0,
+        "total_gastos": 0,
+        "ganhos": 0,
+        "total_ganhos": 0,
+        "sem_categoria": 0,
+        "por_categoria": Counter(),
+        "data_inicio": None,
+        "data_fim": None,
+    }
+    for transaction in transactions:
+        date = transaction["date"]
+        if summary["data_inicio"] is None or date < summary["data_inicio"]:
+            summary["data_inicio"] = date
+        if summary["data_fim"] is None or date > summary["data_fim"]:
+            summary["data_fim"] = date
+
+        if transaction["tipo"] == "ganho":
+            summary["ganhos"] += 1
+            summary["total_ganhos"] += to_cents(transaction["value"])
+            continue
+
+        category_id = categorizer.categorize(transaction["description"])
+        if not category_id:
+            summary["sem_categoria"] += 1
+            continue
+        summary["gastos"] += 1
+        cents = to_cents(transaction["value"])
+        summary["total_gastos"] += cents
+        summary["por_categoria"][categorizer.names[category_id]] += cents
+
+    # Soma em centavos (exata); o resumo sai em reais
+    summary["total_gastos"] = from_cents(summary["total_gastos"])
+    summary["total_ganhos"] = from_cents(summary["total_ganhos"])
+    summary["por_categoria"] = Counter(
+        {nome: from_cents(total) for nome, total in summary["por_categoria"].items()}
+    )
+    return summary
+
+
+def _with_idempotency_key(
+    row: Dict[str, Any], transaction: Dict[str, Any], key_prefix: Union[str, None]
+) -> Dict[str, Any]:
+    # A chave vem da posição do lançamento no extrato, não da posição entre as
+    # linhas geradas: reimportar depois de criar 'Outros' não desloca as chaves
+    if key_prefix is not None and transaction.get("ref"):
+        row["idempotency_key"] = f"{key_prefix}:{transaction['ref']}"
+    return row
+
+
+def iter_expense_rows(
+    transactions: Iterable[Dict[str, Any]],
+    categorizer: LocalCategorizer,
+    key_prefix: Union[str, None] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Gera as linhas de gastos no formato de db.add_expenses_bulk. Com key_prefix,
+    cada linha leva uma idempotency_key derivada da referência do lançamento.
+    """
+    for transaction in transactions:
+        if transaction["tipo"] != "gasto":
+            continue
+        category_id = categorizer.categorize(transaction["description"])
+        if not category_id:
+            continue
+        row = {
+            "value": transaction["value"],
+            "category_id": category_id,
+            "date": transaction["date"],
+            "payment_method_id": None,
+            "description": transaction["description"],
+        }
+        yield _with_idempotency_key(row, transaction, key_prefix)
+
+
+def iter_income_rows(
+    transactions: Iterable[Dict[str, Any]],
+    key_prefix: Union[str, None] = None,
+) -> Iterator[Dict[str, Any]]:
+    """Gera as linhas de ganhos no formato de db.add_ganhos_bulk."""
+    for transaction in transactions:
+        if transaction["tipo"] == "ganho":
+            row = {
+                "value": transaction["value"],
+                "description": transaction["description"],
+                "date": transaction["date"],
+            }
+            yield _with_idempotency_key(row, transaction, key_prefix)
@@ -0,0 +1,260 @@
+# src/core/ledger.py
+import datetime
+from typing import Any, Dict, Iterable, List, Tuple, Union
+
+import numpy as np
+
+from src.core.models import UNKNOWN_CATEGORY, UNKNOWN_PAYMENT_METHOD
+from src.utils.money import cents_array
+
+# Ordinal de 1970-01-01: converte o dia ordinal em datetime64[D]
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+
+def _code_dtype(size: int) -> np.dtype:
+    """Menor inteiro com sinal que comporta `size` códigos."""
+    for dtype in (np.int8, np.int16, np.int32):
+        if size <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+    return np.dtype(np.int64)
+
+
+def _ordinal(date: Union[str, datetime.date]) -> int:
+    if isinstance(date, str):
+        date = datetime.date.fromisoformat(date[:10])
+    return date.toordinal()
+
+
+class _Interner:
+    """Atribui um código inteiro sequencial a cada valor distinto."""
+
+    def __init__(self):
+        self.codes: Dict[Any, int] = {}
+        self.values: List[Any] = []
+
+    def __call__(self, value: Any) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class Ledger:
+    """
+    Gastos em colunas NumPy: dia (ordinal int32), valor (centavos int64), categoria
+    e forma de pagamento (códigos inteiros pequenos) e descrição (id de texto
+    internado). Montado uma vez a partir das linhas do Supabase, ocupa uma fração
+    da lista de dicionários e responde filtros e agrupamentos vetorizados. As
+    somas são exatas e em centavos (veja src/utils/money.py).
+    """
+
+    def __init__(
+        self,
+        day: np.ndarray,
+        cents: np.ndarray,
+        category: np.ndarray,
+        payment: np.ndarray,
+        description: np.ndarray,
+        category_ids: List[Any],
+        category_names: List[str],
+        payment_ids: List[Any],
+        payment_names: List[str],
+        descriptions: List[Union[str, None]],
+    ):
+        self.day = day
+        self.cents = cents
+        self.category = category
+        self.payment = payment
+        self.description = description
+        self.category_ids = category_ids
+        self.category_names = category_names
+        self.payment_ids = payment_ids
+        self.payment_names = payment_names
+        self.descriptions = descriptions
+
+    @classmethod
+    def from_pages(
+        cls,
+        pages: Iterable[List[Dict[str, Any]]],
+        categories: Union[List[Dict[str, Any]], None] = None,
+        payment_methods: Union[List[Dict[str, Any]], None] = None,
+    ) -> "Ledger":
+        """
+        Monta o ledger a partir de páginas de linhas de `expenses` (value, date,
+        category_id, payment_method_id, description). Os nomes vêm das listas de
+        categorias/formas de pagamento ou dos recursos embutidos nas linhas.
+        """
+        category_names = {c["id"]: c["name"] for c in categories or []}
+        payment_names = {p["id"]: p["name"] for p in payment_methods or []}
+        categories_seen, payments_seen, texts = _Interner(), _Interner(), _Interner()
+        columns: Tuple[List[np.ndarray], ...] = ([], [], [], [], [])
+
+        for page in pages:
+            day, value, category, payment, description = [], [], [], [], []
+            for row in page:
+                category_id = row.get("category_id")
+                payment_id = row.get("payment_method_id")
+                embedded = row.get("categories")
+                if embedded and category_id not in category_names:
+                    category_names[category_id] = embedded.get("name")
+                embedded = row.get("payment_methods")
+                if embedded and payment_id not in payment_names:
+                    payment_names[payment_id] = embedded.get("name")
+                day.append(_ordinal(row["date"]))
+                value.append(row["value"])
+                category.append(categories_seen(category_id))
+                payment.append(payments_seen(payment_id))
+                description.append(texts(row.get("description")))
+            columns[0].append(np.asarray(day, dtype=np.int32))
+            columns[1].append(cents_array(value))
+            for column, codes in zip(columns[2:], (category, payment, description)):
+                column.append(np.asarray(codes, dtype=np.int32))
+
+        def concat(parts: List[np.ndarray], dtype: Any) -> np.ndarray:
+            return np.concatenate(parts).astype(dtype) if parts else np.empty(0, dtype)
+
+        return cls(
+            day=concat(columns[0], np.int32),
+            cents=concat(columns[1], np.int64),
+            category=concat(columns[2], _code_dtype(len(categories_seen.values))),
+            payment=concat(columns[3], _code_dtype(len(payments_seen.values))),
+            description=concat(columns[4], np.int32),
+            category_ids=categories_seen.values,
+            category_names=[
+                category_names.get(c) or UNKNOWN_CATEGORY
+                for c in categories_seen.values
+            ],
+            payment_ids=payments_seen.values,
+            payment_names=[
+                payment_names.get(p) or UNKNOWN_PAYMENT_METHOD
+                for p in payments_seen.values
+            ],
+            descriptions=texts.values,
+        )
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: List[Dict[str, Any]],
+        categories: Union[List[Dict[str, Any]], None] = None,
+        payment_methods: Union[List[Dict[str, Any]], None] = None,
+    ) -> "Ledger":
+        return cls.from_pages([rows], categories, payment_methods)
+
+    def __len__(self) -> int:
+        return len(self.day)
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes ocupados pelas colunas (sem as tabelas de nomes)."""
+        return sum(
+            column.nbytes
+            for column in (
+                self.day,
+                self.cents,
+                self.category,
+                self.payment,
+                self.description,
+            )
+        )
+
+    def _take(self, mask: np.ndarray) -> "Ledger":
+        return Ledger(
+            self.day[mask],
+            self.cents[mask],
+            self.category[mask],
+            self.payment[mask],
+            self.description[mask],
+            self.category_ids,
+            self.category_names,
+            self.payment_ids,
+            self.payment_names,
+            self.descriptions,
+        )
+
+    def filter(
+        self,
+        data_inicio: Union[str, None] = None,
+        data_fim: Union[str, None] = None,
+        category_id: Union[str, None] = None,
+        payment_method_id: Union[str, None] = None,
+    ) -> "Ledger":
+        """Novo ledger só com os gastos do período (datas inclusivas) e filtros."""
+        mask = np.ones(len(self), dtype=bool)
+        if data_inicio:
+            mask &= self.day >= _ordinal(data_inicio)
+        if data_fim:
+            mask &= self.day <= _ordinal(data_fim)
+        for ids, codes, wanted in (
+            (self.category_ids, self.category, category_id),
+            (self.payment_ids, self.payment, payment_method_id),
+        ):
+            if wanted:
+                if wanted not in ids:
+                    mask[:] = False
+                else:
+                    mask &= codes == ids.index(wanted)
+        return self._take(mask)
+
+    def total(self) -> int:
+        """Total em centavos."""
+        return int(self.cents.sum())
+
+    def months(self) -> np.ndarray:
+        """Meses desde 1970-01 de cada gasto (int64)."""
+        days = (self.day.astype(np.int64) - _EPOCH_ORDINAL).astype("datetime64[D]")
+        return days.astype("datetime64[M]").astype(np.int64)
+
+    @staticmethod
+    def month_label(month: int) -> str:
+        """Rótulo 'AAAA-MM' de um índice de meses desde 1970-01."""
+        return f"{1970 + month // 12:04d}-{month % 12 + 1:02d}"
+
+    def _group_sum(self, keys: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Chaves distintas (ordenadas) e a soma dos centavos de cada uma."""
+        unique, inverse = np.unique(keys, return_inverse=True)
+        # Somas de inteiros em float64 são exatas até 2**53 centavos
+        sums = np.bincount(inverse.ravel(), weights=self.cents, minlength=len(unique))
+        return unique, np.rint(sums).astype(np.int64)
+
+    def _sum_by_codes(self, codes: np.ndarray, names: List[str]) -> Dict[str, int]:
+        unique, sums = self._group_sum(codes)
+        result: Dict[str, int] = {}
+        for code, total in zip(unique.tolist(), sums.tolist()):
+            # Ids diferentes podem ter o mesmo nome (ex: dois "Desconhecida")
+            result[names[code]] = result.get(names[code], 0) + total
+        return result
+
+    def sum_by_category(self) -> Dict[str, int]:
+        """Total em centavos por nome de categoria."""
+        return self._sum_by_codes(self.category, self.category_names)
+
+    def sum_by_payment_method(self) -> Dict[str, int]:
+        """Total em centavos por nome de forma de pagamento."""
+        return self._sum_by_codes(self.payment, self.payment_names)
+
+    def sum_by_month(self) -> Dict[str, int]:
+        """Total em centavos por mês 'AAAA-MM', em ordem cronológica."""
+        months, sums = self._group_sum(self.months())
+        return {self.month_label(m): s for m, s in zip(months.tolist(), sums.tolist())}
+
+    def sum_by_month_category_payment(self) -> Dict[Tuple[str, str, str], int]:
+        """Total em centavos por (mês 'AAAA-MM', categoria, forma de pagamento)."""
+        n_categories = len(self.category_names)
+        n_payments = len(self.payment_names)
+        keys = (
+            self.months() * n_categories + self.category.astype(np.int64)
+        ) * n_payments + self.payment.astype(np.int64)
+        unique, sums = self._group_sum(keys)
+        result: Dict[Tuple[str, str, str], int] = {}
+        for key, total in zip(unique.tolist(), sums.tolist()):
+            rest, payment = divmod(key, n_payments)
+            month, category = divmod(rest, n_categories)
+            group = (
+                self.month_label(month),
+                self.category_names[category],
+                self.payment_names[payment],
+            )
+            result[group] = result.get(group, 0) + total
+        return result
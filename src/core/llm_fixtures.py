@@ -0,0 +1,149 @@
+# src/core/llm_fixtures.py
+import datetime
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict, List, Union
+
+from src.config import LLM_FIXTURE_MODE, LLM_FIXTURE_PATH, LLM_REPLAY_LATENCY_SCALE
+
+# Os prompts embutem a data de hoje (e datas calculadas a partir dela); sem
+# normalizar, uma gravação só valeria no dia
+_DATE_RE = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+def _relative_dates(today: datetime.date) -> Dict[str, str]:
+    """
+    Datas que o prompt de transação calcula a partir de hoje -> marcador. Datas
+    que coincidem (no dia 1º, ontem é o fim do mês passado) ganham um marcador
+    combinado, para que nenhum marcador "vença" o outro conforme o dia.
+    """
+    last_month_end = today.replace(day=1) - datetime.timedelta(days=1)
+    dates = [
+        (today, "hoje"),
+        (today - datetime.timedelta(days=1), "ontem"),
+        (last_month_end.replace(day=1), "inicio_mes_passado"),
+        (last_month_end, "fim_mes_passado"),
+    ]
+    names: Dict[str, List[str]] = {}
+    for date, name in dates:
+        names.setdefault(date.isoformat(), []).append(name)
+    return {date: f"<{'|'.join(found)}>" for date, found in names.items()}
+
+
+class MissingFixtureError(LookupError):
+    """O prompt não foi gravado e o modo replay não pode chamar o Gemini."""
+
+
+def prompt_key(
+    prompt: str, model: str, today: Union[datetime.date, None] = None
+) -> str:
+    """
+    Hash sha256 do modelo + prompt, com a data de hoje (e ontem, início e fim do
+    mês passado) trocada por um marcador. As outras datas ficam como estão: duas
+    mensagens que só diferem numa data digitada pelo usuário têm chaves distintas.
+    """
+    markers = _relative_dates(today or datetime.date.today())
+    normalized = _DATE_RE.sub(
+        lambda match: markers.get(match.group(), match.group()), prompt.strip()
+    )
+    return hashlib.sha256(f"{model}\n{normalized}".encode("utf-8")).hexdigest()
+
+
+def load_entries(path: str) -> List[Dict[str, Any]]:
+    """Lê as gravações (uma por linha, JSONL). Arquivo inexistente = lista vazia."""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+class LLMFixtures:
+    """
+    Grava pares prompt -> resposta de ask_llama (modo "record") ou os serve de
+    volta, com a latência gravada, sem chamar o Gemini (modo "replay"). Com
+    `latency_scale` 0 o replay responde na hora; 1.0 reproduz a latência real.
+    """
+
+    def __init__(
+        self,
+        mode: str = "off",
+        path: str = LLM_FIXTURE_PATH,
+        latency_scale: float = 1.0,
+    ):
+        self.mode = mode
+        self.path = path
+        self.latency_scale = latency_scale
+        self._lock = threading.Lock()
+        self._entries: Dict[str, List[Dict[str, Any]]] = {}
+        self._cursor: Dict[str, int] = {}
+        if mode == "replay":
+            for entry in load_entries(path):
+                self._entries.setdefault(entry["key"], []).append(entry)
+
+    @property
+    def recording(self) -> bool:
+        return self.mode == "record"
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def record(
+        self,
+        prompt: str,
+        model: str,
+        prompt_type: str,
+        response: str,
+        latency: float,
+    ) -> None:
+        entry = {
+            "key": prompt_key(prompt, model),
+            "model": model,
+            "prompt_type": prompt_type,
+            "prompt": prompt,
+            "response": response,
+            "latency_s": round(latency, 6),
+            "recorded_at": time.time(),
+        }
+        line = json.dumps(entry, ensure_ascii=False)
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+
+    def replay(self, prompt: str, model: str) -> str:
+        """
+        Devolve a resposta gravada para o prompt, dormindo a latência gravada.
+        Prompts gravados várias vezes se alternam na ordem da gravação.
+        """
+        key = prompt_key(prompt, model)
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise MissingFixtureError(f"Prompt sem gravação ({key[:12]})")
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            entry = entries[index % len(entries)]
+        delay = entry.get("latency_s", 0.0) * self.latency_scale
+        if delay > 0:
+            time.sleep(delay)
+        return entry["response"]
+
+
+_fixtures: Union[LLMFixtures, None] = None
+
+
+def get_fixtures() -> LLMFixtures:
+    """Instância configurada por LLM_FIXTURE_MODE/LLM_FIXTURE_PATH, criada uma vez."""
+    global _fixtures
+    if _fixtures is None:
+        _fixtures = LLMFixtures(
+            LLM_FIXTURE_MODE, LLM_FIXTURE_PATH, LLM_REPLAY_LATENCY_SCALE
+        )
+    return _fixtures
@@ -0,0 +1,138 @@
+# src/core/log.py
+import atexit
+import contextvars
+import datetime
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+from typing import Any, Union
+
+from src.config import (
+    LOG_DEBUG_CHAT_IDS,
+    LOG_DEBUG_SAMPLE_RATE,
+    LOG_FORMAT,
+    LOG_LEVEL,
+)
+
+# Identificadores da requisição em andamento, preenchidos por bind_update
+correlation_id: contextvars.ContextVar[Union[str, None]] = contextvars.ContextVar(
+    "correlation_id", default=None
+)
+current_chat_id: contextvars.ContextVar[Union[int, None]] = contextvars.ContextVar(
+    "current_chat_id", default=None
+)
+# Decisão de amostragem de depuração da requisição em andamento
+_trace_sampled: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "trace_sampled", default=False
+)
+
+# Chats com depuração ligada independentemente da amostragem
+DEBUG_CHAT_IDS = set(LOG_DEBUG_CHAT_IDS)
+
+# Atributos padrão de LogRecord; o resto veio de `extra` e vai para o JSON
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+_listener: Union[logging.handlers.QueueListener, None] = None
+
+
+def get_logger(name: str) -> logging.Logger:
+    """Retorna o logger do módulo (use get_logger(__name__))."""
+    return logging.getLogger(name)
+
+
+def bind_update(update_id: Union[int, None], chat_id: Union[int, None]) -> None:
+    """
+    Associa os logs seguintes (inclusive em threads de asyncio.to_thread) ao
+    update do Telegram e sorteia se esta requisição terá payloads de depuração.
+    """
+    correlation_id.set(f"upd-{update_id}" if update_id is not None else None)
+    current_chat_id.set(chat_id)
+    _trace_sampled.set(
+        LOG_DEBUG_SAMPLE_RATE > 0 and random.random() < LOG_DEBUG_SAMPLE_RATE
+    )
+
+
+def should_trace() -> bool:
+    """Indica se a requisição atual deve registrar payloads de depuração."""
+    return _trace_sampled.get() or current_chat_id.get() in DEBUG_CHAT_IDS
+
+
+def trace(logger: logging.Logger, msg: str, **fields: Any) -> None:
+    """
+    Registra em DEBUG um payload potencialmente grande ou sensível (mensagem do
+    usuário, resposta bruta do Gemini). Só é emitido se o logger estiver em DEBUG,
+    se o chat tiver depuração ligada ou se a requisição foi sorteada.
+    """
+    if not (logger.isEnabledFor(logging.DEBUG) or should_trace()):
+        return
+    record = logger.makeRecord(
+        logger.name, logging.DEBUG, "(trace)", 0, msg, (), None, extra=fields
+    )
+    # handle() não reaplica o nível do logger: o payload passa mesmo em produção
+    logger.handle(record)
+
+
+class ContextFilter(logging.Filter):
+    """Copia correlation_id e chat_id para o registro na thread que gerou o log."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.correlation_id = correlation_id.get()
+        record.chat_id = current_chat_id.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro, incluindo os campos passados em `extra`."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload = {
+            "ts": datetime.datetime.fromtimestamp(
+                record.created, tz=datetime.timezone.utc
+            ).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and value is not None:
+                payload[key] = value
+        if record.exc_info:
+            payload["exc"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def setup_logging() -> None:
+    """
+    Configura o logging da aplicação: o código só enfileira o registro e uma thread
+    (QueueListener) formata e escreve no stdout, sem I/O no loop do bot.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if LOG_FORMAT == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(
+            logging.Formatter(
+                "%(asctime)s %(levelname)s %(name)s [%(correlation_id)s] %(message)s"
+            )
+        )
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.handlers = [queue_handler]
+    root.setLevel(LOG_LEVEL)
+    # O httpx registra cada chamada à API do Telegram/Supabase em INFO
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    atexit.register(_listener.stop)
@@ -0,0 +1,253 @@
+# src/core/metrics.py
+import asyncio
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Tuple, Union
+
+from src.core import profiling
+
+# Limites (em segundos) dos buckets de latência: cobre de consultas rápidas
+# ao Supabase até respostas lentas do Gemini e renderização de gráficos
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Marca de erro da chamada instrumentada em andamento (ver mark_error)
+_current_call: contextvars.ContextVar[Union[List[bool], None]] = contextvars.ContextVar(
+    "metrics_current_call", default=None
+)
+
+
+class Histogram:
+    """Histograma cumulativo no formato Prometheus, com séries por (kind, name)."""
+
+    def __init__(self, name: str, help_text: str, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, str], List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, kind: str, name: str, seconds: float) -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get((kind, name))
+            if series is None:
+                # [contagem por bucket (+Inf no fim), soma, total]
+                series = [[0] * (len(self.buckets) + 1), 0.0, 0]
+                self._series[(kind, name)] = series
+            series[0][index] += 1
+            series[1] += seconds
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            snapshot = [
+                (key, list(series[0]), series[1], series[2])
+                for key, series in sorted(self._series.items())
+            ]
+        for (kind, name), counts, total, count in snapshot:
+            labels = f'kind="{kind}",name="{name}"'
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, counts):
+                cumulative += bucket_count
+                lines.append(
+                    f'{self.name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+                )
+            lines.append(f'{self.name}_bucket{{{labels},le="+Inf"}} {count}')
+            lines.append(f"{self.name}_sum{{{labels}}} {total}")
+            lines.append(f"{self.name}_count{{{labels}}} {count}")
+        return lines
+
+
+class Counter:
+    """Contador monotônico por (kind, name)."""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._values: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, kind: str, name: str) -> None:
+        with self._lock:
+            self._values[(kind, name)] = self._values.get((kind, name), 0) + 1
+
+    def get(self, kind: str, name: str) -> int:
+        with self._lock:
+            return self._values.get((kind, name), 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for (kind, name), value in items:
+            lines.append(f'{self.name}{{kind="{kind}",name="{name}"}} {value}')
+        return lines
+
+
+class ConversationStates:
+    """Estado atual de cada chat no ConversationHandler, exposto como gauge."""
+
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self.state_names: Dict[int, str] = {}
+        self._by_chat: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def update(self, chat_id: int, state: Union[int, None]) -> None:
+        """Atualiza o estado do chat. None mantém o estado; negativo (END) encerra."""
+        if state is None:
+            return
+        with self._lock:
+            if state < 0:
+                self._by_chat.pop(chat_id, None)
+            else:
+                self._by_chat[chat_id] = state
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            states = list(self._by_chat.values())
+        result = {name: 0 for name in self.state_names.values()}
+        for state in states:
+            label = self.state_names.get(state, str(state))
+            result[label] = result.get(label, 0) + 1
+        return result
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} gauge"]
+        for state, value in sorted(self.counts().items()):
+            lines.append(f'{self.name}{{state="{state}"}} {value}')
+        return lines
+
+
+LATENCY = Histogram(
+    "bot_latency_seconds", "Latência de handlers, consultas ao banco, LLM e gráficos."
+)
+ERRORS = Counter(
+    "bot_errors_total", "Erros de handlers, consultas ao banco, LLM e gráficos."
+)
+CONVERSATIONS = ConversationStates(
+    "bot_conversation_state", "Conversas abertas em cada estado do ConversationHandler."
+)
+
+
+def observe(kind: str, name: str, seconds: float, error: bool = False) -> None:
+    """Registra a duração de uma chamada (e o erro, se houve)."""
+    LATENCY.observe(kind, name, seconds)
+    if error:
+        ERRORS.inc(kind, name)
+
+
+def mark_error() -> None:
+    """
+    Marca como erro a chamada instrumentada em andamento. Usado pelas funções que
+    tratam a exceção internamente (ex: db.*) e retornam um valor padrão.
+    """
+    current = _current_call.get()
+    if current is not None:
+        current[0] = True
+
+
+def timed(kind: str, name: Union[str, None] = None) -> Callable:
+    """
+    Decorator que mede a latência de funções síncronas ou assíncronas e conta
+    erros (exceções ou mark_error) com os rótulos kind/name. Em updates perfilados
+    a chamada também vira um span "kind:name".
+    """
+
+    def decorator(func: Callable) -> Callable:
+        label = name or func.__name__
+        span_name = f"{kind}:{label}"
+
+        if asyncio.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                flag = [False]
+                token = _current_call.set(flag)
+                start = time.perf_counter()
+                try:
+                    with profiling.span(span_name):
+                        return await func(*args, **kwargs)
+                except Exception:
+                    flag[0] = True
+                    raise
+                finally:
+                    _current_call.reset(token)
+                    observe(kind, label, time.perf_counter() - start, flag[0])
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            flag = [False]
+            token = _current_call.set(flag)
+            start = time.perf_counter()
+            try:
+                with profiling.span(span_name):
+                    return func(*args, **kwargs)
+            except Exception:
+                flag[0] = True
+                raise
+            finally:
+                _current_call.reset(token)
+                observe(kind, label, time.perf_counter() - start, flag[0])
+
+        return wrapper
+
+    return decorator
+
+
+def track_conversation(handler: Callable) -> Callable:
+    """Envolve um callback do ConversationHandler para acompanhar o estado retornado."""
+
+    @functools.wraps(handler)
+    async def wrapper(update, context):
+        state = await handler(update, context)
+        chat = getattr(update, "effective_chat", None)
+        if chat is not None and isinstance(state, int):
+            CONVERSATIONS.update(chat.id, state)
+        return state
+
+    return wrapper
+
+
+def render_metrics() -> str:
+    """Texto de exposição no formato Prometheus."""
+    lines = LATENCY.render() + ERRORS.render() + CONVERSATIONS.render()
+    return "\n".join(lines) + "\n"
+
+
+class _MetricsRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Sem log por requisição: o scrape é periódico e não deve poluir a saída
+        pass
+
+
+def start_metrics_server(host: str, port: int) -> ThreadingHTTPServer:
+    """Sobe o endpoint /metrics numa thread daemon e retorna o servidor."""
+    server = ThreadingHTTPServer((host, port), _MetricsRequestHandler)
+    thread = threading.Thread(
+        target=server.serve_forever, name="metrics-server", daemon=True
+    )
+    thread.start()
+    return server
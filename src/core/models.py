@@ -1,34 +1,266 @@
 # src/core/models.py
-from typing import Optional
-from datetime import date
+from collections.abc import Mapping
+from operator import itemgetter
+from typing import Any, Dict, Iterator, List, Tuple, Union
 
-# Estes são apenas modelos conceituais para organização.
-# No código, você geralmente trabalhará com dicionários Python vindos do Supabase.
+from src.utils.money import to_cents
 
+UNKNOWN_CATEGORY = "Desconhecida"
+UNKNOWN_PAYMENT_METHOD = "Não Informado"
 
-class Gasto:
-    def __init__(self, id: str, valor: float, category_id: str, data: date):
+
+class _Missing:
+    """Marca campos que a consulta não selecionou (diferente de um NULL do banco)."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<ausente>"
+
+    def __reduce__(self) -> str:
+        return "MISSING"
+
+
+MISSING: Any = _Missing()
+
+
+def _embedded_name(row: Dict[str, Any], resource: str, default: str) -> Any:
+    """Nome de um recurso embutido (ex: categories(name)), ou MISSING se não veio."""
+    if resource not in row:
+        return MISSING
+    return (row[resource] or {}).get("name") or default
+
+
+def _names_column(
+    rows: List[Dict[str, Any]],
+    ids: Union[List[Any], None],
+    resource: str,
+    names: Union[Dict[Any, str], None],
+    default: str,
+) -> List[Any]:
+    """
+    Coluna de nomes de uma chave estrangeira. Com os ids e um dicionário de
+    referência, cada id distinto é resolvido uma única vez; sem eles, lê o recurso
+    embutido de cada linha. Sem nenhum dos dois, o campo fica ausente.
+    """
+    if ids is not None and names is not None:
+        lookup = {key: names.get(key) or default for key in set(ids)}
+        return list(map(lookup.__getitem__, ids))
+    if resource in rows[0]:
+        return [
+            (embedded or {}).get("name") or default
+            for embedded in map(itemgetter(resource), rows)
+        ]
+    return [MISSING] * len(rows)
+
+
+class Record(Mapping):
+    """
+    Base dos modelos: atributos em __slots__ (sem __dict__ por instância) e acesso
+    somente leitura como Mapping, então o código que lê `gasto["value"]`,
+    `gasto.get(...)` ou `dict(gasto)` continua funcionando. Só os campos que a
+    consulta trouxe aparecem como chaves. Nas subclasses FIELDS é o próprio
+    __slots__, cuja ordem é a dos argumentos do construtor, das chaves e do
+    __reduce__; por isso ele não é ordenado alfabeticamente (noqa: RUF023).
+    """
+
+    __slots__ = ()
+    FIELDS: Tuple[str, ...] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.FIELDS:
+            value = getattr(self, key)
+            if value is not MISSING:
+                return value
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return (field for field in self.FIELDS if getattr(self, field) is not MISSING)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{key}={value!r}" for key, value in self.items())
+        return f"{type(self).__name__}({fields})"
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        # Objetos com __slots__ e sem __dict__ precisam disso para o pickle/deepcopy
+        return (type(self), tuple(getattr(self, field) for field in self.FIELDS))
+
+
+class Gasto(Record):
+    """Um gasto lido da tabela `expenses`, com os nomes das chaves estrangeiras."""
+
+    __slots__ = (  # noqa: RUF023
+        "id",
+        "value",
+        "date",
+        "description",
+        "category_id",
+        "payment_method_id",
+        "categoria_nome",
+        "forma_pagamento_nome",
+    )
+    FIELDS = __slots__
+
+    def __init__(
+        self,
+        id: Any = MISSING,
+        value: Any = MISSING,
+        date: Any = MISSING,
+        description: Any = MISSING,
+        category_id: Any = MISSING,
+        payment_method_id: Any = MISSING,
+        categoria_nome: Any = MISSING,
+        forma_pagamento_nome: Any = MISSING,
+    ):
         self.id = id
-        self.valor = valor
+        self.value = value
+        self.date = date
+        self.description = description
         self.category_id = category_id
-        self.data = data
+        self.payment_method_id = payment_method_id
+        self.categoria_nome = categoria_nome
+        self.forma_pagamento_nome = forma_pagamento_nome
+
+    @classmethod
+    def from_row(
+        cls,
+        row: Dict[str, Any],
+        categoria_nome: Union[str, None] = None,
+        forma_pagamento_nome: Union[str, None] = None,
+    ) -> "Gasto":
+        """
+        Monta o gasto a partir de uma linha do PostgREST. Os nomes vêm dos
+        argumentos ou dos recursos embutidos `categories(name)` e
+        `payment_methods(name)`, com os mesmos padrões de antes para os ausentes.
+        """
+        get = row.get
+        return cls(
+            get("id", MISSING),
+            get("value", MISSING),
+            get("date", MISSING),
+            get("description", MISSING),
+            get("category_id", MISSING),
+            get("payment_method_id", MISSING),
+            categoria_nome or _embedded_name(row, "categories", UNKNOWN_CATEGORY),
+            forma_pagamento_nome
+            or _embedded_name(row, "payment_methods", UNKNOWN_PAYMENT_METHOD),
+        )
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: List[Dict[str, Any]],
+        category_names: Union[Dict[Any, str], None] = None,
+        payment_names: Union[Dict[Any, str], None] = None,
+    ) -> List["Gasto"]:
+        """
+        Normaliza uma resposta inteira do PostgREST coluna a coluna: cada campo
+        vira uma lista (itemgetter em C, sem cópia de dicionário por linha), os
+        nomes vêm de `category_names`/`payment_names` ({id: nome}) quando os ids
+        foram selecionados, ou dos recursos embutidos, e os objetos são montados
+        de uma vez. Supõe linhas com as mesmas chaves, como o PostgREST devolve.
+        """
+        if not rows:
+            return []
+        present = rows[0].keys()
+        columns = {
+            field: list(map(itemgetter(field), rows)) if field in present else None
+            for field in (
+                "id",
+                "value",
+                "date",
+                "description",
+                "category_id",
+                "payment_method_id",
+            )
+        }
+        categorias = _names_column(
+            rows, columns["category_id"], "categories", category_names, UNKNOWN_CATEGORY
+        )
+        formas = _names_column(
+            rows,
+            columns["payment_method_id"],
+            "payment_methods",
+            payment_names,
+            UNKNOWN_PAYMENT_METHOD,
+        )
+        missing = [MISSING] * len(rows)
+        return list(
+            map(
+                cls,
+                *(missing if column is None else column for column in columns.values()),
+                categorias,
+                formas,
+            )
+        )
 
+    @property
+    def cents(self) -> int:
+        """Valor em centavos."""
+        return to_cents(self.value)
 
-class Ganho:
-    def __init__(self, id: str, valor: float, descricao: str, data: date):
+
+class Ganho(Record):
+    """Um ganho lido da tabela `ganhos`."""
+
+    __slots__ = ("id", "value", "date", "description")  # noqa: RUF023
+    FIELDS = __slots__
+
+    def __init__(
+        self,
+        id: Any = MISSING,
+        value: Any = MISSING,
+        date: Any = MISSING,
+        description: Any = MISSING,
+    ):
         self.id = id
-        self.valor = valor
-        self.descricao = descricao
-        self.data = data
+        self.value = value
+        self.date = date
+        self.description = description
+
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "Ganho":
+        get = row.get
+        return cls(
+            get("id", MISSING),
+            get("value", MISSING),
+            get("date", MISSING),
+            get("description", MISSING),
+        )
 
+    @property
+    def cents(self) -> int:
+        """Valor em centavos."""
+        return to_cents(self.value)
 
-class Categoria:
-    def __init__(self, id: str, nome: str, monthly_limit: Optional[float] = 0.0):
+
+class Categoria(Record):
+    """Uma categoria lida da tabela `categories`."""
+
+    __slots__ = ("id", "name", "monthly_limit", "aliases")  # noqa: RUF023
+    FIELDS = __slots__
+
+    def __init__(
+        self,
+        id: Any = MISSING,
+        name: Any = MISSING,
+        monthly_limit: Any = MISSING,
+        aliases: Any = MISSING,
+    ):
         self.id = id
-        self.nome = nome
+        self.name = name
         self.monthly_limit = monthly_limit
+        self.aliases = aliases
 
-
-# Estes modelos servem para documentar a estrutura esperada dos dados.
-# No código real de db.py, você pode continuar usando dicionários,
-# mas ter essa definição ajuda na clareza.
+    @classmethod
+    def from_row(cls, row: Dict[str, Any]) -> "Categoria":
+        get = row.get
+        return cls(
+            get("id", MISSING),
+            get("name", MISSING),
+            get("monthly_limit", MISSING),
+            get("aliases", MISSING),
+        )
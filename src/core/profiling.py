@@ -0,0 +1,108 @@
+# src/core/profiling.py
+import contextlib
+import contextvars
+import os
+import random
+import threading
+import time
+from typing import Dict, Iterator, List, Tuple, Union
+
+from src.config import PROFILE_CHAT_IDS, PROFILE_DIR, PROFILE_SAMPLE_RATE
+
+# Chats sempre perfilados, independentemente da amostragem
+PROFILE_CHATS = set(PROFILE_CHAT_IDS)
+
+
+class Profile:
+    """Tempos de parede acumulados por pilha de spans de um update."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._totals: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, path: Tuple[str, ...], seconds: float) -> None:
+        # Spans podem terminar em threads (asyncio.to_thread), daí o lock
+        with self._lock:
+            self._totals[path] = self._totals.get(path, 0.0) + seconds
+
+    def total(self) -> float:
+        """Duração do span raiz (o update inteiro), em segundos."""
+        return self._totals.get((self.name,), 0.0)
+
+    def collapsed(self) -> List[str]:
+        """
+        Linhas no formato "collapsed stacks" (raiz;filho;neto <microssegundos>),
+        com o tempo próprio de cada span, prontas para flamegraph.pl ou speedscope.
+        """
+        with self._lock:
+            totals = dict(self._totals)
+        children: Dict[Tuple[str, ...], float] = {}
+        for path, seconds in totals.items():
+            if len(path) > 1:
+                children[path[:-1]] = children.get(path[:-1], 0.0) + seconds
+        lines = []
+        for path, seconds in sorted(totals.items()):
+            self_us = int(max(seconds - children.get(path, 0.0), 0.0) * 1_000_000)
+            if self_us:
+                lines.append(f"{';'.join(path)} {self_us}")
+        return lines
+
+    def dump(self, directory: str = PROFILE_DIR) -> str:
+        """Grava os stacks em <directory>/<nome>.folded e retorna o caminho."""
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{self.name}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(self.collapsed()) + "\n")
+        return path
+
+
+_active: contextvars.ContextVar[Union[Profile, None]] = contextvars.ContextVar(
+    "active_profile", default=None
+)
+_stack: contextvars.ContextVar[Tuple[str, ...]] = contextvars.ContextVar(
+    "profile_stack", default=()
+)
+
+
+def should_profile(chat_id: Union[int, None]) -> bool:
+    """Decide se o update deste chat será perfilado (chat ligado ou amostragem)."""
+    if chat_id in PROFILE_CHATS:
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+@contextlib.contextmanager
+def span(name: str) -> Iterator[None]:
+    """Mede um trecho dentro do update perfilado; sem profile ativo não faz nada."""
+    profile = _active.get()
+    if profile is None:
+        yield
+        return
+    path = _stack.get() + (name,)
+    token = _stack.set(path)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.add(path, time.perf_counter() - start)
+        _stack.reset(token)
+
+
+def record(name: str, seconds: float) -> None:
+    """Registra um span já medido pelo chamador (ex: ask_llama) sob a pilha atual."""
+    profile = _active.get()
+    if profile is not None:
+        profile.add(_stack.get() + (name,), seconds)
+
+
+@contextlib.contextmanager
+def profile_update(name: str) -> Iterator[Profile]:
+    """Ativa o profiling no contexto atual; o span raiz recebe o nome do profile."""
+    profile = Profile(name)
+    active_token = _active.set(profile)
+    try:
+        with span(name):
+            yield profile
+    finally:
+        _active.reset(active_token)
@@ -0,0 +1,173 @@
+# src/core/reports.py
+import datetime
+import io
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, Iterator, Tuple, Union
+
+from supabase import Client
+
+from src.config import REPORT_CACHE_TTL
+from src.core import charts, db
+from src.core.budget import month_bounds
+from src.utils.money import cents_array, format_money, to_cents
+
+# Gráficos sem filtro pedidos pelos comandos /balanco e /gastos_mensal_combinado
+CACHED_CHARTS: Dict[str, Callable[[Client], Union[io.BytesIO, None]]] = {
+    "balanco": charts.generate_balance_chart,
+    "gastos_mensal_combinado": charts.generate_monthly_category_payment_chart,
+}
+
+
+class ChartCache:
+    """
+    Guarda os PNGs já renderizados por nome de gráfico. As entradas expiram
+    após `ttl` segundos e são descartadas sempre que um lançamento novo é gravado.
+    """
+
+    def __init__(self, ttl: int = REPORT_CACHE_TTL):
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, bytes]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Union[io.BytesIO, None]:
+        """Retorna uma cópia do gráfico em cache, ou None se ausente/expirado."""
+        with self._lock:
+            entry = self._entries.get(name)
+            if not entry or time.monotonic() - entry[0] > self.ttl:
+                return None
+            return io.BytesIO(entry[1])
+
+    def render(
+        self, supabase_client: Client, name: str, refresh: bool = False
+    ) -> Union[io.BytesIO, None]:
+        """Retorna o gráfico do cache ou o renderiza e guarda (refresh força renderizar)."""
+        if not refresh:
+            cached = self.get(name)
+            if cached is not None:
+                return cached
+
+        with self._lock:
+            generation = self._generation
+        buf = CACHED_CHARTS[name](supabase_client)
+        if buf is None:
+            return None
+        data = buf.getvalue()
+        with self._lock:
+            # Um lançamento gravado durante a renderização invalida este resultado
+            if generation == self._generation:
+                self._entries[name] = (time.monotonic(), data)
+        return io.BytesIO(data)
+
+    def invalidate(self) -> None:
+        """Descarta todos os gráficos (chamado após gravar gastos/ganhos)."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
+
+
+class DigestSubscriptions:
+    """
+    Chats inscritos no resumo mensal. Com `path`, cada inscrição/cancelamento é
+    gravado num arquivo JSON (substituído de uma vez, sem deixar arquivo pela
+    metade) e recarregado na próxima inicialização; `initial` só vale enquanto o
+    arquivo não existe.
+    """
+
+    def __init__(self, path: Union[str, None] = None, initial: Iterable[int] = ()):
+        self.path = path
+        self._chat_ids = set(initial)
+        self._lock = threading.Lock()
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self._chat_ids = {int(chat_id) for chat_id in json.load(f)}
+
+    def __contains__(self, chat_id: int) -> bool:
+        return chat_id in self._chat_ids
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(sorted(self._chat_ids))
+
+    def __len__(self) -> int:
+        return len(self._chat_ids)
+
+    def toggle(self, chat_id: int) -> bool:
+        """Inscreve ou cancela o chat; retorna True se ele ficou inscrito."""
+        with self._lock:
+            chat_ids = set(self._chat_ids)
+            subscribed = chat_id not in chat_ids
+            if subscribed:
+                chat_ids.add(chat_id)
+            else:
+                chat_ids.discard(chat_id)
+            if self.path:
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(sorted(chat_ids), f)
+                os.replace(tmp_path, self.path)
+            self._chat_ids = chat_ids
+            return subscribed
+
+
+def warm_chart_cache(supabase_client: Client, cache: ChartCache) -> int:
+    """Renderiza de novo todos os gráficos cacheáveis; retorna quantos ficaram prontos."""
+    return sum(
+        1
+        for name in CACHED_CHARTS
+        if cache.render(supabase_client, name, refresh=True) is not None
+    )
+
+
+def previous_month(today: Union[datetime.date, None] = None) -> str:
+    """Data 'AAAA-MM-DD' de um dia do mês anterior a `today`."""
+    today = today or datetime.date.today()
+    return (today.replace(day=1) - datetime.timedelta(days=1)).isoformat()
+
+
+def build_monthly_digest(supabase_client: Client, date: str) -> Union[str, None]:
+    """
+    Monta o texto do resumo do mês da data informada: ganhos, gastos, saldo e
+    gasto por categoria comparado ao limite. Retorna None se o mês não tem lançamentos.
+    """
+    month, first, last = month_bounds(date)
+    # Totais em centavos: somar o mês inteiro em float acumularia erro
+    totals: Dict[str, int] = {}
+    for page in db.iter_gastos_pages(
+        supabase_client,
+        data_inicio=first,
+        data_fim=last,
+        columns="category_id,value",
+    ):
+        for row, cents in zip(page, cents_array([row["value"] for row in page])):
+            totals[row["category_id"]] = totals.get(row["category_id"], 0) + int(cents)
+    ganhos = to_cents(db.get_ganhos_total(supabase_client, first, last))
+    if not totals and not ganhos:
+        return None
+
+    total_gastos = sum(totals.values())
+    lines = [
+        f"📅 Resumo de {month}",
+        f"💰 Ganhos: {format_money(ganhos)}",
+        f"💸 Gastos: {format_money(total_gastos)}",
+        f"📊 Saldo: {format_money(ganhos - total_gastos)}",
+    ]
+    categorias = {cat["id"]: cat for cat in db.get_categories(supabase_client)}
+    if totals:
+        lines.append("")
+        lines.append("Por categoria:")
+    for category_id, total in sorted(totals.items(), key=lambda item: -item[1]):
+        categoria = categorias.get(category_id, {})
+        nome = categoria.get("name", "Outros")
+        limite = categoria.get("monthly_limit")
+        if limite:
+            limite = to_cents(limite)
+            marcador = "🚨" if total > limite else "✅"
+            lines.append(
+                f"{marcador} {nome}: {format_money(total)} de {format_money(limite)}"
+            )
+        else:
+            lines.append(f"- {nome}: {format_money(total)}")
+    return "\n".join(lines)
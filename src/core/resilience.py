@@ -0,0 +1,269 @@
+# src/core/resilience.py
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Union
+
+import httpx
+import requests
+
+from src.config import (
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_RESET_TIMEOUT,
+    GEMINI_TIMEOUT,
+    RETRY_ATTEMPTS,
+    RETRY_BASE_DELAY,
+    RETRY_MAX_DELAY,
+    SUPABASE_TIMEOUT,
+)
+from src.core.log import get_logger
+
+logger = get_logger(__name__)
+
+# Status HTTP que indicam falha passageira do serviço (vale tentar de novo)
+TRANSIENT_STATUS = {408, 425, 429, 500, 502, 503, 504}
+# SQLSTATE do Postgres para cancelamento por timeout, conflito de serialização,
+# deadlock e excesso de conexões; a classe 08 é de erros de conexão
+TRANSIENT_SQLSTATE = {"57014", "40001", "40P01", "53300", "57P01"}
+
+# Mensagens mostradas ao usuário quando uma dependência está indisponível
+UNAVAILABLE_MESSAGES = {
+    "supabase": "O banco de dados está instável no momento",
+    "gemini": "O serviço de IA está instável no momento",
+}
+# Quando uma escrita chegou a ser enviada e falhou no meio do caminho, não dá para
+# afirmar que nada mudou: o servidor pode ter gravado antes de a resposta se perder
+UNCERTAIN_WRITE_MESSAGE = (
+    "Pode ser que a alteração tenha sido salva; confira com /listar_gastos antes "
+    "de tentar de novo"
+)
+
+
+class DependencyUnavailableError(Exception):
+    """
+    Falha passageira de uma dependência (Supabase, Gemini) que persistiu após os
+    retries, estourou o orçamento de latência ou encontrou o circuito aberto.
+    `write_uncertain` indica uma escrita que chegou a ser enviada: o resultado
+    dela é desconhecido.
+    """
+
+    def __init__(self, dependency: str, reason: str, write_uncertain: bool = False):
+        self.dependency = dependency
+        self.reason = reason
+        self.write_uncertain = write_uncertain
+        super().__init__(f"{dependency} indisponível: {reason}")
+
+    @property
+    def user_message(self) -> str:
+        prefix = UNAVAILABLE_MESSAGES.get(self.dependency, "Um serviço está instável")
+        if self.write_uncertain:
+            return f"⚠️ {prefix}. {UNCERTAIN_WRITE_MESSAGE}. 🙏"
+        return f"⚠️ {prefix}. Nada foi alterado; tente de novo em alguns minutos. 🙏"
+
+
+def _status_of(error: Exception) -> Union[int, None]:
+    for attribute in ("status_code", "code"):
+        value = getattr(error, attribute, None)
+        if isinstance(value, int):
+            return value
+        if isinstance(value, str) and value.isdigit() and len(value) == 3:
+            return int(value)
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_transient(error: Exception) -> bool:
+    """
+    True para falhas de rede, timeouts, sobrecarga (429/5xx) e erros passageiros
+    do Postgres. Erros de requisição (4xx, dados inválidos) são permanentes:
+    tentar de novo não muda o resultado.
+    """
+    if isinstance(error, DependencyUnavailableError):
+        return True
+    if isinstance(
+        error,
+        (
+            ConnectionError,
+            TimeoutError,
+            httpx.TransportError,
+            requests.ConnectionError,
+            requests.Timeout,
+        ),
+    ):
+        return True
+    code = getattr(error, "code", None)
+    if isinstance(code, str) and (code in TRANSIENT_SQLSTATE or code.startswith("08")):
+        return True
+    return _status_of(error) in TRANSIENT_STATUS
+
+
+class CircuitBreaker:
+    """
+    Disjuntor por dependência. Depois de `failure_threshold` falhas passageiras
+    seguidas o circuito abre e as chamadas falham na hora por `reset_timeout`
+    segundos; depois disso uma única chamada de teste decide se ele fecha de novo.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = BREAKER_FAILURE_THRESHOLD,
+        reset_timeout: float = BREAKER_RESET_TIMEOUT,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Union[float, None] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._clock() - self._opened_at >= self.reset_timeout:
+                return "half_open"
+            return "open"
+
+    def allow(self) -> bool:
+        """Se a chamada pode seguir. No meio-aberto, só uma chamada de teste por vez."""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._clock() - self._opened_at < self.reset_timeout or self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("Circuito '%s' fechado: dependência respondeu.", self.name)
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._probing:
+                    logger.warning(
+                        "Circuito '%s' aberto após %s falha(s); chamadas falham por %ss.",
+                        self.name,
+                        self._failures,
+                        self.reset_timeout,
+                    )
+                self._opened_at = self._clock()
+                self._probing = False
+
+
+class RetryPolicy:
+    """Tentativas, espera exponencial com jitter e orçamento total de latência."""
+
+    def __init__(
+        self,
+        attempts: int = RETRY_ATTEMPTS,
+        base_delay: float = RETRY_BASE_DELAY,
+        max_delay: float = RETRY_MAX_DELAY,
+        budget: float = SUPABASE_TIMEOUT,
+    ):
+        self.attempts = attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+
+    @property
+    def attempt_timeout(self) -> float:
+        """Timeout de cada tentativa: o orçamento dividido entre as tentativas."""
+        return self.budget / max(1, self.attempts)
+
+    def delay(self, attempt: int, rng: Any = random) -> float:
+        """Espera antes da tentativa `attempt + 1` (jitter completo)."""
+        return rng.uniform(0, min(self.max_delay, self.base_delay * 2**attempt))
+
+
+POLICIES: Dict[str, RetryPolicy] = {
+    "supabase": RetryPolicy(budget=SUPABASE_TIMEOUT),
+    "gemini": RetryPolicy(budget=GEMINI_TIMEOUT),
+}
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(dependency: str) -> CircuitBreaker:
+    with _breakers_lock:
+        if dependency not in _breakers:
+            _breakers[dependency] = CircuitBreaker(dependency)
+        return _breakers[dependency]
+
+
+def reset_breakers() -> None:
+    """Fecha todos os circuitos (usado nos testes)."""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def call(
+    dependency: str,
+    fn: Callable[..., Any],
+    *args: Any,
+    retry: bool = True,
+    write: bool = False,
+    **kwargs: Any,
+) -> Any:
+    """
+    Executa fn(*args, **kwargs) protegida pelo disjuntor de `dependency`. Falhas
+    passageiras são repetidas (se `retry`) enquanto couberem no orçamento de
+    latência; esgotadas, viram DependencyUnavailableError. Erros permanentes
+    sobem sem retry. Escritas sem chave de idempotência devem usar retry=False:
+    um timeout não diz se o servidor gravou ou não. Com `write`, a falha depois
+    de uma tentativa enviada sobe com write_uncertain=True.
+    As esperas entre tentativas bloqueiam a thread: os handlers do bot chamam
+    db.* fora do event loop (asyncio.to_thread) para não congelar os outros chats.
+    """
+    policy = POLICIES.get(dependency) or RetryPolicy()
+    breaker = get_breaker(dependency)
+    deadline = time.monotonic() + policy.budget
+    attempt = 0
+    while True:
+        if not breaker.allow():
+            raise DependencyUnavailableError(
+                dependency, "circuito aberto", write_uncertain=write and attempt > 0
+            )
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            if not is_transient(e):
+                # A dependência respondeu; o erro é da requisição
+                breaker.record_success()
+                raise
+            breaker.record_failure()
+            attempt += 1
+            if not retry or attempt >= policy.attempts:
+                raise DependencyUnavailableError(
+                    dependency, str(e), write_uncertain=write
+                ) from e
+            delay = policy.delay(attempt - 1)
+            if time.monotonic() + delay >= deadline:
+                raise DependencyUnavailableError(
+                    dependency,
+                    f"orçamento de {policy.budget}s esgotado: {e}",
+                    write_uncertain=write,
+                ) from e
+            logger.warning(
+                "Falha passageira em '%s' (tentativa %s/%s): %s",
+                dependency,
+                attempt,
+                policy.attempts,
+                e,
+            )
+            time.sleep(delay)
+            continue
+        breaker.record_success()
+        return result
@@ -0,0 +1,219 @@
+# src/core/search.py
+import bisect
+import heapq
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Set, Union
+
+from supabase import Client
+
+from src.config import SEARCH_INDEX_TTL
+from src.core import db
+from src.core.models import Gasto
+from src.utils.money import cents_array, from_cents
+from src.utils.text_utils import tokenize
+
+# Ignoradas na consulta: "gastos com uber" busca só por "uber"
+STOP_WORDS = frozenset(
+    {"a", "o", "as", "os", "e", "de", "da", "do", "das", "dos", "com", "em"}
+    | {"no", "na", "nos", "nas", "para", "pra", "por"}
+)
+_INDEX_COLUMNS = "id,value,date,description,category_id,payment_method_id"
+
+
+def query_terms(query: str) -> List[str]:
+    """Termos de uma consulta, sem as palavras de STOP_WORDS (se sobrar algum)."""
+    terms = tokenize(query)
+    return [term for term in terms if term not in STOP_WORDS] or terms
+
+
+class SearchIndex:
+    """
+    Índice invertido das descrições dos gastos: cada palavra (sem acentos) aponta
+    para as posições dos gastos que a contêm, e o vocabulário ordenado permite
+    buscar por prefixo ("ube" encontra "Uber" e "UberEats"). O histórico é lido
+    uma vez, página a página e só com as colunas necessárias; depois disso cada
+    gasto gravado pelo bot entra com add(), e uma busca só visita os gastos que
+    contêm os termos.
+    """
+
+    def __init__(self, ttl: int = SEARCH_INDEX_TTL):
+        self.ttl = ttl
+        self._loaded_at: Union[float, None] = None
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        self._postings: Dict[str, List[int]] = {}
+        self._vocabulary: List[str] = []
+        self._positions: Dict[Any, int] = {}
+        self._ids: List[Any] = []
+        self._dates: List[str] = []
+        self._cents: List[int] = []
+        self._descriptions: List[Union[str, None]] = []
+        self._category_ids: List[Any] = []
+        self._payment_ids: List[Any] = []
+
+    def _add_rows(self, rows: List[Dict[str, Any]]) -> List[str]:
+        """Indexa as linhas e retorna as palavras que ainda não existiam."""
+        new_tokens = []
+        for row, cents in zip(rows, cents_array([row["value"] for row in rows])):
+            position = len(self._dates)
+            if row.get("id") is not None:
+                self._positions[row["id"]] = position
+            self._ids.append(row.get("id"))
+            self._dates.append(str(row["date"])[:10])
+            self._cents.append(int(cents))
+            self._descriptions.append(row.get("description"))
+            self._category_ids.append(row.get("category_id"))
+            self._payment_ids.append(row.get("payment_method_id"))
+            new_tokens.extend(self._index_description(position))
+        return new_tokens
+
+    def _index_description(self, position: int) -> List[str]:
+        """Inclui a posição nas listas das palavras da descrição; retorna as novas."""
+        new_tokens = []
+        for token in set(tokenize(self._descriptions[position])):
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = []
+                new_tokens.append(token)
+            postings.append(position)
+        return new_tokens
+
+    def _unindex_description(self, position: int) -> None:
+        for token in set(tokenize(self._descriptions[position])):
+            postings = self._postings[token]
+            postings.remove(position)
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+
+    def _ensure_loaded(self, supabase_client: Client) -> None:
+        if self._loaded_at is not None and (
+            time.monotonic() - self._loaded_at <= self.ttl
+        ):
+            return
+        self._reset()
+        for page in db.iter_gastos_pages(supabase_client, columns=_INDEX_COLUMNS):
+            self._add_rows(page)
+        self._vocabulary = sorted(self._postings)
+        self._loaded_at = time.monotonic()
+
+    def _prefix_matches(self, term: str) -> Set[int]:
+        matches: Set[int] = set()
+        index = bisect.bisect_left(self._vocabulary, term)
+        while index < len(self._vocabulary) and self._vocabulary[index].startswith(
+            term
+        ):
+            matches.update(self._postings[self._vocabulary[index]])
+            index += 1
+        return matches
+
+    def add(self, expenses: Iterable[Dict[str, Any]]) -> None:
+        """
+        Indexa gastos recém-gravados, como devolvidos pelo banco (com id, para
+        que edições posteriores os encontrem). Se o índice ainda não foi
+        carregado, não faz nada: a carga já os incluirá.
+        """
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            for token in self._add_rows(list(expenses)):
+                bisect.insort(self._vocabulary, token)
+
+    def update(self, expense_id: Any, changes: Union[Dict[str, Any], None]) -> None:
+        """
+        Aplica a edição de um gasto (colunas de `changes`) no índice; com
+        changes=None, remove o gasto. Um gasto que o índice não conhece pelo id
+        (gravado depois da carga) faz o índice ser remontado na próxima busca.
+        """
+        with self._lock:
+            if self._loaded_at is None:
+                return
+            position = self._positions.get(expense_id)
+            if position is None:
+                self._loaded_at = None
+                self._reset()
+                return
+            self._unindex_description(position)
+            if changes is None:
+                del self._positions[expense_id]
+                return
+            if "value" in changes:
+                self._cents[position] = int(cents_array([changes["value"]])[0])
+            if "date" in changes:
+                self._dates[position] = str(changes["date"])[:10]
+            for column, values in (
+                ("description", self._descriptions),
+                ("category_id", self._category_ids),
+                ("payment_method_id", self._payment_ids),
+            ):
+                if column in changes:
+                    values[position] = changes[column]
+            for token in self._index_description(position):
+                bisect.insort(self._vocabulary, token)
+
+    def invalidate(self) -> None:
+        """Descarta o índice; a próxima busca o remonta a partir do banco."""
+        with self._lock:
+            self._loaded_at = None
+            self._reset()
+
+    def search(
+        self,
+        supabase_client: Client,
+        query: str,
+        data_inicio: Union[str, None] = None,
+        data_fim: Union[str, None] = None,
+        limit: int = 10,
+    ) -> Dict[str, Any]:
+        """
+        Gastos cuja descrição contém todos os termos da consulta (cada termo como
+        prefixo de uma palavra, sem diferenciar acentos), no período opcional.
+        Retorna {"count": int, "total": float, "gastos": os `limit` mais recentes}.
+        """
+        terms = query_terms(query)
+        with self._lock:
+            self._ensure_loaded(supabase_client)
+            positions: Set[int] = set()
+            for number, term in enumerate(terms):
+                matches = self._prefix_matches(term)
+                positions = matches if number == 0 else positions & matches
+                if not positions:
+                    break
+            if data_inicio or data_fim:
+                dates = self._dates
+                positions = {
+                    position
+                    for position in positions
+                    if (not data_inicio or dates[position] >= data_inicio)
+                    and (not data_fim or dates[position] <= data_fim)
+                }
+            total = sum(self._cents[position] for position in positions)
+            rows = [
+                {
+                    "id": self._ids[position],
+                    "value": from_cents(self._cents[position]),
+                    "date": self._dates[position],
+                    "description": self._descriptions[position],
+                    "category_id": self._category_ids[position],
+                    "payment_method_id": self._payment_ids[position],
+                }
+                for position in heapq.nlargest(
+                    limit,
+                    positions,
+                    key=lambda position: (self._dates[position], position),
+                )
+            ]
+
+        category_names, payment_names = db.reference_data.names(
+            supabase_client,
+            {row["category_id"] for row in rows},
+            {row["payment_method_id"] for row in rows},
+        )
+        return {
+            "count": len(positions),
+            "total": from_cents(total),
+            "gastos": Gasto.from_rows(rows, category_names, payment_names),
+        }
@@ -0,0 +1,219 @@
+# src/core/write_queue.py
+import contextlib
+import json
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, Tuple, Union
+
+from supabase import Client
+
+from src.config import (
+    WRITE_QUEUE_BATCH_SIZE,
+    WRITE_QUEUE_RETRY_BASE,
+    WRITE_QUEUE_RETRY_MAX,
+)
+from src.core import db
+from src.core.log import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending_expenses (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    idempotency_key TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL DEFAULT 0,
+    last_error TEXT,
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+CREATE INDEX IF NOT EXISTS idx_pending_due ON pending_expenses(next_attempt_at, seq);
+"""
+
+
+def backoff_delay(
+    attempts: int,
+    base: float = WRITE_QUEUE_RETRY_BASE,
+    cap: float = WRITE_QUEUE_RETRY_MAX,
+    rng: Union[random.Random, None] = None,
+) -> float:
+    """
+    Espera antes da próxima tentativa: dobra a cada falha, até `cap`, sorteada entre
+    metade e o total para que vários clientes não tentem ao mesmo tempo.
+    """
+    ceiling = min(cap, base * (2 ** min(attempts, 32)))
+    return (rng or random).uniform(ceiling / 2, ceiling)
+
+
+class WriteQueue:
+    """
+    Fila durável (SQLite) de gastos confirmados ainda não gravados no Supabase.
+    O handler enfileira e responde na hora; flush() envia os gastos em lotes via
+    db.add_expenses_bulk, cada um com sua idempotency_key, então reenviar um lote
+    após uma falha parcial não duplica nada. Gastos que falham voltam para a fila
+    com backoff exponencial e nunca são descartados.
+    """
+
+    def __init__(self, path: str, rng: Union[random.Random, None] = None):
+        self.path = path
+        self._rng = rng or random.Random()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        # Só um flush por vez: o job periódico e o drain no desligamento
+        self._flush_lock = threading.Lock()
+        with self._lock:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def enqueue(self, expenses: List[Dict[str, Any]]) -> Union[List[str], None]:
+        """
+        Grava os gastos na fila numa única transação e retorna suas chaves de
+        idempotência, ou None se nem a fila local conseguiu gravar.
+        """
+        keys = [str(uuid.uuid4()) for _ in expenses]
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT INTO pending_expenses (idempotency_key, payload) "
+                    "VALUES (?, ?)",
+                    [
+                        (key, json.dumps(expense, ensure_ascii=False))
+                        for key, expense in zip(keys, expenses)
+                    ],
+                )
+            return keys
+        except sqlite3.Error as e:
+            logger.error("Erro ao gravar gastos na fila local: %s", e)
+            return None
+
+    def pending(self) -> int:
+        """Quantos gastos ainda aguardam gravação no Supabase."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM pending_expenses"
+            ).fetchone()[0]
+
+    def pending_expenses(self, data_inicio: str, data_fim: str) -> List[Dict[str, Any]]:
+        """Gastos ainda na fila com data no período (inclusive), como enfileirados."""
+        with self._lock:
+            payloads = self._conn.execute(
+                "SELECT payload FROM pending_expenses "
+                "WHERE substr(json_extract(payload, '$.date'), 1, 10) BETWEEN ? AND ? "
+                "ORDER BY seq",
+                (data_inicio, data_fim),
+            ).fetchall()
+        return [json.loads(payload) for (payload,) in payloads]
+
+    @contextlib.contextmanager
+    def paused(self) -> Iterator[None]:
+        """
+        Segura os flushes enquanto o bloco roda: uma leitura do Supabase seguida de
+        pending_expenses não perde nem conta duas vezes um gasto enviado no meio.
+        """
+        with self._flush_lock:
+            yield
+
+    def _due(self, limit: int, now: float) -> List[Tuple[int, str, str, int]]:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT seq, idempotency_key, payload, attempts FROM pending_expenses "
+                "WHERE next_attempt_at <= ? ORDER BY seq LIMIT ?",
+                (now, limit),
+            ).fetchall()
+
+    def flush(
+        self,
+        supabase_client: Client,
+        batch_size: int = WRITE_QUEUE_BATCH_SIZE,
+        now: Union[float, None] = None,
+        ignore_backoff: bool = False,
+    ) -> Dict[str, int]:
+        """
+        Envia ao Supabase um lote dos gastos cujo backoff já venceu (ou os mais
+        antigos, com ignore_backoff). Retorna {"flushed": int, "failed": int,
+        "rows": linhas gravadas, com id}.
+        """
+        now = time.time() if now is None else now
+        with self._flush_lock:
+            entries = self._due(batch_size, float("inf") if ignore_backoff else now)
+            if not entries:
+                return {"flushed": 0, "failed": 0, "rows": []}
+
+            # Gastos que já falharam vão um por requisição: um gasto inválido
+            # (ex: categoria apagada) não segura o resto do lote na fila
+            errors: Dict[int, str] = {}
+            rows: List[Dict[str, Any]] = []
+            for retrying in (False, True):
+                group = [
+                    (i, {**json.loads(payload), "idempotency_key": key})
+                    for i, (_, key, payload, attempts) in enumerate(entries)
+                    if bool(attempts) == retrying
+                ]
+                if not group:
+                    continue
+                result = db.add_expenses_bulk(
+                    supabase_client,
+                    [row for _, row in group],
+                    chunk_size=1 if retrying else batch_size,
+                    return_rows=True,
+                )
+                rows.extend(result["rows"])
+                for failure in result["failed"]:
+                    errors[group[failure["index"]][0]] = failure["error"]
+
+            done = [(seq,) for i, (seq, *_) in enumerate(entries) if i not in errors]
+            retries = [
+                (
+                    attempts + 1,
+                    now + backoff_delay(attempts, rng=self._rng),
+                    errors[i],
+                    seq,
+                )
+                for i, (seq, _, _, attempts) in enumerate(entries)
+                if i in errors
+            ]
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "DELETE FROM pending_expenses WHERE seq = ?", done
+                )
+                self._conn.executemany(
+                    "UPDATE pending_expenses SET attempts = ?, next_attempt_at = ?, "
+                    "last_error = ? WHERE seq = ?",
+                    retries,
+                )
+            if retries:
+                logger.warning(
+                    "%s gasto(s) continuam na fila; próxima tentativa em até %.0fs.",
+                    len(retries),
+                    max(retry[1] for retry in retries) - now,
+                )
+            return {"flushed": len(done), "failed": len(retries), "rows": rows}
+
+    def drain(self, supabase_client: Client, timeout: float) -> int:
+        """
+        Esvazia a fila ignorando o backoff (usado no desligamento), até `timeout`
+        segundos. Retorna quantos gastos ficaram na fila para o próximo início.
+        """
+        deadline = time.monotonic() + timeout
+        failures = 0
+        while self.pending() and time.monotonic() < deadline:
+            result = self.flush(supabase_client, ignore_backoff=True)
+            if result["failed"] and not result["flushed"]:
+                # Supabase fora do ar: espera um pouco antes de insistir
+                delay = backoff_delay(failures, rng=self._rng)
+                time.sleep(max(0.0, min(delay, deadline - time.monotonic())))
+                failures += 1
+        remaining = self.pending()
+        if remaining:
+            logger.error(
+                "%s gasto(s) não foram gravados no Supabase; serão enviados no próximo início.",
+                remaining,
+            )
+        return remaining
@@ -3,15 +3,20 @@ import os
 from dotenv import load_dotenv
 
 from src.bot.bot_setup import setup_and_run_bot
-from src.core.db import get_supabase_client  # Importa a função que cria o cliente
+from src.config import DB_BACKEND, DB_REPLICA_PATH, DB_SQLITE_PATH
+from src.core.backends import create_backend
+from src.core.log import get_logger, setup_logging
+
+logger = get_logger(__name__)
 
 
 def main():
     # Carrega variáveis de ambiente do .env
     load_dotenv()
+    setup_logging()
 
-    # Inicializa o cliente Supabase aqui, uma única vez
-    supabase_client = get_supabase_client()
+    # Inicializa o cliente do banco aqui, uma única vez (Supabase por padrão)
+    supabase_client = create_backend(DB_BACKEND, DB_SQLITE_PATH, DB_REPLICA_PATH)
 
     # Passa o cliente Supabase para o setup do bot
     config = {
@@ -21,7 +26,7 @@ def main():
         "SUPABASE_CLIENT": supabase_client,  # Chave importante!
     }
 
-    print("Iniciando bot de finanças...")
+    logger.info("Iniciando bot de finanças...")
     setup_and_run_bot(config)
 
 
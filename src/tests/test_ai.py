@@ -72,6 +72,18 @@ class TestArtificialIntelligence(unittest.TestCase):
         self.assertEqual(info['descricao'], 'Salário')
         self.assertEqual(info['data'], self.last_month_end_str)
 
+    @patch('src.core.ai.ask_llama')
+    @patch('src.core.db.get_categories')
+    def test_extract_transaction_info_valor_em_texto(self, mock_get_categories, mock_ask_llama):
+        mock_get_categories.return_value = []
+        mock_ask_llama.return_value = f'{{"intencao": "ganho", "valor": "R$ 1.234,56", "descricao": "Freela", "data": "{self.today_str}"}}'
+        info = ai.extract_transaction_info("recebi 1.234,56 do freela", self.mock_supabase_client)
+        self.assertEqual(info['valor'], 1234.56)
+
+        mock_ask_llama.return_value = f'{{"intencao": "gasto", "valor": 18.099999999, "categoria": "Transporte", "data": "{self.today_str}"}}'
+        info = ai.extract_transaction_info("corrida de 18,10", self.mock_supabase_client)
+        self.assertEqual(info['valor'], 18.1)
+
     @patch('src.core.ai.ask_llama')
     @patch('src.core.db.get_categories')
     def test_extract_transaction_info_adicionar_categoria(self, mock_get_categories, mock_ask_llama):
@@ -98,6 +110,22 @@ class TestArtificialIntelligence(unittest.TestCase):
         self.assertEqual(info['data_fim'], self.current_month_end_str)
         mock_get_categories.assert_called_once_with(self.mock_supabase_client)
 
+    @patch('src.core.ai.ask_llama')
+    @patch('src.core.db.get_categories')
+    def test_extract_transaction_info_gastos_multiplos(self, mock_get_categories, mock_ask_llama):
+        mock_get_categories.return_value = [{'name': 'Alimentacao'}, {'name': 'Transporte'}]
+        mock_ask_llama.return_value = (
+            f'{{"intencao": "gastos_multiplos", "transacoes": ['
+            f'{{"valor": 120.0, "categoria": "Alimentacao", "data": "{self.today_str}", "forma_pagamento": null, "descricao_gasto": "Mercado"}}, '
+            f'{{"valor": "25,50", "categoria": "Transporte", "data": "{self.yesterday_str}", "forma_pagamento": "pix", "descricao_gasto": "Uber"}}]}}'
+        )
+        info = ai.extract_transaction_info("mercado 120, uber 25,50 ontem no pix", self.mock_supabase_client)
+        self.assertIsNotNone(info)
+        self.assertEqual(info['intencao'], 'gastos_multiplos')
+        self.assertEqual(len(info['transacoes']), 2)
+        self.assertEqual(info['transacoes'][1]['valor'], 25.5)
+        self.assertEqual(mock_ask_llama.call_count, 1)
+
     @patch('src.core.ai.ask_llama')
     @patch('src.core.db.get_categories')
     def test_extract_transaction_info_invalid_json(self, mock_get_categories, mock_ask_llama):
@@ -0,0 +1,192 @@
+# tests/test_backends.py
+import os
+import tempfile
+import unittest
+
+from src.benchmarks.fake_supabase import FakeSupabaseClient
+from src.benchmarks.ledger import generate_ledger
+from src.core import db
+from src.core.backends import MemoryBackend, SQLiteBackend, create_backend
+
+
+class BackendContract:
+    """Os mesmos testes de db.py rodam sobre cada backend."""
+
+    def make_backend(self, tables):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.ledger = generate_ledger(200, seed=5)
+        self.client = self.make_backend(self.ledger)
+
+    def test_get_gastos_joins_names(self):
+        gastos = db.get_gastos(self.client)
+        self.assertEqual(len(gastos), 200)
+        dates = [g["date"] for g in gastos]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+        self.assertTrue(all(g["categoria_nome"] != "Desconhecida" for g in gastos))
+        self.assertIn("Não Informado", {g["forma_pagamento_nome"] for g in gastos})
+
+    def test_filters_by_period_and_category(self):
+        expected = [
+            row
+            for row in self.ledger["expenses"]
+            if row["category_id"] == "cat-0"
+            and "2025-01-01" <= row["date"] <= "2025-03-31"
+        ]
+        summary = db.get_gastos_summary(
+            self.client,
+            data_inicio="2025-01-01",
+            data_fim="2025-03-31",
+            category_id="cat-0",
+        )
+        self.assertEqual(summary["count"], len(expected))
+        self.assertAlmostEqual(summary["total"], sum(r["value"] for r in expected))
+
+    def test_aggregates_count_and_sum(self):
+        expected = [r for r in self.ledger["expenses"] if r["category_id"] == "cat-1"]
+        rows = (
+            self.client.table("expenses")
+            .select("count(),value.sum()")
+            .eq("category_id", "cat-1")
+            .execute()
+            .data
+        )
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0]["count"], len(expected))
+        self.assertAlmostEqual(rows[0]["sum"], sum(r["value"] for r in expected))
+
+    def test_select_columns(self):
+        table = self.client.table("categories")
+        self.assertEqual(table.select().columns, "*")
+        self.assertEqual(table.select("id", "name").columns, "id,name")
+        with self.assertRaises(TypeError):
+            table.select("id", count="exact")
+
+    def test_keyset_pagination_covers_everything_once(self):
+        seen, cursor = [], None
+        while True:
+            page = db.get_gastos_page(self.client, limit=30, cursor=cursor)
+            if not page:
+                break
+            seen.extend(row["id"] for row in page)
+            cursor = {"date": page[-1]["date"], "id": page[-1]["id"]}
+        self.assertEqual(len(seen), 200)
+        self.assertEqual(len(set(seen)), 200)
+
+    def test_writes(self):
+        self.assertTrue(
+            db.add_expense(self.client, 12.5, "cat-1", "2025-06-30", "fp-0", "café")
+        )
+        self.assertEqual(
+            len(db.get_expense_by_category(self.client, "cat-1")),
+            len([r for r in self.ledger["expenses"] if r["category_id"] == "cat-1"])
+            + 1,
+        )
+
+        rows = [{"value": 1.0, "category_id": "cat-2", "date": "2025-06-01"}] * 3
+        first = db.add_expenses_bulk(self.client, rows, idempotency_key="lote")
+        again = db.add_expenses_bulk(self.client, rows, idempotency_key="lote")
+        self.assertEqual((first["inserted"], first["failed"]), (3, []))
+        self.assertEqual(again["failed"], [])
+        self.assertEqual(db.get_gastos_summary(self.client)["count"], 204)
+
+        self.assertTrue(db.add_category(self.client, "academia", 150.0, ["gym"]))
+        self.assertFalse(db.add_category(self.client, "academia"))
+        categoria = next(
+            c for c in db.get_categories(self.client) if c["name"] == "Academia"
+        )
+        self.assertEqual(categoria["aliases"], ["gym"])
+        self.assertTrue(
+            db.update_category_aliases(
+                self.client, categoria["id"], ["gym", "crossfit"]
+            )
+        )
+        self.assertEqual(
+            db.get_category_id_by_text(self.client, "crossfit"), categoria["id"]
+        )
+
+        self.assertTrue(db.add_ganho(self.client, 100.0, "bônus", "2025-06-15"))
+        total = db.get_ganhos_total(self.client, "2025-06-15", "2025-06-15")
+        expected = sum(
+            g["value"] for g in self.ledger["ganhos"] if g["date"] == "2025-06-15"
+        )
+        self.assertAlmostEqual(total, expected + 100.0)
+
+
+class TestMemoryBackend(BackendContract, unittest.TestCase):
+    def make_backend(self, tables):
+        return MemoryBackend(
+            {name: [dict(r) for r in rows] for name, rows in tables.items()}
+        )
+
+    def test_date_index_narrows_candidates(self):
+        index = self.client.index("expenses")
+        candidates = index.candidates(
+            [("date", "gte", "2025-06-01"), ("date", "lte", "2025-06-30")],
+            self.client.tables["expenses"],
+        )
+        self.assertLess(len(candidates), 200)
+        self.assertTrue(
+            all("2025-06-01" <= r["date"] <= "2025-06-30" for r in candidates)
+        )
+
+
+class TestSQLiteBackend(BackendContract, unittest.TestCase):
+    def make_backend(self, tables):
+        return SQLiteBackend(":memory:", tables)
+
+    def test_queries_use_indexes(self):
+        plan = self.client._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM expenses WHERE category_id = ? AND date >= ?",
+            ("cat-0", "2025-01-01"),
+        ).fetchall()
+        self.assertIn(
+            "idx_expenses_category", " ".join(str(tuple(row)) for row in plan)
+        )
+
+    def test_file_database_persists(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "bot.db")
+            backend = create_backend("sqlite", path)
+            db.add_category(backend, "Lazer")
+            backend.close()
+            reopened = SQLiteBackend(path)
+            self.assertEqual(
+                [c["name"] for c in db.get_categories(reopened)], ["Lazer"]
+            )
+            reopened.close()
+
+
+class TestGastosSummary(unittest.TestCase):
+    def setUp(self):
+        self.ledger = generate_ledger(1500, seed=7)
+        self.client = FakeSupabaseClient(self.ledger)
+        self.total = sum(r["value"] for r in self.ledger["expenses"])
+
+    def test_summary_is_aggregated_on_the_server(self):
+        summary = db.get_gastos_summary(self.client)
+        self.assertEqual(summary["count"], 1500)
+        self.assertAlmostEqual(summary["total"], self.total, places=2)
+        self.assertEqual(self.client.calls, 1)
+
+    def test_summary_falls_back_to_pages_past_the_row_cap(self):
+        execute = self.client.execute
+
+        def without_aggregates(query):
+            if "count()" in query.columns:
+                raise ValueError("aggregate functions are not allowed")
+            return execute(query)
+
+        self.client.execute = without_aggregates
+        summary = db.get_gastos_summary(self.client)
+        self.assertEqual(summary["count"], 1500)
+        self.assertAlmostEqual(summary["total"], self.total, places=2)
+        # Sem agregações, o cliente não é consultado com elas de novo
+        calls = self.client.calls
+        db.get_gastos_summary(self.client)
+        self.assertEqual(self.client.calls - calls, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
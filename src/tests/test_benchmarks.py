@@ -0,0 +1,160 @@
+# tests/test_benchmarks.py
+import unittest
+from collections import Counter
+
+from postgrest import SyncPostgrestClient
+
+from src.benchmarks import loadtest, run
+from src.benchmarks.fake_servers import FakePostgrestServer, default_gemini_responder
+from src.benchmarks.fake_supabase import FakeSupabaseClient
+from src.benchmarks.ledger import generate_ledger
+from src.core import db
+
+
+class TestLedger(unittest.TestCase):
+    def test_generate_ledger_is_deterministic_and_skewed(self):
+        ledger = generate_ledger(2000, seed=7)
+        self.assertEqual(ledger, generate_ledger(2000, seed=7))
+        self.assertEqual(len(ledger["expenses"]), 2000)
+
+        counts = Counter(row["category_id"] for row in ledger["expenses"])
+        # A categoria mais frequente deve ser bem mais comum que a menos frequente
+        self.assertGreater(counts["cat-0"], 4 * counts["cat-12"])
+
+
+class TestFakeSupabaseClient(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeSupabaseClient(generate_ledger(300, seed=1))
+
+    def test_select_with_embedded_resources(self):
+        row = (
+            self.client.table("expenses")
+            .select("value,categories(name),payment_methods(name)")
+            .limit(1)
+            .execute()
+            .data[0]
+        )
+        self.assertEqual(set(row), {"value", "categories", "payment_methods"})
+        self.assertIn("name", row["categories"])
+
+    def test_filters_order_and_range(self):
+        rows = (
+            self.client.table("expenses")
+            .select("id,date")
+            .gte("date", "2025-01-01")
+            .lte("date", "2025-01-31")
+            .order("date", desc=True)
+            .range(0, 4)
+            .execute()
+            .data
+        )
+        self.assertLessEqual(len(rows), 5)
+        dates = [row["date"] for row in rows]
+        self.assertEqual(dates, sorted(dates, reverse=True))
+        self.assertTrue(all("2025-01-01" <= d <= "2025-01-31" for d in dates))
+
+    def test_db_functions_run_against_fake(self):
+        gastos = db.get_gastos(self.client)
+        self.assertEqual(len(gastos), 300)
+        self.assertIn("categoria_nome", gastos[0])
+        self.assertTrue(db.add_ganho(self.client, 10.0, "teste", "2025-06-01"))
+
+    def test_or_update_and_upsert(self):
+        rows = (
+            self.client.table("expenses")
+            .select("id,date")
+            .or_("date.lt.2024-01-01,and(date.eq.2025-06-30,id.lt.exp-5)")
+            .execute()
+            .data
+        )
+        self.assertTrue(
+            all(r["date"] < "2024-01-01" or r["date"] == "2025-06-30" for r in rows)
+        )
+
+        updated = (
+            self.client.table("categories")
+            .update({"monthly_limit": 99.0})
+            .eq("id", "cat-1")
+            .execute()
+            .data
+        )
+        self.assertEqual(updated[0]["monthly_limit"], 99.0)
+
+        rows = [{"value": 1.0, "idempotency_key": "k1"}]
+        first = self.client.table("expenses").upsert(
+            rows, on_conflict="idempotency_key", ignore_duplicates=True
+        )
+        self.assertIn("id", first.execute().data[0])
+        again = self.client.table("expenses").upsert(
+            rows, on_conflict="idempotency_key", ignore_duplicates=True
+        )
+        self.assertEqual(again.execute().data, [])
+        self.assertEqual(len(self.client.tables["expenses"]), 301)
+
+
+class TestFakeServers(unittest.TestCase):
+    def test_postgrest_server_translates_requests(self):
+        server = FakePostgrestServer(
+            FakeSupabaseClient(generate_ledger(50, seed=3))
+        ).start()
+        try:
+            client = SyncPostgrestClient(f"{server.url}/rest/v1")
+            rows = (
+                client.table("expenses")
+                .select("id,value,categories(name)")
+                .gte("value", 10)
+                .order("value", desc=True)
+                .limit(3)
+                .execute()
+                .data
+            )
+            self.assertEqual(len(rows), 3)
+            self.assertTrue(all(row["value"] >= 10 for row in rows))
+            self.assertIn("name", rows[0]["categories"])
+
+            inserted = (
+                client.table("payment_methods").insert({"name": "Vr"}).execute().data
+            )
+            self.assertEqual(inserted[0]["name"], "Vr")
+            self.assertEqual(server.requests, 2)
+        finally:
+            server.stop()
+
+    def test_gemini_responder_makes_unique_categories(self):
+        answer = default_gemini_responder("...\nMensagem do Usuário: gastei 50 u1i2\n")
+        self.assertIn("Academia u1i2", answer)
+        self.assertEqual(default_gemini_responder("Termo: academia"), "Lazer")
+
+
+class TestLoadTest(unittest.TestCase):
+    def test_latency_summary_percentiles(self):
+        summary = loadtest.latency_summary([i / 1000 for i in range(1, 101)])
+        self.assertEqual(summary["count"], 100)
+        self.assertEqual(summary["p50_ms"], 50.0)
+        self.assertEqual(summary["p95_ms"], 95.0)
+        self.assertEqual(summary["p99_ms"], 99.0)
+        self.assertIsNone(loadtest.latency_summary([])["p50_ms"])
+
+
+class TestRunBenchmarks(unittest.TestCase):
+    def test_run_selected_cases(self):
+        report = run.run_benchmarks(
+            [200], repeat=1, cases=["filter_gastos_data", "format_expense_lines"]
+        )
+        self.assertEqual(
+            [r["case"] for r in report["results"]],
+            ["filter_gastos_data", "format_expense_lines"],
+        )
+        self.assertIn("peak_mb", report["results"][0])
+        self.assertEqual(report["meta"]["sizes"], [200])
+
+    def test_compare_reports_flags_regressions(self):
+        base = {"results": [{"case": "a", "size": 1, "seconds_min": 1.0}]}
+        new = {"results": [{"case": "a", "size": 1, "seconds_min": 1.5}]}
+        rows = run.compare_reports(base, new, threshold=1.2)
+        self.assertTrue(rows[0]["regression"])
+        self.assertEqual(rows[0]["ratio"], 1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,221 @@
+# tests/test_budget.py
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.core.budget import BudgetTracker, month_bounds
+from src.core.write_queue import WriteQueue
+
+
+class TestBudget(unittest.TestCase):
+    def test_month_bounds(self):
+        self.assertEqual(
+            month_bounds("2024-02-10"), ("2024-02", "2024-02-01", "2024-02-29")
+        )
+        self.assertEqual(
+            month_bounds("2025-12-31"), ("2025-12", "2025-12-01", "2025-12-31")
+        )
+
+    @patch("src.core.db.iter_gastos_pages")
+    def test_record_expense_seeds_month_once(self, mock_pages):
+        # A carga inicial já contém o gasto de 30 recém-gravado
+        mock_pages.return_value = iter(
+            [
+                [
+                    {"category_id": "c1", "value": 50.0},
+                    {"category_id": "c1", "value": 30.0},
+                ]
+            ]
+        )
+        tracker = BudgetTracker(thresholds=[0.8, 1.0])
+        client = MagicMock()
+
+        self.assertEqual(
+            tracker.record_expense(client, "c1", "2025-07-10", 30.0), (50.0, 80.0)
+        )
+        self.assertEqual(
+            tracker.record_expense(client, "c1", "2025-07-11", 20.0), (80.0, 100.0)
+        )
+        self.assertEqual(mock_pages.call_count, 1)
+        _, kwargs = mock_pages.call_args
+        self.assertEqual(kwargs["data_inicio"], "2025-07-01")
+        self.assertEqual(kwargs["data_fim"], "2025-07-31")
+
+    @patch("src.core.db.iter_gastos_pages")
+    def test_record_expenses_batch_in_unloaded_month(self, mock_pages):
+        # A carga já contém os dois gastos de 30 do lote
+        mock_pages.return_value = iter(
+            [
+                [
+                    {"category_id": "c1", "value": 50.0},
+                    {"category_id": "c1", "value": 30.0},
+                    {"category_id": "c1", "value": 30.0},
+                ]
+            ]
+        )
+        tracker = BudgetTracker()
+        expenses = [
+            {"category_id": "c1", "date": "2025-07-10", "value": 30.0},
+            {"category_id": "c1", "date": "2025-07-12", "value": 30.0},
+        ]
+
+        self.assertEqual(
+            tracker.record_expenses(MagicMock(), expenses),
+            [(50.0, 80.0), (80.0, 110.0)],
+        )
+        self.assertEqual(tracker.get_total(MagicMock(), "c1", "2025-07-01"), 110.0)
+        self.assertEqual(mock_pages.call_count, 1)
+
+    @patch("src.core.db.iter_gastos_pages")
+    def test_record_expenses_category_change(self, mock_pages):
+        # Carga feita depois da edição: o gasto de 30 já está em c2
+        mock_pages.return_value = iter(
+            [
+                [
+                    {"category_id": "c1", "value": 20.0},
+                    {"category_id": "c2", "value": 40.0},
+                    {"category_id": "c2", "value": 30.0},
+                ]
+            ]
+        )
+        tracker = BudgetTracker()
+        deltas = [
+            {"category_id": "c1", "date": "2025-07-10", "value": -30.0},
+            {"category_id": "c2", "date": "2025-07-10", "value": 30.0},
+        ]
+
+        self.assertEqual(
+            tracker.record_expenses(MagicMock(), deltas), [(50.0, 20.0), (40.0, 70.0)]
+        )
+
+    @patch("src.core.db.iter_gastos_pages")
+    def test_queued_expenses_are_added_to_the_load(self, mock_pages):
+        # Gastos ainda na fila de escrita não estão na carga do mês
+        mock_pages.return_value = iter([[{"category_id": "c1", "value": 50.0}]])
+        tracker = BudgetTracker()
+        expenses = [
+            {"category_id": "c1", "date": "2025-07-10", "value": 30.0},
+            {"category_id": "c1", "date": "2025-07-12", "value": 30.0},
+        ]
+
+        self.assertEqual(
+            tracker.record_expenses(MagicMock(), expenses, saved=False),
+            [(50.0, 80.0), (80.0, 110.0)],
+        )
+        self.assertEqual(tracker.get_total(MagicMock(), "c1", "2025-07-01"), 110.0)
+
+    @patch("src.core.db.iter_gastos_pages")
+    def test_load_includes_the_write_queue(self, mock_pages):
+        mock_pages.return_value = iter([[{"category_id": "c1", "value": 50.0}]])
+        queue = WriteQueue(":memory:")
+        self.addCleanup(queue.close)
+        # Sobrou na fila de antes de um reinício; outro mês fica de fora da carga
+        queue.enqueue(
+            [
+                {"category_id": "c1", "date": "2025-07-02", "value": 10.0},
+                {"category_id": "c1", "date": "2025-08-02", "value": 99.0},
+            ]
+        )
+        tracker = BudgetTracker(write_queue=queue)
+        # O gasto novo já foi enfileirado quando os alertas rodam
+        expense = {"category_id": "c1", "date": "2025-07-10", "value": 30.0}
+        queue.enqueue([expense])
+
+        self.assertEqual(
+            tracker.record_expenses(MagicMock(), [expense], saved=False),
+            [(60.0, 90.0)],
+        )
+        self.assertEqual(mock_pages.call_count, 1)
+
+    @patch("src.core.db.iter_gastos_pages")
+    def test_failed_load_is_retried(self, mock_pages):
+        def failing_pages(*args, **kwargs):
+            yield [{"category_id": "c1", "value": 10.0}]
+            raise ValueError("timeout")
+
+        mock_pages.side_effect = [
+            failing_pages(),
+            iter(
+                [
+                    [
+                        {"category_id": "c1", "value": 10.0},
+                        {"category_id": "c1", "value": 5.0},
+                    ]
+                ]
+            ),
+        ]
+        tracker = BudgetTracker()
+        client = MagicMock()
+
+        with self.assertRaises(ValueError):
+            tracker.get_total(client, "c1", "2025-07-01")
+        self.assertEqual(tracker.get_total(client, "c1", "2025-07-01"), 15.0)
+        self.assertNotIn("page_size", mock_pages.call_args.kwargs)
+
+    @patch("src.core.db.iter_gastos_pages")
+    def test_slow_load_does_not_block_loaded_months(self, mock_pages):
+        started, release = threading.Event(), threading.Event()
+
+        def pages(supabase_client, data_inicio, **kwargs):
+            if data_inicio == "2025-08-01":
+                started.set()
+                release.wait(5)
+            yield [{"category_id": "c1", "value": 10.0}]
+
+        mock_pages.side_effect = pages
+        tracker = BudgetTracker()
+        client = MagicMock()
+        tracker.get_total(client, "c1", "2025-07-01")
+
+        slow = threading.Thread(
+            target=tracker.get_total, args=(client, "c1", "2025-08-01")
+        )
+        slow.start()
+        self.assertTrue(started.wait(5))
+        # Julho já está carregado: não espera a leitura de agosto
+        self.assertEqual(
+            tracker.record_expense(client, "c1", "2025-07-02", 5.0), (10.0, 15.0)
+        )
+        release.set()
+        slow.join()
+        self.assertEqual(tracker.get_total(client, "c1", "2025-08-01"), 10.0)
+
+    @patch("src.core.db.iter_gastos_pages")
+    def test_load_crossing_invalidate_is_redone(self, mock_pages):
+        tracker = BudgetTracker()
+
+        def stale_pages(*args, **kwargs):
+            tracker.invalidate("2025-07")
+            yield [{"category_id": "c1", "value": 10.0}]
+
+        mock_pages.side_effect = [
+            stale_pages(),
+            iter([[{"category_id": "c1", "value": 40.0}]]),
+        ]
+        self.assertEqual(tracker.get_total(MagicMock(), "c1", "2025-07-01"), 40.0)
+        self.assertEqual(mock_pages.call_count, 2)
+
+    def test_crossed_thresholds(self):
+        tracker = BudgetTracker(thresholds=[1.0, 0.8])
+        self.assertEqual(tracker.crossed_thresholds(70.0, 85.0, 100.0), [0.8])
+        self.assertEqual(tracker.crossed_thresholds(70.0, 120.0, 100.0), [0.8, 1.0])
+        self.assertEqual(tracker.crossed_thresholds(85.0, 90.0, 100.0), [])
+        self.assertEqual(tracker.crossed_thresholds(0.0, 500.0, None), [])
+
+    @patch("src.core.db.iter_gastos_pages")
+    def test_invalidate_reloads_month(self, mock_pages):
+        mock_pages.side_effect = [
+            iter([[{"category_id": "c1", "value": 10.0}]]),
+            iter([[{"category_id": "c1", "value": 40.0}]]),
+        ]
+        tracker = BudgetTracker()
+        client = MagicMock()
+
+        self.assertEqual(tracker.get_total(client, "c1", "2025-07-01"), 10.0)
+        tracker.invalidate("2025-07")
+        self.assertEqual(tracker.get_total(client, "c1", "2025-07-01"), 40.0)
+        self.assertEqual(mock_pages.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
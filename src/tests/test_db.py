@@ -5,6 +5,7 @@ from supabase import Client  # Importar para tipagem do mock
 
 # Importar o módulo db para testar suas funções
 from src.core import db
+from src.core.models import Categoria
 
 
 class TestDatabase(unittest.TestCase):
@@ -28,6 +29,7 @@ class TestDatabase(unittest.TestCase):
         self.mock_table_methods.eq.return_value = self.mock_table_methods
         self.mock_table_methods.order.return_value = self.mock_table_methods
         self.mock_table_methods.limit.return_value = self.mock_table_methods
+        self.mock_table_methods.range.return_value = self.mock_table_methods
 
         # Configuramos o método .execute() para retornar o mock_execute
         self.mock_table_methods.execute.return_value = self.mock_execute
@@ -55,7 +57,9 @@ class TestDatabase(unittest.TestCase):
             }
         ]
         # Configure o retorno do execute() do mock_table_methods.insert
-        self.mock_execute.return_value = MagicMock(data=mock_response_data)
+        self.mock_table_methods.execute.return_value = MagicMock(
+            data=mock_response_data
+        )
 
         # IDs de exemplo
         test_category_id = str(uuid.uuid4())
@@ -69,7 +73,7 @@ class TestDatabase(unittest.TestCase):
             payment_method_id=test_payment_method_id,
             description="Jantar com amigos",
         )
-        self.assertTrue(result)  # Espera que a função retorne True
+        self.assertEqual(result["id"], mock_response_data[0]["id"])
 
         # Verifica se 'table' foi chamado com 'expenses'
         self.mock_supabase_client.table.assert_called_with("expenses")
@@ -125,11 +129,101 @@ class TestDatabase(unittest.TestCase):
         self.assertFalse(result)
         self.mock_table_methods.insert.assert_called_once()
 
+    # --- Testes para add_expenses ---
+    def test_add_expenses_single_request(self):
+        expenses = [
+            {"value": 120.0, "category_id": "cat1", "date": "2025-07-10"},
+            {
+                "value": 25.0,
+                "category_id": "cat2",
+                "date": "2025-07-09",
+                "payment_method_id": "fp1",
+                "description": "Uber",
+            },
+        ]
+        self.mock_table_methods.execute.return_value = MagicMock(
+            data=[{**expense, "id": f"e{i}"} for i, expense in enumerate(expenses)]
+        )
+        result = db.add_expenses(self.mock_supabase_client, expenses)
+        self.assertEqual([row["id"] for row in result], ["e0", "e1"])
+        self.mock_supabase_client.table.assert_called_with("expenses")
+        self.mock_table_methods.insert.assert_called_once()
+        args, kwargs = self.mock_table_methods.insert.call_args
+        inserted_rows = args[0]
+        self.assertEqual(len(inserted_rows), 2)
+        self.assertIsNone(inserted_rows[0]["payment_method_id"])
+        self.assertEqual(inserted_rows[1]["description"], "Uber")
+
+    def test_add_expenses_empty(self):
+        result = db.add_expenses(self.mock_supabase_client, [])
+        self.assertFalse(result)
+        self.mock_table_methods.insert.assert_not_called()
+
+    def test_add_expenses_failure(self):
+        self.mock_table_methods.insert.return_value.execute.side_effect = Exception(
+            "Database connection error"
+        )
+        result = db.add_expenses(
+            self.mock_supabase_client,
+            [{"value": 10.0, "category_id": "cat1", "date": "2025-07-10"}],
+        )
+        self.assertFalse(result)
+
+    # --- Testes para add_expenses_bulk / add_ganhos_bulk ---
+    def test_add_expenses_bulk_chunks(self):
+        expenses = (
+            {"value": float(i), "category_id": "cat1", "date": "2025-07-10"}
+            for i in range(5)
+        )
+        result = db.add_expenses_bulk(self.mock_supabase_client, expenses, chunk_size=2)
+        self.assertEqual(result, {"inserted": 5, "failed": []})
+        self.assertEqual(self.mock_table_methods.insert.call_count, 3)
+        chunk_sizes = [
+            len(call.args[0]) for call in self.mock_table_methods.insert.call_args_list
+        ]
+        self.assertEqual(chunk_sizes, [2, 2, 1])
+
+    def test_add_expenses_bulk_reports_failed_rows(self):
+        self.mock_table_methods.execute.side_effect = [
+            self.mock_execute,
+            Exception("timeout"),
+        ]
+        expenses = [
+            {"value": float(i), "category_id": "cat1", "date": "2025-07-10"}
+            for i in range(4)
+        ]
+        result = db.add_expenses_bulk(self.mock_supabase_client, expenses, chunk_size=2)
+        self.assertEqual(result["inserted"], 2)
+        self.assertEqual([f["index"] for f in result["failed"]], [2, 3])
+        self.assertEqual(result["failed"][0]["error"], "timeout")
+
+    def test_add_expenses_bulk_idempotency_key(self):
+        self.mock_table_methods.upsert.return_value = self.mock_table_methods
+        expenses = [
+            {"value": 10.0, "category_id": "cat1", "date": "2025-07-10"},
+            {"value": 20.0, "category_id": "cat1", "date": "2025-07-11"},
+        ]
+        result = db.add_expenses_bulk(
+            self.mock_supabase_client, expenses, idempotency_key="import-42"
+        )
+        self.assertEqual(result["inserted"], 2)
+        self.mock_table_methods.insert.assert_not_called()
+        args, kwargs = self.mock_table_methods.upsert.call_args
+        self.assertEqual(
+            [row["idempotency_key"] for row in args[0]], ["import-42:0", "import-42:1"]
+        )
+        self.assertEqual(kwargs["on_conflict"], "idempotency_key")
+        self.assertTrue(kwargs["ignore_duplicates"])
+
+    def test_add_ganhos_bulk(self):
+        ganhos = [{"value": 1000.0, "description": "Salário", "date": "2025-07-05"}]
+        result = db.add_ganhos_bulk(self.mock_supabase_client, ganhos)
+        self.assertEqual(result["inserted"], 1)
+        self.mock_supabase_client.table.assert_called_with("ganhos")
+
     # --- Testes para get_gastos ---
     def test_get_gastos_empty(self):
-        self.mock_table_methods.select.return_value.order.return_value.execute.return_value = MagicMock(
-            data=[]
-        )
+        self.mock_table_methods.execute.return_value = MagicMock(data=[])
         gastos = db.get_gastos(self.mock_supabase_client)
         self.assertEqual(gastos, [])
 
@@ -140,20 +234,110 @@ class TestDatabase(unittest.TestCase):
                 "category_id": "cat1",
                 "date": "2025-07-01",
                 "description": "Cafe",
-                "payment_methods": {"name": "Pix"},
-                "categories": {"name": "Alimentacao"},
+                "payment_method_id": "fp1",
             },
         ]
-        self.mock_table_methods.select.return_value.order.return_value.execute.return_value = MagicMock(
-            data=mock_data
-        )
+        # Paginado: a leitura só termina numa página vazia
+        self.mock_table_methods.execute.side_effect = [
+            MagicMock(data=mock_data),
+            MagicMock(data=[]),
+        ]
 
-        gastos = db.get_gastos(self.mock_supabase_client)
+        with patch.object(
+            db.reference_data,
+            "names",
+            return_value=({"cat1": "Alimentacao"}, {"fp1": "Pix"}),
+        ) as mock_names:
+            gastos = db.get_gastos(self.mock_supabase_client)
+        mock_names.assert_called_once_with(self.mock_supabase_client, {"cat1"}, {"fp1"})
+        self.mock_table_methods.select.assert_called_with(
+            "value,category_id,payment_method_id,date,description"
+        )
         self.assertEqual(len(gastos), 1)
         self.assertEqual(gastos[0]["value"], 50.0)
         self.assertEqual(gastos[0]["categoria_nome"], "Alimentacao")
         self.assertEqual(gastos[0]["forma_pagamento_nome"], "Pix")
         self.assertNotIn("categories", gastos[0])
+        self.mock_table_methods.order.assert_any_call("date", desc=True)
+
+    # --- Testes para iter_gastos_pages ---
+    def test_iter_gastos_pages_stops_on_empty_page(self):
+        self.mock_table_methods.range.return_value = self.mock_table_methods
+        self.mock_table_methods.gte.return_value = self.mock_table_methods
+        # A segunda página volta curta (corte do servidor), mas o histórico segue
+        self.mock_table_methods.execute.side_effect = [
+            MagicMock(data=[{"id": 1}, {"id": 2}]),
+            MagicMock(data=[{"id": 3}]),
+            MagicMock(data=[{"id": 4}]),
+            MagicMock(data=[]),
+        ]
+        pages = list(
+            db.iter_gastos_pages(
+                self.mock_supabase_client, page_size=2, data_inicio="2025-07-01"
+            )
+        )
+        self.assertEqual([len(page) for page in pages], [2, 1, 1])
+        self.mock_table_methods.range.assert_any_call(0, 1)
+        self.mock_table_methods.range.assert_any_call(2, 3)
+        self.mock_table_methods.range.assert_any_call(3, 4)
+        self.mock_table_methods.gte.assert_called_with("date", "2025-07-01")
+
+    def test_iter_gastos_pages_raises_when_a_page_fails(self):
+        self.mock_table_methods.range.return_value = self.mock_table_methods
+        self.mock_table_methods.execute.side_effect = [
+            MagicMock(data=[{"id": 1}, {"id": 2}]),
+            ValueError("coluna inexistente"),
+        ]
+        pages = db.iter_gastos_pages(self.mock_supabase_client, page_size=2)
+        self.assertEqual(len(next(pages)), 2)
+        with self.assertRaises(ValueError):
+            next(pages)
+
+    # --- Testes para get_gastos_page ---
+    def test_get_gastos_page_keyset_cursor(self):
+        self.mock_table_methods.or_.return_value = self.mock_table_methods
+        self.mock_execute.data = [
+            {
+                "id": "g2",
+                "value": 10.0,
+                "date": "2025-07-01",
+                "description": "Cafe",
+                "category_id": "cat1",
+                "payment_method_id": None,
+            }
+        ]
+        with patch.object(
+            db.reference_data, "names", return_value=({"cat1": "Alimentacao"}, {})
+        ):
+            gastos = db.get_gastos_page(
+                self.mock_supabase_client,
+                21,
+                cursor={"date": "2025-07-02", "id": "g9"},
+                category_id="cat1",
+            )
+        self.mock_table_methods.or_.assert_called_once_with(
+            "date.lt.2025-07-02,and(date.eq.2025-07-02,id.lt.g9)"
+        )
+        self.mock_table_methods.eq.assert_called_with("category_id", "cat1")
+        self.mock_table_methods.limit.assert_called_with(21)
+        self.assertEqual(gastos[0]["categoria_nome"], "Alimentacao")
+        self.assertEqual(gastos[0]["forma_pagamento_nome"], "Não Informado")
+        self.assertNotIn("categories", gastos[0])
+
+    def test_get_gastos_page_first_page_has_no_cursor(self):
+        self.mock_execute.data = []
+        self.assertEqual(db.get_gastos_page(self.mock_supabase_client, 21), [])
+        self.mock_table_methods.or_.assert_not_called()
+
+    def test_get_gastos_page_and_find_expenses_raise_on_failure(self):
+        # Uma consulta que falhou não pode virar "nenhum gasto encontrado"
+        self.mock_table_methods.gte.return_value = self.mock_table_methods
+        self.mock_table_methods.lte.return_value = self.mock_table_methods
+        self.mock_table_methods.execute.side_effect = ValueError("coluna inválida")
+        with self.assertRaises(ValueError):
+            db.get_gastos_page(self.mock_supabase_client, 21)
+        with self.assertRaises(ValueError):
+            db.find_expenses(self.mock_supabase_client, value=10.0)
 
     # --- Testes para add_ganho ---
     def test_add_ganho_success(self):
@@ -169,9 +353,7 @@ class TestDatabase(unittest.TestCase):
 
     # --- Testes para get_ganhos ---
     def test_get_ganhos_empty(self):
-        self.mock_table_methods.select.return_value.order.return_value.execute.return_value.data = (
-            []
-        )
+        self.mock_table_methods.execute.return_value = MagicMock(data=[])
         ganhos = db.get_ganhos(self.mock_supabase_client)
         self.assertEqual(ganhos, [])
 
@@ -217,14 +399,14 @@ class TestDatabase(unittest.TestCase):
         mock_data = [
             {
                 "id": "cat1",
-                "nome": "Alimentacao",
-                "limite_mensal": 800.0,
+                "name": "Alimentacao",
+                "monthly_limit": 800.0,
                 "aliases": ["food", "grocery"],
             },
             {
                 "id": "cat2",
-                "nome": "Transporte",
-                "limite_mensal": None,
+                "name": "Transporte",
+                "monthly_limit": None,
                 "aliases": None,
             },
         ]
@@ -233,7 +415,9 @@ class TestDatabase(unittest.TestCase):
         )
         categorias = db.get_categories(self.mock_supabase_client)
         self.assertEqual(len(categorias), 2)
-        self.assertEqual(categorias[0]["nome"], "Alimentacao")
+        self.assertIsInstance(categorias[0], Categoria)
+        self.assertEqual(categorias[0]["name"], "Alimentacao")
+        self.assertEqual(categorias, mock_data)
 
     # --- Testes para get_categoria_id_by_text ---
     @patch("src.core.db.get_categories")
@@ -278,6 +462,15 @@ class TestDatabase(unittest.TestCase):
         cat_id = db.get_category_id_by_text(self.mock_supabase_client, "Inexistente")
         self.assertIsNone(cat_id)
 
+    def test_find_category_id_in_list_alias(self):
+        categorias = [
+            {"id": "cat1", "name": "Alimentacao", "aliases": ["mercado"]},
+            {"id": "cat2", "name": "Transporte", "aliases": None},
+        ]
+        self.assertEqual(db.find_category_id_in_list(categorias, "Mercado"), "cat1")
+        self.assertEqual(db.find_category_id_in_list(categorias, "transporte"), "cat2")
+        self.assertIsNone(db.find_category_id_in_list(categorias, "Lazer"))
+
     # --- Testes para get_formas_pagamento ---
     def test_get_formas_pagamento_empty(self):
         self.mock_table_methods.select.return_value.order.return_value.execute.return_value.data = (
@@ -315,6 +508,44 @@ class TestDatabase(unittest.TestCase):
         fp_id = db.get_payment_method_id_by_name(self.mock_supabase_client, "Bitcoin")
         self.assertIsNone(fp_id)
 
+    # --- Testes para get_expense_descriptions ---
+    def test_get_expense_descriptions_reads_every_page(self):
+        self.mock_table_methods.execute.side_effect = [
+            MagicMock(data=[{"description": "Uber", "category_id": "cat1"}]),
+            MagicMock(data=[{"description": "Feira", "category_id": "cat2"}]),
+            MagicMock(data=[]),
+        ]
+        rows = db.get_expense_descriptions(self.mock_supabase_client)
+        self.assertEqual([row["description"] for row in rows], ["Uber", "Feira"])
+        self.mock_table_methods.select.assert_called_with("description,category_id")
+
+    # --- Testes para get_ganhos_total ---
+    def test_get_ganhos_total_filters_period(self):
+        self.mock_table_methods.gte.return_value = self.mock_table_methods
+        self.mock_table_methods.lte.return_value = self.mock_table_methods
+        # Soma todas as páginas, não só a primeira
+        self.mock_table_methods.execute.side_effect = [
+            MagicMock(data=[{"value": 1000.0}, {"value": 250.5}]),
+            MagicMock(data=[{"value": 0.1}]),
+            MagicMock(data=[]),
+        ]
+        total = db.get_ganhos_total(
+            self.mock_supabase_client, "2025-07-01", "2025-07-31"
+        )
+        self.assertEqual(total, 1250.6)
+        self.mock_table_methods.select.assert_called_with("value")
+        self.mock_table_methods.gte.assert_called_with("date", "2025-07-01")
+        self.mock_table_methods.lte.assert_called_with("date", "2025-07-31")
+
+    def test_get_ganhos_total_error(self):
+        self.mock_table_methods.execute.side_effect = Exception("boom")
+        self.assertEqual(db.get_ganhos_total(self.mock_supabase_client), 0.0)
+
+    def test_get_ganhos_total_rejects_non_list_page(self):
+        # Uma página que não é lista não pode prender a paginação num laço
+        self.mock_table_methods.execute.return_value = MagicMock(data=MagicMock())
+        self.assertEqual(db.get_ganhos_total(self.mock_supabase_client), 0.0)
+
     # --- Testes para update_categoria_limite ---
     def test_update_categoria_limite_success(self):
         self.mock_table_methods.update.return_value.eq.return_value.execute.return_value = MagicMock(
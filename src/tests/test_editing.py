@@ -0,0 +1,192 @@
+# tests/test_editing.py
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from telegram.ext import ConversationHandler
+
+from src.benchmarks.fake_supabase import FakeSupabaseClient
+from src.bot.handlers import handle_expense_edit
+from src.bot.handlers.states import ASKING_EXPENSE_EDIT
+from src.core import db
+from src.core.editing import find_edit_candidates, score_candidate
+from src.core.models import Gasto
+from src.core.search import SearchIndex
+
+
+def _expense(id, value, date, description, category_id="c1"):
+    return {
+        "id": id,
+        "value": value,
+        "date": date,
+        "description": description,
+        "category_id": category_id,
+        "payment_method_id": None,
+    }
+
+
+def _tables():
+    return {
+        "categories": [
+            {"id": "c1", "name": "Transporte", "monthly_limit": None, "aliases": None},
+            {"id": "c2", "name": "Alimentacao", "monthly_limit": None, "aliases": None},
+        ],
+        "payment_methods": [{"id": "fp1", "name": "Pix"}],
+        "expenses": [
+            _expense("e1", 15.0, "2025-07-09", "Uber para o trabalho"),
+            _expense("e2", 15.0, "2025-07-10", "Café na Avatim", "c2"),
+            _expense("e3", 22.5, "2025-07-10", "Uber volta"),
+            _expense("e4", 15.0, "2025-05-02", "Uber aeroporto"),
+            _expense("e5", 40.0, "2025-07-20", "Mercado", "c2"),
+        ],
+    }
+
+
+class TestEditing(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeSupabaseClient(_tables())
+        self.index = SearchIndex(ttl=3600)
+
+    def _ids(self, gastos):
+        return [gasto["id"] for gasto in gastos]
+
+    def test_find_expenses_filters_on_the_server(self):
+        gastos = db.find_expenses(self.client, "2025-07-07", "2025-07-13", value=15.0)
+        self.assertEqual(self._ids(gastos), ["e2", "e1"])
+        self.assertEqual(gastos[1]["categoria_nome"], "Transporte")
+        self.assertEqual(self._ids(db.find_expenses(self.client, value=22.5)), ["e3"])
+        self.assertEqual(
+            self._ids(db.find_expenses(self.client, category_id="c2")), ["e5", "e2"]
+        )
+
+    def test_update_and_delete_expense(self):
+        self.assertTrue(db.update_expense(self.client, "e1", {"value": 16.0}))
+        self.assertEqual(db.find_expenses(self.client, value=16.0)[0]["id"], "e1")
+        self.assertTrue(db.delete_expense(self.client, "e1"))
+        self.assertEqual(
+            self._ids(db.find_expenses(self.client, "2025-07-09", "2025-07-09")), []
+        )
+
+    def test_score_candidate(self):
+        gasto = Gasto.from_row(_tables()["expenses"][0])
+        self.assertEqual(
+            score_candidate(gasto, 15.0, "2025-07-09", ["uber"], "c1"), 3 + 2 + 2 + 1
+        )
+        self.assertEqual(score_candidate(gasto, 15.01, "2025-07-11"), 1)
+        self.assertEqual(score_candidate(gasto, 99.0, "2025-08-01", ["cafe"]), 0)
+        # Data inválida vinda do LLM é ignorada
+        self.assertEqual(score_candidate(gasto, 15.0, "ontem"), 3)
+
+    def test_invalid_date_is_dropped(self):
+        candidates = find_edit_candidates(
+            self.client, self.index, value=15.0, date="2025-13-45"
+        )
+        self.assertEqual(
+            self._ids(candidates),
+            self._ids(find_edit_candidates(self.client, self.index, value=15.0)),
+        )
+        self.assertTrue(candidates)
+
+    def test_ranks_by_value_date_and_description(self):
+        candidates = find_edit_candidates(
+            self.client, self.index, value=15.0, date="2025-07-10", description="Uber"
+        )
+        # e1 bate valor, descrição e fica a 1 dia; e2 só valor e data; e3 só
+        # descrição e data; e4 fica fora da janela de datas
+        self.assertEqual(self._ids(candidates), ["e1", "e2", "e3"])
+
+    def test_description_only_is_accent_insensitive(self):
+        candidates = find_edit_candidates(
+            self.client, self.index, date="2025-07-10", description="cafe avatim"
+        )
+        self.assertEqual(self._ids(candidates)[0], "e2")
+
+    def test_falls_back_to_value_outside_the_window(self):
+        candidates = find_edit_candidates(
+            self.client, None, value=22.5, date="2025-09-01"
+        )
+        self.assertEqual(self._ids(candidates), ["e3"])
+        self.assertEqual(find_edit_candidates(self.client, self.index), [])
+
+    def test_does_not_download_the_ledger(self):
+        self.index.search(self.client, "uber")
+        calls = self.client.calls
+        find_edit_candidates(self.client, self.index, value=15.0, date="2025-07-10")
+        self.assertLessEqual(self.client.calls - calls, 2)
+
+    def test_search_index_follows_edits(self):
+        self.index.search(self.client, "uber")
+        calls = self.client.calls
+        self.index.update("e1", {"description": "Táxi para o trabalho", "value": 18.0})
+        self.assertEqual(self.index.search(self.client, "uber")["count"], 2)
+        result = self.index.search(self.client, "taxi")
+        self.assertEqual((result["count"], result["total"]), (1, 18.0))
+        self.index.update("e3", None)
+        self.assertEqual(self.index.search(self.client, "uber")["count"], 1)
+        self.assertEqual(self.index.search(self.client, "volta")["count"], 0)
+        self.assertEqual(self.client.calls, calls)
+        # Gasto gravado depois da carga, com o id devolvido pelo banco: a edição
+        # é aplicada sem remontar o índice
+        novo = db.add_expense(self.client, 9.0, "c1", "2025-07-21", None, "Uber noite")
+        self.index.add([novo])
+        self.index.update(novo["id"], {"value": 11.0})
+        result = self.index.search(self.client, "noite")
+        self.assertEqual((result["count"], result["total"]), (1, 11.0))
+        calls = self.client.calls
+        self.index.search(self.client, "uber")
+        self.assertEqual(self.client.calls, calls)
+        # Gasto desconhecido pelo índice: ele é remontado na próxima busca
+        self.index.update("e-novo", {"value": 1.0})
+        self.index.search(self.client, "uber")
+        self.assertGreater(self.client.calls, calls)
+
+
+class TestDeleteConfirmation(unittest.TestCase):
+    def setUp(self):
+        gasto = _expense("g1", 10.0, "2025-06-01", "Padaria")
+        self.context = MagicMock(
+            user_data={
+                "expense_edit": {
+                    "id": "s1",
+                    "candidates": [gasto],
+                    "selected": 0,
+                    "field": None,
+                    "confirm_delete": False,
+                }
+            }
+        )
+        patcher = patch(
+            "src.bot.handlers.handle_expense_edit.apply_expense_edit", new=AsyncMock()
+        )
+        self.apply = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _tap(self, action):
+        update = MagicMock()
+        update.callback_query.answer = AsyncMock()
+        update.callback_query.edit_message_text = AsyncMock()
+        update.callback_query.edit_message_reply_markup = AsyncMock()
+        update.callback_query.data = f"editar_gasto:s1:{action}"
+        return asyncio.run(handle_expense_edit(update, self.context))
+
+    def test_delete_asks_before_deleting(self):
+        self.assertEqual(self._tap("excluir"), ASKING_EXPENSE_EDIT)
+        self.apply.assert_not_awaited()
+
+        self.assertEqual(self._tap("confirmar_exclusao"), ConversationHandler.END)
+        self.apply.assert_awaited_once()
+        self.assertIsNone(self.apply.call_args.args[3])
+        self.assertNotIn("expense_edit", self.context.user_data)
+
+    def test_confirmation_without_request_is_ignored(self):
+        self.assertEqual(self._tap("confirmar_exclusao"), ASKING_EXPENSE_EDIT)
+        self.apply.assert_not_awaited()
+
+    def test_cancel_keeps_the_expense(self):
+        self._tap("excluir")
+        self.assertEqual(self._tap("cancelar"), ConversationHandler.END)
+        self.apply.assert_not_awaited()
+
+
+if __name__ == "__main__":
+    unittest.main()
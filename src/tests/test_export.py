@@ -0,0 +1,71 @@
+# tests/test_export.py
+import csv
+import gzip
+import os
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.core import export
+
+
+def _page(n, start=0):
+    return [
+        {
+            "id": f"id{i}",
+            "date": "2025-07-01",
+            "value": float(i),
+            "description": f"Gasto {i}",
+            "categories": {"name": "Alimentacao"},
+            "payment_methods": None,
+        }
+        for i in range(start, start + n)
+    ]
+
+
+class TestExport(unittest.TestCase):
+    def test_flatten_page_fallback_names(self):
+        rows = export.flatten_page(_page(1))
+        self.assertEqual(
+            rows[0], ("2025-07-01", 0.0, "Gasto 0", "Alimentacao", "Não Informado")
+        )
+
+    @patch("src.core.db.iter_gastos_pages")
+    def test_export_ledger_csv_gz(self, mock_pages):
+        mock_pages.return_value = iter([_page(3), _page(2, start=3)])
+        path, total = export.export_ledger(MagicMock(), "csv", data_inicio="2025-07-01")
+        try:
+            self.assertEqual(total, 5)
+            self.assertTrue(path.endswith(".csv.gz"))
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows[0], export.EXPORT_COLUMNS)
+            self.assertEqual(len(rows), 6)
+        finally:
+            os.remove(path)
+        self.assertEqual(mock_pages.call_args.kwargs["data_inicio"], "2025-07-01")
+
+    @patch("src.core.db.iter_gastos_pages")
+    def test_export_ledger_fails_instead_of_truncating(self, mock_pages):
+        def pages():
+            yield _page(3)
+            raise RuntimeError("página falhou")
+
+        mock_pages.return_value = pages()
+        created = []
+        mkstemp = export.tempfile.mkstemp
+
+        def recording_mkstemp(**kwargs):
+            created.append(mkstemp(**kwargs))
+            return created[-1]
+
+        with patch("tempfile.mkstemp", side_effect=recording_mkstemp):
+            with self.assertRaises(RuntimeError):
+                export.export_ledger(MagicMock(), "csv")
+        self.assertFalse(os.path.exists(created[0][1]))
+
+    @patch("src.core.db.iter_gastos_pages")
+    def test_export_ledger_empty(self, mock_pages):
+        mock_pages.return_value = iter([])
+        path, total = export.export_ledger(MagicMock(), "csv")
+        self.assertIsNone(path)
+        self.assertEqual(total, 0)
@@ -0,0 +1,239 @@
+# tests/test_importer.py
+import asyncio
+import importlib
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from telegram.ext import ConversationHandler
+
+from src.benchmarks.fake_supabase import FakeSupabaseClient
+from src.bot.handlers import handle_import_confirmation
+from src.core import db, importer
+from src.core.resilience import DependencyUnavailableError
+
+
+class TestStatementParsing(unittest.TestCase):
+    def test_csv_semicolon_br_format(self):
+        stream = io.StringIO(
+            "Data;Descrição;Valor\n"
+            "01/07/2025;Supermercado Avatim;-1.234,56\n"
+            "02/07/2025;Salário;5.000,00\n"
+            "03/07/2025;Linha inválida;abc\n"
+        )
+        transactions = list(importer.iter_csv_transactions(stream))
+        self.assertEqual(len(transactions), 2)
+        self.assertEqual(transactions[0]["date"], "2025-07-01")
+        self.assertEqual(transactions[0]["value"], 1234.56)
+        self.assertEqual(transactions[0]["tipo"], "gasto")
+        self.assertEqual(transactions[1]["tipo"], "ganho")
+
+    def test_csv_comma_en_format(self):
+        stream = io.StringIO("date,title,amount\n2025-07-04,Uber *Trip,-25.90\n")
+        transactions = list(importer.iter_csv_transactions(stream))
+        self.assertEqual(transactions[0]["description"], "Uber *Trip")
+        self.assertEqual(transactions[0]["value"], 25.9)
+
+    def test_csv_unknown_header(self):
+        stream = io.StringIO("foo,bar\n1,2\n")
+        self.assertEqual(list(importer.iter_csv_transactions(stream)), [])
+
+    def test_ofx_sgml(self):
+        stream = io.StringIO(
+            "OFXHEADER:100\n<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>\n"
+            "<STMTTRN>\n<TRNTYPE>DEBIT\n<DTPOSTED>20250710120000[-3:BRT]\n"
+            "<TRNAMT>-40.00\n<FITID>1\n<MEMO>FARMACIA SAO JOAO\n</STMTTRN>\n"
+            "<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20250711<TRNAMT>100.00<NAME>PIX RECEBIDO</STMTTRN>\n"
+            "</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>\n"
+        )
+        transactions = list(importer.iter_ofx_transactions(stream))
+        self.assertEqual(len(transactions), 2)
+        self.assertEqual(transactions[0]["date"], "2025-07-10")
+        self.assertEqual(transactions[0]["description"], "FARMACIA SAO JOAO")
+        self.assertEqual(transactions[0]["tipo"], "gasto")
+        self.assertEqual(transactions[1]["value"], 100.0)
+        self.assertEqual(transactions[1]["tipo"], "ganho")
+
+    def test_refs_are_positions_in_the_statement(self):
+        csv_stream = io.StringIO(
+            "data,descricao,valor\n01/07/2025,A,-1\nx\n02/07/2025,B,-2\n"
+        )
+        self.assertEqual(
+            [t["ref"] for t in importer.iter_csv_transactions(csv_stream)],
+            ["linha1", "linha3"],
+        )
+        ofx_stream = io.StringIO(
+            "<STMTTRN><DTPOSTED>20250710<TRNAMT>-1<FITID>abc</STMTTRN>\n"
+            "<STMTTRN><DTPOSTED>20250711<TRNAMT>-2</STMTTRN>\n"
+        )
+        self.assertEqual(
+            [t["ref"] for t in importer.iter_ofx_transactions(ofx_stream)],
+            ["fitidabc", "bloco2"],
+        )
+
+    def test_parse_amount(self):
+        self.assertEqual(importer.parse_amount("R$ 1.234,56"), 1234.56)
+        self.assertEqual(importer.parse_amount("1,234.56"), 1234.56)
+        self.assertEqual(importer.parse_amount("-10,98"), -10.98)
+        self.assertIsNone(importer.parse_amount(""))
+
+    def test_parse_amount_debit_credit_markers(self):
+        self.assertEqual(importer.parse_amount("45,90 D"), -45.9)
+        self.assertEqual(importer.parse_amount("D 45,90"), -45.9)
+        self.assertEqual(importer.parse_amount("1.234,56C"), 1234.56)
+        self.assertEqual(importer.parse_amount("R$ 10,00 (C)"), 10.0)
+        self.assertEqual(importer.parse_amount("45,90-"), -45.9)
+
+    def test_parse_amounts_matches_parse_amount(self):
+        raws = [
+            "R$ 1.234,56",
+            "1,234.56",
+            "-10,98",
+            "",
+            "abc",
+            "45,90 D",
+            "D 45,90",
+            "1.234,56C",
+            "R$ 10,00 (C)",
+            "45,90-",
+        ]
+        self.assertEqual(
+            importer.parse_amounts(raws), [importer.parse_amount(r) for r in raws]
+        )
+        self.assertEqual(importer.parse_amounts([]), [])
+
+    @patch.object(importer, "CSV_PAGE_SIZE", 2)
+    def test_csv_parsed_in_pages(self):
+        stream = io.StringIO(
+            "Data;Descrição;Valor\n"
+            + "".join(f"0{day}/07/2025;Uber;-{day},00\n" for day in range(1, 6))
+        )
+        transactions = list(importer.iter_csv_transactions(stream))
+        self.assertEqual([t["value"] for t in transactions], [1, 2, 3, 4, 5])
+        self.assertEqual(transactions[-1]["ref"], "linha5")
+
+
+class TestLocalCategorizer(unittest.TestCase):
+    def setUp(self):
+        self.categorias = [
+            {"id": "cat1", "name": "Alimentacao", "aliases": ["mercado", "padaria"]},
+            {"id": "cat2", "name": "Transporte", "aliases": ["uber"]},
+            {"id": "cat3", "name": "Saude", "aliases": None},
+            {"id": "cat4", "name": "Outros", "aliases": None},
+        ]
+        self.history = [
+            {"description": "Drogasil", "category_id": "cat3"},
+            {"description": "Farmácia Drogasil Centro", "category_id": "cat3"},
+        ]
+        self.categorizer = importer.LocalCategorizer(self.categorias, self.history)
+
+    def test_alias_match_with_accents(self):
+        self.assertEqual(self.categorizer.categorize("UBER *TRIP"), "cat2")
+        self.assertEqual(self.categorizer.categorize("Padaria Pão Doce"), "cat1")
+
+    def test_exact_history_match(self):
+        self.assertEqual(self.categorizer.categorize("drogasil"), "cat3")
+
+    def test_history_token_vote(self):
+        self.assertEqual(self.categorizer.categorize("DROGASIL 123 SP"), "cat3")
+
+    def test_fallback_to_outros(self):
+        self.assertEqual(self.categorizer.categorize("XPTO LTDA"), "cat4")
+
+    def test_summarize_statement(self):
+        transactions = [
+            {
+                "date": "2025-07-02",
+                "description": "Uber",
+                "value": 20.0,
+                "tipo": "gasto",
+            },
+            {
+                "date": "2025-07-01",
+                "description": "Mercado",
+                "value": 80.0,
+                "tipo": "gasto",
+            },
+            {
+                "date": "2025-07-03",
+                "description": "Salário",
+                "value": 500.0,
+                "tipo": "ganho",
+            },
+        ]
+        summary = importer.summarize_statement(transactions, self.categorizer)
+        self.assertEqual(summary["gastos"], 2)
+        self.assertEqual(summary["total_gastos"], 100.0)
+        self.assertEqual(summary["ganhos"], 1)
+        self.assertEqual(summary["data_inicio"], "2025-07-01")
+        self.assertEqual(summary["por_categoria"]["Alimentacao"], 80.0)
+
+        rows = list(importer.iter_expense_rows(transactions, self.categorizer))
+        self.assertEqual([row["category_id"] for row in rows], ["cat2", "cat1"])
+        self.assertEqual(len(list(importer.iter_income_rows(transactions))), 1)
+
+    def test_reimport_after_creating_outros_does_not_duplicate(self):
+        statement = (
+            "data,descricao,valor\n"
+            "01/07/2025,Uber,-10\n"
+            "02/07/2025,XPTO LTDA,-20\n"
+            "03/07/2025,Padaria,-30\n"
+        )
+        client = FakeSupabaseClient({"expenses": []})
+        sem_outros = importer.LocalCategorizer(self.categorias[:3])
+        for categorizer in (sem_outros, self.categorizer):
+            db.add_expenses_bulk(
+                client,
+                importer.iter_expense_rows(
+                    importer.iter_csv_transactions(io.StringIO(statement)),
+                    categorizer,
+                    key_prefix="import:arquivo:gastos",
+                ),
+            )
+        self.assertEqual(
+            sorted(row["value"] for row in client.tables["expenses"]), [10, 20, 30]
+        )
+
+
+class TestImportConfirmation(unittest.TestCase):
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        self.addCleanup(lambda: os.path.exists(self.path) and os.remove(self.path))
+        self.caches = {
+            name: MagicMock()
+            for name in ("budget_tracker", "search_index", "chart_cache")
+        }
+        self.context = MagicMock(
+            bot_data={"supabase_client": MagicMock(), **self.caches},
+            user_data={
+                "pending_import": {
+                    "path": self.path,
+                    "file_name": "extrato.csv",
+                    "categorizer": MagicMock(),
+                    "file_unique_id": "f1",
+                }
+            },
+        )
+        self.update = MagicMock()
+        self.update.message.text = "Sim ✅"
+        self.update.message.reply_text = AsyncMock()
+
+    @patch.object(
+        # O pacote reexporta o handler com o mesmo nome do módulo
+        importlib.import_module("src.bot.handlers.handle_import_confirmation"),
+        "_import_statement",
+        side_effect=DependencyUnavailableError("supabase", "timeout", True),
+    )
+    def test_interrupted_import_cleans_up(self, _):
+        result = asyncio.run(handle_import_confirmation(self.update, self.context))
+
+        self.assertEqual(result, ConversationHandler.END)
+        self.assertNotIn("pending_import", self.context.user_data)
+        self.assertFalse(os.path.exists(self.path))
+        for cache in self.caches.values():
+            cache.invalidate.assert_called_once()
+        reply = self.update.message.reply_text.call_args.args[0]
+        self.assertIn("Envie o mesmo arquivo de novo", reply)
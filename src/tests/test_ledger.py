@@ -0,0 +1,143 @@
+# tests/test_ledger.py
+import sys
+import unittest
+
+import pandas as pd
+
+from src.benchmarks.ledger import generate_ledger
+from src.core import db
+from src.core.backends import MemoryBackend
+from src.core.ledger import Ledger
+
+
+class TestLedger(unittest.TestCase):
+    def setUp(self):
+        self.tables = generate_ledger(2000, seed=4)
+        self.client = MemoryBackend(self.tables)
+        self.ledger = db.get_ledger(self.client)
+        self.frame = pd.DataFrame(db.get_gastos(self.client))
+        self.frame["cents"] = (self.frame["value"] * 100).round().astype(int)
+
+    def assertSumsEqual(self, result, expected):
+        self.assertEqual(result, expected)
+        self.assertTrue(all(type(value) is int for value in result.values()))
+
+    def test_columns_and_types(self):
+        self.assertEqual(len(self.ledger), 2000)
+        self.assertEqual(self.ledger.day.dtype.name, "int32")
+        self.assertEqual(self.ledger.cents.dtype.name, "int64")
+        self.assertEqual(self.ledger.category.dtype.name, "int8")
+        self.assertEqual(self.ledger.payment.dtype.name, "int8")
+        self.assertEqual(self.ledger.description.dtype.name, "int32")
+        self.assertEqual(self.ledger.total(), self.frame["cents"].sum())
+
+    def test_group_bys_match_pandas(self):
+        self.assertSumsEqual(
+            self.ledger.sum_by_category(),
+            self.frame.groupby("categoria_nome")["cents"].sum().to_dict(),
+        )
+        self.assertSumsEqual(
+            self.ledger.sum_by_payment_method(),
+            self.frame.groupby("forma_pagamento_nome")["cents"].sum().to_dict(),
+        )
+        months = pd.to_datetime(self.frame["date"]).dt.to_period("M").astype(str)
+        self.assertSumsEqual(
+            self.ledger.sum_by_month(),
+            self.frame.groupby(months)["cents"].sum().to_dict(),
+        )
+        self.assertEqual(
+            list(self.ledger.sum_by_month()), sorted(self.ledger.sum_by_month())
+        )
+        self.assertSumsEqual(
+            self.ledger.sum_by_month_category_payment(),
+            self.frame.groupby([months, "categoria_nome", "forma_pagamento_nome"])[
+                "cents"
+            ]
+            .sum()
+            .to_dict(),
+        )
+
+    def test_filter_is_inclusive_and_combines(self):
+        expenses = self.tables["expenses"]
+        first = min(row["date"] for row in expenses)
+        category_id = expenses[0]["category_id"]
+        payment_id = expenses[0]["payment_method_id"]
+        by_day = self.ledger.filter(data_inicio=first, data_fim=first)
+        self.assertEqual(
+            len(by_day), sum(1 for row in expenses if row["date"] == first)
+        )
+        combined = self.ledger.filter(
+            category_id=category_id, payment_method_id=payment_id
+        )
+        self.assertEqual(
+            len(combined),
+            sum(
+                1
+                for row in expenses
+                if row["category_id"] == category_id
+                and row["payment_method_id"] == payment_id
+            ),
+        )
+        self.assertGreater(len(combined), 0)
+        self.assertEqual(len(self.ledger.filter(category_id="nao-existe")), 0)
+
+    def test_server_side_filters(self):
+        expenses = self.tables["expenses"]
+        last = max(row["date"] for row in expenses)
+        start = last[:8] + "01"
+        ledger = db.get_ledger(self.client, data_inicio=start, data_fim=last)
+        self.assertEqual(
+            len(ledger), sum(1 for row in expenses if start <= row["date"] <= last)
+        )
+        self.assertEqual(len(ledger.sum_by_month()), 1)
+
+    def test_unknown_references_and_interned_descriptions(self):
+        ledger = Ledger.from_rows(
+            [
+                {"value": 10.0, "date": "2025-01-31", "description": "café"},
+                {
+                    "value": 5.5,
+                    "date": "2025-02-01",
+                    "category_id": "c1",
+                    "payment_method_id": "fp1",
+                    "description": "café",
+                },
+            ],
+            categories=[{"id": "c1", "name": "Alimentacao"}],
+            payment_methods=[{"id": "fp1", "name": "Pix"}],
+        )
+        self.assertEqual(
+            ledger.sum_by_category(), {"Desconhecida": 1000, "Alimentacao": 550}
+        )
+        self.assertEqual(
+            ledger.sum_by_payment_method(), {"Não Informado": 1000, "Pix": 550}
+        )
+        self.assertEqual(ledger.sum_by_month(), {"2025-01": 1000, "2025-02": 550})
+        self.assertEqual(ledger.descriptions, ["café"])
+        self.assertEqual(ledger.description.tolist(), [0, 0])
+
+    def test_empty(self):
+        ledger = Ledger.from_rows([])
+        self.assertEqual(len(ledger), 0)
+        self.assertEqual(ledger.total(), 0)
+        self.assertEqual(ledger.sum_by_category(), {})
+        self.assertEqual(ledger.sum_by_month_category_payment(), {})
+
+    def test_totals_are_exact(self):
+        rows = [{"value": 0.1, "date": "2025-01-01"}] * 1000
+        self.assertNotEqual(sum(row["value"] for row in rows), 100.0)
+        ledger = Ledger.from_rows(rows)
+        self.assertEqual(ledger.total(), 10000)
+        self.assertEqual(ledger.sum_by_month(), {"2025-01": 10000})
+
+    def test_much_smaller_than_dicts(self):
+        rows = db.get_gastos(self.client)
+        dict_bytes = sys.getsizeof(rows) + sum(
+            sys.getsizeof(row) + sum(sys.getsizeof(v) for v in row.values())
+            for row in rows
+        )
+        self.assertLess(self.ledger.nbytes * 10, dict_bytes)
+
+
+if __name__ == "__main__":
+    unittest.main()
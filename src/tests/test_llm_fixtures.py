@@ -0,0 +1,136 @@
+# tests/test_llm_fixtures.py
+import datetime
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.core import ai, llm_fixtures
+from src.core.llm_fixtures import LLMFixtures, MissingFixtureError, prompt_key
+
+
+class TestPromptKey(unittest.TestCase):
+    def test_today_does_not_change_the_key(self):
+        self.assertEqual(
+            prompt_key(
+                "hoje é 2025-07-07, mês passado 2025-06-01 a 2025-06-30",
+                "gemini",
+                datetime.date(2025, 7, 7),
+            ),
+            prompt_key(
+                "hoje é 2026-01-02, mês passado 2025-12-01 a 2025-12-31",
+                "gemini",
+                datetime.date(2026, 1, 2),
+            ),
+        )
+        # Datas digitadas pelo usuário continuam distinguindo as gravações
+        today = datetime.date(2025, 7, 7)
+        self.assertNotEqual(
+            prompt_key("gastei 50 em 2025-03-10", "gemini", today),
+            prompt_key("gastei 50 em 2025-03-11", "gemini", today),
+        )
+        self.assertNotEqual(
+            prompt_key("gastei 50", "gemini"), prompt_key("gastei 60", "gemini")
+        )
+        self.assertNotEqual(
+            prompt_key("gastei 50", "gemini"), prompt_key("gastei 50", "outro")
+        )
+
+    def test_coinciding_dates_on_the_first(self):
+        # No dia 1º ontem é o fim do mês passado: a chave não depende do mês
+        self.assertEqual(
+            prompt_key(
+                "hoje 2025-08-01, ontem 2025-07-31, fim 2025-07-31",
+                "gemini",
+                datetime.date(2025, 8, 1),
+            ),
+            prompt_key(
+                "hoje 2026-03-01, ontem 2026-02-28, fim 2026-02-28",
+                "gemini",
+                datetime.date(2026, 3, 1),
+            ),
+        )
+        # ...nem se confunde com a de um dia em que as datas não coincidem
+        self.assertNotEqual(
+            prompt_key(
+                "hoje 2025-08-01, ontem 2025-07-31, fim 2025-07-31",
+                "gemini",
+                datetime.date(2025, 8, 1),
+            ),
+            prompt_key(
+                "hoje 2025-08-02, ontem 2025-08-01, fim 2025-07-31",
+                "gemini",
+                datetime.date(2025, 8, 2),
+            ),
+        )
+
+
+class TestLLMFixtures(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "gravacoes", "llm.jsonl")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_record_then_replay_in_order(self):
+        recorder = LLMFixtures("record", self.path)
+        recorder.record("p1", "m", "transacao", "r1", 0.5)
+        recorder.record("p1", "m", "transacao", "r2", 0.5)
+        self.assertEqual(len(llm_fixtures.load_entries(self.path)), 2)
+
+        replayer = LLMFixtures("replay", self.path, latency_scale=0)
+        self.assertEqual(
+            [replayer.replay("p1", "m") for _ in range(3)], ["r1", "r2", "r1"]
+        )
+        with self.assertRaises(MissingFixtureError):
+            replayer.replay("p2", "m")
+
+    @patch("src.core.llm_fixtures.time.sleep")
+    def test_replay_sleeps_scaled_latency(self, mock_sleep):
+        LLMFixtures("record", self.path).record("p", "m", "geral", "r", 0.4)
+        LLMFixtures("replay", self.path, latency_scale=0.5).replay("p", "m")
+        mock_sleep.assert_called_once_with(0.2)
+
+    @patch("src.core.ai.genai.GenerativeModel")
+    def test_ask_llama_records_and_replays(self, mock_model):
+        mock_model.return_value.generate_content.return_value = MagicMock(
+            parts=[object()], text=' {"intencao": "gasto"} '
+        )
+        recorder = LLMFixtures("record", self.path)
+        with patch("src.core.llm_fixtures.get_fixtures", return_value=recorder):
+            self.assertEqual(ai.ask_llama("prompt"), '{"intencao": "gasto"}')
+
+        mock_model.reset_mock()
+        replayer = LLMFixtures("replay", self.path, latency_scale=0)
+        with patch("src.core.llm_fixtures.get_fixtures", return_value=replayer):
+            self.assertEqual(ai.ask_llama("prompt"), '{"intencao": "gasto"}')
+            with self.assertRaises(MissingFixtureError):
+                ai.ask_llama("outro prompt")
+        mock_model.assert_not_called()
+
+
+class TestParseTransactionResponse(unittest.TestCase):
+    def test_parses_json_with_surrounding_text(self):
+        data = ai.parse_transaction_response(
+            'Resposta: {"intencao": "gasto", "valor": 50.0} ok'
+        )
+        self.assertEqual(data, {"intencao": "gasto", "valor": 50.0})
+        self.assertIsNone(ai.parse_transaction_response("sem json"))
+
+    def test_skips_transacoes_that_are_not_objects(self):
+        data = ai.parse_transaction_response(
+            '{"intencao": "gastos_multiplos", "transacoes": ["uber 20", {"valor": "20"}]}'
+        )
+        self.assertEqual(data["transacoes"], [{"valor": 20.0}])
+
+    def test_rejects_transacoes_that_are_not_a_list(self):
+        self.assertIsNone(
+            ai.parse_transaction_response(
+                '{"intencao": "gastos_multiplos", "transacoes": "uber 20"}'
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,78 @@
+# tests/test_log.py
+import contextvars
+import json
+import logging
+import unittest
+from unittest.mock import patch
+
+from src.core import log
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestLog(unittest.TestCase):
+    def setUp(self):
+        self.logger = logging.getLogger("tests.log")
+        self.logger.setLevel(logging.INFO)
+        self.logger.propagate = False
+        self.handler = _ListHandler()
+        self.handler.addFilter(log.ContextFilter())
+        self.logger.handlers = [self.handler]
+
+    def _run(self, func):
+        # Cada teste roda num contexto próprio, como um update do bot
+        return contextvars.copy_context().run(func)
+
+    def test_trace_skipped_in_production(self):
+        def run():
+            log.bind_update(1, 123)
+            log.trace(self.logger, "payload", response="segredo")
+
+        self._run(run)
+        self.assertEqual(self.handler.records, [])
+
+    def test_trace_emitted_for_debug_chat(self):
+        def run():
+            log.bind_update(2, 555)
+            log.trace(self.logger, "payload", response="bruto")
+
+        with patch.object(log, "DEBUG_CHAT_IDS", {555}):
+            self._run(run)
+        record = self.handler.records[0]
+        self.assertEqual(record.levelno, logging.DEBUG)
+        self.assertEqual(record.response, "bruto")
+        self.assertEqual(record.correlation_id, "upd-2")
+        self.assertEqual(record.chat_id, 555)
+
+    def test_trace_sampling(self):
+        def run():
+            log.bind_update(3, 1)
+            log.trace(self.logger, "payload")
+
+        with patch.object(log, "LOG_DEBUG_SAMPLE_RATE", 1.0):
+            self._run(run)
+        self.assertEqual(len(self.handler.records), 1)
+
+    def test_json_formatter_includes_context_and_extra(self):
+        def run():
+            log.bind_update(4, 77)
+            self.logger.info("Olá %s", "mundo", extra={"prompt_type": "transacao"})
+
+        self._run(run)
+        line = json.loads(log.JsonFormatter().format(self.handler.records[0]))
+        self.assertEqual(line["msg"], "Olá mundo")
+        self.assertEqual(line["level"], "INFO")
+        self.assertEqual(line["correlation_id"], "upd-4")
+        self.assertEqual(line["chat_id"], 77)
+        self.assertEqual(line["prompt_type"], "transacao")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+# tests/test_metrics.py
+import asyncio
+import unittest
+import urllib.request
+from unittest.mock import MagicMock
+
+from src.core import metrics
+
+
+class TestMetrics(unittest.TestCase):
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = metrics.Histogram("t_latency", "teste", buckets=(0.1, 1.0))
+        histogram.observe("db", "q", 0.05)
+        histogram.observe("db", "q", 0.5)
+        histogram.observe("db", "q", 5.0)
+        text = "\n".join(histogram.render())
+        self.assertIn('t_latency_bucket{kind="db",name="q",le="0.1"} 1', text)
+        self.assertIn('t_latency_bucket{kind="db",name="q",le="1.0"} 2', text)
+        self.assertIn('t_latency_bucket{kind="db",name="q",le="+Inf"} 3', text)
+        self.assertIn('t_latency_count{kind="db",name="q"} 3', text)
+
+    def test_timed_sync_counts_mark_error(self):
+        @metrics.timed("teste", "sync_mark")
+        def swallow():
+            try:
+                raise ValueError("boom")
+            except Exception:
+                metrics.mark_error()
+                return []
+
+        before = metrics.ERRORS.get("teste", "sync_mark")
+        self.assertEqual(swallow(), [])
+        self.assertEqual(metrics.ERRORS.get("teste", "sync_mark"), before + 1)
+
+    def test_timed_async_counts_exception(self):
+        @metrics.timed("teste")
+        async def failing():
+            raise RuntimeError("boom")
+
+        before = metrics.ERRORS.get("teste", "failing")
+        with self.assertRaises(RuntimeError):
+            asyncio.run(failing())
+        self.assertEqual(metrics.ERRORS.get("teste", "failing"), before + 1)
+        self.assertIn('name="failing"', metrics.render_metrics())
+
+    def test_nested_mark_error_only_marks_inner_call(self):
+        @metrics.timed("teste", "inner")
+        def inner():
+            metrics.mark_error()
+
+        @metrics.timed("teste", "outer")
+        def outer():
+            inner()
+
+        before = metrics.ERRORS.get("teste", "outer")
+        outer()
+        self.assertEqual(metrics.ERRORS.get("teste", "outer"), before)
+
+    def test_conversation_states(self):
+        states = metrics.ConversationStates("t_state", "teste")
+        states.state_names = {4: "ASKING_CONFIRMATION"}
+        states.update(1, 4)
+        states.update(2, 4)
+        states.update(2, None)
+        states.update(1, -1)
+        self.assertEqual(states.counts(), {"ASKING_CONFIRMATION": 1})
+
+    def test_track_conversation(self):
+        async def handler(update, context):
+            return 4
+
+        update = MagicMock()
+        update.effective_chat.id = 987654
+        result = asyncio.run(metrics.track_conversation(handler)(update, None))
+        self.assertEqual(result, 4)
+        self.assertEqual(metrics.CONVERSATIONS._by_chat.pop(987654), 4)
+
+    def test_expired_conversation_leaves_gauge(self):
+        from src.bot.bot_setup import expire_conversation
+
+        update = MagicMock()
+        update.effective_chat.id = 987655
+        context = MagicMock(user_data={})
+        metrics.CONVERSATIONS.update(987655, 4)
+        asyncio.run(metrics.track_conversation(expire_conversation)(update, context))
+        self.assertNotIn(987655, metrics.CONVERSATIONS._by_chat)
+
+    def test_metrics_endpoint(self):
+        server = metrics.start_metrics_server("127.0.0.1", 0)
+        try:
+            port = server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics") as resp:
+                body = resp.read().decode("utf-8")
+            self.assertIn("# TYPE bot_latency_seconds histogram", body)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
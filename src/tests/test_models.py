@@ -0,0 +1,106 @@
+# tests/test_models.py
+import copy
+import pickle
+import unittest
+
+import pandas as pd
+
+from src.core.models import Categoria, Gasto, Ganho
+
+
+class TestModels(unittest.TestCase):
+    def setUp(self):
+        self.row = {
+            "id": "g1",
+            "value": 19.99,
+            "date": "2025-07-01",
+            "description": "Cafe",
+            "category_id": "cat1",
+            "categories": {"name": "Alimentacao"},
+            "payment_methods": None,
+        }
+
+    def test_from_row_flattens_embedded_names(self):
+        gasto = Gasto.from_row(self.row)
+        self.assertEqual(gasto.categoria_nome, "Alimentacao")
+        self.assertEqual(gasto.forma_pagamento_nome, "Não Informado")
+        self.assertEqual(gasto.cents, 1999)
+        self.assertFalse(hasattr(gasto, "__dict__"))
+
+    def test_mapping_access_only_has_selected_fields(self):
+        gasto = Gasto.from_row(self.row)
+        self.assertEqual(gasto["value"], 19.99)
+        self.assertNotIn("categories", gasto)
+        self.assertNotIn("payment_method_id", gasto)
+        self.assertEqual(gasto.get("payment_method_id", "x"), "x")
+        with self.assertRaises(KeyError):
+            gasto["payment_method_id"]
+        self.assertEqual(
+            dict(gasto),
+            {
+                "id": "g1",
+                "value": 19.99,
+                "date": "2025-07-01",
+                "description": "Cafe",
+                "category_id": "cat1",
+                "categoria_nome": "Alimentacao",
+                "forma_pagamento_nome": "Não Informado",
+            },
+        )
+        self.assertEqual(gasto, dict(gasto))
+
+    def test_null_is_not_missing(self):
+        gasto = Gasto.from_row({"value": 5.0, "description": None})
+        self.assertIn("description", gasto)
+        self.assertIsNone(gasto["description"])
+        self.assertNotIn("categoria_nome", gasto)
+
+    def test_explicit_names_win(self):
+        gasto = Gasto.from_row(
+            {"value": 1.0}, categoria_nome="Lazer", forma_pagamento_nome="Pix"
+        )
+        self.assertEqual(
+            (gasto["categoria_nome"], gasto["forma_pagamento_nome"]), ("Lazer", "Pix")
+        )
+
+    def test_from_rows_matches_from_row(self):
+        rows = [
+            self.row,
+            {**self.row, "id": "g2", "categories": None, "payment_methods": {}},
+            {**self.row, "id": "g3", "payment_methods": {"name": "Pix"}},
+        ]
+        self.assertEqual(Gasto.from_rows(rows), [Gasto.from_row(r) for r in rows])
+        self.assertEqual(Gasto.from_rows([]), [])
+
+    def test_from_rows_resolves_ids_through_reference_data(self):
+        rows = [
+            {"value": 1.0, "category_id": "c1", "payment_method_id": None},
+            {"value": 2.0, "category_id": "c-apagada", "payment_method_id": "fp1"},
+        ]
+        gastos = Gasto.from_rows(rows, {"c1": "Lazer"}, {"fp1": "Pix"})
+        self.assertEqual(
+            [(g.categoria_nome, g.forma_pagamento_nome) for g in gastos],
+            [("Lazer", "Não Informado"), ("Desconhecida", "Pix")],
+        )
+        self.assertNotIn("id", gastos[0])
+        # Sem ids nem recursos embutidos, os nomes ficam ausentes
+        self.assertNotIn("categoria_nome", Gasto.from_rows([{"value": 1.0}])[0])
+
+    def test_pickle_copy_and_dataframe(self):
+        gasto = Gasto.from_row(self.row)
+        self.assertEqual(pickle.loads(pickle.dumps(gasto)), gasto)
+        self.assertNotIn("payment_method_id", copy.deepcopy(gasto))
+        frame = pd.DataFrame([gasto, gasto])
+        self.assertEqual(frame["value"].sum(), 39.98)
+
+    def test_other_models(self):
+        ganho = Ganho.from_row({"value": 1000.0, "description": "Salário"})
+        self.assertEqual(ganho.cents, 100000)
+        self.assertEqual(dict(ganho), {"value": 1000.0, "description": "Salário"})
+        categoria = Categoria.from_row({"id": "c1", "name": "Lazer"})
+        self.assertEqual(categoria["name"], "Lazer")
+        self.assertIn("Categoria(id='c1', name='Lazer')", repr(categoria))
+
+
+if __name__ == "__main__":
+    unittest.main()
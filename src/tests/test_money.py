@@ -0,0 +1,80 @@
+# tests/test_money.py
+import unittest
+
+from src.utils.money import (
+    cents_array,
+    format_money,
+    from_cents,
+    parse_money,
+    parse_money_array,
+    sum_money,
+    to_cents,
+)
+
+CASES = {
+    "R$ 1.234,56": 123456,
+    "1,234.56": 123456,
+    "1.234.567,89": 123456789,
+    "1234,5": 123450,
+    "12.50": 1250,
+    "0,05": 5,
+    "1.234": 123400,
+    "800": 80000,
+    "-10,98": -1098,
+    "45,90-": -4590,
+    " r$ 10 ": 1000,
+}
+INVALID = ["", "abc", "Viagem2025", "1234.567", "1.23.45", "12,"]
+
+
+class TestMoney(unittest.TestCase):
+    def test_parse_money_br_and_en(self):
+        for text, cents in CASES.items():
+            self.assertEqual(parse_money(text), cents, text)
+        for text in INVALID:
+            self.assertIsNone(parse_money(text), text)
+
+    def test_parse_money_numbers(self):
+        self.assertEqual(parse_money(12), 1200)
+        self.assertEqual(parse_money(0.1 + 0.2), 30)
+        self.assertEqual(parse_money(1.005), 101)
+        self.assertIsNone(parse_money(None))
+        self.assertIsNone(parse_money(True))
+
+    def test_parse_money_array_matches_scalar(self):
+        texts = list(CASES) + INVALID
+        cents, valid = parse_money_array(texts)
+        self.assertEqual(cents.dtype.name, "int64")
+        for text, value, ok in zip(texts, cents.tolist(), valid.tolist()):
+            expected = parse_money(text)
+            self.assertEqual(ok, expected is not None, text)
+            self.assertEqual(value, expected or 0, text)
+        self.assertEqual(len(parse_money_array([])[0]), 0)
+
+    def test_to_cents(self):
+        self.assertEqual(to_cents("1.234,56"), 123456)
+        self.assertEqual(to_cents(19.99), 1999)
+        with self.assertRaises(ValueError):
+            to_cents("abc")
+
+    def test_exact_sums(self):
+        values = [0.1] * 10
+        self.assertNotEqual(sum(values), 1.0)
+        self.assertEqual(sum_money(values), 100)
+        self.assertEqual(sum_money(v for v in values), 100)
+        self.assertEqual(sum_money([]), 0)
+        self.assertEqual(cents_array([19.99, 0.07]).tolist(), [1999, 7])
+
+    def test_cents_array_rounds_like_to_cents(self):
+        values = [1.005, 0.125, -0.125, 2.675, 0.015, -1.005, 19.99, 0.0]
+        self.assertEqual(cents_array(values).tolist(), [to_cents(v) for v in values])
+        self.assertEqual(sum_money([0.005, 0.005]), 2)
+
+    def test_format_matches_float_formatting(self):
+        for cents in (0, 5, 1999, 123456, -1250):
+            self.assertEqual(format_money(cents), f"R${from_cents(cents):.2f}")
+        self.assertEqual(format_money(123456), "R$1234.56")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+# tests/test_profiling.py
+import asyncio
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.core import metrics, profiling
+
+
+class TestProfiling(unittest.TestCase):
+    def test_span_is_noop_without_profile(self):
+        with profiling.span("db:get_categories"):
+            pass
+        profiling.record("llm:transacao", 1.0)
+        self.assertIsNone(profiling._active.get())
+
+    def test_collapsed_uses_self_time(self):
+        profile = profiling.Profile("update-1")
+        profile.add(("update-1",), 1.0)
+        profile.add(("update-1", "ai:extract_transaction_info"), 0.75)
+        profile.add(("update-1", "ai:extract_transaction_info", "llm:transacao"), 0.5)
+        self.assertEqual(
+            profile.collapsed(),
+            [
+                "update-1 250000",
+                "update-1;ai:extract_transaction_info 250000",
+                "update-1;ai:extract_transaction_info;llm:transacao 500000",
+            ],
+        )
+
+    def test_timed_calls_become_nested_spans(self):
+        @metrics.timed("teste", "inner")
+        def inner():
+            profiling.record("llm:teste", 0.01)
+
+        @metrics.timed("teste", "outer")
+        async def outer():
+            await asyncio.to_thread(inner)
+
+        async def run():
+            with profiling.profile_update("update-2") as profile:
+                await outer()
+            return profile
+
+        profile = asyncio.run(run())
+        paths = set(profile._totals)
+        self.assertIn(("update-2", "teste:outer"), paths)
+        self.assertIn(("update-2", "teste:outer", "teste:inner", "llm:teste"), paths)
+        self.assertGreater(profile.total(), 0)
+
+    def test_dump_writes_folded_file(self):
+        profile = profiling.Profile("update-3")
+        profile.add(("update-3",), 0.002)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = profile.dump(tmp)
+            self.assertEqual(os.path.basename(path), "update-3.folded")
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(f.read(), "update-3 2000\n")
+
+    def test_should_profile(self):
+        with patch.object(profiling, "PROFILE_CHATS", {42}):
+            self.assertTrue(profiling.should_profile(42))
+            self.assertFalse(profiling.should_profile(7))
+        with patch.object(profiling, "PROFILE_SAMPLE_RATE", 1.0):
+            self.assertTrue(profiling.should_profile(None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+# tests/test_reference_data.py
+import unittest
+from collections import Counter
+
+from src.benchmarks.fake_supabase import FakeSupabaseClient
+from src.benchmarks.ledger import generate_ledger
+from src.core import db
+
+
+class TestReferenceData(unittest.TestCase):
+    def setUp(self):
+        self.tables = generate_ledger(300, seed=7)
+        self.client = FakeSupabaseClient(self.tables)
+        self.reference = db.ReferenceData(ttl=300)
+
+    def test_names_are_loaded_once(self):
+        categories, payments = self.reference.names(self.client)
+        self.assertEqual(
+            categories, {c["id"]: c["name"] for c in self.tables["categories"]}
+        )
+        self.assertEqual(
+            payments, {p["id"]: p["name"] for p in self.tables["payment_methods"]}
+        )
+        calls = self.client.calls
+        self.reference.names(self.client)
+        self.reference.categories(self.client)
+        self.assertEqual(self.client.calls, calls)
+
+    def test_expired_and_invalidated_entries_reload(self):
+        self.reference.names(self.client)
+        calls = self.client.calls
+        self.reference.invalidate(self.client)
+        self.reference.names(self.client)
+        self.assertEqual(self.client.calls, calls + 2)
+        self.reference.ttl = -1
+        self.reference.names(self.client)
+        self.assertEqual(self.client.calls, calls + 4)
+
+    def test_unknown_id_reloads_once(self):
+        self.reference.names(self.client)
+        self.tables["categories"].append({"id": "c-nova", "name": "Nova"})
+        categories, _ = self.reference.names(self.client, {"c-nova", None})
+        self.assertEqual(categories["c-nova"], "Nova")
+        calls = self.client.calls
+        self.reference.names(self.client, {"c-apagada"})
+        self.assertEqual(self.client.calls, calls)
+
+    def test_empty_reference_is_not_cached(self):
+        client = FakeSupabaseClient({"categories": [], "payment_methods": []})
+        self.reference.names(client)
+        calls = client.calls
+        self.reference.names(client)
+        self.assertGreater(client.calls, calls)
+
+    def test_gastos_resolve_names_without_embedding(self):
+        categories = {c["id"]: c["name"] for c in self.tables["categories"]}
+        payments = {p["id"]: p["name"] for p in self.tables["payment_methods"]}
+        expected = Counter(
+            (
+                row["value"],
+                row["date"],
+                categories[row["category_id"]],
+                payments.get(row.get("payment_method_id"), "Não Informado"),
+            )
+            for row in self.tables["expenses"]
+        )
+        gastos = db.get_gastos(self.client)
+        self.assertEqual(
+            Counter(
+                (g["value"], g["date"], g["categoria_nome"], g["forma_pagamento_nome"])
+                for g in gastos
+            ),
+            expected,
+        )
+        self.assertNotIn("categories", gastos[0])
+
+    def test_writes_invalidate_the_shared_cache(self):
+        db.reference_data.names(self.client)
+        db.add_category(self.client, "Pets")
+        categories, _ = db.reference_data.names(self.client)
+        self.assertIn("Pets", categories.values())
+
+
+if __name__ == "__main__":
+    unittest.main()
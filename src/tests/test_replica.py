@@ -0,0 +1,123 @@
+# tests/test_replica.py
+import unittest
+
+from src.benchmarks.ledger import generate_ledger
+from src.core import db
+from src.core.backends import MemoryBackend, ReplicaClient, SQLiteBackend
+
+
+class CountingBackend(MemoryBackend):
+    """Supabase falso que conta as consultas recebidas por ação."""
+
+    def __init__(self, tables):
+        super().__init__(tables)
+        self.calls = {}
+
+    def execute(self, query):
+        self.calls[query.action] = self.calls.get(query.action, 0) + 1
+        return super().execute(query)
+
+
+class TestReplicaClient(unittest.TestCase):
+    def setUp(self):
+        ledger = generate_ledger(120, seed=9)
+        for rows in ledger.values():
+            for i, row in enumerate(rows):
+                # Marcas d'água repetidas exercitam o desempate por id
+                row["created_at"] = f"2025-06-30T10:00:{i // 7:02d}+00:00"
+        self.remote = CountingBackend(ledger)
+        self.replica = ReplicaClient(
+            self.remote,
+            SQLiteBackend(enforce_foreign_keys=False),
+            page_size=25,
+            overlap_seconds=0,
+        )
+
+    def test_initial_sync_copies_everything(self):
+        self.assertFalse(self.replica.ready)
+        synced = self.replica.sync_all()
+        self.assertEqual(synced, sum(len(rows) for rows in self.remote.tables.values()))
+        self.assertTrue(self.replica.ready)
+        self.assertEqual(db.get_gastos_summary(self.replica)["count"], 120)
+
+    def test_reads_are_served_locally_after_sync(self):
+        self.replica.sync_all()
+        selects = self.remote.calls["select"]
+        gastos = db.get_gastos(self.replica)
+        self.assertEqual(len(gastos), 120)
+        self.assertEqual(self.remote.calls["select"], selects)
+        # Mesma data pode vir em ordem diferente entre os backends
+        self.assertEqual(
+            sorted(gastos, key=repr),
+            sorted(db.get_gastos(self.remote), key=repr),
+        )
+
+    def test_incremental_sync_brings_only_new_rows(self):
+        self.replica.sync_all()
+        self.assertEqual(self.replica.sync_all(), 0)
+        self.remote.table("expenses").insert(
+            {
+                "value": 7.0,
+                "category_id": "cat-1",
+                "date": "2025-07-01",
+                "created_at": "2025-07-01T09:00:00+00:00",
+            }
+        ).execute()
+        self.assertEqual(self.replica.sync_all(), 1)
+        self.assertEqual(db.get_gastos_summary(self.replica)["count"], 121)
+
+    def test_overlap_rereads_without_counting(self):
+        self.replica.overlap_seconds = 3600
+        self.replica.sync_all()
+        self.assertEqual(self.replica.sync_all(), 0)
+        self.assertEqual(db.get_gastos_summary(self.replica)["count"], 120)
+
+    def test_writes_go_through_to_both(self):
+        self.replica.sync_all()
+        self.assertTrue(
+            db.add_expense(self.replica, 12.5, "cat-2", "2025-06-30", "fp-0", "café")
+        )
+        self.assertEqual(db.get_gastos_summary(self.remote)["count"], 121)
+        self.assertEqual(db.get_gastos_summary(self.replica)["count"], 121)
+
+        self.assertTrue(db.add_category(self.replica, "academia"))
+        names = [c["name"] for c in db.get_categories(self.replica)]
+        self.assertIn("Academia", names)
+
+    def test_reconcile_brings_external_edits_and_deletes(self):
+        self.replica.sync_all()
+        gasto, removido = self.remote.tables["expenses"][:2]
+        # Edição e exclusão feitas fora do bot: created_at não muda
+        self.remote.table("expenses").update({"value": 999.0}).eq(
+            "id", gasto["id"]
+        ).execute()
+        self.remote.table("expenses").delete().eq("id", removido["id"]).execute()
+        self.assertEqual(self.replica.sync_all(), 0)
+
+        self.assertEqual(self.replica.reconcile_all(), 2)
+        self.assertEqual(
+            db.get_gastos_summary(self.replica), db.get_gastos_summary(self.remote)
+        )
+        self.assertEqual(self.replica.reconcile_all(), 0)
+
+    def test_reconcile_keeps_rows_written_during_it(self):
+        self.replica.sync_all()
+        self.replica.local.table("expenses").insert(
+            {
+                "id": "recente",
+                "value": 1.0,
+                "category_id": "cat-1",
+                "date": "2025-07-01",
+                "created_at": "2999-01-01T00:00:00+00:00",
+            }
+        ).execute()
+        self.replica.reconcile_all()
+        self.assertEqual(db.get_gastos_summary(self.replica)["count"], 121)
+
+    def test_reads_fall_back_to_remote_before_sync(self):
+        self.assertEqual(len(db.get_gastos(self.replica)), 120)
+        self.assertGreater(self.remote.calls["select"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+# tests/test_reports.py
+import datetime
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.core import reports
+
+
+class TestChartCache(unittest.TestCase):
+    def setUp(self):
+        self.render = MagicMock(side_effect=lambda client: io.BytesIO(b"png"))
+        patcher = patch.dict(reports.CACHED_CHARTS, {"balanco": self.render})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_render_uses_cache_until_invalidated(self):
+        cache = reports.ChartCache(ttl=60)
+        client = MagicMock()
+
+        self.assertEqual(cache.render(client, "balanco").getvalue(), b"png")
+        self.assertEqual(cache.render(client, "balanco").getvalue(), b"png")
+        self.assertEqual(self.render.call_count, 1)
+
+        cache.invalidate()
+        self.assertIsNone(cache.get("balanco"))
+        cache.render(client, "balanco")
+        self.assertEqual(self.render.call_count, 2)
+
+    def test_render_does_not_cache_missing_chart(self):
+        self.render.side_effect = lambda client: None
+        cache = reports.ChartCache(ttl=60)
+        self.assertIsNone(cache.render(MagicMock(), "balanco"))
+        self.assertIsNone(cache.get("balanco"))
+
+    def test_expired_entry(self):
+        cache = reports.ChartCache(ttl=0)
+        cache.render(MagicMock(), "balanco")
+        with patch("src.core.reports.time.monotonic", return_value=1e12):
+            self.assertIsNone(cache.get("balanco"))
+
+
+class TestMonthlyDigest(unittest.TestCase):
+    def test_previous_month(self):
+        self.assertEqual(
+            reports.previous_month(datetime.date(2025, 1, 1)), "2024-12-31"
+        )
+
+    @patch("src.core.db.get_categories")
+    @patch("src.core.db.get_ganhos_total")
+    @patch("src.core.db.iter_gastos_pages")
+    def test_build_monthly_digest(self, mock_pages, mock_ganhos, mock_categories):
+        mock_pages.return_value = iter(
+            [
+                [
+                    {"category_id": "c1", "value": 300.0},
+                    {"category_id": "c2", "value": 50.0},
+                    {"category_id": "c1", "value": 250.0},
+                ]
+            ]
+        )
+        mock_ganhos.return_value = 1000.0
+        mock_categories.return_value = [
+            {"id": "c1", "name": "Alimentacao", "monthly_limit": 500.0},
+            {"id": "c2", "name": "Lazer", "monthly_limit": None},
+        ]
+
+        digest = reports.build_monthly_digest(MagicMock(), "2025-06-30")
+
+        self.assertIn("Resumo de 2025-06", digest)
+        self.assertIn("Gastos: R$600.00", digest)
+        self.assertIn("Saldo: R$400.00", digest)
+        self.assertIn("🚨 Alimentacao: R$550.00 de R$500.00", digest)
+        self.assertIn("- Lazer: R$50.00", digest)
+        mock_ganhos.assert_called_once_with(
+            mock_pages.call_args[0][0], "2025-06-01", "2025-06-30"
+        )
+
+    @patch("src.core.db.get_ganhos_total", return_value=0.0)
+    @patch("src.core.db.iter_gastos_pages", return_value=iter([]))
+    def test_build_monthly_digest_empty(self, mock_pages, mock_ganhos):
+        self.assertIsNone(reports.build_monthly_digest(MagicMock(), "2025-06-30"))
+
+
+class TestDigestSubscriptions(unittest.TestCase):
+    def test_subscriptions_survive_restart(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "resumo.json")
+            subscriptions = reports.DigestSubscriptions(path, initial=[10])
+            self.assertTrue(subscriptions.toggle(20))
+            self.assertFalse(subscriptions.toggle(10))
+
+            # O arquivo vale mais que a lista inicial depois da primeira gravação
+            reopened = reports.DigestSubscriptions(path, initial=[10])
+            self.assertEqual(list(reopened), [20])
+            self.assertNotIn(10, reopened)
+
+    def test_without_path_keeps_memory_only(self):
+        subscriptions = reports.DigestSubscriptions(initial=[3, 1])
+        self.assertEqual(list(subscriptions), [1, 3])
+        self.assertFalse(subscriptions.toggle(3))
+        self.assertEqual(len(subscriptions), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
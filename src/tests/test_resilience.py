@@ -0,0 +1,175 @@
+# tests/test_resilience.py
+import asyncio
+import threading
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import httpx
+from postgrest.exceptions import APIError
+
+from src.bot.commands.category import category_command
+from src.core import db, resilience
+from src.core.backends import MemoryBackend
+from src.core.resilience import (
+    CircuitBreaker,
+    DependencyUnavailableError,
+    RetryPolicy,
+    is_transient,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FailingBackend(MemoryBackend):
+    """Banco em memória que falha nas primeiras `failures` consultas."""
+
+    def __init__(self, error, failures=10**6):
+        super().__init__({"categories": [{"id": "cat-1", "name": "Lazer"}]})
+        self.error = error
+        self.failures = failures
+        self.calls = 0
+
+    def execute(self, query):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.error
+        return super().execute(query)
+
+
+class TestClassification(unittest.TestCase):
+    def test_transient_errors(self):
+        self.assertTrue(is_transient(ConnectionError("reset")))
+        self.assertTrue(is_transient(httpx.ReadTimeout("lento")))
+        self.assertTrue(is_transient(APIError({"message": "x", "code": 503})))
+        self.assertTrue(is_transient(APIError({"message": "x", "code": "57014"})))
+        self.assertTrue(is_transient(APIError({"message": "x", "code": "08006"})))
+
+    def test_permanent_errors(self):
+        self.assertFalse(is_transient(ValueError("valor inválido")))
+        self.assertFalse(is_transient(APIError({"message": "x", "code": "23505"})))
+        self.assertFalse(is_transient(APIError({"message": "x", "code": 400})))
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            "teste", failure_threshold=3, reset_timeout=10, clock=self.clock
+        )
+
+    def test_opens_after_consecutive_failures(self):
+        for _ in range(2):
+            self.breaker.record_failure()
+        self.breaker.record_success()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "closed")
+        self.breaker.record_failure()
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "open")
+        self.assertFalse(self.breaker.allow())
+
+    def test_half_open_allows_single_probe(self):
+        for _ in range(3):
+            self.breaker.record_failure()
+        self.clock.now = 10
+        self.assertEqual(self.breaker.state, "half_open")
+        self.assertTrue(self.breaker.allow())
+        self.assertFalse(self.breaker.allow())
+        self.breaker.record_failure()
+        self.assertEqual(self.breaker.state, "open")
+
+        self.clock.now = 20
+        self.assertTrue(self.breaker.allow())
+        self.breaker.record_success()
+        self.assertEqual(self.breaker.state, "closed")
+
+
+class TestCall(unittest.TestCase):
+    def setUp(self):
+        resilience.reset_breakers()
+        policy = RetryPolicy(attempts=3, base_delay=0.001, max_delay=0.001, budget=5)
+        patcher = patch.dict(resilience.POLICIES, {"supabase": policy})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(resilience.reset_breakers)
+
+    def test_retries_transient_failures(self):
+        client = FailingBackend(ConnectionError("reset"), failures=2)
+        self.assertEqual(len(db.get_categories(client)), 1)
+        self.assertEqual(client.calls, 3)
+
+    def test_persistent_failure_is_not_masked(self):
+        client = FailingBackend(ConnectionError("reset"))
+        with self.assertRaises(DependencyUnavailableError) as ctx:
+            db.get_categories(client)
+        self.assertEqual(ctx.exception.dependency, "supabase")
+        self.assertIn("banco de dados", ctx.exception.user_message)
+        self.assertEqual(client.calls, 3)
+
+    def test_permanent_failure_keeps_old_contract(self):
+        client = FailingBackend(ValueError("coluna inválida"))
+        self.assertEqual(db.get_categories(client), [])
+        self.assertEqual(client.calls, 1)
+
+    def test_non_idempotent_writes_are_not_retried(self):
+        client = FailingBackend(httpx.ReadTimeout("lento"))
+        with self.assertRaises(DependencyUnavailableError):
+            db.add_expense(client, 10.0, "cat-1", "2025-06-01")
+        self.assertEqual(client.calls, 1)
+
+    def test_failed_write_does_not_claim_nothing_changed(self):
+        client = FailingBackend(httpx.ReadTimeout("lento"))
+        with self.assertRaises(DependencyUnavailableError) as ctx:
+            db.add_expense(client, 10.0, "cat-1", "2025-06-01")
+        self.assertTrue(ctx.exception.write_uncertain)
+        self.assertNotIn("Nada foi alterado", ctx.exception.user_message)
+        self.assertIn("/listar_gastos", ctx.exception.user_message)
+
+        # Com o circuito aberto a escrita nem sai: aí nada mudou mesmo
+        for _ in range(2):
+            with self.assertRaises(DependencyUnavailableError):
+                db.get_categories(client)
+        with self.assertRaises(DependencyUnavailableError) as ctx:
+            db.add_expense(client, 10.0, "cat-1", "2025-06-01")
+        self.assertFalse(ctx.exception.write_uncertain)
+        self.assertIn("Nada foi alterado", ctx.exception.user_message)
+
+    def test_handlers_retry_off_the_event_loop(self):
+        client = FailingBackend(ConnectionError("reset"), failures=1)
+        threads = []
+        execute = client.execute
+
+        def tracking_execute(query):
+            threads.append(threading.current_thread())
+            return execute(query)
+
+        client.execute = tracking_execute
+        update = MagicMock()
+        update.message.reply_text = AsyncMock()
+        context = MagicMock(bot_data={"supabase_client": client})
+
+        asyncio.run(category_command(update, context))
+        self.assertEqual(client.calls, 2)
+        self.assertNotIn(threading.main_thread(), threads)
+        self.assertIn("Lazer", update.message.reply_text.call_args.args[0])
+
+    def test_open_circuit_fails_fast(self):
+        client = FailingBackend(ConnectionError("reset"))
+        for _ in range(2):
+            with self.assertRaises(DependencyUnavailableError):
+                db.get_categories(client)
+        calls = client.calls
+        with self.assertRaises(DependencyUnavailableError) as ctx:
+            db.get_categories(client)
+        self.assertIn("circuito aberto", str(ctx.exception))
+        self.assertEqual(client.calls, calls)
+
+
+if __name__ == "__main__":
+    unittest.main()
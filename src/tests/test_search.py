@@ -0,0 +1,128 @@
+# tests/test_search.py
+import unittest
+
+from src.benchmarks.fake_supabase import FakeSupabaseClient
+from src.core.search import SearchIndex, query_terms
+
+
+def _tables():
+    return {
+        "categories": [
+            {"id": "c1", "name": "Transporte", "monthly_limit": None, "aliases": None},
+            {"id": "c2", "name": "Alimentacao", "monthly_limit": None, "aliases": None},
+        ],
+        "payment_methods": [{"id": "fp1", "name": "Pix"}],
+        "expenses": [
+            {
+                "id": "e1",
+                "value": 15.3,
+                "date": "2025-07-01",
+                "description": "Uber para o trabalho",
+                "category_id": "c1",
+                "payment_method_id": "fp1",
+            },
+            {
+                "id": "e2",
+                "value": 22.1,
+                "date": "2025-07-15",
+                "description": "UberEats almoço",
+                "category_id": "c2",
+                "payment_method_id": None,
+            },
+            {
+                "id": "e3",
+                "value": 8.0,
+                "date": "2025-08-02",
+                "description": "Café na Avatim",
+                "category_id": "c2",
+                "payment_method_id": "fp1",
+            },
+            {
+                "id": "e4",
+                "value": 0.1,
+                "date": "2025-08-03",
+                "description": None,
+                "category_id": "c2",
+                "payment_method_id": None,
+            },
+        ],
+    }
+
+
+class TestSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.client = FakeSupabaseClient(_tables())
+        self.index = SearchIndex(ttl=3600)
+
+    def test_query_terms_drop_stop_words(self):
+        self.assertEqual(query_terms("gastos com uber"), ["gastos", "uber"])
+        self.assertEqual(query_terms("de"), ["de"])
+
+    def test_prefix_and_accent_insensitive(self):
+        result = self.index.search(self.client, "uber")
+        self.assertEqual(result["count"], 2)
+        self.assertAlmostEqual(result["total"], 37.4)
+        # Mais recente primeiro, com os nomes resolvidos
+        self.assertEqual([g["id"] for g in result["gastos"]], ["e2", "e1"])
+        self.assertEqual(result["gastos"][1]["categoria_nome"], "Transporte")
+        self.assertEqual(result["gastos"][0]["forma_pagamento_nome"], "Não Informado")
+        self.assertEqual(self.index.search(self.client, "CAFE")["count"], 1)
+        self.assertEqual(self.index.search(self.client, "avat")["count"], 1)
+
+    def test_all_terms_must_match(self):
+        self.assertEqual(self.index.search(self.client, "uber almoco")["count"], 1)
+        self.assertEqual(self.index.search(self.client, "uber avatim")["count"], 0)
+        self.assertEqual(self.index.search(self.client, "")["count"], 0)
+
+    def test_period_and_limit(self):
+        result = self.index.search(
+            self.client, "uber", data_inicio="2025-07-10", data_fim="2025-07-31"
+        )
+        self.assertEqual([g["id"] for g in result["gastos"]], ["e2"])
+        limited = self.index.search(self.client, "uber", limit=1)
+        self.assertEqual((limited["count"], len(limited["gastos"])), (2, 1))
+
+    def test_loads_once_and_adds_incrementally(self):
+        self.index.search(self.client, "uber")
+        calls = self.client.calls
+        self.index.add(
+            [
+                {
+                    "value": 30.0,
+                    "date": "2025-09-01",
+                    "description": "Ônibus intermunicipal",
+                    "category_id": "c1",
+                    "payment_method_id": None,
+                },
+                {
+                    "value": 12.0,
+                    "date": "2025-09-02",
+                    "description": "uber",
+                    "category_id": "c1",
+                },
+            ]
+        )
+        self.assertEqual(self.index.search(self.client, "onib")["count"], 1)
+        self.assertEqual(self.index.search(self.client, "uber")["count"], 3)
+        self.assertEqual(self.client.calls, calls)
+
+    def test_add_before_load_and_invalidate(self):
+        self.index.add([{"value": 1.0, "date": "2025-01-01", "description": "uber"}])
+        self.assertEqual(self.index.search(self.client, "uber")["count"], 2)
+        self.client.tables["expenses"].append(
+            {
+                "id": "e5",
+                "value": 5.0,
+                "date": "2025-09-01",
+                "description": "Uber noturno",
+                "category_id": "c1",
+                "payment_method_id": None,
+            }
+        )
+        self.assertEqual(self.index.search(self.client, "uber")["count"], 2)
+        self.index.invalidate()
+        self.assertEqual(self.index.search(self.client, "uber")["count"], 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+# tests/test_single_flight.py
+import threading
+import time
+import unittest
+
+from src.core import db
+from src.core.backends import MemoryBackend
+
+
+class GatedBackend(MemoryBackend):
+    """Banco em memória cujas consultas esperam liberação e são contadas."""
+
+    def __init__(self, tables, error=None):
+        super().__init__(tables)
+        self.release = threading.Event()
+        self.offsets = []
+        self.error = error
+
+    @property
+    def calls(self):
+        return len(self.offsets)
+
+    def execute(self, query):
+        self.offsets.append(query.row_offset)
+        self.release.wait(5)
+        if self.error:
+            raise self.error
+        return super().execute(query)
+
+
+def wait_for_waiters(count):
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        with db._flights_lock:
+            if any(flight.waiters >= count for flight in db._flights.values()):
+                return
+        time.sleep(0.001)
+    raise AssertionError("chamadas concorrentes não chegaram")
+
+
+def run_concurrently(func, client, n):
+    results, errors = [None] * n, [None] * n
+
+    def worker(i):
+        try:
+            results[i] = func(client)
+        except Exception as e:
+            errors[i] = e
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_reads_share_one_query(self):
+        client = GatedBackend({"categories": [{"id": "c1", "name": "Lazer"}]})
+        threads, results, errors = run_concurrently(db.get_categories, client, 8)
+        wait_for_waiters(7)
+        client.release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(client.calls, 1)
+        self.assertEqual(errors, [None] * 8)
+        self.assertTrue(all(r == results[0] for r in results))
+        # Cada chamador monta seus próprios modelos
+        self.assertIsNot(results[0][0], results[1][0])
+        self.assertEqual(results[1][0]["name"], "Lazer")
+
+    def test_later_reads_are_fresh(self):
+        client = GatedBackend({"payment_methods": [{"id": "p1", "name": "Pix"}]})
+        client.release.set()
+        self.assertEqual(len(db.get_payment_methods(client)), 1)
+        client.table("payment_methods").insert({"name": "Débito"}).execute()
+        self.assertEqual(len(db.get_payment_methods(client)), 2)
+        self.assertEqual(client.calls, 3)
+
+    def test_concurrent_page_reads_share_one_query(self):
+        client = GatedBackend(
+            {
+                "ganhos": [
+                    {
+                        "id": "g1",
+                        "value": 10.0,
+                        "description": "x",
+                        "date": "2025-07-01",
+                    }
+                ]
+            }
+        )
+        threads, results, errors = run_concurrently(db.get_ganhos, client, 4)
+        wait_for_waiters(3)
+        client.release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [None] * 4)
+        self.assertEqual(client.offsets.count(0), 1)
+        self.assertTrue(all(len(r) == 1 for r in results))
+
+    def test_failed_read_is_shared_too(self):
+        client = GatedBackend({}, error=ValueError("consulta inválida"))
+        threads, results, errors = run_concurrently(db.get_gastos, client, 4)
+        wait_for_waiters(3)
+        client.release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(client.calls, 1)
+        self.assertEqual(results, [[]] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,6 @@
 # tests/test_text_utils.py
 import unittest
-from src.utils.text_utils import to_camel_case
+from src.utils.text_utils import fold_text, to_camel_case, tokenize
 
 
 class TestTextUtils(unittest.TestCase):
@@ -47,3 +47,8 @@ class TestTextUtils(unittest.TestCase):
         self.assertEqual(
             to_camel_case("TV purchase"), "TVPurchase"
         )  # Se já vier capitalizado
+
+    def test_tokenize_folds_accents(self):
+        self.assertEqual(fold_text("Café São"), "cafe sao")
+        self.assertEqual(tokenize("Pão-de-Açúcar 24h"), ["pao", "de", "acucar", "24h"])
+        self.assertEqual(tokenize(None), [])
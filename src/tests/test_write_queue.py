@@ -0,0 +1,106 @@
+# tests/test_write_queue.py
+import os
+import random
+import tempfile
+import unittest
+
+from src.core import db
+from src.core.backends import MemoryBackend
+from src.core.write_queue import WriteQueue, backoff_delay
+
+
+class FlakyBackend(MemoryBackend):
+    """Banco em memória que simula o Supabase fora do ar e a FK de categoria."""
+
+    def __init__(self):
+        super().__init__({"categories": [{"id": "cat-1", "name": "Lazer"}]})
+        self.down = False
+        self.writes = 0
+
+    def execute(self, query):
+        if query.action != "select":
+            self.writes += 1
+            if self.down:
+                raise ConnectionError("Supabase fora do ar")
+            if any(row.get("category_id") == "cat-apagada" for row in query.payload):
+                raise ValueError("violates foreign key constraint")
+        return super().execute(query)
+
+
+def expense(value, category_id="cat-1"):
+    return {"value": value, "category_id": category_id, "date": "2025-06-01"}
+
+
+class TestWriteQueue(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "fila.db")
+        self.queue = WriteQueue(self.path, rng=random.Random(1))
+        self.client = FlakyBackend()
+
+    def tearDown(self):
+        self.queue.close()
+        self.tmpdir.cleanup()
+
+    def test_flush_sends_batch_in_one_request(self):
+        self.assertEqual(len(self.queue.enqueue([expense(1), expense(2)])), 2)
+        self.queue.enqueue([expense(3)])
+        self.assertEqual(self.queue.pending(), 3)
+        result = self.queue.flush(self.client, now=0)
+        self.assertEqual((result["flushed"], result["failed"]), (3, 0))
+        # As linhas gravadas voltam com id, para entrar no índice de busca
+        self.assertEqual([row["value"] for row in result["rows"]], [1, 2, 3])
+        self.assertTrue(all(row["id"] for row in result["rows"]))
+        self.assertEqual(self.client.writes, 1)
+        self.assertEqual(self.queue.pending(), 0)
+        self.assertEqual(db.get_gastos_summary(self.client)["total"], 6)
+
+    def test_failed_entries_back_off_and_survive_restart(self):
+        self.queue.enqueue([expense(10)])
+        self.client.down = True
+        self.assertEqual(
+            self.queue.flush(self.client, now=100),
+            {"flushed": 0, "failed": 1, "rows": []},
+        )
+        # Antes do backoff vencer, nada é reenviado
+        self.assertEqual(self.queue.flush(self.client, now=100)["failed"], 0)
+
+        self.queue.close()
+        self.queue = WriteQueue(self.path)
+        self.assertEqual(self.queue.pending(), 1)
+        self.client.down = False
+        self.assertEqual(self.queue.flush(self.client, now=10_000)["flushed"], 1)
+        self.assertEqual(db.get_gastos_summary(self.client)["count"], 1)
+
+    def test_retry_after_partial_write_does_not_duplicate(self):
+        keys = self.queue.enqueue([expense(5)])
+        # O Supabase gravou, mas a resposta se perdeu: a entrada continua na fila
+        db.add_expenses_bulk(self.client, [{**expense(5), "idempotency_key": keys[0]}])
+        self.queue.flush(self.client, now=0)
+        self.assertEqual(db.get_gastos_summary(self.client)["count"], 1)
+        self.assertEqual(self.queue.pending(), 0)
+
+    def test_invalid_entry_does_not_block_others(self):
+        self.queue.enqueue([expense(1), expense(2, "cat-apagada")])
+        self.assertEqual(self.queue.flush(self.client, now=0)["failed"], 2)
+        result = self.queue.flush(self.client, ignore_backoff=True)
+        self.assertEqual((result["flushed"], result["failed"]), (1, 1))
+        self.assertEqual([row["value"] for row in result["rows"]], [1])
+        self.assertEqual(self.queue.pending(), 1)
+
+    def test_drain_empties_queue(self):
+        self.queue.enqueue([expense(i) for i in range(250)])
+        self.assertEqual(self.queue.drain(self.client, timeout=5), 0)
+        self.assertEqual(db.get_gastos_summary(self.client)["count"], 250)
+
+    def test_backoff_grows_and_is_capped(self):
+        rng = random.Random(3)
+        delays = [backoff_delay(n, base=1, cap=60, rng=rng) for n in range(10)]
+        self.assertTrue(0.5 <= delays[0] <= 1)
+        self.assertTrue(4 <= delays[3] <= 8)
+        self.assertTrue(all(d <= 60 for d in delays))
+        self.assertGreaterEqual(delays[-1], 30)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,96 @@
+# src/utils/money.py
+import re
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Any, Iterable, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+# Símbolo de moeda e espaços; qualquer outra letra torna o texto inválido
+_NOISE = r"(?i)r\$|\$|\s"
+# Milhares com ponto ou vírgula (grupos de 3) e até 2 casas decimais com o outro
+# separador: "1.234,56", "1,234.56", "1234,5", "12.50". Um separador seguido de
+# exatamente 3 dígitos é de milhar ("1.234" = mil duzentos e trinta e quatro)
+_PATTERN = (
+    r"^(?P<sign>-?)(?P<units>\d{1,3}(?:[.,]\d{3})+|\d+)"
+    r"(?:[.,](?P<frac>\d{1,2}))?(?P<trailing>-?)$"
+)
+_REGEX = re.compile(_PATTERN)
+
+
+def parse_money(value: Any) -> Union[int, None]:
+    """
+    Converte um valor em centavos. Números são arredondados para o centavo; textos
+    aceitam formato brasileiro e americano ("R$ 1.234,56", "1,234.56", "-10,98",
+    "45,90-"). Retorna None se o texto não for um valor.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if not isinstance(value, str):
+        try:
+            return to_cents(value)
+        except (InvalidOperation, ValueError):
+            return None
+    match = _REGEX.match(re.sub(_NOISE, "", value))
+    if not match:
+        return None
+    cents = int(re.sub(r"[.,]", "", match["units"])) * 100
+    cents += int((match["frac"] or "").ljust(2, "0"))
+    return -cents if match["sign"] or match["trailing"] else cents
+
+
+def parse_money_array(values: Iterable[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Versão vetorizada de parse_money para textos (ex: a coluna de valor de uma
+    página do extrato). Retorna (centavos int64, máscara de válidos); inválidos
+    ficam com 0.
+    """
+    text = pd.Series(list(values), dtype=object).fillna("").astype(str)
+    if text.empty:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool)
+    parts = text.str.replace(_NOISE, "", regex=True).str.extract(_PATTERN)
+    valid = parts["units"].notna().to_numpy()
+    units = parts["units"].str.replace(r"[.,]", "", regex=True).fillna("0")
+    frac = parts["frac"].fillna("").str.ljust(2, "0")
+    cents = units.astype(np.int64).to_numpy() * 100 + frac.astype(np.int64).to_numpy()
+    negative = ((parts["sign"] == "-") | (parts["trailing"] == "-")).to_numpy()
+    return np.where(negative, -cents, cents), valid
+
+
+def to_cents(value: Union[int, float, str, Decimal]) -> int:
+    """Centavos de um valor em reais (meio centavo arredonda para cima)."""
+    if isinstance(value, str):
+        cents = parse_money(value)
+        if cents is None:
+            raise ValueError(f"Valor inválido: {value!r}")
+        return cents
+    reais = Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    return int(reais * 100)
+
+
+def cents_array(values: Iterable[float]) -> np.ndarray:
+    """
+    Centavos (int64) de valores numéricos em reais, como vêm do Supabase. Meio
+    centavo arredonda para longe do zero, como em to_cents; a folga relativa
+    absorve o erro de representação do float (1.005 * 100 = 100.49999999999999).
+    """
+    reais = np.asarray(list(values) if not hasattr(values, "__len__") else values)
+    reais = reais.astype(np.float64)
+    scaled = np.abs(reais) * 100
+    cents = np.floor(scaled + 0.5 + scaled * 1e-12)
+    return (np.sign(reais) * cents).astype(np.int64)
+
+
+def sum_money(values: Iterable[float]) -> int:
+    """Soma exata, em centavos, de valores em reais."""
+    return int(cents_array(values).sum())
+
+
+def from_cents(cents: Any) -> Any:
+    """Reais (float) de centavos; aceita arrays. Usado para gravar e plotar."""
+    return cents / 100
+
+
+def format_money(cents: int) -> str:
+    """Formata centavos como 'R$1234.56', o mesmo texto de f'R${valor:.2f}'."""
+    return f"R${cents / 100:.2f}"
@@ -1,5 +1,23 @@
 # src/utils/text_utils.py
 import re
+import unicodedata
+from typing import List, Union
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+def fold_text(text: str) -> str:
+    """Minúsculas e sem acentos: 'Café São Paulo' -> 'cafe sao paulo'."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: Union[str, None]) -> List[str]:
+    """Palavras (letras e dígitos) de um texto, já normalizadas por fold_text."""
+    if not text:
+        return []
+    return _WORD.findall(fold_text(text))
+
 
 def to_camel_case(s: str) -> str:
     """Converte uma string para PascalCase (cada palavra começa com maiúscula, sem forçar o resto para minúscula).